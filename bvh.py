@@ -0,0 +1,293 @@
+from typing import Callable, Tuple
+import numpy as np
+
+LEAF_SIZE = 4  # Максимальное число элементов в листе
+REBUILD_RATIO = 2.0  # Допустимый рост суммарной площади узлов после обновлений
+
+def transform_boxes(minimum: np.ndarray, maximum: np.ndarray,
+                    matrices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Мировые AABB набора локальных AABB
+
+    Args:
+        minimum: Минимальные углы локальных AABB (K, 3)
+        maximum: Максимальные углы локальных AABB (K, 3)
+        matrices: Матрицы модели для вектор-столбцов (K, 4, 4)
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Минимальные и максимальные углы мировых AABB (K, 3)
+    """
+    minimum = np.asarray(minimum, dtype=np.float64).reshape(-1, 3)
+    maximum = np.asarray(maximum, dtype=np.float64).reshape(-1, 3)
+    matrices = np.asarray(matrices, dtype=np.float64).reshape(-1, 4, 4)
+    linear = matrices[:, :3, :3]
+    center = np.einsum('kij,kj->ki', linear, (minimum + maximum) * 0.5) + matrices[:, :3, 3]
+    extent = np.einsum('kij,kj->ki', np.abs(linear), (maximum - minimum) * 0.5)
+    return center - extent, center + extent
+
+def _ranges(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Объединение диапазонов [start, start + count) в один массив индексов"""
+    first = np.cumsum(counts) - counts
+    return np.repeat(starts - first, counts) + np.arange(counts.sum())
+
+def _spread_bits(values: np.ndarray) -> np.ndarray:
+    """Разнесение 21 младшего бита с шагом 3 (для кода Мортона)"""
+    values = values & np.uint64(0x1fffff)
+    for shift, mask in ((32, 0x1f00000000ffff), (16, 0x1f0000ff0000ff), (8, 0x100f00f00f00f00f),
+                        (4, 0x10c30c30c30c30c3), (2, 0x1249249249249249)):
+        values = (values | (values << np.uint64(shift))) & np.uint64(mask)
+    return values
+
+def _morton_codes(points: np.ndarray) -> np.ndarray:
+    """Коды Мортона точек, квантованных по 21 биту на ось в пределах их AABB"""
+    if not len(points):
+        return np.empty(0, dtype=np.uint64)
+    low = points.min(axis=0)
+    span = np.maximum(points.max(axis=0) - low, 1e-12)
+    cells = ((points - low) / span * 0x1fffff).astype(np.uint64)
+    return (_spread_bits(cells[:, 0]) | (_spread_bits(cells[:, 1]) << np.uint64(1))
+            | (_spread_bits(cells[:, 2]) << np.uint64(2)))
+
+def _surface_area(lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+    size = np.maximum(upper - lower, 0.0)
+    return 2.0 * (size[:, 0] * size[:, 1] + size[:, 1] * size[:, 2] + size[:, 2] * size[:, 0])
+
+class BVH:
+    """Иерархия ограничивающих объемов (AABB) над набором элементов
+
+    Дерево строится по кодам Мортона центров элементов и хранится в
+    массивах; листья имеют номера от 0, потомки — меньшие номера, чем
+    предки, корень — root. Элементы листа занимают непрерывный
+    диапазон массива order.
+
+    При перемещении элементов дерево не перестраивается, а уточняется
+    (refit): пересчитываются объемы затронутых листьев и их предков.
+    Качество дерева после уточнений оценивается суммарной площадью
+    узлов; если она выросла более чем в rebuild_ratio раз по сравнению с
+    построением, needs_rebuild() возвращает True.
+
+    Запросы обходят дерево по уровням: узлы текущего фронта проверяются
+    одной векторной операцией. Результат — индексы элементов.
+
+    Attributes:
+        lower: Минимальные углы AABB элементов (K, 3)
+        upper: Максимальные углы AABB элементов (K, 3)
+        order: Индексы элементов в порядке листьев (K,)
+        root: Номер корневого узла (-1 для пустого дерева)
+        leaf_of: Лист каждого элемента (K,)
+        node_lower: Минимальные углы AABB узлов (M, 3)
+        node_upper: Максимальные углы AABB узлов (M, 3)
+        left: Левый потомок узла (-1 у листа) (M,)
+        right: Правый потомок узла (-1 у листа) (M,)
+        start: Начало диапазона элементов листа в order (M,)
+        count: Число элементов листа (0 у внутренних узлов) (M,)
+        parent: Родитель узла (-1 у корня) (M,)
+        depth: Глубина узла (M,)
+    """
+
+    def __init__(self, lower: np.ndarray, upper: np.ndarray, leaf_size: int = LEAF_SIZE,
+                 rebuild_ratio: float = REBUILD_RATIO):
+        """Построение иерархии
+
+        Args:
+            lower: Минимальные углы AABB элементов (K, 3)
+            upper: Максимальные углы AABB элементов (K, 3)
+            leaf_size: Максимальное число элементов в листе
+            rebuild_ratio: Допустимый рост суммарной площади узлов
+
+        Raises:
+            ValueError: Если размер листа меньше 1
+        """
+        if leaf_size < 1:
+            raise ValueError("Leaf size must be at least 1")
+        self.lower = np.array(lower, dtype=np.float64).reshape(-1, 3)
+        self.upper = np.array(upper, dtype=np.float64).reshape(-1, 3)
+        self.leaf_size = leaf_size
+        self.rebuild_ratio = rebuild_ratio
+        self.rebuild()
+
+    def __len__(self):
+        return len(self.lower)
+
+    def rebuild(self) -> None:
+        """Полное перестроение дерева по текущим AABB элементов
+
+        Элементы упорядочиваются по коду Мортона центров и делятся на
+        листья по leaf_size подряд идущих элементов; соседние узлы
+        объединяются попарно снизу вверх. Все шаги векторные, поэтому
+        построение дерева над миллионом треугольников занимает доли секунды.
+        """
+        count = len(self.lower)
+        self.order = np.argsort(_morton_codes((self.lower + self.upper) * 0.5), kind='stable')
+        starts = np.arange(0, count, self.leaf_size)
+        leaves = len(starts)
+        left, right, levels = [np.full(leaves, -1, dtype=np.intp)], [np.full(leaves, -1, dtype=np.intp)], []
+        level = np.arange(leaves)
+        total = leaves
+        while len(level) > 1:
+            pairs = len(level) // 2
+            parents = np.arange(total, total + pairs)
+            left.append(level[0:2 * pairs:2])
+            right.append(level[1:2 * pairs:2])
+            levels.append(parents)
+            total += pairs
+            # Узел без пары переходит на следующий уровень без изменений
+            level = np.concatenate((parents, level[2 * pairs:]))
+        self.left = np.concatenate(left)
+        self.right = np.concatenate(right)
+        self.root = int(level[0]) if leaves else -1
+        self.start = np.zeros(total, dtype=np.intp)
+        self.count = np.zeros(total, dtype=np.intp)
+        self.start[:leaves] = starts
+        self.count[:leaves] = np.minimum(self.leaf_size, count - starts)
+        self.parent = np.full(total, -1, dtype=np.intp)
+        self.depth = np.zeros(total, dtype=np.intp)
+        for parents in reversed(levels):
+            for children in (self.left[parents], self.right[parents]):
+                self.parent[children] = parents
+                self.depth[children] = self.depth[parents] + 1
+        self.node_lower = np.empty((total, 3))
+        self.node_upper = np.empty((total, 3))
+        self.leaf_of = np.empty(count, dtype=np.intp)
+        self.leaf_of[self.order] = np.arange(count) // self.leaf_size
+        if leaves:
+            self.node_lower[:leaves] = np.minimum.reduceat(self.lower[self.order], starts)
+            self.node_upper[:leaves] = np.maximum.reduceat(self.upper[self.order], starts)
+        for parents in levels:
+            self._union_children(parents)
+        self.build_cost = self.cost()
+
+    def cost(self) -> float:
+        """Суммарная площадь поверхности узлов (мера качества дерева)"""
+        return float(_surface_area(self.node_lower, self.node_upper).sum())
+
+    def needs_rebuild(self) -> bool:
+        """Ухудшилось ли дерево после уточнений настолько, что его стоит перестроить"""
+        return self.cost() > self.rebuild_ratio * max(self.build_cost, 1e-12)
+
+    def refit(self, items, lower: np.ndarray, upper: np.ndarray) -> None:
+        """Обновление AABB части элементов без изменения структуры дерева
+
+        Пересчитываются только листья с измененными элементами и их предки.
+
+        Args:
+            items: Индексы элементов (J,)
+            lower: Новые минимальные углы (J, 3)
+            upper: Новые максимальные углы (J, 3)
+        """
+        items = np.asarray(items, dtype=np.intp).reshape(-1)
+        if not len(items):
+            return
+        self.lower[items] = np.asarray(lower, dtype=np.float64).reshape(-1, 3)
+        self.upper[items] = np.asarray(upper, dtype=np.float64).reshape(-1, 3)
+        self._refit_nodes(np.unique(self.leaf_of[items]))
+
+    def _refit_nodes(self, leaves: np.ndarray) -> None:
+        """Пересчет AABB листьев и всех их предков (снизу вверх по глубине)"""
+        if not len(leaves):
+            return
+        items = self.order[_ranges(self.start[leaves], self.count[leaves])]
+        offsets = np.cumsum(self.count[leaves]) - self.count[leaves]
+        self.node_lower[leaves] = np.minimum.reduceat(self.lower[items], offsets)
+        self.node_upper[leaves] = np.maximum.reduceat(self.upper[items], offsets)
+
+        ancestors = []
+        nodes = np.unique(self.parent[leaves])
+        nodes = nodes[nodes >= 0]
+        while len(nodes):
+            ancestors.append(nodes)
+            nodes = np.unique(self.parent[nodes])
+            nodes = nodes[nodes >= 0]
+        if not ancestors:
+            return
+        ancestors = np.unique(np.concatenate(ancestors))
+        depths = self.depth[ancestors]
+        for depth in np.unique(depths)[::-1]:
+            self._union_children(ancestors[depths == depth])
+
+    def _union_children(self, nodes: np.ndarray) -> None:
+        """AABB внутренних узлов как объединение AABB их потомков"""
+        self.node_lower[nodes] = np.minimum(self.node_lower[self.left[nodes]], self.node_lower[self.right[nodes]])
+        self.node_upper[nodes] = np.maximum(self.node_upper[self.left[nodes]], self.node_upper[self.right[nodes]])
+
+    def _query(self, overlaps: Callable[[np.ndarray, np.ndarray], np.ndarray]) -> np.ndarray:
+        """Обход дерева с отбором узлов и элементов функцией overlaps(lower, upper) -> маска"""
+        if self.root < 0:
+            return np.empty(0, dtype=np.intp)
+        found = []
+        frontier = np.array([self.root], dtype=np.intp)
+        while len(frontier):
+            frontier = frontier[overlaps(self.node_lower[frontier], self.node_upper[frontier])]
+            leaf = self.left[frontier] < 0
+            leaves = frontier[leaf]
+            if len(leaves):
+                found.append(self.order[_ranges(self.start[leaves], self.count[leaves])])
+            inner = frontier[~leaf]
+            frontier = np.concatenate((self.left[inner], self.right[inner]))
+        if not found:
+            return np.empty(0, dtype=np.intp)
+        items = np.concatenate(found)
+        return np.sort(items[overlaps(self.lower[items], self.upper[items])])
+
+    def query_aabb(self, minimum, maximum) -> np.ndarray:
+        """Элементы, AABB которых пересекает заданный параллелепипед"""
+        minimum = np.asarray(minimum, dtype=np.float64)
+        maximum = np.asarray(maximum, dtype=np.float64)
+        return self._query(lambda lower, upper: ((lower <= maximum) & (upper >= minimum)).all(axis=1))
+
+    def query_sphere(self, center, radius: float) -> np.ndarray:
+        """Элементы, AABB которых пересекает сферу"""
+        center = np.asarray(center, dtype=np.float64)
+
+        def overlaps(lower, upper):
+            closest = np.clip(center, lower, upper)
+            return ((closest - center) ** 2).sum(axis=1) <= radius * radius
+        return self._query(overlaps)
+
+    def query_frustum(self, planes: np.ndarray) -> np.ndarray:
+        """Элементы, AABB которых не лежит целиком вне пирамиды видимости
+
+        Args:
+            planes: Плоскости (6, 4); точка внутри, если a*x + b*y + c*z + d >= 0
+        """
+        planes = np.asarray(planes, dtype=np.float64).reshape(-1, 4)
+        normals, offsets = planes[:, :3], planes[:, 3]
+        spans = np.abs(normals).T
+
+        def overlaps(lower, upper):
+            distance = ((lower + upper) * 0.5) @ normals.T + offsets
+            return ~(distance < -(((upper - lower) * 0.5) @ spans)).any(axis=1)
+        return self._query(overlaps)
+
+    def query_ray(self, origin, direction, max_distance: float = np.inf) -> Tuple[np.ndarray, np.ndarray]:
+        """Элементы, AABB которых пересекает луч, в порядке удаления
+
+        Args:
+            origin: Начало луча (3,)
+            direction: Направление луча (3,); расстояния измеряются в его длинах
+            max_distance: Максимальное расстояние вдоль луча
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Индексы элементов и расстояния до
+                входа луча в их AABB (0, если начало луча внутри)
+        """
+        origin = np.asarray(origin, dtype=np.float64)
+        direction = np.asarray(direction, dtype=np.float64)
+        parallel = direction == 0
+        inverse = 1.0 / np.where(parallel, 1.0, direction)
+
+        def entry(lower, upper):
+            near = (lower - origin) * inverse
+            far = (upper - origin) * inverse
+            t_near, t_far = np.minimum(near, far), np.maximum(near, far)
+            if parallel.any():
+                # Луч параллелен слою: слой либо не ограничивает луч, либо не пересекается
+                inside = ((lower <= origin) & (origin <= upper))[:, parallel]
+                t_near[:, parallel] = np.where(inside, -np.inf, np.inf)
+                t_far[:, parallel] = np.where(inside, np.inf, -np.inf)
+            t_near = np.maximum(t_near.max(axis=1), 0.0)
+            return t_near, (t_near <= t_far.min(axis=1)) & (t_near <= max_distance)
+
+        items = self._query(lambda lower, upper: entry(lower, upper)[1])
+        distances = entry(self.lower[items], self.upper[items])[0]
+        order = np.argsort(distances, kind='stable')
+        return items[order], distances[order]
@@ -1,5 +1,6 @@
 from typing import List, Tuple, Union
 import math
+from vector import Matrix4, Vector3
 
 class Camera:
     """Camera class for 3D scene viewing and projection"""
@@ -31,7 +32,7 @@ class Camera:
         self.near = near
         self.far = far
 
-    def get_projection_matrix(self) -> List[List[float]]:
+    def get_projection_matrix(self) -> Matrix4:
         """Получение матрицы проекции
         
         Создает матрицу перспективной проекции на основе параметров камеры:
@@ -40,24 +41,25 @@ class Camera:
         - ближней и дальней плоскостей отсечения (near, far) - границы видимого пространства
         
         Матрица проекции преобразует координаты из пространства камеры
-        в нормализованные координаты устройства (NDC).
+        в координаты отсечения; после деления на w получаются нормализованные
+        координаты устройства (NDC).
         
         Returns:
-            List[List[float]]: Матрица проекции 4x4
+            Matrix4: Матрица проекции для вектор-столбцов
         """
         f = 1.0 / math.tan(math.radians(self.fov) / 2.0)
         
         # Build perspective projection matrix
-        projection = [
+        projection = Matrix4([
             [f/self.aspect, 0, 0, 0],
             [0, f, 0, 0],
-            [0, 0, (self.far + self.near)/(self.near - self.far), -1],
-            [0, 0, (2*self.far*self.near)/(self.near - self.far), 0]
-        ]
+            [0, 0, (self.far + self.near)/(self.near - self.far), (2*self.far*self.near)/(self.near - self.far)],
+            [0, 0, -1, 0]
+        ])
         
         return projection
 
-    def get_view_matrix(self) -> List[List[float]]:
+    def get_view_matrix(self) -> Matrix4:
         """Получение матрицы вида
         
         Создает матрицу преобразования вида на основе:
@@ -69,7 +71,7 @@ class Camera:
         в систему координат камеры.
         
         Returns:
-            List[List[float]]: Матрица вида 4x4
+            Matrix4: Матрица вида для вектор-столбцов
         """
         # Normalize up vector first
         up_length = math.sqrt(sum(x*x for x in self.up))
@@ -111,19 +113,76 @@ class Camera:
             right[0] * forward[1] - right[1] * forward[0]
         ]
         
-        # Build view matrix
-        view = [
-            [right[0], up[0], -forward[0], 0],
-            [right[1], up[1], -forward[1], 0],
-            [right[2], up[2], -forward[2], 0],
-            [-sum(right[i] * self.position[i] for i in range(3)),
-             -sum(up[i] * self.position[i] for i in range(3)),
-             sum(forward[i] * self.position[i] for i in range(3)),
-             1]
-        ]
+        # Build view matrix: rows are the camera axes
+        view = Matrix4([
+            [right[0], right[1], right[2], -sum(right[i] * self.position[i] for i in range(3))],
+            [up[0], up[1], up[2], -sum(up[i] * self.position[i] for i in range(3))],
+            [-forward[0], -forward[1], -forward[2], sum(forward[i] * self.position[i] for i in range(3))],
+            [0, 0, 0, 1]
+        ])
         
         return view
 
+    def get_frustum_planes(self) -> List[Tuple[float, float, float, float]]:
+        """Получение плоскостей пирамиды видимости
+
+        Плоскости извлекаются из произведения матриц вида и проекции
+        (метод Гриба-Хартмана). Точка p находится внутри пирамиды видимости,
+        если для всех плоскостей a*x + b*y + c*z + d >= 0.
+
+        Returns:
+            List[Tuple[float, float, float, float]]: Шесть плоскостей (a, b, c, d)
+                с единичными нормалями в порядке: левая, правая, нижняя,
+                верхняя, ближняя, дальняя
+        """
+        # clip = Projection * View * p, координаты отсечения задаются строками
+        rows = (self.get_projection_matrix() * self.get_view_matrix()).data.tolist()
+        w = rows[3]
+
+        planes = []
+        for axis in range(3):
+            for sign in (1, -1):
+                plane = [w[i] + sign * rows[axis][i] for i in range(4)]
+                length = math.sqrt(sum(x*x for x in plane[:3]))
+                if length > 0:
+                    plane = [x/length for x in plane]
+                planes.append(tuple(plane))
+        return planes
+
+    def screen_to_ray(self, x: float, y: float, width: int, height: int) -> Tuple[Vector3, Vector3]:
+        """Луч из камеры через точку экрана (например, для выбора объекта)
+        
+        Экранные координаты соответствуют рендереру: (0, 0) — левый верхний
+        угол, луч проходит через центр символа (x, y).
+        
+        Args:
+            x: Столбец экрана
+            y: Строка экрана
+            width: Ширина области вывода в символах
+            height: Высота области вывода в символах
+            
+        Returns:
+            Tuple[Vector3, Vector3]: Начало луча (позиция камеры) и единичное направление
+            
+        Raises:
+            ValueError: Если размеры области вывода не положительны
+        """
+        if width <= 0 or height <= 0:
+            raise ValueError("Viewport size must be positive")
+        ndc_x = 2.0 * (x + 0.5) / width - 1.0
+        ndc_y = 1.0 - 2.0 * (y + 0.5) / height
+        # Точка на дальней плоскости, переведенная обратно в мировые координаты
+        inverse = (self.get_projection_matrix() * self.get_view_matrix()).inverse().data
+        far = inverse @ (ndc_x, ndc_y, 1.0, 1.0)
+        origin = Vector3(*self.position)
+        direction = Vector3(*(far[:3] / far[3])) - origin
+        return origin, direction.normalize()
+        
+    def state_key(self) -> Tuple:
+        """Ключ состояния камеры (положение, ориентация и параметры проекции)"""
+        return (tuple(self.position), tuple(self.target), tuple(self.up),
+                self.fov, self.aspect, self.near, self.far)
+
     def move(self, x: float, y: float, z: float) -> None:
         """Move the camera by the given offsets"""
         self.position[0] += x
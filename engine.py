@@ -6,6 +6,7 @@ from scene import Scene
 from camera import Camera
 from renderer import Renderer
 from input_handler import InputHandler
+from quality import QualityGovernor
 
 class Engine:
     """Класс для управления игровым движком
@@ -17,7 +18,8 @@ class Engine:
     - Осуществляет рендеринг
     """
     
-    def __init__(self, scene: Scene, camera: Camera, renderer: Renderer, input_handler: InputHandler):
+    def __init__(self, scene: Scene, camera: Camera, renderer: Renderer, input_handler: InputHandler,
+                 governor: QualityGovernor = None):
         """Инициализация движка
         
         Args:
@@ -25,6 +27,7 @@ class Engine:
             camera: Камера для отображения сцены
             renderer: Рендерер для отрисовки в консоли
             input_handler: Обработчик пользовательского ввода
+            governor: Регулятор качества рендеринга для удержания target_fps
         """
         self.logger = logging.getLogger(__name__)
         # Core components
@@ -38,6 +41,8 @@ class Engine:
         self.target_fps = 30
         self.frame_time = 1.0 / self.target_fps
         self.screen = None
+        self.skipped_frames = 0  # Кадры, пропущенные из-за отсутствия изменений
+        self.governor = governor
         
         # Game state
         self.state = "initializing"  # initializing, running, paused, stopped
@@ -199,7 +204,10 @@ class Engine:
         """Очистка ресурсов при выходе
         
         Восстанавливает настройки терминала и освобождает ресурсы curses
+        и рендерера
         """
+        if hasattr(self.renderer, 'close'):
+            self.renderer.close()
         if self.screen:
             self.screen.keypad(False)
             curses.nocbreak()
@@ -220,6 +228,8 @@ class Engine:
             self.running = True
             self.last_time = time.time()
             self.logger.info("Starting game loop")
+            if self.governor is not None:
+                self.governor.apply(self.renderer)
             
             frame_count = 0
             fps_update_time = self.last_time
@@ -248,10 +258,13 @@ class Engine:
                 self.last_time = current_time
                 
                 # Обновление состояния
+                work_start = time.perf_counter()
                 self.update(delta_time)
                 
                 # Рендеринг
-                self.render()
+                rendered = self.render()
+                if rendered:
+                    self.adjust_quality(time.perf_counter() - work_start)
                 
         except Exception as e:
             self.cleanup()
@@ -288,11 +301,34 @@ class Engine:
         """Отрисовка сцены
         
         Запускает процесс рендеринга текущего состояния сцены
-        с учетом положения камеры и настроек рендерера
+        с учетом положения камеры и настроек рендерера. Если сцена, камера,
+        освещение и экран не изменились с предыдущего кадра, рендеринг
+        пропускается полностью.
+        
+        Returns:
+            bool: True, если кадр был отрисован
         """
         # Update renderer lights from scene
         self.renderer.lights = self.scene.get_lights()
+        if not self.renderer.needs_redraw(self.scene, self.camera):
+            self.skipped_frames += 1
+            return False
         self.renderer.render(self.scene, self.camera)
+        return True
+        
+    def adjust_quality(self, frame_time: float) -> bool:
+        """Передача времени кадра регулятору качества
+        
+        Args:
+            frame_time: Время обновления и рендеринга кадра (в секундах)
+            
+        Returns:
+            bool: True, если уровень качества изменился
+        """
+        if self.governor is None or not self.governor.record_frame(frame_time):
+            return False
+        self.governor.apply(self.renderer)
+        return True
         
     def stop(self) -> None:
         """Остановка игрового цикла
@@ -0,0 +1,129 @@
+from typing import Tuple
+import numpy as np
+
+class FrameBuffer:
+    """Буфер кадра с буфером глубины для консольного рендеринга
+
+    Хранит:
+    - задний буфер символов, в который рисуется текущий кадр
+    - буфер глубины (z-buffer) для определения видимости
+    - передний буфер с содержимым, уже выведенным на экран
+
+    Сравнение заднего и переднего буферов позволяет выводить на экран
+    только изменившиеся ячейки.
+    """
+
+    BLANK = ord(' ')
+
+    def __init__(self, width: int, height: int):
+        """Инициализация буфера кадра
+
+        Args:
+            width: Ширина буфера в символах
+            height: Высота буфера в символах
+
+        Raises:
+            ValueError: При некорректных размерах
+        """
+        self.width = 0
+        self.height = 0
+        self.resize(width, height)
+
+    def resize(self, width: int, height: int) -> None:
+        """Изменение размеров буфера с полной очисткой содержимого"""
+        if width <= 0 or height <= 0:
+            raise ValueError("Invalid framebuffer dimensions")
+        self.width = int(width)
+        self.height = int(height)
+        self.chars = np.full((self.height, self.width), self.BLANK, dtype=np.uint8)
+        self.depth = np.full((self.height, self.width), np.inf, dtype=np.float32)
+        # Экран после очистки заполнен пробелами
+        self.front = np.full((self.height, self.width), self.BLANK, dtype=np.uint8)
+
+    def clear(self) -> None:
+        """Очистка заднего буфера и буфера глубины перед новым кадром"""
+        self.chars.fill(self.BLANK)
+        self.depth.fill(np.inf)
+
+    def invalidate(self) -> None:
+        """Сброс переднего буфера после очистки экрана"""
+        self.front.fill(self.BLANK)
+
+    def plot(self, x: np.ndarray, y: np.ndarray, depth: np.ndarray, chars: np.ndarray) -> int:
+        """Запись фрагментов в буфер с проверкой глубины
+
+        Для каждой ячейки выбирается ближайший фрагмент (наименьшая глубина),
+        который записывается только если он ближе уже сохраненного значения.
+
+        Args:
+            x: Координаты x фрагментов
+            y: Координаты y фрагментов
+            depth: Глубина фрагментов (меньше — ближе к камере)
+            chars: Коды символов фрагментов
+
+        Returns:
+            int: Количество записанных ячеек
+        """
+        return plot_fragments(self.chars, self.depth, x, y, depth, chars)
+
+    def swap(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Получение изменившихся ячеек и обновление переднего буфера
+
+        Returns:
+            Tuple: координаты y, x и коды символов ячеек, отличающихся
+                   от выведенных в предыдущем кадре
+        """
+        ys, xs = np.nonzero(self.chars != self.front)
+        codes = self.chars[ys, xs]
+        self.front[ys, xs] = codes
+        return ys, xs, codes
+
+def plot_fragments(char_buffer: np.ndarray, depth_buffer: np.ndarray, x: np.ndarray,
+                   y: np.ndarray, depth: np.ndarray, chars: np.ndarray) -> int:
+    """Запись фрагментов в буферы символов и глубины с проверкой глубины
+
+    Работает с любыми массивами (height, width), в том числе с буферами
+    в разделяемой памяти.
+
+    Args:
+        char_buffer: Буфер символов (height, width)
+        depth_buffer: Буфер глубины (height, width)
+        x: Координаты x фрагментов
+        y: Координаты y фрагментов
+        depth: Глубина фрагментов (меньше — ближе к камере)
+        chars: Коды символов фрагментов
+
+    Returns:
+        int: Количество записанных ячеек
+    """
+    height, width = depth_buffer.shape
+    x = np.asarray(x, dtype=np.int64).ravel()
+    y = np.asarray(y, dtype=np.int64).ravel()
+    depth = np.broadcast_to(np.asarray(depth, dtype=np.float32), x.shape)
+    chars = np.broadcast_to(np.asarray(chars, dtype=np.uint8), x.shape)
+
+    inside = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+    if not inside.all():
+        x, y, depth, chars = x[inside], y[inside], depth[inside], chars[inside]
+    if not len(x):
+        return 0
+
+    # Для каждой ячейки оставляем ближайший фрагмент
+    index = y * width + x
+    order = np.lexsort((depth, index))
+    sorted_index = index[order]
+    first = np.empty(len(order), dtype=bool)
+    first[0] = True
+    np.not_equal(sorted_index[1:], sorted_index[:-1], out=first[1:])
+    selected = order[first]
+    index = sorted_index[first]
+
+    # Проверка глубины относительно уже нарисованного
+    flat_depth = depth_buffer.reshape(-1)
+    flat_chars = char_buffer.reshape(-1)
+    passed = depth[selected] < flat_depth[index]
+    index = index[passed]
+    selected = selected[passed]
+    flat_depth[index] = depth[selected]
+    flat_chars[index] = chars[selected]
+    return len(index)
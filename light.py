@@ -35,8 +35,7 @@ class Light:
             self.position.y - point[1], 
             self.position.z - point[2]
         )
-        direction.normalize()
-        return direction
+        return direction.normalize_ip()
         
     def get_intensity(self, point: Vector3) -> float:
         """Get light intensity at given point
@@ -48,6 +47,11 @@ class Light:
             Light intensity value between 0.0 and 1.0
         """
         return self.intensity
+        
+    def state_key(self) -> tuple:
+        """Ключ состояния источника света для отслеживания изменений"""
+        p = self.position
+        return (type(self).__name__, p[0], p[1], p[2], self.intensity, self.color)
 
 class DirectionalLight(Light):
     """Направленный источник света
@@ -64,8 +68,13 @@ class DirectionalLight(Light):
             intensity: Интенсивность света (от 0.0 до 1.0)
         """
         super().__init__(None, intensity)
-        self.direction = direction or Vector3(0, -1, 0)
-        self.direction.normalize()
+        # Копия нормализуется, вектор вызывающего кода не изменяется
+        self.direction = (direction or Vector3(0, -1, 0)).normalize()
+        
+    def state_key(self) -> tuple:
+        """Ключ состояния источника света с учетом направления"""
+        d = self.direction
+        return super().state_key() + (d[0], d[1], d[2])
         
     def get_direction(self, point: Vector3) -> Vector3:
         """Get light direction (constant for directional light)"""
@@ -0,0 +1,152 @@
+import math
+from typing import List, Optional
+import numpy as np
+from mesh import Mesh
+
+# Размер объекта на экране (в символах по диаметру), начиная с которого
+# используется полная детализация. Уровень i > 0 строится кластеризацией
+# вершин по сетке DETAIL_SIZE / 2^(i-1) ячеек на диаметр, поэтому при
+# выборе уровня по размеру на экране кластер не больше одного символа.
+DETAIL_SIZE = 32.0
+MAX_LEVELS = 4
+
+def cluster_vertices(mesh: Mesh, cell_size: float) -> Mesh:
+    """Упрощение сетки кластеризацией вершин по равномерной сетке
+
+    Вершины, попавшие в одну ячейку, заменяются их средним положением;
+    вырожденные и повторяющиеся треугольники удаляются. Обход вершин
+    оставшихся треугольников сохраняется.
+
+    Args:
+        mesh: Исходная сетка
+        cell_size: Размер ячейки сетки кластеризации
+
+    Returns:
+        Mesh: Упрощенная сетка
+
+    Raises:
+        ValueError: Если размер ячейки не положителен
+    """
+    if cell_size <= 0:
+        raise ValueError("Cell size must be positive")
+    vertices = mesh.vertices.data
+    if not len(vertices):
+        return mesh
+    cells = np.floor((vertices - np.asarray(mesh.bounds.minimum)) / cell_size).astype(np.int64)
+    _, cluster, counts = np.unique(cells, axis=0, return_inverse=True, return_counts=True)
+    cluster = cluster.reshape(-1)
+    positions = np.stack([np.bincount(cluster, weights=vertices[:, axis], minlength=len(counts))
+                          for axis in range(3)], axis=1) / counts[:, None]
+
+    triangles = cluster[mesh.triangles]
+    a, b, c = triangles.T
+    triangles = triangles[(a != b) & (b != c) & (a != c)]
+    # Треугольник поворачивается так, чтобы первым был наименьший индекс,
+    # после чего одинаковые треугольники с одинаковым обходом совпадают
+    shift = np.argmin(triangles, axis=1)
+    rows = np.arange(len(triangles))[:, None]
+    triangles = triangles[rows, (shift[:, None] + np.arange(3)) % 3]
+    triangles = np.unique(triangles, axis=0)
+
+    vertex_normals = None
+    if mesh.vertex_normals is not None:
+        vertex_normals = np.stack([np.bincount(cluster, weights=mesh.vertex_normals[:, axis],
+                                               minlength=len(counts)) for axis in range(3)], axis=1)
+        length = np.linalg.norm(vertex_normals, axis=1, keepdims=True)
+        vertex_normals = np.divide(vertex_normals, length, out=np.zeros_like(vertex_normals),
+                                   where=length > 0)
+    return Mesh.from_arrays(positions, triangles, validate=False, vertex_normals=vertex_normals)
+
+class LODChain:
+    """Цепочка уровней детализации сетки
+
+    Уровень 0 — исходная сетка, каждый следующий строится кластеризацией
+    вершин по вдвое более крупной сетке. Уровни создаются при первом
+    обращении. Если очередное упрощение почти не уменьшает число
+    треугольников, уровень совпадает с предыдущим; если оно удаляет все
+    треугольники, цепочка заканчивается, и более грубые уровни совпадают
+    с последним построенным.
+
+    Attributes:
+        levels: Построенные уровни, начиная с исходной сетки
+        max_levels: Максимальное число уровней
+    """
+
+    def __init__(self, mesh: Mesh, max_levels: int = MAX_LEVELS, detail_size: float = DETAIL_SIZE,
+                 min_reduction: float = 0.1):
+        """Создание цепочки уровней детализации
+
+        Args:
+            mesh: Исходная сетка
+            max_levels: Максимальное число уровней (включая исходный)
+            detail_size: Число ячеек кластеризации на диаметр для уровня 1
+            min_reduction: Минимальная доля треугольников, удаляемых очередным уровнем
+
+        Raises:
+            ValueError: При некорректных параметрах
+        """
+        if max_levels < 1:
+            raise ValueError("At least one LOD level is required")
+        self.levels: List[Mesh] = [mesh]
+        self.max_levels = max_levels
+        self.detail_size = detail_size
+        self.min_reduction = min_reduction
+        self._complete = mesh.bounds is None or max_levels == 1
+
+    def level(self, index: int) -> Mesh:
+        """Сетка уровня index (с ограничением последним доступным уровнем)"""
+        index = min(max(index, 0), self.max_levels - 1)
+        while index >= len(self.levels) and not self._complete:
+            self._build_next()
+        return self.levels[min(index, len(self.levels) - 1)]
+
+    def _build_next(self) -> None:
+        base = self.levels[0]
+        previous = self.levels[-1]
+        resolution = self.detail_size / 2 ** (len(self.levels) - 1)
+        simplified = cluster_vertices(base, 2.0 * base.bounds.radius / resolution)
+        if not len(simplified.triangles):
+            self._complete = True
+            return
+        if len(simplified.triangles) > (1.0 - self.min_reduction) * len(previous.triangles):
+            # Упрощение почти ничего не дает: уровень совпадает с предыдущим
+            simplified = previous
+        self.levels.append(simplified)
+        self._complete = len(self.levels) >= self.max_levels
+
+def select_level(screen_size: float, bias: int = 0, max_levels: int = MAX_LEVELS,
+                 detail_size: float = DETAIL_SIZE) -> int:
+    """Выбор уровня детализации по размеру объекта на экране
+
+    Полная детализация используется, пока диаметр объекта на экране не
+    меньше detail_size символов; каждое уменьшение размера вдвое
+    понижает детализацию на один уровень.
+
+    Args:
+        screen_size: Диаметр проекции объекта в символах
+        bias: Смещение уровня (положительное — грубее)
+        max_levels: Число уровней
+        detail_size: Размер полной детализации
+
+    Returns:
+        int: Индекс уровня от 0 до max_levels - 1
+    """
+    if screen_size >= detail_size:
+        level = 0
+    elif screen_size <= 0:
+        level = max_levels - 1
+    else:
+        level = int(math.floor(math.log2(detail_size / screen_size))) + 1
+    return min(max(level + bias, 0), max_levels - 1)
+
+def get_lod_chain(mesh: Optional[Mesh]) -> Optional[LODChain]:
+    """Цепочка уровней детализации сетки (None для объектов без сетки)
+
+    Цепочка хранится в самой сетке, поэтому уровни строятся один раз
+    для всех объектов, использующих сетку.
+    """
+    if mesh is None:
+        return None
+    if mesh.lod_chain is None:
+        mesh.lod_chain = LODChain(mesh)
+    return mesh.lod_chain
@@ -1,3 +1,4 @@
+import sys
 import time
 import curses
 import logging
@@ -9,6 +10,9 @@ from renderer import Renderer
 from input_handler import InputHandler
 from object import Cube, Plane
 from vector import Vector3
+from light import DirectionalLight
+from quality import QualityGovernor
+from scene_io import load_scene
 
 def initialize_demo_scene(scene):
     """Инициализация демонстрационной сцены с базовыми объектами
@@ -29,6 +33,9 @@ def initialize_demo_scene(scene):
     ground.translate(0, -2, 0)
     scene.add_object(ground)
     
+    # Добавляем направленный источник света
+    scene.add_light(DirectionalLight(Vector3(-1, -1, 1), 1.0))
+    
     return scene
 
 def setup_logging():
@@ -59,15 +66,21 @@ def main():
     """
     try:
         logger.info("Creating core components")
+        camera = None
         try:
-            scene = Scene()
-            scene = initialize_demo_scene(scene)
+            if len(sys.argv) > 1:
+                # Снимок сцены, сохраненный scene_io.save_scene
+                scene, camera = load_scene(sys.argv[1])
+            else:
+                scene = Scene()
+                scene = initialize_demo_scene(scene)
         except Exception as e:
             logger.error(f"Failed to initialize scene: {str(e)}")
             raise
             
         try:
-            camera = Camera(position=(0, 0, -10), target=(0, 0, 0))
+            if camera is None:
+                camera = Camera(position=(0, 0, -10), target=(0, 0, 0))
         except Exception as e:
             logger.error(f"Failed to initialize camera: {str(e)}")
             raise
@@ -86,6 +99,7 @@ def main():
         
         # Создаем и инициализируем движок
         engine = Engine(scene, camera, renderer, input_handler)
+        engine.governor = QualityGovernor(engine.target_fps)
         
         # Устанавливаем начальное состояние компонентов
         engine.set_component_status('scene', True)
@@ -0,0 +1,199 @@
+import math
+import weakref
+from typing import Callable, Hashable, Optional, Sequence, Tuple
+import numpy as np
+from vector import Vector3Array
+from rasterizer import triangulate_faces
+from shading import face_normals
+
+class Bounds:
+    """Ограничивающий объем вершин объекта в локальных координатах
+
+    Attributes:
+        minimum: Минимальный угол ограничивающего параллелепипеда (AABB)
+        maximum: Максимальный угол ограничивающего параллелепипеда (AABB)
+        center: Центр ограничивающей сферы (совпадает с центром AABB)
+        radius: Радиус ограничивающей сферы
+    """
+
+    def __init__(self, minimum: Tuple[float, float, float], maximum: Tuple[float, float, float],
+                 center: Tuple[float, float, float], radius: float):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.center = center
+        self.radius = radius
+
+    @property
+    def half_extents(self) -> Tuple[float, float, float]:
+        """Половины размеров AABB по осям"""
+        return tuple((hi - lo) * 0.5 for lo, hi in zip(self.minimum, self.maximum))
+
+    @classmethod
+    def from_vertices(cls, vertices) -> Optional['Bounds']:
+        """Расчет ограничивающего объема по списку вершин
+
+        Args:
+            vertices: Список вершин, Vector3Array или массив (N, 3)
+
+        Returns:
+            Bounds: Ограничивающий объем или None для пустого списка вершин
+        """
+        if len(vertices) == 0:
+            return None
+        if isinstance(vertices, (Vector3Array, np.ndarray)):
+            points = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+            low, high = points.min(axis=0), points.max(axis=0)
+            middle = (low + high) * 0.5
+            radius = np.sqrt(((points - middle) ** 2).sum(axis=1).max())
+            return cls(tuple(low.tolist()), tuple(high.tolist()), tuple(middle.tolist()), float(radius))
+        xs = [v[0] for v in vertices]
+        ys = [v[1] for v in vertices]
+        zs = [v[2] for v in vertices]
+        minimum = (float(min(xs)), float(min(ys)), float(min(zs)))
+        maximum = (float(max(xs)), float(max(ys)), float(max(zs)))
+        center = tuple((lo + hi) * 0.5 for lo, hi in zip(minimum, maximum))
+        radius = math.sqrt(max((x - center[0]) ** 2 + (y - center[1]) ** 2 + (z - center[2]) ** 2
+                               for x, y, z in zip(xs, ys, zs)))
+        return cls(minimum, maximum, center, float(radius))
+
+class Mesh:
+    """Разделяемый ресурс геометрии: вершины, грани, треугольники, нормали и границы
+
+    Объекты Object3D ссылаются на сетку, а не владеют ею, поэтому множество
+    одинаковых объектов хранит одну копию геометрии. Треугольники, нормали
+    и ограничивающий объем вычисляются один раз при создании сетки.
+    Данные сетки доступны только для чтения: изменение вершин одного
+    объекта отразилось бы на всех объектах с этой сеткой.
+
+    Attributes:
+        vertices: Вершины в локальных координатах (Vector3Array, только чтение)
+        faces: Грани в виде кортежей индексов вершин (у сеток из from_arrays —
+            массив треугольников (T, 3), у загруженных из снимка —
+            последовательность граней, декодируемая при первом обращении)
+        triangles: Индексы вершин треугольников (T, 3)
+        triangle_faces: Индекс исходной грани для каждого треугольника (T,)
+        normals: Единичные внешние нормали треугольников в локальных координатах (T, 3)
+        vertex_normals: Единичные нормали вершин (N, 3) или None, если не заданы
+        bounds: Ограничивающий объем или None для пустой сетки
+        lod_chain: Цепочка уровней детализации (создается lod.get_lod_chain)
+        triangle_bvh: BVH треугольников для выбора лучом (создается picking.get_triangle_bvh)
+    """
+
+    __slots__ = ('vertices', 'faces', 'triangles', 'triangle_faces', 'normals', 'vertex_normals', 'bounds',
+                 'lod_chain', 'triangle_bvh', '__weakref__')
+
+    def __init__(self, vertices, faces: Sequence[Sequence[int]] = ()):
+        """Создание сетки
+
+        Args:
+            vertices: Вершины (список Vector3 или кортежей, Vector3Array или массив (N, 3))
+            faces: Грани в виде последовательностей индексов вершин
+
+        Raises:
+            ValueError: Если грань содержит меньше трех вершин или
+                ссылается на несуществующую вершину
+        """
+        self.vertices = Vector3Array(vertices)
+        self.vertices.data.setflags(write=False)
+        self.faces = tuple(tuple(int(i) for i in face) for face in faces)
+        self.triangles, self.triangle_faces = triangulate_faces(self.faces)
+        if len(self.triangles) and not 0 <= self.triangles.min() <= self.triangles.max() < len(self.vertices):
+            raise ValueError("Face refers to a vertex outside the mesh")
+        for array in (self.triangles, self.triangle_faces):
+            array.setflags(write=False)
+        self.normals = face_normals(self.vertices.data, self.triangles)
+        self.normals.setflags(write=False)
+        self.vertex_normals = None
+        self.bounds = Bounds.from_vertices(self.vertices)
+        self.lod_chain = None
+        self.triangle_bvh = None
+
+    @classmethod
+    def from_arrays(cls, vertices: np.ndarray, triangles: np.ndarray,
+                    normals: Optional[np.ndarray] = None, bounds: Optional[Bounds] = None,
+                    validate: bool = True, vertex_normals: Optional[np.ndarray] = None,
+                    triangle_faces: Optional[np.ndarray] = None) -> 'Mesh':
+        """Создание треугольной сетки из готовых массивов без копирования
+
+        Используется загрузчиками моделей: массивы (в том числе отображенные
+        в память) используются напрямую, а гранями сетки служат треугольники.
+
+        Args:
+            vertices: Вершины (N, 3) float64
+            triangles: Индексы вершин треугольников (T, 3)
+            normals: Готовые нормали треугольников (T, 3) или None для расчета
+            bounds: Готовый ограничивающий объем или None для расчета
+            validate: Проверять индексы треугольников
+            vertex_normals: Нормали вершин (N, 3) или None
+            triangle_faces: Индексы исходных граней треугольников (T,) или None
+                (каждый треугольник — отдельная грань)
+
+        Raises:
+            ValueError: Если треугольник ссылается на несуществующую вершину
+        """
+        mesh = object.__new__(cls)
+        mesh.vertices = Vector3Array(vertices, copy=False)
+        mesh.vertices.data.setflags(write=False)
+        mesh.triangles = np.asarray(triangles).reshape(-1, 3)
+        if validate and len(mesh.triangles) \
+                and not 0 <= mesh.triangles.min() <= mesh.triangles.max() < len(mesh.vertices):
+            raise ValueError("Face refers to a vertex outside the mesh")
+        mesh.faces = mesh.triangles
+        mesh.triangle_faces = np.arange(len(mesh.triangles)) if triangle_faces is None \
+            else np.asarray(triangle_faces).reshape(-1)
+        mesh.normals = face_normals(mesh.vertices.data, mesh.triangles) if normals is None \
+            else np.asarray(normals, dtype=np.float64).reshape(-1, 3)
+        mesh.vertex_normals = None if vertex_normals is None \
+            else np.asarray(vertex_normals, dtype=np.float64).reshape(-1, 3)
+        for array in (mesh.triangles, mesh.triangle_faces, mesh.normals, mesh.vertex_normals):
+            if array is not None:
+                array.setflags(write=False)
+        mesh.bounds = Bounds.from_vertices(mesh.vertices) if bounds is None else bounds
+        mesh.lod_chain = None
+        mesh.triangle_bvh = None
+        return mesh
+
+    @classmethod
+    def cached(cls, key: Hashable, factory: Callable[[], 'Mesh']) -> 'Mesh':
+        """Получение сетки из кэша или создание ее фабрикой
+
+        Сетка хранится в кэше, пока на нее ссылается хотя бы один объект.
+
+        Args:
+            key: Ключ сетки (например, ('cube', size))
+            factory: Функция, создающая сетку при промахе кэша
+
+        Returns:
+            Mesh: Общая сетка для ключа
+        """
+        mesh = _mesh_cache.get(key)
+        if mesh is None:
+            mesh = factory()
+            _mesh_cache[key] = mesh
+        return mesh
+
+    def transform_instances(self, matrices: np.ndarray) -> np.ndarray:
+        """Вершины всех экземпляров сетки одним пакетным умножением
+
+        Args:
+            matrices: Аффинные матрицы экземпляров для вектор-столбцов (K, 4, 4)
+
+        Returns:
+            np.ndarray: Вершины экземпляров в мировых координатах (K, N, 3)
+        """
+        matrices = np.asarray(matrices, dtype=np.float64).reshape(-1, 4, 4)
+        linear = matrices[:, :3, :3].transpose(0, 2, 1)
+        return np.matmul(self.vertices.data, linear) + matrices[:, None, :3, 3]
+
+    def __len__(self):
+        return len(self.vertices)
+
+    def __repr__(self):
+        return f"Mesh(vertices={len(self.vertices)}, faces={len(self.faces)})"
+
+# Общие сетки по ключу; сетка удаляется из кэша вместе с последней ссылкой на нее
+_mesh_cache = weakref.WeakValueDictionary()
+
+def clear_mesh_cache() -> None:
+    """Очистка кэша сеток (существующие объекты сохраняют свои сетки)"""
+    _mesh_cache.clear()
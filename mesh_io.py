@@ -0,0 +1,407 @@
+import os
+import logging
+from array import array
+from itertools import islice
+from typing import BinaryIO, List, Optional, Tuple
+import numpy as np
+from mesh import Bounds, Mesh
+from object import Object3D
+
+logger = logging.getLogger(__name__)
+
+# Число строк (OBJ, ASCII PLY) или записей (бинарный PLY), читаемых за один раз
+CHUNK_SIZE = 1 << 16
+
+# Кэш сетки: заголовок и массивы вершин, треугольников и нормалей подряд
+CACHE_SUFFIX = '.meshcache'
+CACHE_MAGIC = b'MESHC001'
+_CACHE_HEADER = np.dtype([
+    ('magic', 'S8'),
+    ('source_size', '<i8'),
+    ('source_mtime_ns', '<i8'),
+    ('vertex_count', '<i8'),
+    ('triangle_count', '<i8'),
+    ('index_size', '<i8'),
+    ('bounds_min', '<f8', (3,)),
+    ('bounds_max', '<f8', (3,)),
+    ('bounds_center', '<f8', (3,)),
+    ('bounds_radius', '<f8'),
+])
+
+# Типы свойств PLY и соответствующие типы NumPy
+_PLY_TYPES = {
+    'char': 'i1', 'int8': 'i1', 'uchar': 'u1', 'uint8': 'u1',
+    'short': 'i2', 'int16': 'i2', 'ushort': 'u2', 'uint16': 'u2',
+    'int': 'i4', 'int32': 'i4', 'uint': 'u4', 'uint32': 'u4',
+    'float': 'f4', 'float32': 'f4', 'double': 'f8', 'float64': 'f8',
+}
+
+def load_mesh(path: str, use_cache: bool = True) -> Mesh:
+    """Загрузка треугольной сетки из файла OBJ или PLY
+
+    Файл читается потоково, порциями строк или записей, без создания
+    объектов Python для отдельных вершин. Многоугольные грани разбиваются
+    на треугольники веером. После разбора рядом с исходным файлом
+    сохраняется бинарный кэш (<файл>.meshcache); последующие загрузки
+    отображают его в память (mmap) без разбора. Кэш считается устаревшим,
+    если изменились размер или время изменения исходного файла.
+
+    Args:
+        path: Путь к файлу .obj или .ply
+        use_cache: Использовать и обновлять бинарный кэш
+
+    Returns:
+        Mesh: Сетка с массивами вершин и треугольников
+
+    Raises:
+        ValueError: Если формат файла не поддерживается или файл поврежден
+        OSError: Если файл не удается прочитать
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in ('.obj', '.ply'):
+        raise ValueError(f"Unsupported mesh format: {extension or path}")
+    stat = os.stat(path)
+    cache_path = path + CACHE_SUFFIX
+    if use_cache:
+        mesh = _open_cache(cache_path, stat)
+        if mesh is not None:
+            return mesh
+
+    if extension == '.obj':
+        vertices, triangles = read_obj(path)
+    else:
+        vertices, triangles = read_ply(path)
+    mesh = Mesh.from_arrays(vertices, triangles)
+    if use_cache:
+        try:
+            _write_cache(cache_path, stat, mesh)
+        except OSError as e:
+            logger.warning(f"Could not write mesh cache {cache_path}: {e}")
+    return mesh
+
+def load_object(path: str, use_cache: bool = True, color: str = "#FFFFFF") -> Object3D:
+    """Загрузка модели OBJ или PLY в виде объекта с сеткой
+
+    Args:
+        path: Путь к файлу .obj или .ply
+        use_cache: Использовать и обновлять бинарный кэш сетки
+        color: Цвет объекта
+
+    Returns:
+        Object3D: Объект, ссылающийся на загруженную сетку
+    """
+    return Object3D(color=color, mesh=load_mesh(path, use_cache))
+
+def read_obj(path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Потоковый разбор файла Wavefront OBJ
+
+    Учитываются только вершины (v) и грани (f); индексы текстурных
+    координат и нормалей в гранях (v/vt/vn) отбрасываются, отрицательные
+    индексы отсчитываются от последней прочитанной вершины.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Вершины (N, 3) и треугольники (T, 3)
+
+    Raises:
+        ValueError: Если грань содержит меньше трех вершин
+    """
+    chunks: List[np.ndarray] = []
+    indices = array('q')
+    vertex_count = 0
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        while True:
+            lines = list(islice(f, CHUNK_SIZE))
+            if not lines:
+                break
+            vertex_lines = []
+            for line in lines:
+                if line.startswith('v '):
+                    vertex_lines.append(line)
+                elif line.startswith('f '):
+                    base = vertex_count + len(vertex_lines)
+                    face = [int(token.partition('/')[0]) for token in line.split()[1:]]
+                    if len(face) < 3:
+                        raise ValueError("Face must have at least 3 vertices")
+                    face = [i - 1 if i > 0 else base + i for i in face]
+                    first = face[0]
+                    for i in range(1, len(face) - 1):
+                        indices.extend((first, face[i], face[i + 1]))
+            if vertex_lines:
+                chunk = np.loadtxt(vertex_lines, usecols=(1, 2, 3), ndmin=2, dtype=np.float64)
+                chunks.append(chunk)
+                vertex_count += len(chunk)
+    vertices = np.concatenate(chunks) if chunks else np.empty((0, 3))
+    return vertices, np.frombuffer(indices, dtype=np.int64).reshape(-1, 3)
+
+def read_ply(path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Потоковый разбор файла PLY (ASCII и бинарного)
+
+    Из элемента vertex читаются свойства x, y, z, из элемента face —
+    список vertex_indices (или vertex_index). Остальные элементы и
+    свойства пропускаются.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Вершины (N, 3) и треугольники (T, 3)
+
+    Raises:
+        ValueError: Если заголовок PLY некорректен
+    """
+    with open(path, 'rb') as f:
+        fmt, elements = _read_ply_header(f)
+        vertices = np.empty((0, 3))
+        triangles = np.empty((0, 3), dtype=np.int64)
+        for name, count, properties in elements:
+            if fmt == 'ascii':
+                result = _read_ply_ascii_element(f, name, count, properties)
+            else:
+                order = '<' if fmt == 'binary_little_endian' else '>'
+                result = _read_ply_binary_element(f, name, count, properties, order)
+            if name == 'vertex':
+                vertices = result
+            elif name == 'face':
+                triangles = result
+    return vertices, triangles
+
+def _read_ply_header(f: BinaryIO):
+    """Разбор заголовка PLY: формат и список элементов (имя, число, свойства)
+
+    Свойство задается кортежем (имя, тип) или (имя, тип длины, тип элементов)
+    для списков.
+    """
+    if f.readline().strip() != b'ply':
+        raise ValueError("Not a PLY file")
+    fmt = None
+    elements = []
+    while True:
+        line = f.readline()
+        if not line:
+            raise ValueError("Unexpected end of PLY header")
+        words = line.decode('ascii', errors='replace').split()
+        if not words or words[0] in ('comment', 'obj_info'):
+            continue
+        if words[0] == 'end_header':
+            break
+        if words[0] == 'format':
+            fmt = words[1]
+            if fmt not in ('ascii', 'binary_little_endian', 'binary_big_endian'):
+                raise ValueError(f"Unsupported PLY format: {fmt}")
+        elif words[0] == 'element':
+            elements.append((words[1], int(words[2]), []))
+        elif words[0] == 'property':
+            if not elements:
+                raise ValueError("PLY property outside of an element")
+            try:
+                if words[1] == 'list':
+                    prop = (words[4], _PLY_TYPES[words[2]], _PLY_TYPES[words[3]])
+                else:
+                    prop = (words[2], _PLY_TYPES[words[1]])
+            except (KeyError, IndexError):
+                raise ValueError(f"Invalid PLY property: {line.strip()!r}")
+            elements[-1][2].append(prop)
+    if fmt is None:
+        raise ValueError("PLY header has no format")
+    return fmt, elements
+
+def _vertex_columns(properties) -> List[int]:
+    names = [prop[0] for prop in properties]
+    try:
+        return [names.index(axis) for axis in ('x', 'y', 'z')]
+    except ValueError:
+        raise ValueError("PLY vertex element must have x, y and z properties")
+
+def _face_list(properties) -> int:
+    for index, prop in enumerate(properties):
+        if prop[0] in ('vertex_indices', 'vertex_index') and len(prop) == 3:
+            return index
+    raise ValueError("PLY face element must have a vertex_indices list")
+
+def _read_ply_ascii_element(f: BinaryIO, name: str, count: int, properties) -> Optional[np.ndarray]:
+    """Чтение элемента ASCII PLY порциями строк"""
+    if name == 'vertex':
+        if any(len(prop) == 3 for prop in properties):
+            raise ValueError("PLY vertex element with list properties is not supported")
+        columns = _vertex_columns(properties)
+        chunks = []
+        remaining = count
+        while remaining > 0:
+            lines = list(islice(f, min(remaining, CHUNK_SIZE)))
+            if not lines:
+                raise ValueError("Unexpected end of PLY data")
+            chunks.append(np.loadtxt(lines, usecols=columns, ndmin=2, dtype=np.float64))
+            remaining -= len(lines)
+        return np.concatenate(chunks) if chunks else np.empty((0, 3))
+    if name == 'face':
+        list_index = _face_list(properties)
+        indices = array('q')
+        for _ in range(count):
+            values = f.readline().split()
+            # Значения свойств до списка вершин пропускаются
+            position = 0
+            for prop in properties[:list_index]:
+                position += 1 + int(values[position]) if len(prop) == 3 else 1
+            length = int(values[position])
+            face = [int(v) for v in values[position + 1:position + 1 + length]]
+            _extend_fan(indices, face)
+        return np.frombuffer(indices, dtype=np.int64).reshape(-1, 3)
+    for _ in range(count):
+        f.readline()
+    return None
+
+def _read_ply_binary_element(f: BinaryIO, name: str, count: int, properties,
+                             order: str) -> Optional[np.ndarray]:
+    """Чтение элемента бинарного PLY порциями записей"""
+    if not any(len(prop) == 3 for prop in properties):
+        # Записи фиксированного размера читаются структурированным массивом
+        dtype = np.dtype([(f'p{i}', order + prop[1]) for i, prop in enumerate(properties)])
+        columns = _vertex_columns(properties) if name == 'vertex' else None
+        chunks = []
+        remaining = count
+        while remaining > 0:
+            size = min(remaining, CHUNK_SIZE)
+            records = np.frombuffer(_read_exact(f, size * dtype.itemsize), dtype=dtype)
+            if columns is not None:
+                chunks.append(np.stack([records[f'p{i}'] for i in columns], axis=1).astype(np.float64))
+            remaining -= size
+        if columns is None:
+            return None
+        return np.concatenate(chunks) if chunks else np.empty((0, 3))
+    if name == 'face' and len(properties) == 1 and _face_list(properties) == 0:
+        return _read_ply_binary_faces(f, count, properties[0], order)
+    # Элемент со списками общего вида читается по одной записи
+    list_index = _face_list(properties) if name == 'face' else -1
+    indices = array('q')
+    for _ in range(count):
+        for index, prop in enumerate(properties):
+            if len(prop) == 3:
+                length_type = np.dtype(order + prop[1])
+                item_type = np.dtype(order + prop[2])
+                length = int(np.frombuffer(_read_exact(f, length_type.itemsize), dtype=length_type)[0])
+                values = np.frombuffer(_read_exact(f, length * item_type.itemsize), dtype=item_type)
+                if index == list_index:
+                    _extend_fan(indices, values.tolist())
+            else:
+                _read_exact(f, np.dtype(prop[1]).itemsize)
+    if name == 'face':
+        return np.frombuffer(indices, dtype=np.int64).reshape(-1, 3)
+    return None
+
+def _read_ply_binary_faces(f: BinaryIO, count: int, prop, order: str) -> np.ndarray:
+    """Чтение граней бинарного PLY, в которых есть только список вершин
+
+    Если все грани порции имеют одинаковое число вершин (обычно 3),
+    порция читается одним структурированным массивом; иначе она
+    разбирается по одной грани.
+    """
+    length_type = np.dtype(order + prop[1])
+    item_type = np.dtype(order + prop[2])
+    chunks = []
+    remaining = count
+    while remaining > 0:
+        # Размер граней порции определяется по первой грани
+        head = _read_exact(f, length_type.itemsize)
+        arity = int(np.frombuffer(head, dtype=length_type)[0])
+        record = np.dtype([('length', length_type), ('indices', item_type, (arity,))])
+        size = min(remaining, CHUNK_SIZE)
+        data = head + f.read(size * record.itemsize - len(head))
+        usable = len(data) // record.itemsize
+        records = np.frombuffer(data, dtype=record, count=usable)
+        mismatch = np.flatnonzero(records['length'] != arity)
+        uniform = 0 if arity < 3 else int(mismatch[0]) if len(mismatch) else usable
+        if uniform:
+            polygons = records['indices'][:uniform].astype(np.int64)
+            chunks.append(_fan(polygons))
+        # Данные после последней однородной грани разбираются заново
+        rest = memoryview(data)[uniform * record.itemsize:]
+        if uniform < size:
+            f.seek(-len(rest), os.SEEK_CUR)
+            length = int(np.frombuffer(_read_exact(f, length_type.itemsize), dtype=length_type)[0])
+            face = np.frombuffer(_read_exact(f, length * item_type.itemsize), dtype=item_type)
+            indices = array('q')
+            _extend_fan(indices, face.tolist())
+            chunks.append(np.frombuffer(indices, dtype=np.int64).reshape(-1, 3))
+            uniform += 1
+        remaining -= uniform
+    return np.concatenate(chunks) if chunks else np.empty((0, 3), dtype=np.int64)
+
+def _fan(polygons: np.ndarray) -> np.ndarray:
+    """Разбиение массива многоугольников одного размера (F, n) на треугольники"""
+    n = polygons.shape[1]
+    fan = np.arange(1, n - 1)
+    triangles = np.empty((len(polygons), n - 2, 3), dtype=np.int64)
+    triangles[:, :, 0] = polygons[:, :1]
+    triangles[:, :, 1] = polygons[:, fan]
+    triangles[:, :, 2] = polygons[:, fan + 1]
+    return triangles.reshape(-1, 3)
+
+def _extend_fan(indices: array, face: List[int]) -> None:
+    if len(face) < 3:
+        raise ValueError("Face must have at least 3 vertices")
+    first = face[0]
+    for i in range(1, len(face) - 1):
+        indices.extend((first, face[i], face[i + 1]))
+
+def _read_exact(f: BinaryIO, size: int) -> bytes:
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError("Unexpected end of PLY data")
+    return data
+
+def _open_cache(cache_path: str, stat: os.stat_result) -> Optional[Mesh]:
+    """Открытие кэша сетки через mmap (None, если кэша нет или он устарел)"""
+    try:
+        header = np.fromfile(cache_path, dtype=_CACHE_HEADER, count=1)
+    except OSError:
+        return None
+    if len(header) != 1:
+        return None
+    header = header[0]
+    if header['magic'] != CACHE_MAGIC or header['source_size'] != stat.st_size \
+            or header['source_mtime_ns'] != stat.st_mtime_ns:
+        return None
+    n, t = int(header['vertex_count']), int(header['triangle_count'])
+    index_type = np.dtype('<i4' if header['index_size'] == 4 else '<i8')
+    offset = _CACHE_HEADER.itemsize
+    expected = offset + n * 24 + t * 3 * index_type.itemsize + t * 24
+    if os.path.getsize(cache_path) != expected:
+        logger.warning(f"Ignoring truncated mesh cache {cache_path}")
+        return None
+
+    def view(dtype, shape):
+        nonlocal offset
+        if not shape[0]:
+            return np.empty(shape, dtype=dtype)
+        result = np.memmap(cache_path, dtype=dtype, mode='r', offset=offset, shape=shape)
+        offset += result.nbytes
+        return result
+
+    vertices = view(np.dtype('<f8'), (n, 3))
+    triangles = view(index_type, (t, 3))
+    normals = view(np.dtype('<f8'), (t, 3))
+    bounds = None
+    if n:
+        bounds = Bounds(tuple(header['bounds_min'].tolist()), tuple(header['bounds_max'].tolist()),
+                        tuple(header['bounds_center'].tolist()), float(header['bounds_radius']))
+    # Кэш записан после проверки исходного файла, поэтому массивы не проверяются повторно
+    return Mesh.from_arrays(vertices, triangles, normals, bounds, validate=False)
+
+def _write_cache(cache_path: str, stat: os.stat_result, mesh: Mesh) -> None:
+    """Запись кэша сетки (через временный файл, чтобы не оставить частичный кэш)"""
+    triangles = mesh.triangles
+    index_type = np.dtype('<i4') if len(mesh.vertices) < 2 ** 31 else np.dtype('<i8')
+    header = np.zeros(1, dtype=_CACHE_HEADER)
+    bounds = mesh.bounds
+    header[0] = (CACHE_MAGIC, stat.st_size, stat.st_mtime_ns, len(mesh.vertices),
+                 len(triangles), index_type.itemsize,
+                 bounds.minimum if bounds else (0, 0, 0), bounds.maximum if bounds else (0, 0, 0),
+                 bounds.center if bounds else (0, 0, 0), bounds.radius if bounds else 0)
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(header.tobytes())
+            f.write(np.ascontiguousarray(mesh.vertices.data, dtype='<f8').tobytes())
+            f.write(np.ascontiguousarray(triangles, dtype=index_type).tobytes())
+            f.write(np.ascontiguousarray(mesh.normals, dtype='<f8').tobytes())
+        os.replace(temp_path, cache_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
@@ -0,0 +1,106 @@
+from typing import Tuple
+import numpy as np
+
+def _normalized(vectors: np.ndarray) -> np.ndarray:
+    """Нормализация строк массива (нулевые векторы вырожденных граней остаются нулевыми)"""
+    length = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, length, out=np.zeros_like(vectors), where=length > 0)
+
+def vertex_face_index(triangles: np.ndarray, vertex_count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Индекс смежности «вершина -> треугольники» в сжатом виде (CSR)
+
+    Треугольники вершины v перечислены в faces[offsets[v]:offsets[v + 1]].
+
+    Args:
+        triangles: Индексы вершин треугольников (T, 3)
+        vertex_count: Число вершин
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Смещения (N + 1,) и индексы треугольников (3T,)
+    """
+    corners = np.asarray(triangles, dtype=np.intp).reshape(-1)
+    offsets = np.zeros(vertex_count + 1, dtype=np.intp)
+    np.cumsum(np.bincount(corners, minlength=vertex_count), out=offsets[1:])
+    faces = np.argsort(corners, kind='stable') // 3
+    return offsets, faces
+
+def _segments(offsets: np.ndarray, items: np.ndarray, keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Элементы CSR-индекса для набора ключей и номер ключа каждого элемента"""
+    starts = offsets[keys]
+    counts = offsets[keys + 1] - starts
+    owner = np.repeat(np.arange(len(keys)), counts)
+    # Позиция элемента: начало его сегмента плюс номер внутри сегмента
+    first = np.cumsum(counts) - counts
+    return items[np.repeat(starts, counts) + np.arange(counts.sum()) - first[owner]], owner
+
+class SurfaceNormals:
+    """Нормали треугольников и вершин с частичным пересчетом
+
+    Нормаль вершины — нормированная сумма векторных произведений
+    смежных треугольников, то есть среднее нормалей, взвешенное
+    площадями. При изменении части вершин пересчитываются только
+    смежные с ними треугольники и вершины этих треугольников; смежность
+    хранится в индексе «вершина -> треугольники», построенном один раз.
+
+    Attributes:
+        vertices: Копия вершин (N, 3)
+        triangles: Индексы вершин треугольников (T, 3)
+        face_normals: Единичные внешние нормали треугольников (T, 3)
+        vertex_normals: Единичные нормали вершин (N, 3)
+    """
+
+    def __init__(self, vertices, triangles: np.ndarray):
+        """Полный расчет нормалей
+
+        Args:
+            vertices: Вершины (N, 3) (Vector3Array или массив)
+            triangles: Индексы вершин треугольников (T, 3)
+        """
+        self.vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3).copy()
+        self.triangles = np.asarray(triangles, dtype=np.intp).reshape(-1, 3)
+        self._offsets, self._faces = vertex_face_index(self.triangles, len(self.vertices))
+        # Векторные произведения треугольников: длина равна удвоенной площади
+        self._cross = self._face_cross(np.arange(len(self.triangles)))
+        self.face_normals = _normalized(self._cross)
+        corners = self.triangles.reshape(-1)
+        sums = np.zeros_like(self.vertices)
+        for axis in range(3):
+            sums[:, axis] = np.bincount(corners, weights=np.repeat(self._cross[:, axis], 3),
+                                        minlength=len(self.vertices))
+        self.vertex_normals = _normalized(sums)
+
+    def _face_cross(self, faces: np.ndarray) -> np.ndarray:
+        v0, v1, v2 = (self.vertices[self.triangles[faces, k]] for k in range(3))
+        return np.cross(v2 - v0, v1 - v0).reshape(-1, 3)
+
+    def adjacent_faces(self, indices) -> np.ndarray:
+        """Треугольники, содержащие хотя бы одну из вершин (без повторов)"""
+        indices = np.unique(np.asarray(indices, dtype=np.intp).reshape(-1))
+        return np.unique(_segments(self._offsets, self._faces, indices)[0])
+
+    def update(self, indices, positions) -> Tuple[np.ndarray, np.ndarray]:
+        """Изменение части вершин и пересчет затронутых нормалей
+
+        Args:
+            indices: Индексы измененных вершин (K,)
+            positions: Новые положения вершин (K, 3)
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Индексы пересчитанных треугольников
+                и пересчитанных вершин
+        """
+        indices = np.asarray(indices, dtype=np.intp).reshape(-1)
+        self.vertices[indices] = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        faces = self.adjacent_faces(indices)
+        if not len(faces):
+            return faces, faces
+        self._cross[faces] = self._face_cross(faces)
+        self.face_normals[faces] = _normalized(self._cross[faces])
+        # Нормаль вершины зависит от всех смежных треугольников, включая
+        # не изменившиеся, поэтому сумма собирается заново по индексу смежности
+        touched = np.unique(self.triangles[faces])
+        adjacent, owner = _segments(self._offsets, self._faces, touched)
+        sums = np.stack([np.bincount(owner, weights=self._cross[adjacent, axis], minlength=len(touched))
+                         for axis in range(3)], axis=1)
+        self.vertex_normals[touched] = _normalized(sums)
+        return faces, touched
@@ -1,41 +1,491 @@
-from typing import List, Tuple
-from vector import Vector3, Matrix4
+from typing import List, Optional, Tuple
+import numpy as np
+from vector import BoundVector3, Vector3, Vector3Array, Matrix4, Quaternion
+from mesh import Bounds, Mesh
+from normals import SurfaceNormals
+from picking import RayHit, get_triangle_bvh, raycast_geometry, triangle_bvh
+from rasterizer import triangulate_faces
+from lod import LODChain, get_lod_chain
 
 class Object3D:
-    """Base class for 3D objects"""
+    """Base class for 3D objects
     
-    def __init__(self, vertices: List[Vector3] = None, faces: List[Tuple[int, ...]] = None, color: str = "#FFFFFF"):
-        self.vertices = vertices or []
-        self.faces = faces or []
-        self.position = Vector3()
-        self.rotation = Vector3()
-        self.scale = Vector3(1.0, 1.0, 1.0)
+    Геометрия задается либо собственными вершинами и гранями, либо
+    ссылкой на разделяемую сетку Mesh. Присваивание vertices или faces
+    отвязывает объект от сетки.
+    """
+    
+    def __init__(self, vertices: List[Vector3] = None, faces: List[Tuple[int, ...]] = None, color: str = "#FFFFFF",
+                 mesh: Optional[Mesh] = None):
+        if mesh is not None:
+            vertices, faces = mesh.vertices, mesh.faces
+        self.vertices = vertices if vertices is not None else []
+        self.faces = faces if faces is not None else []
+        self.mesh = mesh  # разделяемая сетка (None — собственная геометрия)
+        self._parent = None  # родитель в иерархии сцены
+        self._children = []
+        # Хранилище трансформаций сцены, к строке которого привязан объект
+        self._transform_store = None
+        self._transform_slot = None
+        # Векторы трансформации принадлежат объекту и при добавлении в сцену
+        # перепривязываются к строке хранилища, оставаясь теми же объектами
+        self._position = BoundVector3.detached()
+        self._rotation = BoundVector3.detached()
+        self.orientation: Optional[Quaternion] = None  # если задан, заменяет углы rotation
+        self._scale = BoundVector3.detached(1.0, 1.0, 1.0)
         self.color = color
         self.ambient = 0.1  # коэффициент фонового освещения
         self.diffuse = 0.7  # коэффициент диффузного отражения
         self.specular = 0.3  # коэффициент зеркального отражения
+        self.double_sided = False  # грани видны с обеих сторон (без отбрасывания нелицевых)
+        self.version = 0  # счетчик изменений геометрии
+        # Кэш мировой матрицы и вершин в мировых координатах. Ключ кэша
+        # строится из значений трансформации, поэтому прямое изменение
+        # obj.position.x и т.п. тоже сбрасывает кэш.
+        self._world_matrix = None
+        self._transform_cache_key = None
+        self._world_vertices_key = None
+        self.transform_hits = 0
+        self.transform_misses = 0
+        self.vertices_hits = 0
+        self.vertices_misses = 0
+        self._pick_geometry_cache = None  # вершины, треугольники и BVH для выбора лучом
+        self._pick_key = None
+        
+    @property
+    def vertices(self) -> List[Vector3]:
+        return self._vertices
+        
+    @vertices.setter
+    def vertices(self, vertices: List[Vector3]) -> None:
+        self._vertices = vertices
+        self._bounds = None
+        self._world_vertices = None
+        self._normals = None
+        self.mesh = None
+        self.version = getattr(self, 'version', -1) + 1
+        
+    @property
+    def faces(self) -> List[Tuple[int, ...]]:
+        return self._faces
+        
+    @faces.setter
+    def faces(self, faces: List[Tuple[int, ...]]) -> None:
+        self._faces = faces
+        self._normals = None
+        self.mesh = None
+        
+    @property
+    def position(self) -> Vector3:
+        return self._position
+        
+    @position.setter
+    def position(self, value: Vector3) -> None:
+        self._set_vector('_position', value)
+        
+    @property
+    def rotation(self) -> Vector3:
+        return self._rotation
+        
+    @rotation.setter
+    def rotation(self, value: Vector3) -> None:
+        self._set_vector('_rotation', value)
+        
+    @property
+    def scale(self) -> Vector3:
+        return self._scale
+        
+    @scale.setter
+    def scale(self, value: Vector3) -> None:
+        self._set_vector('_scale', value)
+        
+    @property
+    def orientation(self) -> Optional[Quaternion]:
+        return self._orientation
+        
+    @orientation.setter
+    def orientation(self, value: Optional[Quaternion]) -> None:
+        self._orientation = value
+        if self._transform_store is not None:
+            self._transform_store.set_orientation(self._transform_slot, value)
+        
+    def _set_vector(self, name: str, value: Vector3) -> None:
+        """Присваивание вектора трансформации
+        
+        Координаты копируются в вектор объекта (у объекта в сцене — в его
+        строку хранилища), а сам вектор объекта остается прежним, поэтому
+        ссылки на него, полученные ранее, продолжают управлять объектом.
+        """
+        getattr(self, name).set(value[0], value[1], value[2])
+        
+    def _bind_transform(self, store, slot: int) -> None:
+        """Привязка векторов трансформации к строке slot хранилища store"""
+        self._transform_store = store
+        self._transform_slot = slot
+        for vector, array in ((self._position, store.positions), (self._rotation, store.rotations),
+                              (self._scale, store.scales)):
+            vector.bind(array[slot], store.dirty, slot)
+        
+    def _unbind_transform(self) -> None:
+        """Отвязка от хранилища: векторы сохраняют координаты в собственной памяти"""
+        for vector in (self._position, self._rotation, self._scale):
+            vector.detach()
+        self._transform_store = None
+        self._transform_slot = None
+        
+    @property
+    def parent(self) -> Optional['Object3D']:
+        """Родительский объект (None — объект в корне иерархии)"""
+        return self._parent
+        
+    @property
+    def children(self) -> List['Object3D']:
+        """Дочерние объекты в порядке добавления (изменять нельзя)"""
+        return self._children
+        
+    def add_child(self, child: 'Object3D') -> None:
+        """Добавление дочернего объекта (см. set_parent)"""
+        child.set_parent(self)
+        
+    def remove_child(self, child: 'Object3D') -> None:
+        """Отсоединение дочернего объекта
+        
+        Raises:
+            ValueError: Если объект не является дочерним
+        """
+        if child._parent is not self:
+            raise ValueError("Object is not a child of this object")
+        child.set_parent(None)
+        
+    def set_parent(self, parent: Optional['Object3D']) -> None:
+        """Перенос объекта к новому родителю (None — в корень иерархии)
+        
+        Положение, поворот и масштаб объекта задаются относительно
+        родителя, поэтому мировая трансформация объекта и всех его
+        потомков следует за родителем. Родитель и потомок должны быть
+        либо в одной сцене, либо оба вне сцены.
+        
+        Args:
+            parent: Новый родитель или None
+            
+        Raises:
+            ValueError: Если родитель — сам объект или его потомок, либо
+                объекты находятся в разных сценах
+        """
+        if parent is self._parent:
+            return
+        if parent is not None:
+            if parent._transform_store is not self._transform_store:
+                raise ValueError("Parent and child must belong to the same scene")
+            # Цикл возможен, только если новый родитель — сам объект или его потомок
+            node = parent if self._children else None
+            if parent is self:
+                raise ValueError("Object cannot be parented to itself or its descendant")
+            while node is not None:
+                if node is self:
+                    raise ValueError("Object cannot be parented to itself or its descendant")
+                node = node._parent
+        if self._parent is not None:
+            self._parent._children.remove(self)
+        self._parent = parent
+        if parent is not None:
+            parent._children.append(self)
+        if self._transform_store is not None:
+            self._transform_store.set_parent(self._transform_slot,
+                                             None if parent is None else parent._transform_slot)
+        
+    def traverse(self):
+        """Объект и все его потомки в прямом порядке (родитель раньше детей)"""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node._children))
+        
+    @property
+    def lod_chain(self) -> Optional[LODChain]:
+        """Цепочка уровней детализации сетки объекта (None без сетки)
+        
+        Цепочка общая для всех объектов с одной сеткой.
+        """
+        return get_lod_chain(self.mesh)
+        
+    def mark_dirty(self) -> None:
+        """Отметка об изменении вершин или граней на месте
+        
+        Сбрасывает ограничивающий объем и увеличивает счетчик изменений,
+        чтобы изменение было учтено при следующем кадре.
+        """
+        self._bounds = None
+        self._world_vertices = None
+        self._normals = None
+        self.version += 1
+        
+    def update_vertices(self, indices, positions) -> None:
+        """Изменение части вершин с частичным пересчетом нормалей
+        
+        Пересчитываются только нормали треугольников, смежных с
+        измененными вершинами, и нормали вершин этих треугольников.
+        Объект с разделяемой сеткой сначала получает собственную копию
+        вершин (сетка доступна только для чтения).
+        
+        Args:
+            indices: Индексы изменяемых вершин (K,)
+            positions: Новые положения вершин (K, 3)
+            
+        Raises:
+            IndexError: Если индекс вершины вне диапазона
+        """
+        indices = np.asarray(indices, dtype=np.intp).reshape(-1)
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        if len(indices) and not 0 <= indices.min() <= indices.max() < len(self._vertices):
+            raise IndexError("Vertex index out of range")
+        if self.mesh is not None:
+            normals, faces = self._normals, self._faces
+            self.vertices = Vector3Array(self.mesh.vertices)
+            self._faces, self._normals = faces, normals
+        if isinstance(self._vertices, Vector3Array):
+            self._vertices.data[indices] = positions
+        elif isinstance(self._vertices, np.ndarray):
+            self._vertices.reshape(-1, 3)[indices] = positions
+        else:
+            for index, (x, y, z) in zip(indices.tolist(), positions.tolist()):
+                self._vertices[index] = Vector3(x, y, z)
+        self._bounds = None
+        self._world_vertices = None
+        self.version += 1
+        if self._normals is not None:
+            self._normals.update(indices, positions)
+        
+    def _surface_normals(self) -> SurfaceNormals:
+        """Нормали собственной геометрии (рассчитываются при первом обращении)"""
+        if self._normals is None:
+            triangles = self.mesh.triangles if self.mesh is not None else triangulate_faces(self._faces)[0]
+            vertices = self._vertices if len(self._vertices) else np.empty((0, 3))
+            if not isinstance(vertices, (Vector3Array, np.ndarray)):
+                vertices = Vector3Array(vertices, copy=False)
+            self._normals = SurfaceNormals(vertices, triangles)
+        return self._normals
+        
+    def get_face_normals(self) -> np.ndarray:
+        """Единичные внешние нормали треугольников в локальных координатах (T, 3)
+        
+        Порядок треугольников совпадает с triangulate_faces(faces)
+        (у объекта с сеткой — с mesh.triangles).
+        """
+        if self.mesh is not None:
+            return self.mesh.normals
+        return self._surface_normals().face_normals
+        
+    def get_vertex_normals(self) -> np.ndarray:
+        """Единичные нормали вершин в локальных координатах (N, 3)
+        
+        Нормаль вершины — среднее нормалей смежных треугольников,
+        взвешенное их площадями (у сеток с заданными нормалями вершин
+        используются они).
+        """
+        if self.mesh is not None and self.mesh.vertex_normals is not None:
+            return self.mesh.vertex_normals
+        return self._surface_normals().vertex_normals
+        
+    def intersect_ray(self, origin, direction, max_distance: float = float('inf')) -> Optional[RayHit]:
+        """Ближайшее пересечение луча с гранями объекта
+        
+        Луч переводится в локальные координаты объекта, где треугольники
+        отбираются по BVH геометрии (строится при первом выборе и
+        хранится в сетке или, для собственной геометрии, в объекте до
+        изменения вершин или граней).
+        
+        Args:
+            origin: Начало луча в мировых координатах
+            direction: Направление луча (расстояния измеряются в его длинах)
+            max_distance: Максимальное расстояние вдоль луча
+            
+        Returns:
+            Optional[RayHit]: Попадание или None
+        """
+        if not len(self._vertices) or not len(self._faces):
+            return None
+        try:
+            inverse = self.transform().affine_inverse().data
+        except ValueError:
+            return None  # Объект сжат в плоскость нулевым масштабом
+        vertices, triangles, triangle_faces, bvh = self._pick_geometry()
+        origin = np.asarray(origin, dtype=np.float64)
+        direction = np.asarray(direction, dtype=np.float64)
+        # Направление не нормируется, поэтому расстояния совпадают с мировыми
+        found = raycast_geometry(inverse[:3, :3] @ origin + inverse[:3, 3], inverse[:3, :3] @ direction,
+                                 vertices, triangles, bvh, max_distance)
+        if found is None:
+            return None
+        triangle, distance, weights = found
+        return RayHit(self, distance, origin + distance * direction, triangle,
+                      int(triangle_faces[triangle]), triangles[triangle], weights)
+        
+    def _pick_geometry(self) -> Tuple:
+        """Вершины (N, 3), треугольники, исходные грани треугольников и их BVH"""
+        if self.mesh is not None:
+            mesh = self.mesh
+            return mesh.vertices.data, mesh.triangles, mesh.triangle_faces, get_triangle_bvh(mesh)
+        key = (self.version, id(self._faces), len(self._faces))
+        if key != self._pick_key:
+            vertices = self._vertices
+            if not isinstance(vertices, (Vector3Array, np.ndarray)):
+                vertices = Vector3Array(vertices, copy=False)
+            vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+            triangles, triangle_faces = triangulate_faces(self._faces)
+            self._pick_geometry_cache = (vertices, triangles, triangle_faces, triangle_bvh(vertices, triangles))
+            self._pick_key = key
+        return self._pick_geometry_cache
+        
+    def state_key(self) -> Tuple:
+        """Ключ наблюдаемого состояния объекта
+        
+        Включает счетчик изменений геометрии, трансформацию и материал.
+        Если ключ не изменился, объект выглядит так же, как в предыдущем кадре.
+        """
+        return (self.version, id(self._vertices), len(self._vertices), len(self.faces),
+                self.position.x, self.position.y, self.position.z,
+                self.rotation.x, self.rotation.y, self.rotation.z,
+                None if self.orientation is None else tuple(self.orientation),
+                self.scale.x, self.scale.y, self.scale.z,
+                None if self._parent is None else id(self._parent),
+                self.ambient, self.diffuse, self.specular, self.double_sided)
+        
+    def invalidate_bounds(self) -> None:
+        """Сброс ограничивающего объема после изменения вершин на месте"""
+        self._bounds = None
+        
+    def get_bounds(self) -> Optional[Bounds]:
+        """Получение ограничивающего объема объекта в локальных координатах
+        
+        Объем рассчитывается при первом обращении и пересчитывается только
+        после замены списка вершин (или вызова invalidate_bounds()).
+        
+        Returns:
+            Bounds: Ограничивающая сфера и AABB или None, если вершин нет
+        """
+        if self._bounds is None:
+            self._bounds = self.mesh.bounds if self.mesh is not None else Bounds.from_vertices(self._vertices)
+        return self._bounds
         
     def transform(self) -> Matrix4:
         """Получение полной матрицы трансформации объекта
         
         Комбинирует все преобразования объекта в следующем порядке:
         1. масштабирование (scale) - изменение размеров объекта
-        2. поворот (rotation) - вращение вокруг локальных осей X, Y, Z
+        2. поворот (orientation или rotation) - вращение вокруг локальных осей X, Y, Z
         3. перемещение (translation) - смещение в мировых координатах
         
         Порядок применения важен, так как матричные операции не коммутативны.
+        Матрица строится сразу в готовом виде (Matrix4.compose_trs) и
+        кэшируется до изменения положения, поворота или масштаба.
+        У дочернего объекта результат умножается слева на мировую матрицу
+        родителя. Возвращаемую матрицу нельзя изменять на месте.
         
         Returns:
             Matrix4: Итоговая матрица трансформации для преобразования 
                     локальных координат в мировые
         """
-        translation = Matrix4.translation(self.position.x, self.position.y, self.position.z)
-        rotation_x = Matrix4.rotation_x(self.rotation.x)
-        rotation_y = Matrix4.rotation_y(self.rotation.y)
-        rotation_z = Matrix4.rotation_z(self.rotation.z)
-        scale = Matrix4.scale(self.scale.x, self.scale.y, self.scale.z)
+        return self._cached_transform(self._transform_key())
+        
+    def _cached_transform(self, key: Tuple) -> Matrix4:
+        if key == self._transform_cache_key:
+            self.transform_hits += 1
+            return self._world_matrix
+        self.transform_misses += 1
+        self._world_matrix = self.local_transform()
+        if self._transform_store is None and self._parent is not None:
+            self._world_matrix = key[-1] * self._world_matrix
+        self._transform_cache_key = key
+        return self._world_matrix
+        
+    def local_transform(self) -> Matrix4:
+        """Матрица трансформации относительно родителя (без кэширования)"""
+        rotation = self.rotation if self.orientation is None else self.orientation
+        return Matrix4.compose_trs(self.position, rotation, self.scale)
+        
+    def _transform_key(self) -> Tuple:
+        """Ключ кэша мировой матрицы
+        
+        Составляется из значений положения, поворота и масштаба и мировой
+        матрицы родителя. У объекта из хранилища трансформаций сцены
+        ключ — версия его строки.
+        """
+        if self._transform_store is not None:
+            return self._transform_store.key(self._transform_slot)
+        if self._parent is None:
+            return self._local_key()
+        return self._local_key() + (self._parent_world(),)
+        
+    def _local_key(self) -> Tuple:
+        p, r, s = self.position, self.rotation, self.scale
+        return (p.x, p.y, p.z, r.x, r.y, r.z,
+                None if self.orientation is None else tuple(self.orientation),
+                s.x, s.y, s.z)
+        
+    def _parent_world(self) -> Matrix4:
+        """Мировая матрица родителя; матрицы предков обновляются сверху вниз без рекурсии"""
+        chain = []
+        node = self._parent
+        while node._parent is not None:
+            chain.append(node)
+            node = node._parent
+        matrix = node.transform()
+        for node in reversed(chain):
+            matrix = node._cached_transform(node._local_key() + (matrix,))
+        return matrix
+        
+    def get_world_vertices(self) -> np.ndarray:
+        """Вершины в мировых координатах в виде массива (N, 3)
+        
+        Результат кэшируется до изменения трансформации или вершин
+        (замены списка вершин или вызова mark_dirty()). Массив
+        доступен только для чтения.
+        
+        Returns:
+            np.ndarray: Вершины в мировых координатах (N, 3)
+        """
+        key = self._world_vertices_stale()
+        if key is None:
+            self.vertices_hits += 1
+            return self._world_vertices
+        self.vertices_misses += 1
+        points = self._world_matrix.transform_points(self._vertices) if len(self._vertices) \
+            else np.empty((0, 3))
+        self._store_world_vertices(points, key)
+        return points
+        
+    def _world_vertices_stale(self) -> Optional[Tuple]:
+        """Ключ кэша мировых вершин, если кэш устарел (иначе None)
+        
+        Обновляет мировую матрицу, если изменилась трансформация.
+        """
+        if self._transform_key() != self._transform_cache_key:
+            self.transform()
+        key = (self._transform_cache_key, self.version)
+        if self._world_vertices is not None and key == self._world_vertices_key:
+            return None
+        return key
         
-        return translation * rotation_z * rotation_y * rotation_x * scale
+    def _store_world_vertices(self, points: np.ndarray, key: Tuple) -> None:
+        points.setflags(write=False)
+        self._world_vertices = points
+        self._world_vertices_key = key
+        
+    def get_orientation(self) -> Quaternion:
+        """Текущая ориентация объекта в виде кватерниона"""
+        if self.orientation is not None:
+            return self.orientation
+        return Quaternion.from_euler(self.rotation.x, self.rotation.y, self.rotation.z)
+        
+    def rotate_by(self, rotation: Quaternion) -> None:
+        """Поворот объекта кватернионом в мировых осях
+        
+        После первого вызова ориентация хранится в orientation, и
+        дальнейшие повороты композируются без углов Эйлера.
+        """
+        self.orientation = (rotation * self.get_orientation()).normalize()
         
     def get_transformed_vertices(self) -> List[Vector3]:
         """Получение трансформированных вершин объекта
@@ -52,8 +502,7 @@ class Object3D:
         Returns:
             List[Vector3]: Список вершин в мировых координатах
         """
-        transform = self.transform()
-        return [transform * vertex for vertex in self.vertices]
+        return [Vector3.from_floats(x, y, z) for x, y, z in self.get_world_vertices().tolist()]
 
     def translate(self, x: float, y: float, z: float) -> None:
         """Перемещение объекта на заданные величины
@@ -68,7 +517,14 @@ class Object3D:
         self.position.z += z
 
     def rotate(self, x: float, y: float, z: float) -> None:
-        """Rotate object by given angles"""
+        """Rotate object by given angles
+        
+        Если ориентация задана кватернионом, поворот на углы Эйлера
+        применяется к ней в локальных осях объекта.
+        """
+        if self.orientation is not None:
+            self.orientation = (self.orientation * Quaternion.from_euler(x, y, z)).normalize()
+            return
         self.rotation.x += x
         self.rotation.y += y
         self.rotation.z += z
@@ -79,21 +535,114 @@ class Object3D:
         self.scale.y = y
         self.scale.z = z
 
+def compose_transforms(objects) -> np.ndarray:
+    """Матрицы трансформации набора объектов одним векторным расчетом
+    
+    Матрицы строятся относительно родителя (см. Object3D.local_transform).
+    
+    Args:
+        objects: Объекты Object3D
+        
+    Returns:
+        np.ndarray: Матрицы (N, 4, 4) для вектор-столбцов, как у Object3D.transform
+    """
+    count = len(objects)
+    positions = np.empty((count, 3))
+    scales = np.empty((count, 3))
+    angles = np.zeros((count, 3))
+    quaternions = []  # (индекс, кватернион) объектов с заданной orientation
+    for i, obj in enumerate(objects):
+        p, r, s = obj.position, obj.rotation, obj.scale
+        positions[i] = (p.x, p.y, p.z)
+        scales[i] = (s.x, s.y, s.z)
+        if obj.orientation is None:
+            angles[i] = (r.x, r.y, r.z)
+        else:
+            quaternions.append((i, tuple(obj.orientation)))
+    result = Matrix4.compose_trs_batch(positions, angles, scales)
+    if quaternions:
+        indices = [i for i, _ in quaternions]
+        result[indices] = Matrix4.compose_trs_batch(positions[indices], [q for _, q in quaternions],
+                                                    scales[indices])
+    return result
+
+def update_transforms(objects) -> List[Matrix4]:
+    """Обновление кэшированных мировых матриц набора объектов
+    
+    Матрицы объектов, трансформация которых изменилась, строятся
+    одним вызовом compose_transforms; для остальных используется кэш.
+    
+    Args:
+        objects: Объекты Object3D
+        
+    Returns:
+        List[Matrix4]: Мировые матрицы объектов (изменять на месте нельзя)
+    """
+    stale = []
+    for obj in objects:
+        key = obj._transform_key()
+        if key == obj._transform_cache_key:
+            obj.transform_hits += 1
+        else:
+            obj.transform_misses += 1
+            obj._transform_cache_key = key
+            stale.append(obj)
+    if stale:
+        for obj, matrix in zip(stale, compose_transforms(stale)):
+            if obj._transform_store is None and obj._parent is not None:
+                # Последний элемент ключа — мировая матрица родителя
+                matrix = obj._transform_cache_key[-1].data @ matrix
+            obj._world_matrix = Matrix4._wrap(matrix)
+    return [obj._world_matrix for obj in objects]
+
+def update_world_vertices(objects) -> None:
+    """Обновление кэшированных мировых вершин набора объектов
+    
+    Объекты с общей сеткой и устаревшим кэшем трансформируются вместе:
+    вершины сетки умножаются на матрицы всех экземпляров одной
+    пакетной операцией (Mesh.transform_instances). Остальные объекты
+    обновляются при обращении к get_world_vertices().
+    
+    Args:
+        objects: Объекты Object3D
+    """
+    instances = {}
+    for obj in objects:
+        if obj.mesh is None:
+            continue
+        key = obj._world_vertices_stale()
+        if key is not None:
+            instances.setdefault(id(obj.mesh), []).append((obj, key))
+    for group in instances.values():
+        mesh = group[0][0].mesh
+        matrices = np.array([obj._world_matrix.data for obj, _ in group])
+        for (obj, key), points in zip(group, mesh.transform_instances(matrices)):
+            obj.vertices_misses += 1
+            obj._store_world_vertices(points, key)
+
 class Cube(Object3D):
-    """Basic cube object"""
+    """Basic cube object
+    
+    Кубы одного размера используют одну общую сетку.
+    """
     
     def __init__(self, size: float = 1.0):
+        super().__init__(mesh=Mesh.cached(('cube', float(size)), lambda: self.build_mesh(size)))
+        
+    @staticmethod
+    def build_mesh(size: float) -> Mesh:
+        """Создание сетки куба с ребром size"""
         # Define 8 vertices of a cube
         half = size / 2
         vertices = [
-            Vector3(-half, -half, -half),  # 0: front bottom left
-            Vector3(half, -half, -half),   # 1: front bottom right
-            Vector3(half, half, -half),    # 2: front top right
-            Vector3(-half, half, -half),   # 3: front top left
-            Vector3(-half, -half, half),   # 4: back bottom left
-            Vector3(half, -half, half),    # 5: back bottom right
-            Vector3(half, half, half),     # 6: back top right
-            Vector3(-half, half, half),    # 7: back top left
+            (-half, -half, -half),  # 0: front bottom left
+            (half, -half, -half),   # 1: front bottom right
+            (half, half, -half),    # 2: front top right
+            (-half, half, -half),   # 3: front top left
+            (-half, -half, half),   # 4: back bottom left
+            (half, -half, half),    # 5: back bottom right
+            (half, half, half),     # 6: back top right
+            (-half, half, half),    # 7: back top left
         ]
         
         # Define faces as vertex indices
@@ -106,22 +655,33 @@ class Cube(Object3D):
             (4, 5, 1, 0),  # bottom
         ]
         
-        super().__init__(vertices, faces)
+        return Mesh(vertices, faces)
 
 class Plane(Object3D):
-    """Basic plane object"""
+    """Basic plane object
+    
+    Плоскости одного размера используют одну общую сетку.
+    """
     
     def __init__(self, width: float = 1.0, height: float = 1.0):
+        super().__init__(mesh=Mesh.cached(('plane', float(width), float(height)),
+                                          lambda: self.build_mesh(width, height)))
+        # Плоскость не замкнута, поэтому видна с обеих сторон
+        self.double_sided = True
+        
+    @staticmethod
+    def build_mesh(width: float, height: float) -> Mesh:
+        """Создание сетки плоскости width x height в плоскости XZ"""
         half_w = width / 2
         half_h = height / 2
         
         vertices = [
-            Vector3(-half_w, 0, -half_h),
-            Vector3(half_w, 0, -half_h),
-            Vector3(half_w, 0, half_h),
-            Vector3(-half_w, 0, half_h),
+            (-half_w, 0, -half_h),
+            (half_w, 0, -half_h),
+            (half_w, 0, half_h),
+            (-half_w, 0, half_h),
         ]
         
         faces = [(0, 1, 2, 3)]
         
-        super().__init__(vertices, faces)
\ No newline at end of file
+        return Mesh(vertices, faces)
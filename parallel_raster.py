@@ -0,0 +1,297 @@
+import os
+import time
+import logging
+import multiprocessing
+from multiprocessing import shared_memory
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+from rasterizer import draw_triangles
+
+# Поля примитива в буфере: x0..x2, y0..y2, z0..z2, код символа
+PRIMITIVE_FIELDS = 10
+
+logger = logging.getLogger(__name__)
+
+# Сегменты разделяемой памяти, подключенные в процессе-воркере
+_worker_segments: Dict[str, shared_memory.SharedMemory] = {}
+
+def _attach(kind: str, name: str) -> shared_memory.SharedMemory:
+    """Подключение сегмента разделяемой памяти в воркере с кэшированием"""
+    segment = _worker_segments.get(kind)
+    if segment is not None and segment.name == name:
+        return segment
+    if segment is not None:
+        segment.close()
+    # Сегментом владеет основной процесс: воркеры разделяют с ним
+    # resource_tracker, поэтому сегмент только подключается и закрывается,
+    # а удаление и снятие с учета выполняет основной процесс
+    segment = shared_memory.SharedMemory(name=name)
+    _worker_segments[kind] = segment
+    return segment
+
+def _frame_views(buffer, width: int, height: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Массивы символов и глубины поверх буфера сегмента кадра"""
+    cells = width * height
+    depth_offset = (cells + 7) // 8 * 8
+    chars = np.ndarray((height, width), dtype=np.uint8, buffer=buffer)
+    depth = np.ndarray((height, width), dtype=np.float32, buffer=buffer, offset=depth_offset)
+    return chars, depth
+
+def _frame_bytes(width: int, height: int) -> int:
+    cells = width * height
+    return (cells + 7) // 8 * 8 + cells * 4
+
+def _rasterize_tile(task) -> int:
+    """Растеризация одного тайла в процессе-воркере"""
+    frame_name, width, height, primitive_name, count, char_table, region, index = task
+    frame = _attach('frame', frame_name)
+    primitives = _attach('primitives', primitive_name)
+    chars, depth = _frame_views(frame.buf, width, height)
+    data = np.ndarray((count, PRIMITIVE_FIELDS), dtype=np.float64, buffer=primitives.buf)[index]
+    return draw_triangles(chars, depth, data[:, 0:3], data[:, 3:6], data[:, 6:9],
+                          data[:, 9].astype(np.uint8), char_table, region=region)
+
+def bin_triangles(screen_x: np.ndarray, screen_y: np.ndarray, width: int, height: int,
+                  tile_width: int, tile_height: int) -> List[Tuple[Tuple[int, int, int, int], np.ndarray]]:
+    """Распределение треугольников по экранным тайлам
+
+    Треугольник попадает во все тайлы, которые пересекает его
+    ограничивающий прямоугольник.
+
+    Args:
+        screen_x, screen_y: Экранные координаты вершин треугольников (T, 3)
+        width, height: Размеры экрана
+        tile_width, tile_height: Размеры тайла
+
+    Returns:
+        List: Пары (прямоугольник тайла (x0, y0, x1, y1), индексы треугольников)
+    """
+    tiles_x = (width + tile_width - 1) // tile_width
+    tiles_y = (height + tile_height - 1) // tile_height
+    min_x = np.clip(np.floor(screen_x.min(axis=1)) // tile_width, 0, tiles_x - 1).astype(np.int64)
+    max_x = np.clip(np.floor(screen_x.max(axis=1)) // tile_width, -1, tiles_x - 1).astype(np.int64)
+    min_y = np.clip(np.floor(screen_y.min(axis=1)) // tile_height, 0, tiles_y - 1).astype(np.int64)
+    max_y = np.clip(np.floor(screen_y.max(axis=1)) // tile_height, -1, tiles_y - 1).astype(np.int64)
+    # Треугольники целиком за пределами экрана не попадают ни в один тайл
+    span_x = np.maximum(max_x - min_x + 1, 0)
+    span_y = np.maximum(max_y - min_y + 1, 0)
+    span_x[(screen_x.max(axis=1) < 0) | (screen_x.min(axis=1) >= width)] = 0
+    span_y[(screen_y.max(axis=1) < 0) | (screen_y.min(axis=1) >= height)] = 0
+    counts = span_x * span_y
+
+    triangle = np.repeat(np.arange(len(counts)), counts)
+    local = np.arange(len(triangle)) - np.repeat(np.cumsum(counts) - counts, counts)
+    tile_x = min_x[triangle] + local % span_x[triangle]
+    tile_y = min_y[triangle] + local // span_x[triangle]
+    tile = tile_y * tiles_x + tile_x
+
+    order = np.argsort(tile, kind='stable')
+    tile = tile[order]
+    triangle = triangle[order]
+    ids, starts = np.unique(tile, return_index=True)
+    bins = []
+    for tile_id, part in zip(ids.tolist(), np.split(triangle, starts[1:])):
+        tx, ty = tile_id % tiles_x, tile_id // tiles_x
+        region = (tx * tile_width, ty * tile_height,
+                  min((tx + 1) * tile_width, width), min((ty + 1) * tile_height, height))
+        bins.append((region, part))
+    return bins
+
+class ParallelRasterizer:
+    """Растеризатор, распределяющий экранные тайлы по процессам
+
+    Треугольники кадра записываются в разделяемую память и
+    распределяются по тайлам экрана. Каждый тайл растеризуется
+    процессом-воркером непосредственно в буферы символов и глубины,
+    также расположенные в разделяемой памяти, поэтому основному процессу
+    остается только вывести готовый кадр.
+
+    Для небольших кадров накладные расходы на передачу задач превышают
+    выигрыш, поэтому ниже порога min_triangles используется
+    последовательная растеризация. Если порог не задан, его нужно
+    измерить функцией calibrate() до начала рендеринга (Renderer делает
+    это в initialize()); до калибровки кадры растеризуются
+    последовательно, чтобы измерение не попало в кадр.
+    """
+
+    def __init__(self, workers: int = None, tile_size: Tuple[int, int] = (32, 16),
+                 min_triangles: float = None):
+        """Инициализация параллельного растеризатора
+
+        Args:
+            workers: Количество процессов (по умолчанию число ядер)
+            tile_size: Размеры тайла (ширина, высота) в символах
+            min_triangles: Минимальное число треугольников кадра для
+                параллельной растеризации; None — не задан до вызова calibrate()
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.tile_width, self.tile_height = tile_size
+        self.min_triangles = min_triangles
+        self.last_mode = None  # 'serial' или 'parallel' для последнего кадра
+        self._pool = None
+        self._frame = None
+        self._frame_size = None
+        self._views = None
+        self._bound = None
+        self._primitives = None
+        self._capacity = 0
+
+    def _ensure_pool(self):
+        if self._pool is None:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+            self._pool = context.Pool(self.workers)
+        return self._pool
+
+    def bind(self, framebuffer) -> None:
+        """Перенос буферов символов и глубины кадра в разделяемую память
+
+        Буферы FrameBuffer заменяются представлениями сегмента разделяемой
+        памяти (содержимое сохраняется), поэтому все записи в кадр
+        видны процессам-воркерам.
+        """
+        size = (framebuffer.width, framebuffer.height)
+        if self._views is not None and framebuffer.chars is self._views[0] \
+                and framebuffer.depth is self._views[1]:
+            return
+        self._unbind()
+        if self._frame_size != size:
+            self._views = None
+            self._release(self._frame)
+            self._frame = shared_memory.SharedMemory(create=True, size=_frame_bytes(*size))
+            self._frame_size = size
+            self._views = _frame_views(self._frame.buf, *size)
+        chars, depth = self._views
+        np.copyto(chars, framebuffer.chars)
+        np.copyto(depth, framebuffer.depth)
+        framebuffer.chars = chars
+        framebuffer.depth = depth
+        self._bound = framebuffer
+
+    def _unbind(self) -> None:
+        """Возврат буферов привязанного кадра в обычную память"""
+        framebuffer, self._bound = self._bound, None
+        if framebuffer is not None and self._views is not None:
+            if framebuffer.chars is self._views[0]:
+                framebuffer.chars = framebuffer.chars.copy()
+            if framebuffer.depth is self._views[1]:
+                framebuffer.depth = framebuffer.depth.copy()
+
+    def rasterize(self, framebuffer, screen_x: np.ndarray, screen_y: np.ndarray,
+                  depth: np.ndarray, codes: np.ndarray, char_table: np.ndarray) -> int:
+        """Растеризация треугольников кадра в буфер кадра
+
+        Args:
+            framebuffer: Буфер кадра (переносится в разделяемую память)
+            screen_x, screen_y, depth: Экранные координаты и глубина вершин (T, 3)
+            codes: Код символа каждого треугольника, 0 — символ по глубине
+            char_table: Таблица символов на 256 уровней яркости
+
+        Returns:
+            int: Количество записанных ячеек
+        """
+        if self.min_triangles is None or len(codes) < self.min_triangles or self.workers < 2:
+            self.last_mode = 'serial'
+            return draw_triangles(framebuffer.chars, framebuffer.depth, screen_x, screen_y,
+                                  depth, codes, char_table)
+        self.bind(framebuffer)
+        self.last_mode = 'parallel'
+        return self._rasterize_parallel(screen_x, screen_y, depth, codes, char_table)
+
+    def _rasterize_parallel(self, screen_x, screen_y, depth, codes, char_table) -> int:
+        width, height = self._frame_size
+        count = len(codes)
+        if count > self._capacity:
+            self._release(self._primitives)
+            self._capacity = max(count, 2 * self._capacity, 1024)
+            self._primitives = shared_memory.SharedMemory(
+                create=True, size=self._capacity * PRIMITIVE_FIELDS * 8)
+        data = np.ndarray((count, PRIMITIVE_FIELDS), dtype=np.float64, buffer=self._primitives.buf)
+        data[:, 0:3] = screen_x
+        data[:, 3:6] = screen_y
+        data[:, 6:9] = depth
+        data[:, 9] = codes
+
+        bins = bin_triangles(data[:, 0:3], data[:, 3:6], width, height,
+                             self.tile_width, self.tile_height)
+        tasks = [(self._frame.name, width, height, self._primitives.name, count,
+                  char_table, region, index) for region, index in bins]
+        return sum(self._ensure_pool().map(_rasterize_tile, tasks, chunksize=1))
+
+    def calibrate(self, width: int, height: int,
+                  counts: Sequence[int] = (256, 1024, 4096, 16384, 65536),
+                  repeats: int = 3) -> float:
+        """Измерение порога, с которого параллельная растеризация быстрее
+
+        На синтетических кадрах с разным числом треугольников сравнивается
+        время последовательной и параллельной растеризации.
+
+        Args:
+            width, height: Размеры кадра
+            counts: Проверяемые количества треугольников (по возрастанию)
+            repeats: Количество повторов измерения (берется лучшее время)
+
+        Returns:
+            float: Порог min_triangles (inf, если параллельный режим не выигрывает)
+        """
+        from framebuffer import FrameBuffer
+
+        self.min_triangles = float('inf')
+        if self.workers < 2:
+            return self.min_triangles
+
+        rng = np.random.default_rng(0)
+        bound = self._bound
+        framebuffer = FrameBuffer(width, height)
+        self.bind(framebuffer)
+        char_table = np.full(256, ord('#'), dtype=np.uint8)
+        for count in counts:
+            centers = rng.uniform([0, 0], [width, height], (count, 2))
+            screen_x = centers[:, 0, None] + rng.uniform(-3, 3, (count, 3))
+            screen_y = centers[:, 1, None] + rng.uniform(-2, 2, (count, 3))
+            depth = rng.uniform(-1, 1, (count, 3))
+            codes = np.zeros(count, dtype=np.uint8)
+
+            timings = {}
+            for mode in ('serial', 'parallel'):
+                best = float('inf')
+                for _ in range(repeats):
+                    framebuffer.clear()
+                    start = time.perf_counter()
+                    if mode == 'serial':
+                        draw_triangles(framebuffer.chars, framebuffer.depth, screen_x,
+                                       screen_y, depth, codes, char_table)
+                    else:
+                        self._rasterize_parallel(screen_x, screen_y, depth, codes, char_table)
+                    best = min(best, time.perf_counter() - start)
+                timings[mode] = best
+            logger.info(f"Raster calibration {count} triangles: serial {timings['serial'] * 1000:.2f}ms, "
+                        f"parallel {timings['parallel'] * 1000:.2f}ms")
+            if timings['parallel'] < timings['serial']:
+                self.min_triangles = count
+                break
+        self._unbind()
+        if bound is not None and (bound.width, bound.height) == self._frame_size:
+            self.bind(bound)
+        return self.min_triangles
+
+    @staticmethod
+    def _release(segment) -> None:
+        if segment is not None:
+            segment.close()
+            segment.unlink()
+
+    def close(self) -> None:
+        """Остановка процессов и освобождение разделяемой памяти"""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+        self._unbind()
+        self._views = None
+        self._release(self._frame)
+        self._release(self._primitives)
+        self._frame = None
+        self._frame_size = None
+        self._primitives = None
+        self._capacity = 0
@@ -0,0 +1,112 @@
+from typing import Optional, Tuple
+import numpy as np
+from bvh import BVH
+from mesh import Mesh
+
+# Допуск теста пересечения луча с треугольником
+EPSILON = 1e-12
+
+class RayHit:
+    """Результат пересечения луча с объектом
+
+    Attributes:
+        object: Объект, в который попал луч
+        distance: Расстояние вдоль луча в длинах его направления
+        point: Точка попадания в мировых координатах (3,)
+        triangle: Индекс треугольника в триангуляции граней объекта
+        face: Индекс исходной грани объекта
+        vertices: Индексы вершин треугольника (3,)
+        barycentric: Барицентрические координаты точки в треугольнике (3,)
+    """
+
+    __slots__ = ('object', 'distance', 'point', 'triangle', 'face', 'vertices', 'barycentric')
+
+    def __init__(self, obj, distance: float, point: np.ndarray, triangle: int, face: int,
+                 vertices: np.ndarray, barycentric: np.ndarray):
+        self.object = obj
+        self.distance = distance
+        self.point = point
+        self.triangle = triangle
+        self.face = face
+        self.vertices = vertices
+        self.barycentric = barycentric
+
+    @property
+    def vertex(self) -> int:
+        """Индекс вершины треугольника, ближайшей к точке попадания"""
+        return int(self.vertices[int(np.argmax(self.barycentric))])
+
+    def __repr__(self):
+        return f"RayHit(distance={self.distance:.4f}, face={self.face}, vertex={self.vertex})"
+
+def triangle_bvh(vertices: np.ndarray, triangles: np.ndarray) -> BVH:
+    """Иерархия ограничивающих объемов над треугольниками сетки
+
+    Args:
+        vertices: Вершины (N, 3)
+        triangles: Индексы вершин треугольников (T, 3)
+    """
+    corners = np.asarray(vertices, dtype=np.float64)[triangles]
+    return BVH(corners.min(axis=1), corners.max(axis=1))
+
+def get_triangle_bvh(mesh: Mesh) -> BVH:
+    """BVH треугольников сетки (строится при первом обращении и хранится в сетке)"""
+    if mesh.triangle_bvh is None:
+        mesh.triangle_bvh = triangle_bvh(mesh.vertices.data, mesh.triangles)
+    return mesh.triangle_bvh
+
+def intersect_triangles(origin: np.ndarray, direction: np.ndarray, vertices: np.ndarray,
+                        triangles: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Пересечение луча с набором треугольников (алгоритм Мёллера–Трумбора)
+
+    Треугольники пересекаются с обеих сторон.
+
+    Args:
+        origin: Начало луча (3,)
+        direction: Направление луча (3,)
+        vertices: Вершины (N, 3)
+        triangles: Индексы вершин треугольников (T, 3)
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Маска попаданий (T,),
+            расстояния (T,) и барицентрические координаты (T, 3)
+    """
+    v0, v1, v2 = (vertices[triangles[:, k]] for k in range(3))
+    edge1, edge2 = v1 - v0, v2 - v0
+    p = np.cross(direction, edge2)
+    determinant = np.einsum('ij,ij->i', edge1, p)
+    valid = np.abs(determinant) > EPSILON
+    inverse = np.divide(1.0, determinant, out=np.zeros_like(determinant), where=valid)
+    s = origin - v0
+    u = np.einsum('ij,ij->i', s, p) * inverse
+    q = np.cross(s, edge1)
+    v = (q @ direction) * inverse
+    t = np.einsum('ij,ij->i', edge2, q) * inverse
+    hit = valid & (u >= 0.0) & (v >= 0.0) & (u + v <= 1.0) & (t >= 0.0)
+    return hit, t, np.stack((1.0 - u - v, u, v), axis=1)
+
+def raycast_geometry(origin: np.ndarray, direction: np.ndarray, vertices: np.ndarray, triangles: np.ndarray,
+                     bvh: BVH, max_distance: float = np.inf) -> Optional[Tuple[int, float, np.ndarray]]:
+    """Ближайшее пересечение луча с треугольной сеткой
+
+    Args:
+        origin: Начало луча (3,)
+        direction: Направление луча (3,)
+        vertices: Вершины (N, 3)
+        triangles: Индексы вершин треугольников (T, 3)
+        bvh: BVH треугольников (triangle_bvh)
+        max_distance: Максимальное расстояние вдоль луча
+
+    Returns:
+        Optional[Tuple[int, float, np.ndarray]]: Индекс треугольника,
+            расстояние и барицентрические координаты или None
+    """
+    candidates, _ = bvh.query_ray(origin, direction, max_distance)
+    if not len(candidates):
+        return None
+    hit, t, weights = intersect_triangles(origin, direction, vertices, triangles[candidates])
+    hit &= t <= max_distance
+    if not hit.any():
+        return None
+    nearest = np.flatnonzero(hit)[np.argmin(t[hit])]
+    return int(candidates[nearest]), float(t[nearest]), weights[nearest]
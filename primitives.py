@@ -0,0 +1,331 @@
+import math
+import numpy as np
+from mesh import Mesh
+from object import Object3D
+
+# Процедурные примитивы. Вершины, треугольники и нормали вершин строятся
+# векторно на массивах; сетки кэшируются по параметрам генератора, поэтому
+# повторное создание примитива с теми же параметрами не строит геометрию заново.
+# Треугольники обходятся по часовой стрелке при взгляде снаружи, как грани Cube.
+
+def _quads(grid: np.ndarray) -> np.ndarray:
+    """Треугольники четырехугольной сетки индексов вершин
+
+    Args:
+        grid: Индексы вершин (R + 1, C + 1); ячейка (i, j) образована
+            вершинами grid[i, j], grid[i, j + 1], grid[i + 1, j + 1], grid[i + 1, j]
+
+    Returns:
+        np.ndarray: Треугольники (2 * R * C, 3)
+    """
+    a = grid[:-1, :-1].ravel()
+    b = grid[:-1, 1:].ravel()
+    c = grid[1:, 1:].ravel()
+    d = grid[1:, :-1].ravel()
+    return np.stack([np.stack([a, b, c], axis=1), np.stack([a, c, d], axis=1)], axis=1).reshape(-1, 3)
+
+def _fan(center: int, ring: np.ndarray) -> np.ndarray:
+    """Треугольники веера от центральной вершины к замкнутому кольцу вершин"""
+    return np.stack([np.full(len(ring), center), ring, np.roll(ring, -1)], axis=1)
+
+def _check_resolution(**values) -> None:
+    for name, (value, minimum) in values.items():
+        if int(value) != value or value < minimum:
+            raise ValueError(f"{name} must be an integer >= {minimum}")
+
+def _check_size(**values) -> None:
+    for name, value in values.items():
+        if value <= 0:
+            raise ValueError(f"{name} must be positive")
+
+def uv_sphere_mesh(radius: float = 1.0, segments: int = 16, rings: int = 8) -> Mesh:
+    """Сетка UV-сферы
+
+    Args:
+        radius: Радиус сферы
+        segments: Число делений по долготе (>= 3)
+        rings: Число делений по широте (>= 2)
+
+    Returns:
+        Mesh: Общая сетка для этих параметров
+
+    Raises:
+        ValueError: При некорректных параметрах
+    """
+    _check_size(radius=radius)
+    _check_resolution(segments=(segments, 3), rings=(rings, 2))
+    key = ('uv_sphere', float(radius), int(segments), int(rings))
+    return Mesh.cached(key, lambda: _build_uv_sphere(radius, int(segments), int(rings)))
+
+def _build_uv_sphere(radius: float, segments: int, rings: int) -> Mesh:
+    theta = np.linspace(0.0, math.pi, rings + 1)[1:-1, None]
+    phi = np.linspace(0.0, 2.0 * math.pi, segments, endpoint=False)[None, :]
+    ring_normals = np.stack([np.sin(theta) * np.cos(phi),
+                             np.broadcast_to(np.cos(theta), (rings - 1, segments)),
+                             np.sin(theta) * np.sin(phi)], axis=2).reshape(-1, 3)
+    normals = np.concatenate([[(0.0, 1.0, 0.0)], ring_normals, [(0.0, -1.0, 0.0)]])
+    bottom = len(normals) - 1
+    # Кольца 1..rings-1 замыкаются по долготе повтором первого столбца
+    grid = 1 + np.arange((rings - 1) * segments).reshape(rings - 1, segments)
+    grid = np.concatenate([grid, grid[:, :1]], axis=1)
+    triangles = np.concatenate([
+        _fan(0, grid[0, :-1]),
+        _quads(grid)[:, [0, 2, 1]],
+        _fan(bottom, grid[-1, :-1])[:, [0, 2, 1]],
+    ])
+    return Mesh.from_arrays(normals * radius, triangles, vertex_normals=normals)
+
+def icosphere_mesh(radius: float = 1.0, subdivisions: int = 2) -> Mesh:
+    """Сетка икосферы (подразделенного икосаэдра)
+
+    Каждое подразделение делит треугольник на четыре; вершины
+    проецируются на сферу, поэтому треугольники почти равновелики.
+
+    Args:
+        radius: Радиус сферы
+        subdivisions: Число подразделений (>= 0)
+
+    Returns:
+        Mesh: Общая сетка для этих параметров
+
+    Raises:
+        ValueError: При некорректных параметрах
+    """
+    _check_size(radius=radius)
+    _check_resolution(subdivisions=(subdivisions, 0))
+    key = ('icosphere', float(radius), int(subdivisions))
+    return Mesh.cached(key, lambda: _build_icosphere(radius, int(subdivisions)))
+
+def _build_icosphere(radius: float, subdivisions: int) -> Mesh:
+    t = (1.0 + math.sqrt(5.0)) / 2.0
+    vertices = np.array([
+        (-1, t, 0), (1, t, 0), (-1, -t, 0), (1, -t, 0),
+        (0, -1, t), (0, 1, t), (0, -1, -t), (0, 1, -t),
+        (t, 0, -1), (t, 0, 1), (-t, 0, -1), (-t, 0, 1),
+    ], dtype=np.float64)
+    triangles = np.array([
+        (0, 5, 11), (0, 1, 5), (0, 7, 1), (0, 10, 7), (0, 11, 10),
+        (1, 9, 5), (5, 4, 11), (11, 2, 10), (10, 6, 7), (7, 8, 1),
+        (3, 4, 9), (3, 2, 4), (3, 6, 2), (3, 8, 6), (3, 9, 8),
+        (4, 5, 9), (2, 11, 4), (6, 10, 2), (8, 7, 6), (9, 1, 8),
+    ], dtype=np.int64)
+    vertices /= np.linalg.norm(vertices, axis=1, keepdims=True)
+    for _ in range(subdivisions):
+        # Каждое ребро получает одну общую среднюю точку
+        edges = np.sort(triangles[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+        unique, inverse = np.unique(edges, axis=0, return_inverse=True)
+        middle = vertices[unique].mean(axis=1)
+        middle /= np.linalg.norm(middle, axis=1, keepdims=True)
+        m = len(vertices) + inverse.reshape(-1, 3)
+        vertices = np.concatenate([vertices, middle])
+        a, b, c = triangles.T
+        ab, bc, ca = m.T
+        triangles = np.stack([
+            np.stack([a, ab, ca], axis=1), np.stack([ab, b, bc], axis=1),
+            np.stack([ca, bc, c], axis=1), np.stack([ab, bc, ca], axis=1),
+        ], axis=1).reshape(-1, 3)
+    return Mesh.from_arrays(vertices * radius, triangles, vertex_normals=vertices)
+
+def cylinder_mesh(radius: float = 0.5, height: float = 1.0, segments: int = 16,
+                  caps: bool = True) -> Mesh:
+    """Сетка цилиндра вдоль оси Y с центром в начале координат
+
+    Вершины боковой поверхности и крышек не общие, чтобы у них были
+    собственные нормали.
+
+    Args:
+        radius: Радиус основания
+        height: Высота
+        segments: Число делений окружности (>= 3)
+        caps: Закрывать ли торцы
+
+    Returns:
+        Mesh: Общая сетка для этих параметров
+
+    Raises:
+        ValueError: При некорректных параметрах
+    """
+    _check_size(radius=radius, height=height)
+    _check_resolution(segments=(segments, 3))
+    key = ('cylinder', float(radius), float(height), int(segments), bool(caps))
+    return Mesh.cached(key, lambda: _build_cylinder(radius, height, int(segments), bool(caps)))
+
+def _build_cylinder(radius: float, height: float, segments: int, caps: bool) -> Mesh:
+    phi = np.linspace(0.0, 2.0 * math.pi, segments, endpoint=False)
+    circle = np.stack([np.cos(phi), np.zeros(segments), np.sin(phi)], axis=1)
+    half = height / 2.0
+    up = np.array([0.0, 1.0, 0.0])
+    # Боковая поверхность: нижнее кольцо, затем верхнее
+    vertices = [circle * radius - up * half, circle * radius + up * half]
+    normals = [circle, circle]
+    grid = np.arange(2 * segments).reshape(2, segments)
+    triangles = [_quads(np.concatenate([grid, grid[:, :1]], axis=1))]
+    if caps:
+        for sign in (1.0, -1.0):
+            start = sum(len(v) for v in vertices)
+            vertices.append(np.concatenate([[up * sign * half], circle * radius + up * sign * half]))
+            normals.append(np.tile(up * sign, (segments + 1, 1)))
+            fan = _fan(start, start + 1 + np.arange(segments))
+            triangles.append(fan if sign > 0 else fan[:, [0, 2, 1]])
+    return Mesh.from_arrays(np.concatenate(vertices), np.concatenate(triangles),
+                            vertex_normals=np.concatenate(normals))
+
+def cone_mesh(radius: float = 0.5, height: float = 1.0, segments: int = 16, cap: bool = True) -> Mesh:
+    """Сетка конуса вдоль оси Y: основание при y = -height/2, вершина при y = height/2
+
+    Вершина конуса повторяется для каждого сегмента, чтобы нормали
+    боковой поверхности были гладкими по окружности.
+
+    Args:
+        radius: Радиус основания
+        height: Высота
+        segments: Число делений окружности (>= 3)
+        cap: Закрывать ли основание
+
+    Returns:
+        Mesh: Общая сетка для этих параметров
+
+    Raises:
+        ValueError: При некорректных параметрах
+    """
+    _check_size(radius=radius, height=height)
+    _check_resolution(segments=(segments, 3))
+    key = ('cone', float(radius), float(height), int(segments), bool(cap))
+    return Mesh.cached(key, lambda: _build_cone(radius, height, int(segments), bool(cap)))
+
+def _build_cone(radius: float, height: float, segments: int, cap: bool) -> Mesh:
+    phi = np.linspace(0.0, 2.0 * math.pi, segments, endpoint=False)
+    circle = np.stack([np.cos(phi), np.zeros(segments), np.sin(phi)], axis=1)
+    half = height / 2.0
+    # Нормаль боковой поверхности наклонена к оси на угол раствора конуса
+    slant = circle * height + np.array([0.0, radius, 0.0])
+    slant /= np.linalg.norm(slant, axis=1, keepdims=True)
+    # Нормаль вершины конуса берется посередине сегмента
+    middle = np.roll(slant, -1, axis=0) + slant
+    middle /= np.linalg.norm(middle, axis=1, keepdims=True)
+    base = circle * radius - np.array([0.0, half, 0.0])
+    apex = np.tile((0.0, half, 0.0), (segments, 1))
+    vertices = [base, apex]
+    normals = [slant, middle]
+    ring = np.arange(segments)
+    triangles = [np.stack([segments + ring, ring, np.roll(ring, -1)], axis=1)]
+    if cap:
+        start = 2 * segments
+        vertices.append(np.concatenate([[(0.0, -half, 0.0)], base]))
+        normals.append(np.tile((0.0, -1.0, 0.0), (segments + 1, 1)))
+        triangles.append(_fan(start, start + 1 + ring)[:, [0, 2, 1]])
+    return Mesh.from_arrays(np.concatenate(vertices), np.concatenate(triangles),
+                            vertex_normals=np.concatenate(normals))
+
+def torus_mesh(major_radius: float = 1.0, minor_radius: float = 0.25, major_segments: int = 24,
+               minor_segments: int = 12) -> Mesh:
+    """Сетка тора в плоскости XZ
+
+    Args:
+        major_radius: Радиус окружности центров трубки
+        minor_radius: Радиус трубки
+        major_segments: Число делений вдоль тора (>= 3)
+        minor_segments: Число делений сечения трубки (>= 3)
+
+    Returns:
+        Mesh: Общая сетка для этих параметров
+
+    Raises:
+        ValueError: При некорректных параметрах
+    """
+    _check_size(major_radius=major_radius, minor_radius=minor_radius)
+    _check_resolution(major_segments=(major_segments, 3), minor_segments=(minor_segments, 3))
+    key = ('torus', float(major_radius), float(minor_radius), int(major_segments), int(minor_segments))
+    return Mesh.cached(key, lambda: _build_torus(major_radius, minor_radius,
+                                                 int(major_segments), int(minor_segments)))
+
+def _build_torus(major_radius: float, minor_radius: float, major_segments: int,
+                 minor_segments: int) -> Mesh:
+    u = np.linspace(0.0, 2.0 * math.pi, major_segments, endpoint=False)[:, None]
+    v = np.linspace(0.0, 2.0 * math.pi, minor_segments, endpoint=False)[None, :]
+    normals = np.stack([np.cos(v) * np.cos(u),
+                        np.broadcast_to(np.sin(v), (major_segments, minor_segments)),
+                        np.cos(v) * np.sin(u)], axis=2).reshape(-1, 3)
+    centers = np.stack([np.cos(u), np.zeros_like(u), np.sin(u)], axis=2)
+    centers = np.broadcast_to(centers * major_radius, (major_segments, minor_segments, 3)).reshape(-1, 3)
+    # Сетка замыкается в обоих направлениях
+    grid = np.arange(major_segments * minor_segments).reshape(major_segments, minor_segments)
+    grid = np.concatenate([grid, grid[:, :1]], axis=1)
+    grid = np.concatenate([grid, grid[:1]], axis=0)
+    return Mesh.from_arrays(centers + normals * minor_radius, _quads(grid)[:, [0, 2, 1]],
+                            vertex_normals=normals)
+
+def grid_mesh(width: float = 1.0, depth: float = 1.0, columns: int = 1, rows: int = 1) -> Mesh:
+    """Сетка подразделенной плоскости в плоскости XZ с нормалью +Y
+
+    Args:
+        width: Размер по оси X
+        depth: Размер по оси Z
+        columns: Число ячеек по оси X (>= 1)
+        rows: Число ячеек по оси Z (>= 1)
+
+    Returns:
+        Mesh: Общая сетка для этих параметров
+
+    Raises:
+        ValueError: При некорректных параметрах
+    """
+    _check_size(width=width, depth=depth)
+    _check_resolution(columns=(columns, 1), rows=(rows, 1))
+    key = ('grid', float(width), float(depth), int(columns), int(rows))
+    return Mesh.cached(key, lambda: _build_grid(width, depth, int(columns), int(rows)))
+
+def _build_grid(width: float, depth: float, columns: int, rows: int) -> Mesh:
+    x = np.linspace(-width / 2.0, width / 2.0, columns + 1)
+    z = np.linspace(-depth / 2.0, depth / 2.0, rows + 1)
+    xs, zs = np.meshgrid(x, z)
+    vertices = np.stack([xs.ravel(), np.zeros(xs.size), zs.ravel()], axis=1)
+    normals = np.tile((0.0, 1.0, 0.0), (len(vertices), 1))
+    grid = np.arange(len(vertices)).reshape(rows + 1, columns + 1)
+    return Mesh.from_arrays(vertices, _quads(grid), vertex_normals=normals)
+
+class Sphere(Object3D):
+    """UV-сфера"""
+
+    def __init__(self, radius: float = 1.0, segments: int = 16, rings: int = 8, color: str = "#FFFFFF"):
+        super().__init__(color=color, mesh=uv_sphere_mesh(radius, segments, rings))
+
+class IcoSphere(Object3D):
+    """Икосфера"""
+
+    def __init__(self, radius: float = 1.0, subdivisions: int = 2, color: str = "#FFFFFF"):
+        super().__init__(color=color, mesh=icosphere_mesh(radius, subdivisions))
+
+class Cylinder(Object3D):
+    """Цилиндр вдоль оси Y"""
+
+    def __init__(self, radius: float = 0.5, height: float = 1.0, segments: int = 16, caps: bool = True,
+                 color: str = "#FFFFFF"):
+        super().__init__(color=color, mesh=cylinder_mesh(radius, height, segments, caps))
+        # Без торцов внутренняя поверхность видна
+        self.double_sided = not caps
+
+class Cone(Object3D):
+    """Конус вдоль оси Y"""
+
+    def __init__(self, radius: float = 0.5, height: float = 1.0, segments: int = 16, cap: bool = True,
+                 color: str = "#FFFFFF"):
+        super().__init__(color=color, mesh=cone_mesh(radius, height, segments, cap))
+        self.double_sided = not cap
+
+class Torus(Object3D):
+    """Тор в плоскости XZ"""
+
+    def __init__(self, major_radius: float = 1.0, minor_radius: float = 0.25, major_segments: int = 24,
+                 minor_segments: int = 12, color: str = "#FFFFFF"):
+        super().__init__(color=color, mesh=torus_mesh(major_radius, minor_radius,
+                                                      major_segments, minor_segments))
+
+class Grid(Object3D):
+    """Подразделенная плоскость в плоскости XZ"""
+
+    def __init__(self, width: float = 1.0, depth: float = 1.0, columns: int = 1, rows: int = 1,
+                 color: str = "#FFFFFF"):
+        super().__init__(color=color, mesh=grid_mesh(width, depth, columns, rows))
+        # Плоскость не замкнута, поэтому видна с обеих сторон
+        self.double_sided = True
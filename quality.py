@@ -0,0 +1,169 @@
+import logging
+from collections import deque
+from typing import List, Optional, Sequence, Tuple
+
+class QualityLevel:
+    """Набор настроек качества рендеринга
+
+    Attributes:
+        name: Название уровня
+        resolution_scale: Масштаб внутреннего разрешения кадра (0, 1]
+        shading: Режим затенения ('fragment' или 'flat')
+        max_lights: Максимальное число источников света (None — без ограничения)
+        lod_bias: Смещение уровня детализации (0 — наиболее детальный)
+    """
+
+    def __init__(self, name: str, resolution_scale: float = 1.0, shading: str = 'flat',
+                 max_lights: Optional[int] = None, lod_bias: int = 0):
+        self.name = name
+        self.resolution_scale = resolution_scale
+        self.shading = shading
+        self.max_lights = max_lights
+        self.lod_bias = lod_bias
+
+    def apply(self, renderer) -> None:
+        """Применение настроек уровня к рендереру"""
+        renderer.resolution_scale = self.resolution_scale
+        renderer.shading = self.shading
+        renderer.max_lights = self.max_lights
+        renderer.lod_bias = self.lod_bias
+
+    def __repr__(self):
+        return (f"QualityLevel({self.name!r}, scale={self.resolution_scale}, "
+                f"shading={self.shading!r}, max_lights={self.max_lights}, lod_bias={self.lod_bias})")
+
+# Уровни качества от наивысшего к наинизшему
+DEFAULT_LEVELS = (
+    QualityLevel('ultra', 1.0, 'fragment', None, 0),
+    QualityLevel('high', 1.0, 'flat', None, 0),
+    QualityLevel('medium', 1.0, 'flat', 2, 1),
+    QualityLevel('low', 0.75, 'flat', 1, 2),
+    QualityLevel('minimal', 0.5, 'flat', 1, 3),
+)
+
+class QualityGovernor:
+    """Регулятор качества рендеринга для удержания целевой частоты кадров
+
+    Следит за скользящим окном времен кадров. Если среднее время кадра
+    превышает бюджет (1 / target_fps) более чем в downgrade_ratio раз,
+    качество понижается на один уровень; если оно меньше бюджета в
+    upgrade_ratio раз — повышается.
+
+    Для защиты от колебаний используется гистерезис:
+    - пороги понижения и повышения разнесены
+    - после каждого изменения окно очищается, и следующее решение
+      принимается только по полному окну кадров нового уровня
+    - повышение требует более длинной серии кадров с запасом; если
+      повышение тут же пришлось отменить, требуемая серия удваивается
+
+    Attributes:
+        level: Индекс текущего уровня (0 — наивысшее качество)
+        reason: Причина последнего изменения уровня
+        changes: История изменений (номер кадра, старый уровень, новый уровень, причина)
+    """
+
+    def __init__(self, target_fps: float = 30.0, levels: Sequence[QualityLevel] = DEFAULT_LEVELS,
+                 window: int = 30, downgrade_ratio: float = 1.1, upgrade_ratio: float = 0.6,
+                 start_level: int = 1):
+        """Инициализация регулятора качества
+
+        Args:
+            target_fps: Целевая частота кадров
+            levels: Уровни качества от наивысшего к наинизшему
+            window: Размер окна усреднения времен кадров
+            downgrade_ratio: Доля бюджета кадра, выше которой качество понижается
+            upgrade_ratio: Доля бюджета кадра, ниже которой качество повышается
+            start_level: Начальный уровень
+
+        Raises:
+            ValueError: При некорректных параметрах
+        """
+        if target_fps <= 0:
+            raise ValueError("Target FPS must be positive")
+        if not levels:
+            raise ValueError("At least one quality level is required")
+        if window <= 0:
+            raise ValueError("Window must be positive")
+        if not 0 < upgrade_ratio < downgrade_ratio:
+            raise ValueError("Upgrade ratio must be below downgrade ratio")
+        self.logger = logging.getLogger(__name__)
+        self.levels: List[QualityLevel] = list(levels)
+        self.budget = 1.0 / target_fps
+        self.window = window
+        self.downgrade_ratio = downgrade_ratio
+        self.upgrade_ratio = upgrade_ratio
+        self.level = min(max(start_level, 0), len(self.levels) - 1)
+        self.reason = "initial"
+        self.changes: List[Tuple[int, int, int, str]] = []
+        self.frames = 0
+        self._times = deque(maxlen=window)
+        # Длина серии кадров с запасом, необходимая для повышения
+        self._upgrade_frames = 2 * window
+        self._headroom_frames = 0
+        self._last_upgrade_frame = None
+
+    @property
+    def current(self) -> QualityLevel:
+        """Текущий уровень качества"""
+        return self.levels[self.level]
+
+    def average(self) -> float:
+        """Среднее время кадра в окне (0, если кадров нет)"""
+        return sum(self._times) / len(self._times) if self._times else 0.0
+
+    def record_frame(self, frame_time: float) -> bool:
+        """Учет времени очередного кадра
+
+        Args:
+            frame_time: Время кадра в секундах
+
+        Returns:
+            bool: True, если уровень качества изменился
+        """
+        self.frames += 1
+        self._times.append(frame_time)
+        if self._last_upgrade_frame is not None \
+                and self.frames - self._last_upgrade_frame > 2 * self.window:
+            # Повышение удержалось — сбрасываем накопленную задержку
+            self._last_upgrade_frame = None
+            self._upgrade_frames = 2 * self.window
+        if len(self._times) < self.window:
+            return False
+
+        average = self.average()
+        if average > self.budget * self.downgrade_ratio:
+            self._headroom_frames = 0
+            if self.level < len(self.levels) - 1:
+                if self._last_upgrade_frame is not None \
+                        and self.frames - self._last_upgrade_frame <= 2 * self.window:
+                    # Повышение не удержалось: следующее потребует вдвое больше кадров
+                    self._upgrade_frames *= 2
+                return self._change(self.level + 1,
+                                    f"average frame {average * 1000:.1f}ms over budget "
+                                    f"{self.budget * 1000:.1f}ms")
+        elif average < self.budget * self.upgrade_ratio:
+            self._headroom_frames += 1
+            # Серия с запасом включает кадры, заполнившие окно
+            if self.level > 0 and self._headroom_frames + self.window - 1 >= self._upgrade_frames:
+                return self._change(self.level - 1,
+                                    f"average frame {average * 1000:.1f}ms under "
+                                    f"{self.upgrade_ratio:.0%} of budget {self.budget * 1000:.1f}ms",
+                                    upgrade=True)
+        else:
+            self._headroom_frames = 0
+        return False
+
+    def _change(self, level: int, reason: str, upgrade: bool = False) -> bool:
+        old = self.level
+        self.level = level
+        self.reason = reason
+        self.changes.append((self.frames, old, level, reason))
+        self._times.clear()
+        self._headroom_frames = 0
+        self._last_upgrade_frame = self.frames if upgrade else None
+        self.logger.info(f"Quality {self.levels[old].name} -> {self.current.name}: {reason}")
+        return True
+
+    def apply(self, renderer) -> None:
+        """Применение текущего уровня к рендереру"""
+        self.current.apply(renderer)
@@ -0,0 +1,271 @@
+from typing import List, Sequence, Tuple
+import numpy as np
+from framebuffer import plot_fragments
+
+# Максимальное число пикселей-кандидатов, обрабатываемых за один пакет
+DEFAULT_BATCH_PIXELS = 1 << 18
+
+def triangulate_faces(faces: Sequence[Sequence[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Разбиение многоугольных граней на треугольники веером
+
+    Грань (v0, v1, ..., vn) превращается в треугольники (v0, vi, vi+1),
+    порядок обхода вершин сохраняется.
+
+    Args:
+        faces: Список граней в виде кортежей индексов вершин
+            или массив граней одного размера (F, n)
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: массив треугольников (T, 3) и
+            индекс исходной грани для каждого треугольника (T,)
+    """
+    if len(faces) == 0:
+        return np.empty((0, 3), dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    if isinstance(faces, np.ndarray) and faces.ndim == 2:
+        arity = {faces.shape[1]}
+    else:
+        arity = {len(face) for face in faces}
+    if len(arity) == 1:
+        # Все грани одного размера: веер строится целиком на массивах
+        n = arity.pop()
+        if n < 3:
+            raise ValueError("Face must have at least 3 vertices")
+        polygons = np.asarray(faces, dtype=np.int64)
+        fan = np.arange(1, n - 1)
+        triangles = np.empty((len(polygons), n - 2, 3), dtype=np.int64)
+        triangles[:, :, 0] = polygons[:, :1]
+        triangles[:, :, 1] = polygons[:, fan]
+        triangles[:, :, 2] = polygons[:, fan + 1]
+        face_index = np.repeat(np.arange(len(polygons)), n - 2)
+        return triangles.reshape(-1, 3), face_index
+
+    triangles: List[Tuple[int, int, int]] = []
+    face_index: List[int] = []
+    for index, face in enumerate(faces):
+        if len(face) < 3:
+            raise ValueError("Face must have at least 3 vertices")
+        for i in range(1, len(face) - 1):
+            triangles.append((face[0], face[i], face[i + 1]))
+            face_index.append(index)
+    return np.array(triangles, dtype=np.int64), np.array(face_index, dtype=np.int64)
+
+class Fragments:
+    """Результат растеризации: набор фрагментов (пикселей) треугольников
+
+    Attributes:
+        x, y: Координаты пикселей на экране
+        depth: Интерполированная глубина в NDC
+        triangle: Индекс треугольника, породившего фрагмент
+        weights: Барицентрические координаты фрагмента (K, 3)
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, depth: np.ndarray,
+                 triangle: np.ndarray, weights: np.ndarray):
+        self.x = x
+        self.y = y
+        self.depth = depth
+        self.triangle = triangle
+        self.weights = weights
+
+    def __len__(self):
+        return len(self.x)
+
+    @staticmethod
+    def concatenate(parts: List['Fragments']) -> 'Fragments':
+        """Объединение нескольких наборов фрагментов"""
+        if not parts:
+            return Fragments(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64),
+                             np.empty(0), np.empty(0, dtype=np.int64), np.empty((0, 3)))
+        if len(parts) == 1:
+            return parts[0]
+        return Fragments(*(np.concatenate([getattr(p, name) for p in parts])
+                           for name in ('x', 'y', 'depth', 'triangle', 'weights')))
+
+def rasterize_triangles(screen_x: np.ndarray, screen_y: np.ndarray, depth: np.ndarray,
+                        width: int, height: int,
+                        batch_pixels: int = DEFAULT_BATCH_PIXELS,
+                        region: Tuple[int, int, int, int] = None) -> Fragments:
+    """Растеризация пакета треугольников в экранном пространстве
+
+    Для всех треугольников сразу вычисляются ограничивающие прямоугольники,
+    пиксели-кандидаты генерируются массивами, а принадлежность пикселя
+    треугольнику проверяется через функции ребер (edge functions).
+    Глубина интерполируется барицентрически для каждого пикселя.
+
+    Args:
+        screen_x: Координаты x вершин треугольников (T, 3)
+        screen_y: Координаты y вершин треугольников (T, 3)
+        depth: Глубина вершин в NDC (T, 3)
+        width: Ширина экрана
+        height: Высота экрана
+        batch_pixels: Ограничение числа кандидатов в одном пакете
+        region: Прямоугольник (x0, y0, x1, y1) экрана, которым ограничивается
+            растеризация (x1, y1 не включаются); по умолчанию весь экран
+
+    Returns:
+        Fragments: Фрагменты, покрытые треугольниками
+    """
+    screen_x = np.asarray(screen_x, dtype=np.float64).reshape(-1, 3)
+    screen_y = np.asarray(screen_y, dtype=np.float64).reshape(-1, 3)
+    depth = np.asarray(depth, dtype=np.float64).reshape(-1, 3)
+
+    x0, x1, x2 = screen_x.T
+    y0, y1, y2 = screen_y.T
+    area = (x1 - x0) * (y2 - y0) - (x2 - x0) * (y1 - y0)
+
+    left, top, right, bottom = region if region is not None else (0, 0, width, height)
+    # Пиксель покрыт, если его центр лежит внутри треугольника
+    min_x = np.maximum(np.ceil(screen_x.min(axis=1) - 0.5), left).astype(np.int64)
+    max_x = np.minimum(np.floor(screen_x.max(axis=1) - 0.5), right - 1).astype(np.int64)
+    min_y = np.maximum(np.ceil(screen_y.min(axis=1) - 0.5), top).astype(np.int64)
+    max_y = np.minimum(np.floor(screen_y.max(axis=1) - 0.5), bottom - 1).astype(np.int64)
+    box_width = max_x - min_x + 1
+    box_height = max_y - min_y + 1
+
+    candidates = (np.abs(area) > 1e-12) & (box_width > 0) & (box_height > 0)
+    triangles = np.nonzero(candidates)[0]
+    if not len(triangles):
+        return Fragments.concatenate([])
+
+    counts = box_width[triangles] * box_height[triangles]
+    ends = np.cumsum(counts)
+
+    parts = []
+    start = 0
+    while start < len(triangles):
+        # Набираем треугольники, пока пакет не превысит batch_pixels
+        offset = ends[start - 1] if start else 0
+        stop = int(np.searchsorted(ends, offset + batch_pixels, side='right'))
+        stop = max(stop, start + 1)
+        batch = triangles[start:stop]
+        parts.append(_rasterize_batch(batch, counts[start:stop], min_x, min_y, box_width,
+                                      x0, y0, x1, y1, x2, y2, area, depth))
+        start = stop
+
+    return Fragments.concatenate(parts)
+
+def _rasterize_batch(batch, counts, min_x, min_y, box_width,
+                     x0, y0, x1, y1, x2, y2, area, depth) -> Fragments:
+    """Растеризация одного пакета треугольников"""
+    total = int(counts.sum())
+    owner = np.repeat(np.arange(len(batch)), counts)
+    starts = np.cumsum(counts) - counts
+    local = np.arange(total) - starts[owner]
+    triangle = batch[owner]
+
+    row_width = box_width[triangle]
+    px = min_x[triangle] + local % row_width
+    py = min_y[triangle] + local // row_width
+    cx = px + 0.5
+    cy = py + 0.5
+
+    inv_area = 1.0 / area[triangle]
+    ax, ay = x0[triangle], y0[triangle]
+    bx, by = x1[triangle], y1[triangle]
+    qx, qy = x2[triangle], y2[triangle]
+    # Нормированные функции ребер — барицентрические координаты пикселя
+    w0 = ((bx - cx) * (qy - cy) - (qx - cx) * (by - cy)) * inv_area
+    w1 = ((qx - cx) * (ay - cy) - (ax - cx) * (qy - cy)) * inv_area
+    w2 = 1.0 - w0 - w1
+
+    inside = (w0 >= 0) & (w1 >= 0) & (w2 >= 0)
+    triangle = triangle[inside]
+    weights = np.stack((w0[inside], w1[inside], w2[inside]), axis=1)
+    z = np.einsum('ij,ij->i', weights, depth[triangle])
+    return Fragments(px[inside], py[inside], z, triangle, weights)
+
+def fragment_chars(depth: np.ndarray, codes: np.ndarray, char_table: np.ndarray) -> np.ndarray:
+    """Символы фрагментов по кодам треугольников
+
+    Args:
+        depth: Глубина фрагментов в NDC
+        codes: Коды символов треугольников для каждого фрагмента;
+            0 означает, что символ выбирается по глубине
+        char_table: Таблица символов на 256 уровней яркости
+
+    Returns:
+        np.ndarray: Коды символов фрагментов
+    """
+    by_depth = codes == 0
+    if not by_depth.any():
+        return codes
+    level = (np.clip((1.0 - depth[by_depth]) * 0.5, 0.0, 1.0) * 255.0).astype(np.uint8)
+    chars = codes.copy()
+    chars[by_depth] = char_table[level]
+    return chars
+
+def draw_triangles(char_buffer: np.ndarray, depth_buffer: np.ndarray,
+                   screen_x: np.ndarray, screen_y: np.ndarray, depth: np.ndarray,
+                   codes: np.ndarray, char_table: np.ndarray,
+                   region: Tuple[int, int, int, int] = None) -> int:
+    """Растеризация треугольников с записью в буферы символов и глубины
+
+    Args:
+        char_buffer: Буфер символов (height, width)
+        depth_buffer: Буфер глубины (height, width)
+        screen_x, screen_y, depth: Экранные координаты и глубина вершин (T, 3)
+        codes: Код символа каждого треугольника (T,), 0 — символ по глубине
+        char_table: Таблица символов на 256 уровней яркости
+        region: Прямоугольник экрана, которым ограничивается растеризация
+
+    Returns:
+        int: Количество записанных ячеек
+    """
+    height, width = depth_buffer.shape
+    fragments = rasterize_triangles(screen_x, screen_y, depth, width, height, region=region)
+    if not len(fragments):
+        return 0
+    chars = fragment_chars(fragments.depth, np.asarray(codes, dtype=np.uint8)[fragments.triangle],
+                           char_table)
+    return plot_fragments(char_buffer, depth_buffer, fragments.x, fragments.y,
+                          fragments.depth, chars)
+
+def clip_triangles_near(corners: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Отсечение треугольников ближней плоскостью в однородных координатах
+
+    Вершина лежит перед ближней плоскостью, если z + w >= 0 (координаты
+    отсечения). Треугольники целиком перед плоскостью сохраняются,
+    целиком за ней — отбрасываются. Треугольник с одной вершиной перед
+    плоскостью укорачивается, с двумя — превращается в четырехугольник
+    из двух треугольников. Порядок обхода вершин сохраняется.
+
+    Args:
+        corners: Вершины треугольников (T, 3, C): первые 4 компоненты —
+            координаты отсечения (x, y, z, w), остальные — атрибуты,
+            интерполируемые вдоль отсекаемых ребер
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: отсеченные треугольники (T', 3, C)
+            и индекс исходного треугольника для каждого из них (T',)
+    """
+    corners = np.asarray(corners, dtype=np.float64)
+    distance = corners[:, :, 2] + corners[:, :, 3]
+    inside = distance >= 0.0
+    count = inside.sum(axis=1)
+
+    parts = [corners[count == 3]]
+    sources = [np.nonzero(count == 3)[0]]
+
+    for kept in (1, 2):
+        index = np.nonzero(count == kept)[0]
+        if not len(index):
+            continue
+        # Поворот обхода: на первое место ставится единственная вершина
+        # перед плоскостью (kept == 1) или за ней (kept == 2)
+        lone = np.argmax(inside[index] if kept == 1 else ~inside[index], axis=1)
+        order = (lone[:, None] + np.arange(3)) % 3
+        a, b, c = np.moveaxis(np.take_along_axis(corners[index], order[:, :, None], axis=1), 1, 0)
+        da, db, dc = np.take_along_axis(distance[index], order, axis=1).T
+        # Точки пересечения ребер AB и CA с плоскостью
+        ab = a + (b - a) * (da / (da - db))[:, None]
+        ca = a + (c - a) * (da / (da - dc))[:, None]
+        if kept == 1:
+            parts.append(np.stack((a, ab, ca), axis=1))
+            sources.append(index)
+        else:
+            parts.append(np.stack((ab, b, c), axis=1))
+            parts.append(np.stack((ab, c, ca), axis=1))
+            sources.extend((index, index))
+
+    return np.concatenate(parts), np.concatenate(sources)
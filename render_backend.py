@@ -0,0 +1,154 @@
+import curses
+from typing import List, Tuple
+import numpy as np
+
+class RenderBackend:
+    """Базовый интерфейс устройства вывода для Renderer
+
+    Бэкенд сообщает размеры области вывода, принимает изменившиеся ячейки
+    кадра и завершает вывод кадра. Рендерер не обращается к устройству
+    вывода напрямую, поэтому один и тот же конвейер работает и в
+    терминале, и без него.
+    """
+
+    def initialize(self) -> None:
+        """Подготовка устройства вывода"""
+        pass
+
+    def size(self) -> Tuple[int, int]:
+        """Размеры области вывода (height, width)"""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Полная очистка области вывода"""
+        pass
+
+    def write(self, ys: np.ndarray, xs: np.ndarray, codes: np.ndarray) -> None:
+        """Запись изменившихся ячеек
+
+        Args:
+            ys: Номера строк ячеек
+            xs: Номера столбцов ячеек
+            codes: Коды символов ячеек
+        """
+        raise NotImplementedError
+
+    def present(self, framebuffer) -> None:
+        """Завершение вывода кадра
+
+        Args:
+            framebuffer: Буфер кадра, из которого были записаны ячейки
+        """
+        pass
+
+class CursesBackend(RenderBackend):
+    """Вывод кадра в окно curses"""
+
+    def __init__(self, screen):
+        """Инициализация бэкенда curses
+
+        Args:
+            screen: Окно curses для отрисовки
+
+        Raises:
+            ValueError: Если передан некорректный экран
+        """
+        if screen is None:
+            raise ValueError("Screen cannot be None")
+        self.screen = screen
+
+    def initialize(self) -> None:
+        """Инициализация цветовых пар терминала
+
+        Raises:
+            RuntimeError: Если терминал не поддерживает цвета
+        """
+        try:
+            if not curses.has_colors():
+                raise RuntimeError("Terminal does not support colors")
+            curses.start_color()
+            curses.use_default_colors()
+            for i in range(8):
+                try:
+                    curses.init_pair(i + 1, i, -1)
+                except curses.error as e:
+                    raise RuntimeError(f"Failed to initialize color pair {i}: {str(e)}")
+        except Exception as e:
+            raise RuntimeError(f"Color initialization failed: {str(e)}")
+
+    def size(self) -> Tuple[int, int]:
+        height, width = self.screen.getmaxyx()
+        return height, width
+
+    def clear(self) -> None:
+        self.screen.clear()
+
+    def write(self, ys: np.ndarray, xs: np.ndarray, codes: np.ndarray) -> None:
+        addch = self.screen.addch
+        for y, x, code in zip(ys.tolist(), xs.tolist(), codes.tolist()):
+            try:
+                addch(y, x, code)
+            except curses.error:
+                # Ignore errors when writing to the last cell
+                pass
+
+    def present(self, framebuffer) -> None:
+        self.screen.refresh()
+
+class MemoryBackend(RenderBackend):
+    """Вывод кадра в массивы NumPy без терминала
+
+    Используется для тестов, пакетного рендеринга и профилирования:
+    кадр сохраняется в массиве символов, а содержимое буфера глубины
+    копируется при выводе кадра.
+
+    Attributes:
+        chars: Символы выведенного кадра (height, width)
+        depth: Глубина выведенного кадра (height, width)
+        frames: Количество выведенных кадров
+        cells_written: Количество ячеек, записанных в последнем кадре
+    """
+
+    BLANK = ord(' ')
+
+    def __init__(self, width: int = 80, height: int = 24):
+        """Инициализация бэкенда в памяти
+
+        Args:
+            width: Ширина области вывода в символах
+            height: Высота области вывода в символах
+
+        Raises:
+            ValueError: При некорректных размерах
+        """
+        self.resize(width, height)
+        self.frames = 0
+        self.cells_written = 0
+
+    def resize(self, width: int, height: int) -> None:
+        """Изменение размеров области вывода (аналог изменения размеров терминала)"""
+        if width <= 0 or height <= 0:
+            raise ValueError("Invalid screen dimensions")
+        self.width = int(width)
+        self.height = int(height)
+        self.chars = np.full((self.height, self.width), self.BLANK, dtype=np.uint8)
+        self.depth = np.full((self.height, self.width), np.inf, dtype=np.float32)
+
+    def size(self) -> Tuple[int, int]:
+        return self.height, self.width
+
+    def clear(self) -> None:
+        self.chars.fill(self.BLANK)
+        self.depth.fill(np.inf)
+
+    def write(self, ys: np.ndarray, xs: np.ndarray, codes: np.ndarray) -> None:
+        self.chars[ys, xs] = codes
+        self.cells_written = len(codes)
+
+    def present(self, framebuffer) -> None:
+        np.copyto(self.depth, framebuffer.depth)
+        self.frames += 1
+
+    def lines(self) -> List[str]:
+        """Содержимое выведенного кадра в виде строк"""
+        return [bytes(row).decode('ascii') for row in self.chars]
@@ -1,85 +1,148 @@
 import math
 import curses
+from itertools import chain
 from typing import List, Tuple
+import numpy as np
+from framebuffer import FrameBuffer
+from render_backend import CursesBackend, RenderBackend
+from rasterizer import clip_triangles_near, draw_triangles, rasterize_triangles, triangulate_faces
+from parallel_raster import ParallelRasterizer
+from shading import FaceShadingCache, LightArrays, face_normals, shade, shade_diffuse, shade_specular
 from light import DirectionalLight
-from vector import Vector3
+from lod import DETAIL_SIZE, select_level
+from object import Object3D, update_transforms, update_world_vertices
+from scene import Scene
+from vector import Vector3, Vector3Array
 
 class Renderer:
     """Класс для рендеринга 3D сцены в консоли
 
     Отвечает за:
-    - Инициализацию экрана консоли
+    - Инициализацию устройства вывода (curses или буфер в памяти)
     - Отрисовку точек с учетом глубины и освещения 
+    - Растеризацию граней объектов с попиксельной интерполяцией глубины
+    - Пакетный расчет освещения граней и фрагментов от всех источников
+    - Буферизацию кадра с тестом глубины и выводом только изменившихся ячеек
     - Преобразование 3D координат в 2D координаты экрана
-    - Применение матриц преобразования к вершинам
+    - Отбрасывание объектов вне пирамиды видимости камеры
+    - Отсечение треугольников ближней плоскостью и отбрасывание нелицевых граней
+    - Пакетное применение матриц преобразования к вершинам (NumPy)
+    - Параллельную растеризацию кадра по экранным тайлам
     """
     
-    def __init__(self):
+    def __init__(self, backend: RenderBackend = None, parallel: bool = False,
+                 workers: int = None, min_triangles: float = None):
+        """Инициализация рендерера
+        
+        Args:
+            backend: Устройство вывода кадра. Если не задано, при вызове
+                initialize(screen) создается CursesBackend для окна curses.
+                Для рендеринга без терминала используется MemoryBackend.
+            parallel: Растеризовать кадр в нескольких процессах
+            workers: Количество процессов (по умолчанию число ядер)
+            min_triangles: Порог числа треугольников для параллельной
+                растеризации; None — измерить при initialize()
+        """
+        self.backend = backend
         self.screen = None
         self.width = 0
         self.height = 0
         self.ascii_chars = " .:-=+*#%@"  # Символы для отображения глубины
         self._initialized = False
+        self.framebuffer = None  # Буфер кадра с буфером глубины
         self.lights = []  # Список источников света
         self.ambient_intensity = 0.2  # Интенсивность фонового освещения
         self.specular_power = 32.0  # Степень отражения для specular подсветки
         self.specular_intensity = 0.5  # Интенсивность отражения
+        self.shading = 'flat'  # Режим затенения: 'flat' (по граням) или 'fragment'
+        self.face_cache = FaceShadingCache()  # Кэш фоновой и диффузной освещенности граней
+        self.specular_cache = FaceShadingCache()  # Кэш бликов граней (зависит от камеры)
+        self.frustum_culling = True  # Отбрасывать объекты вне поля зрения камеры
+        self.culled_objects = 0  # Количество отброшенных объектов в последнем кадре
+        self.backface_culling = True  # Отбрасывать грани, повернутые от камеры
+        self.resolution_scale = 1.0  # Масштаб внутреннего разрешения кадра
+        self.max_lights = None  # Ограничение числа источников света (None — все)
+        self.lod_bias = 0  # Смещение уровня детализации объектов
+        self.lod = True  # Выбирать уровень детализации сеток по размеру на экране
+        self.lod_detail_size = DETAIL_SIZE  # Размер на экране для полной детализации
+        self.lod_objects = 0  # Количество объектов с упрощенной сеткой в последнем кадре
+        self._output = None  # Буфер вывода при пониженном внутреннем разрешении
+        self._screen_size = None  # Размеры экрана (height, width)
+        self._output_version = 0  # Счетчик сбросов устройства вывода
+        self._last_frame_key = None  # Состояние, выведенное последним кадром
+        self._char_table = None  # Таблица символов по уровню освещенности
+        self._char_table_source = None
+        # Треугольники кадра с плоским затенением, растеризуемые одним пакетом
+        self._batch = []
+        self.parallel = ParallelRasterizer(workers, min_triangles=min_triangles) if parallel else None
         
-    def initialize(self, screen, lights: List = None) -> None:
+    def initialize(self, screen=None, lights: List = None) -> None:
         """Инициализация рендерера
         
         Args:
-            screen: Окно curses для отрисовки
+            screen: Окно curses для отрисовки. Не требуется, если бэкенд
+                был задан при создании рендерера
+            lights: Список источников света
             
         Raises:
             ValueError: Если передан некорректный экран
             RuntimeError: При ошибке инициализации
         """
-        if screen is None:
+        if screen is None and self.backend is None:
             raise ValueError("Screen cannot be None")
             
         try:
-            self.screen = screen
-            self.height, self.width = screen.getmaxyx()
+            if screen is not None:
+                self.screen = screen
+                if not isinstance(self.backend, CursesBackend) or self.backend.screen is not screen:
+                    self.backend = CursesBackend(screen)
+                    self._initialized = False
+            self.height, self.width = self.backend.size()
             
             if self.height <= 0 or self.width <= 0:
                 raise ValueError("Invalid screen dimensions")
+            self.framebuffer = FrameBuffer(self.width, self.height)
+            self._screen_size = (self.height, self.width)
+            # Порог параллельной растеризации измеряется до первого кадра,
+            # чтобы калибровка не увеличила время кадра
+            if self.parallel is not None and self.parallel.min_triangles is None:
+                self.parallel.calibrate(self.width, self.height)
+            self._output = None
                 
             if not self._initialized:
-                try:
-                    if not curses.has_colors():
-                        raise RuntimeError("Terminal does not support colors")
-                    curses.start_color()
-                    curses.use_default_colors()
-                    for i in range(8):
-                        try:
-                            curses.init_pair(i + 1, i, -1)
-                        except curses.error as e:
-                            raise RuntimeError(f"Failed to initialize color pair {i}: {str(e)}")
-                    self._initialized = True
-                except Exception as e:
-                    self._initialized = False
-                    raise RuntimeError(f"Color initialization failed: {str(e)}")
+                self.backend.initialize()
+                self._initialized = True
             self.lights = lights or []
+            self._output_version += 1
         except Exception as e:
             self._initialized = False
             raise RuntimeError(f"Failed to initialize renderer: {str(e)}")
         
     def clear(self) -> None:
-        """Очистка экрана"""
-        self.screen.clear()
+        """Очистка экрана
+        
+        После очистки следующий кадр будет выведен полностью.
+        """
+        self.backend.clear()
+        if self.framebuffer is not None:
+            self.framebuffer.invalidate()
+        self._output_version += 1
         
-    def draw_point(self, x: int, y: int, depth: float, normal: List[float], position: List[float], intensity: float = 1.0) -> None:
+    def draw_point(self, x: int, y: int, depth: float, normal: List[float] = None, position: List[float] = None, intensity: float = 1.0) -> None:
         """Отрисовка точки с учетом глубины и освещения
         
         Args:
             x: Координата x на экране
             y: Координата y на экране  
             depth: Глубина точки в диапазоне [-1, 1]
-            normal: Нормаль поверхности в точке [nx, ny, nz]
+            normal: Нормаль поверхности в точке [nx, ny, nz]. Если не задана,
+                освещение не рассчитывается и используется intensity
             position: Позиция точки в мировых координатах [x, y, z]
             intensity: Базовая интенсивность освещения [0, 1]
         
+        Точка записывается в буфер кадра с проверкой глубины и появляется
+        на экране при следующем выводе кадра (present).
+        
         Raises:
             RuntimeError: Если рендерер не инициализирован
         """
@@ -92,47 +155,24 @@ class Renderer:
         # Ensure depth is in [-1, 1] range
         depth = max(-1.0, min(1.0, depth))
             
-        # Calculate lighting from all sources
-        total_intensity = self.ambient_intensity  # Start with ambient light
-        
-        # Convert position and normal to Vector3 if they're lists
-        pos_vec = Vector3(*position) if isinstance(position, (list, tuple)) else position
-        normal_vec = Vector3(*normal) if isinstance(normal, (list, tuple)) else normal
-        normal_vec = normal_vec.normalize()
-        
-        for light in self.lights:
-            if hasattr(light, 'get_intensity'):
-                # Get light direction and intensity
-                light_dir = light.get_direction(pos_vec)
-                light_intensity = light.get_intensity(pos_vec)
-                
-                # Calculate diffuse lighting using normal
-                dot_product = normal_vec.dot(light_dir)
-                diffuse = max(0.0, dot_product) * light_intensity
-                
-                # Calculate specular reflection
-                reflection = (normal_vec.scale(2.0 * dot_product) - light_dir).normalize()
-                view_dir = Vector3(0, 0, 1)  # Assuming camera looks along Z axis
-                spec_dot = max(0.0, reflection.dot(view_dir))
-                specular = pow(spec_dot, self.specular_power) * self.specular_intensity
-                
-                total_intensity += (diffuse + specular) * intensity
-
-        # Clamp total intensity
-        total_intensity = min(1.0, max(0.0, total_intensity))
+        if normal is None:
+            # Точка без нормали (например, вершина) не освещается
+            total_intensity = intensity
+        else:
+            normals = np.array([[normal[0], normal[1], normal[2]]], dtype=np.float64)
+            normals /= max(np.linalg.norm(normals), 1e-12)
+            positions = np.zeros((1, 3)) if position is None else \
+                np.array([[position[0], position[1], position[2]]], dtype=np.float64)
+            view_dirs = np.array([[0.0, 0.0, 1.0]])  # Assuming camera looks along Z axis
+            total_intensity = shade(normals, positions, view_dirs, LightArrays(self.lights),
+                                    ambient_intensity=self.ambient_intensity,
+                                    specular_power=self.specular_power,
+                                    specular_intensity=self.specular_intensity,
+                                    scale=intensity)[0]
         
-        # Convert depth to [0, 1] range and combine with lighting
-        normalized_depth = (-depth + 1.0) * 0.5 * total_intensity
-        
-        # Convert depth to ASCII character index
-        char_index = min(int(normalized_depth * (len(self.ascii_chars) - 1)), 
-                        len(self.ascii_chars) - 1)
-        
-        try:
-            self.screen.addch(int(y), int(x), self.ascii_chars[char_index])
-        except curses.error:
-            # Ignore errors when writing to the last cell
-            pass
+        chars = self._depth_chars(np.array([depth]), total_intensity)
+        self._ensure_framebuffer()
+        self.framebuffer.plot([x], [y], [depth], chars)
             
     def add_light(self, light) -> None:
         """Add a light source to the renderer
@@ -146,10 +186,19 @@ class Renderer:
         """Рендеринг всей сцены
         
         Выполняет:
-        - Очистку экрана
-        - Получение матриц вида и проекции от камеры
-        - Преобразование координат вершин объектов
-        - Отрисовку всех видимых точек
+        - Очистку буфера кадра и буфера глубины
+        - Вычисление матрицы вида-проекции (один раз за кадр)
+        - Отбрасывание объектов, ограничивающий объем которых лежит
+          вне пирамиды видимости камеры (для Scene — запросом к иерархии
+          ограничивающих объемов сцены, затем точной проверкой)
+        - Выбор уровня детализации сеток по размеру объекта на экране
+        - Пакетное преобразование вершин каждого объекта
+        - Отсечение граней ближней плоскостью камеры и отбрасывание
+          нелицевых граней
+        - Растеризацию граней (объекты без граней рисуются вершинами)
+        - Расчет освещения граней или фрагментов
+        - Запись фрагментов в буфер кадра с тестом глубины
+        - Вывод на экран только изменившихся ячеек
         
         Args:
             scene: Сцена с объектами для рендеринга
@@ -158,67 +207,556 @@ class Renderer:
         Raises:
             RuntimeError: Если рендерер не инициализирован
         """
-        if not self.screen:
+        if not self._initialized or self.backend is None:
             raise RuntimeError("Renderer not initialized")
             
-        self.clear()
+        frame_key = self.frame_key(scene, camera)
+        self._ensure_framebuffer()
+        if self.parallel is not None:
+            self.parallel.bind(self.framebuffer)
+        self.framebuffer.clear()
         
+        self.face_cache.begin_frame()
+        self.specular_cache.begin_frame()
+        self._batch = []
+        self.culled_objects = 0
+        self.lod_objects = 0
         if scene and camera:
-            # Получаем матрицы преобразования
-            view_matrix = camera.get_view_matrix()
-            projection_matrix = camera.get_projection_matrix()
+            # Вершины умножаются как вектор-строки: clip = p * (P * V)^T
+            view_projection = self._view_projection(camera)
+            # Источники света упаковываются в массивы один раз за кадр
+            lights = LightArrays(self._active_lights())
+            eye = np.asarray(camera.position, dtype=np.float64)
+            planes = self._frustum_planes(camera) if self.frustum_culling else None
             
             # Рендерим каждый объект в сцене
             if hasattr(scene, 'objects'):
-                for obj in scene.objects:
-                    if hasattr(obj, 'vertices'):
-                        for vertex in obj.vertices:
-                            # Применяем матрицу вида
-                            view_pos = self._apply_matrix(vertex, view_matrix)
-                            # Применяем проекцию
-                            proj_pos = self._apply_matrix(view_pos, projection_matrix)
-                            
-                            # Преобразуем в экранные координаты
-                            if proj_pos[3] != 0:
-                                screen_x = int((proj_pos[0] / proj_pos[3] + 1.0) * self.width * 0.5)
-                                screen_y = int((1.0 - proj_pos[1] / proj_pos[3]) * self.height * 0.5)
-                                depth = (proj_pos[2] / proj_pos[3] + 1.0) * 0.5
-                                
-                                self.draw_point(screen_x, screen_y, depth)
-        
-        self.screen.refresh()
-        
-    def _apply_matrix(self, point, matrix: List[List[float]]) -> List[float]:
-        """Применение матричного преобразования к точке в однородных координатах
+                objects = [obj for obj in scene.objects if hasattr(obj, 'vertices')]
+                if planes is not None and isinstance(scene, Scene):
+                    # Группы объектов вне поля зрения отбрасываются по BVH сцены
+                    candidates = [obj for obj in scene.query_frustum(planes) if hasattr(obj, 'vertices')]
+                    self.culled_objects += len(objects) - len(candidates)
+                    objects = candidates
+                visible = []
+                for obj, model in zip(objects, self._model_matrices(objects, scene)):
+                    if planes is not None and self._outside_frustum(obj, model, planes):
+                        self.culled_objects += 1
+                        continue
+                    visible.append((obj, model))
+                detail = self._select_lods(visible, view_projection) if self.lod else {}
+                self.lod_objects = len(detail)
+                # Экземпляры общих сеток трансформируются одной пакетной операцией
+                update_world_vertices([obj for obj, _ in visible
+                                       if _has_object_transform(obj) and id(obj) not in detail])
+                for obj, model in visible:
+                    lod_mesh = detail.get(id(obj))
+                    if lod_mesh is not None:
+                        world = lod_mesh.transform_instances(obj.transform().data)[0]
+                        self._render_faces(obj, world, view_projection, lights, eye,
+                                           lod_mesh.triangles)
+                        continue
+                    if _has_faces(obj) and _has_object_transform(obj):
+                        # Мировые вершины кэшируются объектом до изменения трансформации
+                        world = obj.get_world_vertices()
+                        if len(world):
+                            self._render_faces(obj, world, view_projection, lights, eye)
+                        continue
+                    vertices = self._pack_vertices(obj.vertices)
+                    if not len(vertices):
+                        continue
+                    if _has_faces(obj):
+                        world = vertices @ model[:3, :3] + model[3, :3]
+                        self._render_faces(obj, world, view_projection, lights, eye)
+                    else:
+                        self._render_points(vertices, model @ view_projection)
+        self.face_cache.end_frame()
+        self.specular_cache.end_frame()
+        self._flush_batch()
+        
+        self.present()
+        self._last_frame_key = frame_key
+        
+    def frame_key(self, scene, camera) -> Tuple:
+        """Ключ наблюдаемого состояния кадра
+        
+        Объединяет ключи состояния сцены, камеры и источников света,
+        настройки рендерера и размеры области вывода. Если ключ совпадает
+        с ключом последнего выведенного кадра, кадр не изменится.
+        """
+        try:
+            size = self.backend.size() if self.backend is not None else None
+        except (TypeError, ValueError, curses.error):
+            size = None
+        return (_state_key(scene), _state_key(camera),
+                tuple(_state_key(light) for light in self.lights),
+                (self.ascii_chars, self.shading, self.ambient_intensity, self.specular_power,
+                 self.specular_intensity, self.frustum_culling, self.backface_culling,
+                 self.resolution_scale, self.max_lights, self.lod_bias, self.lod,
+                 self.lod_detail_size),
+                size, self._output_version)
+        
+    def needs_redraw(self, scene, camera) -> bool:
+        """Проверка, изменилось ли что-либо с момента вывода последнего кадра
+        
+        Returns:
+            bool: False, если сцена, камера, освещение, настройки и экран
+                  не изменились и кадр можно не перерисовывать
+        """
+        return self.frame_key(scene, camera) != self._last_frame_key
+        
+    def _render_points(self, vertices: np.ndarray, matrix: np.ndarray) -> None:
+        """Отрисовка вершин объекта точками"""
+        screen_x, screen_y, depth, visible = self.project_vertices(vertices, matrix)
+        depth = depth[visible]
+        self.framebuffer.plot(screen_x[visible], screen_y[visible],
+                              depth, self._depth_chars(depth))
+        
+    def _render_faces(self, obj, world: np.ndarray, view_projection: np.ndarray,
+                      lights: LightArrays, eye: np.ndarray, triangles: np.ndarray = None) -> None:
+        """Растеризация и освещение граней объекта
         
         Args:
-            point: Точка для преобразования (Vector3 или список из 3-4 координат)
-            matrix: Матрица преобразования 4x4
+            obj: Объект с гранями и коэффициентами материала
+            world: Вершины объекта в мировых координатах (N, 3)
+            view_projection: Матрица вида-проекции для вектор-строк
+            lights: Упакованные источники света кадра
+            eye: Позиция камеры в мировых координатах
+            triangles: Треугольники (M, 3) вместо граней объекта (уровень детализации)
+        """
+        if triangles is None:
+            mesh = getattr(obj, 'mesh', None)
+            triangles = mesh.triangles if mesh is not None else triangulate_faces(obj.faces)[0]
+        clip = self._clip_coords(world, view_projection)
+        # Отсечение ближней плоскостью; мировые координаты вершин
+        # интерполируются вместе с координатами отсечения
+        corners, source = clip_triangles_near(
+            np.concatenate((clip[triangles], world[triangles]), axis=2))
+        if not len(source):
+            return
+        screen_x, screen_y, depth, inv_w = self._to_screen(corners[:, :, :4])
+        
+        if self.backface_culling and not getattr(obj, 'double_sided', False):
+            front = self._front_facing(screen_x, screen_y)
+            if not front.all():
+                corners, source = corners[front], source[front]
+                screen_x, screen_y = screen_x[front], screen_y[front]
+                depth, inv_w = depth[front], inv_w[front]
+                if not len(source):
+                    return
             
-        Returns:
-            List[float]: Преобразованные координаты точки
+        if not len(lights):
+            # Без источников света яркость определяется глубиной (код 0)
+            self._batch.append((screen_x, screen_y, depth, np.zeros(len(source), dtype=np.uint8)))
+            return
             
-        Raises:
-            ValueError: При некорректной матрице или точке
-        """
-        if not matrix or len(matrix) != 4 or any(len(row) != 4 for row in matrix):
-            raise ValueError("Invalid transformation matrix")
+        normals = face_normals(world, triangles)
+        if getattr(obj, 'double_sided', False):
+            # Обратная сторона двусторонней грани освещается как лицевая
+            away = np.einsum('ij,ij->i', normals, eye - world[triangles[:, 0]]) < 0
+            normals[away] = -normals[away]
+        material = dict(ambient=getattr(obj, 'ambient', 0.1),
+                        diffuse=getattr(obj, 'diffuse', 0.7),
+                        specular=getattr(obj, 'specular', 0.3),
+                        ambient_intensity=self.ambient_intensity,
+                        specular_power=self.specular_power,
+                        specular_intensity=self.specular_intensity)
+        if self.shading == 'fragment':
+            fragments = rasterize_triangles(screen_x, screen_y, depth, self.width, self.height)
+            if not len(fragments):
+                return
+            # Перспективно-корректная интерполяция мировых координат
+            triangle = fragments.triangle
+            weights = fragments.weights * inv_w[triangle]
+            weights /= weights.sum(axis=1, keepdims=True)
+            positions = np.einsum('kj,kjc->kc', weights, corners[triangle, :, 4:7])
+            view_dirs = eye - positions
+            view_dirs /= np.maximum(np.linalg.norm(view_dirs, axis=1, keepdims=True), 1e-12)
+            intensity = shade(normals[source[triangle]], positions, view_dirs, lights, **material)
+            self.framebuffer.plot(fragments.x, fragments.y, fragments.depth,
+                                  self._intensity_chars(intensity))
+            return
             
-        # Handle Vector3 objects
-        if hasattr(point, 'x'):
-            point = [point.x, point.y, point.z, 1.0]
-        # Handle regular sequences
-        elif len(point) == 3:
-            point = [point[0], point[1], point[2], 1.0]
-        elif len(point) != 4:
-            raise ValueError("Point must have 3 or 4 coordinates")
+        centers = world[triangles].mean(axis=1)
+        key = (lights.key, tuple(sorted(material.items())))
+        
+        def compute(mask):
+            return shade_diffuse(normals[mask], centers[mask], lights, material['ambient'],
+                                 material['diffuse'], material['ambient_intensity'])
             
-        result = [0.0, 0.0, 0.0, 0.0]
-        for i in range(4):
-            result[i] = sum(point[j] * matrix[i][j] for j in range(4))
+        face_intensity = self.face_cache.get(id(obj), key, normals, centers, compute)
+        if material['specular'] * material['specular_intensity'] > 0:
+            # От положения камеры зависят только блики; они кэшируются отдельно,
+            # и движение камеры не сбрасывает фоновую и диффузную составляющие
+            def compute_specular(mask):
+                view_dirs = eye - centers[mask]
+                view_dirs /= np.maximum(np.linalg.norm(view_dirs, axis=1, keepdims=True), 1e-12)
+                return shade_specular(normals[mask], centers[mask], view_dirs, lights, material['specular'],
+                                      material['specular_power'], material['specular_intensity'])
+                
+            face_intensity = face_intensity + self.specular_cache.get(
+                id(obj), key + (tuple(eye),), normals, centers, compute_specular)
+        face_intensity = np.clip(face_intensity, 0.0, 1.0)
+        # Грань с плоским затенением рисуется одним символом
+        self._batch.append((screen_x, screen_y, depth,
+                            self._intensity_chars(face_intensity[source])))
+        
+    def _flush_batch(self) -> None:
+        """Растеризация накопленных за кадр треугольников
+        
+        Все треугольники кадра растеризуются одним пакетом — в нескольких
+        процессах, если включена параллельная растеризация.
+        """
+        batch, self._batch = self._batch, []
+        if not batch:
+            return
+        screen_x, screen_y, depth, codes = (np.concatenate(part) for part in zip(*batch))
+        # Таблица символов строится при первом обращении
+        self._intensity_chars(np.empty(0))
+        if self.parallel is not None:
+            self.parallel.rasterize(self.framebuffer, screen_x, screen_y, depth, codes,
+                                    self._char_table)
+        else:
+            draw_triangles(self.framebuffer.chars, self.framebuffer.depth, screen_x, screen_y,
+                           depth, codes, self._char_table)
             
-        # Prevent division by zero in projection
-        if abs(result[3]) < 1e-7:
-            result[3] = 1e-7
+    def close(self) -> None:
+        """Освобождение ресурсов рендерера (процессов растеризации)"""
+        if self.parallel is not None:
+            self.parallel.close()
+        
+    def present(self) -> int:
+        """Вывод кадра на экран
+        
+        На экран записываются только ячейки, изменившиеся с предыдущего
+        кадра, поэтому полная перерисовка терминала не требуется.
+        Кадр, построенный в пониженном разрешении, перед выводом
+        растягивается до размеров экрана.
+        
+        Returns:
+            int: Количество выведенных ячеек
+        """
+        output = self._upscale()
+        ys, xs, codes = output.swap()
+        self.backend.write(ys, xs, codes)
+        self.backend.present(output)
+        return len(codes)
+        
+    def _upscale(self) -> FrameBuffer:
+        """Буфер кадра в разрешении экрана
+        
+        При полном разрешении возвращается сам буфер кадра. Передний буфер
+        (уже выведенное содержимое) передается между буфером кадра и
+        буфером вывода при смене масштаба, поэтому вывод остается
+        разностным.
+        """
+        framebuffer = self._output_size_buffer()
+        if framebuffer is None:
+            if self._output is not None:
+                if self._output.front.shape == self.framebuffer.front.shape:
+                    np.copyto(self.framebuffer.front, self._output.front)
+                self._output = None
+            return self.framebuffer
+        rows = (np.arange(framebuffer.height) * self.framebuffer.height) // framebuffer.height
+        columns = (np.arange(framebuffer.width) * self.framebuffer.width) // framebuffer.width
+        framebuffer.chars[:] = self.framebuffer.chars[rows[:, None], columns[None, :]]
+        framebuffer.depth[:] = self.framebuffer.depth[rows[:, None], columns[None, :]]
+        return framebuffer
+        
+    def _output_size_buffer(self) -> FrameBuffer:
+        """Буфер вывода в разрешении экрана или None при полном разрешении"""
+        height, width = self._screen_size
+        if (width, height) == (self.framebuffer.width, self.framebuffer.height):
+            return None
+        if self._output is None:
+            self._output = FrameBuffer(width, height)
+        elif (self._output.width, self._output.height) != (width, height):
+            self._output.resize(width, height)
+        return self._output
+        
+    def _active_lights(self) -> List:
+        """Источники света кадра с учетом ограничения max_lights
+        
+        При ограничении используются самые яркие источники.
+        """
+        if self.max_lights is None or len(self.lights) <= self.max_lights:
+            return self.lights
+        ranked = sorted(self.lights, key=lambda light: getattr(light, 'intensity', 1.0),
+                        reverse=True)
+        return ranked[:max(self.max_lights, 0)]
+        
+    def _ensure_framebuffer(self) -> None:
+        """Создание или изменение размеров буфера кадра
+        
+        Размер буфера кадра равен размеру экрана, умноженному на
+        resolution_scale; width и height рендерера задают внутреннее
+        разрешение кадра.
+        """
+        screen = self._screen_size or (self.height, self.width)
+        if self.backend is not None:
+            try:
+                height, width = self.backend.size()
+                if height > 0 and width > 0:
+                    screen = (height, width)
+            except (TypeError, ValueError, curses.error):
+                pass
+        scale = min(max(float(self.resolution_scale), 0.01), 1.0)
+        self.height = max(1, int(round(screen[0] * scale)))
+        self.width = max(1, int(round(screen[1] * scale)))
+        
+        if self.framebuffer is None:
+            self.framebuffer = FrameBuffer(self.width, self.height)
+        elif (self.framebuffer.width, self.framebuffer.height) != (self.width, self.height):
+            if screen != self._screen_size:
+                # После изменения размеров терминала кадр выводится заново
+                self.framebuffer.resize(self.width, self.height)
+                self._output = None
+                if self.backend is not None:
+                    self.backend.clear()
+            else:
+                # Изменилось только внутреннее разрешение: выведенное
+                # содержимое экрана сохраняется в буфере вывода
+                if self._output is None:
+                    self._output = FrameBuffer(screen[1], screen[0])
+                    if self._output.front.shape == self.framebuffer.front.shape:
+                        np.copyto(self._output.front, self.framebuffer.front)
+                self.framebuffer.resize(self.width, self.height)
+        self._screen_size = screen
+        
+    def _intensity_chars(self, intensity: np.ndarray) -> np.ndarray:
+        """Коды символов ASCII-палитры для массива значений освещенности [0, 1]
+        
+        Используется заранее построенная таблица на 256 уровней, которая
+        пересоздается только при изменении ascii_chars.
+        """
+        if self._char_table_source != self.ascii_chars:
+            ramp = np.frombuffer(self.ascii_chars.encode('ascii'), dtype=np.uint8)
+            levels = np.linspace(0.0, 1.0, 256)
+            # Первый символ палитры (пробел) оставлен для пустых ячеек
+            index = 1 + np.minimum((levels * (len(ramp) - 1)).astype(np.int64), len(ramp) - 2)
+            self._char_table = ramp[index]
+            self._char_table_source = self.ascii_chars
+        level = (np.clip(intensity, 0.0, 1.0) * 255.0).astype(np.uint8)
+        return self._char_table[level]
+        
+    def _depth_chars(self, depth: np.ndarray, intensity=1.0) -> np.ndarray:
+        """Коды символов ASCII-палитры для глубины в NDC и освещенности"""
+        # Convert depth to [0, 1] range and combine with lighting
+        return self._intensity_chars((1.0 - np.clip(depth, -1.0, 1.0)) * 0.5 * intensity)
+        
+    def project_vertices(self, vertices: np.ndarray, matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Пакетное преобразование вершин в экранные координаты
+        
+        Все вершины преобразуются одним матричным умножением, после чего
+        за один проход выполняются перспективное деление и перевод в
+        координаты экрана.
+        
+        Args:
+            vertices: Массив вершин формы (N, 3) или (N, 4)
+            matrix: Матрица 4x4 (модель-вид-проекция) для вектор-строк
+            
+        Returns:
+            Tuple: экранные x и y (int), глубина в NDC [-1, 1] и маска
+                   вершин, попадающих на экран перед камерой
+        """
+        screen_x, screen_y, depth, in_front, _ = self._project(vertices, matrix)
+        screen_x = np.floor(screen_x).astype(np.int64)
+        screen_y = np.floor(screen_y).astype(np.int64)
+        visible = (in_front
+                   & (screen_x >= 0) & (screen_x < self.width)
+                   & (screen_y >= 0) & (screen_y < self.height))
+        return screen_x, screen_y, depth, visible
+        
+    def _project(self, vertices: np.ndarray, matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Преобразование вершин в непрерывные экранные координаты
+        
+        Returns:
+            Tuple: экранные x и y (float), глубина в NDC, маска вершин перед
+                   ближней плоскостью камеры и величина 1/w для
+                   перспективной интерполяции
+        """
+        clip = self._clip_coords(vertices, matrix)
+        # Вершина перед ближней плоскостью: z >= -w в координатах отсечения
+        in_front = clip[:, 2] + clip[:, 3] >= 0.0
+        screen_x, screen_y, depth, inv_w = self._to_screen(clip)
+        return screen_x, screen_y, depth, in_front, inv_w
+        
+    @staticmethod
+    def _clip_coords(vertices: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+        """Однородные координаты отсечения вершин (N, 4)"""
+        vertices = np.asarray(vertices, dtype=np.float64)
+        if vertices.shape[1] == 3:
+            homogeneous = np.empty((len(vertices), 4))
+            homogeneous[:, :3] = vertices
+            homogeneous[:, 3] = 1.0
+        else:
+            homogeneous = vertices
+        return homogeneous @ matrix
+        
+    def _to_screen(self, clip: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Перспективное деление и перевод координат отсечения (..., 4) на экран
+        
+        Для вершин за камерой (w <= 0) величина 1/w принимается равной нулю.
+        
+        Returns:
+            Tuple: экранные x и y, глубина в NDC и 1/w
+        """
+        w = clip[..., 3]
+        inv_w = np.divide(1.0, w, out=np.zeros_like(w), where=w > 1e-12)
+        screen_x = (clip[..., 0] * inv_w + 1.0) * self.width * 0.5
+        screen_y = (1.0 - clip[..., 1] * inv_w) * self.height * 0.5
+        return screen_x, screen_y, clip[..., 2] * inv_w, inv_w
+        
+    @staticmethod
+    def _front_facing(screen_x: np.ndarray, screen_y: np.ndarray) -> np.ndarray:
+        """Маска лицевых треугольников по направлению обхода на экране
+        
+        Грани задаются обходом по часовой стрелке при взгляде снаружи;
+        ось y экрана направлена вниз, поэтому у лицевых граней
+        ориентированная площадь на экране положительна.
+        """
+        x0, x1, x2 = screen_x.T
+        y0, y1, y2 = screen_y.T
+        return (x1 - x0) * (y2 - y0) - (x2 - x0) * (y1 - y0) > 0.0
+        
+    def _view_projection(self, camera) -> np.ndarray:
+        """Матрица вида-проекции камеры для вектор-строк
+        
+        Камера возвращает Matrix4 для вектор-столбцов (clip = P * V * p);
+        конвейер умножает вектор-строки, поэтому произведение транспонируется.
+        """
+        view = np.asarray(camera.get_view_matrix(), dtype=np.float64)
+        projection = np.asarray(camera.get_projection_matrix(), dtype=np.float64)
+        if view.shape != (4, 4) or projection.shape != (4, 4):
+            raise ValueError("Invalid transformation matrix")
+        return (projection @ view).T
+        
+    def _frustum_planes(self, camera) -> np.ndarray:
+        """Плоскости пирамиды видимости камеры (6, 4) или None, если недоступны"""
+        if not hasattr(camera, 'get_frustum_planes'):
+            return None
+        planes = np.asarray(camera.get_frustum_planes(), dtype=np.float64)
+        if planes.shape != (6, 4):
+            return None
+        return planes
+        
+    @staticmethod
+    def _outside_frustum(obj, model: np.ndarray, planes: np.ndarray) -> bool:
+        """Проверка, что объект целиком лежит вне пирамиды видимости
+        
+        Сначала проверяется ограничивающая сфера, затем параллелепипед
+        (AABB в локальных координатах, преобразованный матрицей модели).
+        Объект отбрасывается, если объем целиком лежит с внешней стороны
+        хотя бы одной плоскости.
+        
+        Args:
+            obj: Объект сцены (используется get_bounds())
+            model: Матрица модели для вектор-строк
+            planes: Плоскости пирамиды видимости (6, 4)
+        """
+        bounds = obj.get_bounds() if hasattr(obj, 'get_bounds') else None
+        if bounds is None:
+            return False
+        linear = model[:3, :3]
+        center = np.asarray(bounds.center, dtype=np.float64) @ linear + model[3, :3]
+        normals = planes[:, :3]
+        distance = normals @ center + planes[:, 3]
+        
+        # Масштаб сферы — наибольшая длина образа базисного вектора
+        radius = bounds.radius * np.linalg.norm(linear, axis=1).max()
+        if (distance < -radius).any():
+            return True
+        extent = np.abs(normals @ linear.T) @ np.asarray(bounds.half_extents, dtype=np.float64)
+        return bool((distance < -extent).any())
+        
+    def _select_lods(self, visible, view_projection: np.ndarray) -> dict:
+        """Выбор упрощенных сеток для видимых объектов
+        
+        Размер объекта на экране оценивается по ограничивающей сфере:
+        диаметр в символах равен 2 * r * f * height / (2 * w), где f —
+        масштаб проекции по оси Y, а w — глубина центра сферы. Объекты,
+        сфера которых пересекает плоскость камеры, рисуются с полной
+        детализацией.
+        
+        Args:
+            visible: Пары (объект, матрица модели) видимых объектов
+            view_projection: Матрица вида-проекции для вектор-строк
             
-        return result
\ No newline at end of file
+        Returns:
+            dict: Упрощенная сетка по id объекта (только для уровней > 0)
+        """
+        detail = {}
+        scale = np.linalg.norm(view_projection[:3, 1])
+        for obj, model in visible:
+            if not _has_object_transform(obj) or obj.mesh is None or obj.mesh.bounds is None:
+                continue
+            bounds = obj.mesh.bounds
+            linear = model[:3, :3]
+            center = np.asarray(bounds.center, dtype=np.float64) @ linear + model[3, :3]
+            radius = bounds.radius * np.linalg.norm(linear, axis=1).max()
+            w = center @ view_projection[:3, 3] + view_projection[3, 3]
+            if w <= radius:
+                continue
+            size = radius * scale * self.height / w
+            chain = obj.lod_chain
+            level = select_level(size, self.lod_bias, chain.max_levels, self.lod_detail_size)
+            if level > 0:
+                lod_mesh = chain.level(level)
+                if lod_mesh is not obj.mesh:
+                    detail[id(obj)] = lod_mesh
+        return detail
+        
+    def _model_matrices(self, objects, scene=None) -> List[np.ndarray]:
+        """Матрицы модели всех объектов кадра для вектор-строк
+        
+        Кэшированные матрицы объектов Object3D со стандартной трансформацией
+        обновляются одним векторным расчетом (для Scene — по хранилищу
+        трансформаций сцены); для остальных вызывается transform().
+        """
+        if isinstance(scene, Scene):
+            return [np.identity(4) if matrix is None else np.asarray(matrix.data, dtype=np.float64).T
+                    for matrix in scene.world_matrices(objects)]
+        models = [None] * len(objects)
+        batch = [i for i, obj in enumerate(objects) if _has_object_transform(obj)]
+        if batch:
+            for i, matrix in zip(batch, update_transforms([objects[i] for i in batch])):
+                models[i] = matrix.data.T
+        for i, obj in enumerate(objects):
+            if models[i] is None:
+                models[i] = self._model_matrix(obj)
+        return models
+        
+    def _model_matrix(self, obj) -> np.ndarray:
+        """Матрица модели объекта для вектор-строк
+        
+        Matrix4 хранит преобразование для вектор-столбцов, поэтому
+        для умножения вектор-строк матрица транспонируется.
+        """
+        if not hasattr(obj, 'transform'):
+            return np.identity(4)
+        return np.asarray(obj.transform().data, dtype=np.float64).T
+        
+    @staticmethod
+    def _pack_vertices(vertices) -> np.ndarray:
+        """Упаковка списка вершин (Vector3 или кортежей) в массив (N, 3)"""
+        if isinstance(vertices, Vector3Array):
+            return vertices.data
+        if isinstance(vertices, np.ndarray):
+            return vertices.reshape(-1, 3)
+        count = len(vertices)
+        coords = chain.from_iterable((v[0], v[1], v[2]) for v in vertices)
+        return np.fromiter(coords, dtype=np.float64, count=count * 3).reshape(count, 3)
+
+def _has_faces(obj) -> bool:
+    """Есть ли у объекта грани (список граней или массив треугольников)"""
+    faces = getattr(obj, 'faces', None)
+    return faces is not None and len(faces) > 0
+
+def _has_object_transform(obj) -> bool:
+    """Объект Object3D со стандартной (кэшируемой) трансформацией"""
+    return isinstance(obj, Object3D) and type(obj).transform is Object3D.transform
+
+def _state_key(item):
+    """Ключ состояния компонента (уникальный, если компонент его не предоставляет)"""
+    if item is not None and hasattr(item, 'state_key'):
+        return item.state_key()
+    return object()
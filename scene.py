@@ -1,49 +1,404 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
+import numpy as np
+from bvh import BVH, transform_boxes
+from object import Object3D, update_transforms
+from transform_store import TransformStore
+from vector import Matrix4
+from picking import RayHit
 
 class Scene:
     """Класс для управления объектами в 3D сцене
     
     Управляет коллекцией 3D объектов и источников света,
     обеспечивая добавление, удаление и обновление элементов сцены.
+    
+    Объекты хранятся по целочисленным дескрипторам (handle), которые не
+    меняются и не переиспользуются; добавление и удаление выполняются за
+    O(1), а порядок обхода objects совпадает с порядком добавления.
+    Положение, поворот и масштаб объектов Object3D переносятся в общее
+    хранилище transforms (непрерывные массивы), и мировые матрицы всех
+    изменившихся объектов пересчитываются одним векторным вызовом
+    (update_transforms). Объекты образуют иерархию (Object3D.parent):
+    add_object и remove_object добавляют и удаляют объект вместе со всеми
+    потомками, а мировые матрицы пересчитываются только в поддеревьях
+    изменившихся объектов.
+    
+    Пространственные запросы (query_frustum, query_aabb, query_sphere,
+    query_ray) используют иерархию ограничивающих объемов (BVH) над
+    мировыми AABB объектов. Иерархия строится при первом запросе после
+    изменения состава сцены; при перемещении объектов она уточняется
+    только для изменившихся объектов и перестраивается, когда качество
+    дерева заметно ухудшилось.
     """
     
     def __init__(self):
         """Инициализация пустой сцены
         
-        Создает пустые списки для хранения объектов и источников света
+        Создает пустые хранилища объектов, источников света и трансформаций
+        """
+        self._entities = {}  # Объекты по дескриптору (в порядке добавления)
+        self._handles = {}  # Дескриптор по id объекта
+        self._next_handle = 0
+        self._updaters = {}  # Методы update объектов по дескриптору
+        self._objects = None  # Кэш списка объектов
+        self._lights = {}  # Источники света по id (в порядке добавления)
+        self._light_list = None  # Кэш списка источников света
+        self.transforms = TransformStore()  # Трансформации объектов Object3D
+        self.version = 0   # Счетчик изменений состава сцены
+        self._index = None  # BVH над мировыми AABB объектов
+        self._index_version = None  # Версия сцены, для которой построен индекс
+        self._indexed = []  # Объекты в индексе (номер элемента BVH -> объект)
+        self._index_state = []  # (матрица, объем) объектов при последнем обновлении
+        self._unbounded = []  # Объекты без ограничивающего объема
+        self.index_rebuilds = 0  # Количество построений индекса
+        
+    @property
+    def objects(self) -> List:
+        """Список объектов в порядке добавления (изменять нельзя)"""
+        if self._objects is None:
+            self._objects = list(self._entities.values())
+        return self._objects
+        
+    @property
+    def lights(self) -> List:
+        """Список источников света в порядке добавления (изменять нельзя)"""
+        if self._light_list is None:
+            self._light_list = list(self._lights.values())
+        return self._light_list
+        
+    def add_object(self, obj) -> int:
+        """Добавление объекта в сцену вместе с его потомками
+        
+        Returns:
+            int: Дескриптор объекта (для уже добавленного — прежний)
+            
+        Raises:
+            ValueError: Если родителя объекта нет в сцене
         """
-        self.objects = []  # Список 3D объектов в сцене
-        self.lights = []   # Список источников света
+        handle = self._handles.get(id(obj))
+        if handle is not None:
+            return handle
+        parent = getattr(obj, 'parent', None)
+        if parent is not None and id(parent) not in self._handles:
+            raise ValueError("Parent object is not in the scene")
+        if isinstance(obj, Object3D):
+            for node in obj.traverse():
+                self._add_entity(node)
+        else:
+            self._add_entity(obj)
+        return self._handles[id(obj)]
         
-    def add_object(self, obj) -> None:
-        """Добавление объекта в сцену"""
-        self.objects.append(obj)
+    def _add_entity(self, obj) -> None:
+        if id(obj) in self._handles:
+            return
+        handle = self._next_handle
+        self._next_handle += 1
+        self._entities[handle] = obj
+        self._handles[id(obj)] = handle
+        update = getattr(obj, 'update', None)
+        if callable(update):
+            self._updaters[handle] = update
+        if _has_object_transform(obj) and obj._transform_store is None:
+            self.transforms.add(obj)
+        self._objects = None
+        self.version += 1
+        
+    def add_objects(self, objects) -> List[int]:
+        """Добавление набора объектов
+        
+        Returns:
+            List[int]: Дескрипторы объектов в том же порядке
+        """
+        return [self.add_object(obj) for obj in objects]
         
     def remove_object(self, obj) -> None:
-        """Удаление объекта из сцены"""
-        if obj in self.objects:
-            self.objects.remove(obj)
+        """Удаление объекта из сцены вместе с его потомками
+        
+        Объект отсоединяется от родителя; связи внутри удаленного
+        поддерева сохраняются.
+        """
+        if id(obj) not in self._handles:
+            return
+        if not isinstance(obj, Object3D):
+            self._remove_entity(obj)
+            return
+        if obj.parent is not None:
+            obj.set_parent(None)
+        # Потомки удаляются раньше родителей
+        for node in reversed(list(obj.traverse())):
+            self._remove_entity(node)
+            
+    def _remove_entity(self, obj) -> None:
+        handle = self._handles.pop(id(obj), None)
+        if handle is None:
+            return
+        del self._entities[handle]
+        self._updaters.pop(handle, None)
+        if getattr(obj, '_transform_store', None) is self.transforms:
+            self.transforms.remove(obj._transform_slot)
+        self._objects = None
+        self.version += 1
+        
+    def remove_objects(self, objects) -> None:
+        """Удаление набора объектов"""
+        for obj in objects:
+            self.remove_object(obj)
+            
+    def get_object(self, handle: int):
+        """Объект по дескриптору
+        
+        Raises:
+            KeyError: Если объекта с таким дескриптором нет в сцене
+        """
+        return self._entities[handle]
+        
+    def handle_of(self, obj) -> Optional[int]:
+        """Дескриптор объекта или None, если объект не в сцене"""
+        return self._handles.get(id(obj))
             
     def add_light(self, light) -> None:
         """Добавление источника света"""
-        if light not in self.lights:
-            self.lights.append(light)
+        if id(light) not in self._lights:
+            self._lights[id(light)] = light
+            self._light_list = None
+            self.version += 1
             
     def remove_light(self, light) -> None:
         """Удаление источника света"""
-        if light in self.lights:
-            self.lights.remove(light)
+        if self._lights.pop(id(light), None) is not None:
+            self._light_list = None
+            self.version += 1
             
     def get_lights(self) -> List:
         """Получение списка всех источников света"""
         return self.lights
         
     def update(self, delta_time: float) -> None:
-        """Обновление состояния сцены"""
-        for obj in self.objects:
-            if hasattr(obj, 'update'):
-                obj.update(delta_time)
+        """Обновление состояния сцены (вызов update() объектов, у которых он есть)"""
+        for update in list(self._updaters.values()):
+            update(delta_time)
                 
     def get_objects(self) -> List:
         """Получение списка всех объектов"""
-        return self.objects
\ No newline at end of file
+        return self.objects
+        
+    def set_transforms(self, handles, positions=None, rotations=None, scales=None) -> None:
+        """Пакетная запись трансформаций объектов
+        
+        Args:
+            handles: Дескрипторы объектов (K,)
+            positions: Положения (K, 3) или None
+            rotations: Углы Эйлера (K, 3) или None
+            scales: Масштабы (K, 3) или None
+            
+        Raises:
+            KeyError: Если дескриптора нет в сцене
+            ValueError: Если трансформация объекта не хранится в сцене
+        """
+        slots = self._slots(handles)
+        for array, values in ((self.transforms.positions, positions), (self.transforms.rotations, rotations),
+                              (self.transforms.scales, scales)):
+            if values is not None:
+                array[slots] = np.asarray(values, dtype=np.float64).reshape(-1, 3)
+        self.transforms.dirty[slots] = True
+        
+    def get_transforms(self, handles) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Положения, углы Эйлера и масштабы объектов (копии массивов (K, 3))
+        
+        Raises:
+            KeyError: Если дескриптора нет в сцене
+            ValueError: Если трансформация объекта не хранится в сцене
+        """
+        slots = self._slots(handles)
+        return (self.transforms.positions[slots], self.transforms.rotations[slots],
+                self.transforms.scales[slots])
+        
+    def _slots(self, handles) -> np.ndarray:
+        """Строки хранилища трансформаций по дескрипторам"""
+        slots = []
+        for handle in np.asarray(handles, dtype=np.intp).reshape(-1).tolist():
+            obj = self._entities[handle]
+            if getattr(obj, '_transform_store', None) is not self.transforms:
+                raise ValueError("Object transform is not stored in the scene")
+            slots.append(obj._transform_slot)
+        return np.array(slots, dtype=np.intp)
+        
+    def update_transforms(self) -> List:
+        """Пересчет мировых матриц объектов, трансформация которых изменилась
+        
+        Returns:
+            List: Объекты с пересчитанными матрицами
+        """
+        return self.transforms.update()
+        
+    def world_matrices(self, objects) -> List[Optional[Matrix4]]:
+        """Мировые матрицы объектов (None для объектов без transform())
+        
+        Матрицы объектов из хранилища сцены берутся из кэша после
+        векторного пересчета измененных строк; для остальных объектов
+        Object3D используется update_transforms, для прочих — transform().
+        """
+        self.transforms.update()
+        matrices = [None] * len(objects)
+        batch = []
+        for i, obj in enumerate(objects):
+            if getattr(obj, '_transform_store', None) is self.transforms:
+                matrices[i] = obj._world_matrix
+            elif _has_object_transform(obj):
+                batch.append(i)
+            elif hasattr(obj, 'transform'):
+                matrices[i] = obj.transform()
+        for i, matrix in zip(batch, update_transforms([objects[i] for i in batch])):
+            matrices[i] = matrix
+        return matrices
+        
+    def spatial_index(self) -> BVH:
+        """Иерархия ограничивающих объемов объектов, согласованная с их текущим положением
+        
+        Мировые матрицы объектов берутся из их кэша, поэтому мировые
+        AABB пересчитываются только для объектов, у которых изменилась
+        трансформация или ограничивающий объем.
+        
+        Returns:
+            BVH: Индекс, элемент i которого соответствует объекту _indexed[i]
+        """
+        if (self._index is None or self._index_version != self.version
+                or len(self.objects) != len(self._indexed) + len(self._unbounded)
+                or any(hasattr(obj, 'get_bounds') and obj.get_bounds() is not None
+                       for obj in self._unbounded)):
+            # Изменился состав сцены (в том числе прямым изменением списка objects)
+            self._rebuild_index()
+            return self._index
+        state = self._object_state(self._indexed)
+        changed = [i for i, (old, new) in enumerate(zip(self._index_state, state))
+                   if old[0] is not new[0] or old[1] is not new[1]]
+        if not changed:
+            return self._index
+        if any(state[i][1] is None for i in changed):
+            # Объект потерял ограничивающий объем: меняется состав индекса
+            self._rebuild_index()
+            return self._index
+        self._index_state = state
+        lower, upper = _world_boxes([state[i] for i in changed])
+        self._index.refit(changed, lower, upper)
+        if self._index.needs_rebuild():
+            self._index.rebuild()
+            self.index_rebuilds += 1
+        return self._index
+        
+    def _rebuild_index(self) -> None:
+        objects = [obj for obj in self.objects if hasattr(obj, 'get_bounds')]
+        state = self._object_state(objects)
+        bounded = [i for i, (_, bounds) in enumerate(state) if bounds is not None]
+        self._unbounded = [obj for obj in self.objects
+                           if not hasattr(obj, 'get_bounds') or obj.get_bounds() is None]
+        self._indexed = [objects[i] for i in bounded]
+        self._index_state = [state[i] for i in bounded]
+        self._index = BVH(*_world_boxes(self._index_state))
+        self._index_version = self.version
+        self.index_rebuilds += 1
+        
+    def _object_state(self, objects) -> List[Tuple]:
+        """Пары (мировая матрица, локальный объем) объектов"""
+        return [(matrix, obj.get_bounds()) for matrix, obj in zip(self.world_matrices(objects), objects)]
+        
+    def _select(self, items) -> List:
+        """Объекты по номерам элементов индекса в порядке списка objects"""
+        found = {id(self._indexed[i]) for i in items.tolist()}
+        return [obj for obj in self.objects if id(obj) in found]
+        
+    def query_frustum(self, planes) -> List:
+        """Объекты, мировой AABB которых не лежит целиком вне пирамиды видимости
+        
+        Объекты без ограничивающего объема возвращаются всегда.
+        
+        Args:
+            planes: Плоскости пирамиды видимости (6, 4), например Camera.get_frustum_planes()
+            
+        Returns:
+            List: Объекты в порядке списка objects
+        """
+        items = self.spatial_index().query_frustum(np.asarray(planes, dtype=np.float64))
+        found = {id(self._indexed[i]) for i in items.tolist()}
+        found.update(id(obj) for obj in self._unbounded)
+        return [obj for obj in self.objects if id(obj) in found]
+        
+    def query_aabb(self, minimum, maximum) -> List:
+        """Объекты, мировой AABB которых пересекает заданный параллелепипед"""
+        return self._select(self.spatial_index().query_aabb(minimum, maximum))
+        
+    def query_sphere(self, center, radius: float) -> List:
+        """Объекты, мировой AABB которых пересекает сферу"""
+        return self._select(self.spatial_index().query_sphere(center, radius))
+        
+    def query_ray(self, origin, direction, max_distance: float = float('inf')) -> List[Tuple[float, object]]:
+        """Объекты, мировой AABB которых пересекает луч
+        
+        Args:
+            origin: Начало луча
+            direction: Направление луча (расстояния измеряются в его длинах)
+            max_distance: Максимальное расстояние вдоль луча
+            
+        Returns:
+            List[Tuple[float, object]]: Пары (расстояние до AABB, объект) по возрастанию расстояния
+        """
+        items, distances = self.spatial_index().query_ray(origin, direction, max_distance)
+        return [(float(t), self._indexed[i]) for i, t in zip(items.tolist(), distances.tolist())]
+        
+    def raycast(self, origin, direction, max_distance: float = float('inf')) -> Optional[RayHit]:
+        """Ближайшее попадание луча в грани объектов сцены
+        
+        Объекты перебираются в порядке входа луча в их мировые AABB
+        (запрос к BVH сцены); перебор заканчивается, когда AABB
+        следующего объекта дальше найденного попадания.
+        
+        Args:
+            origin: Начало луча (например, из Camera.screen_to_ray)
+            direction: Направление луча (расстояния измеряются в его длинах)
+            max_distance: Максимальное расстояние вдоль луча
+            
+        Returns:
+            Optional[RayHit]: Объект, грань, треугольник и барицентрическая
+                точка попадания или None
+        """
+        best = None
+        for entry, obj in self.query_ray(origin, direction, max_distance):
+            if best is not None and entry > best.distance:
+                break
+            if not hasattr(obj, 'intersect_ray'):
+                continue
+            hit = obj.intersect_ray(origin, direction, max_distance if best is None else best.distance)
+            if hit is not None and (best is None or hit.distance < best.distance):
+                best = hit
+        return best
+        
+    def state_key(self) -> Tuple:
+        """Ключ наблюдаемого состояния сцены
+        
+        Составляется из счетчика изменений сцены и ключей состояния
+        объектов и источников света. Для элементов без state_key()
+        используется уникальное значение, поэтому такая сцена всегда
+        считается изменившейся.
+        """
+        return (self.version,
+                tuple(_state_key(obj) for obj in self.objects),
+                tuple(_state_key(light) for light in self.lights))
+
+def _has_object_transform(obj) -> bool:
+    """Объект Object3D со стандартной (кэшируемой) трансформацией"""
+    return isinstance(obj, Object3D) and type(obj).transform is Object3D.transform
+
+def _world_boxes(state) -> Tuple[np.ndarray, np.ndarray]:
+    """Мировые AABB по парам (матрица, локальный объем)"""
+    if not state:
+        return np.empty((0, 3)), np.empty((0, 3))
+    matrices = np.array([np.identity(4) if matrix is None else np.asarray(matrix.data, dtype=np.float64)
+                         for matrix, _ in state])
+    return transform_boxes([bounds.minimum for _, bounds in state],
+                           [bounds.maximum for _, bounds in state], matrices)
+
+def _state_key(item):
+    """Ключ состояния элемента сцены (уникальный, если элемент его не предоставляет)"""
+    if hasattr(item, 'state_key'):
+        return item.state_key()
+    return object()
@@ -0,0 +1,529 @@
+import os
+import mmap
+import logging
+from collections.abc import Sequence
+from itertools import chain, islice
+from typing import List, Optional, Tuple
+import numpy as np
+from camera import Camera
+from light import DirectionalLight, Light
+from mesh import Bounds, Mesh
+from object import Object3D
+from rasterizer import triangulate_faces
+from scene import Scene
+from shading import face_normals
+from vector import Quaternion, Vector3, Vector3Array
+
+logger = logging.getLogger(__name__)
+
+# Снимок сцены: заголовок, таблицы объектов, источников света и
+# геометрии, затем массивы геометрии. Все разделы выровнены по ALIGNMENT
+# байт, числа записаны в порядке little-endian.
+SCENE_MAGIC = b'SCENEBIN'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+# Число записей или строк массива, преобразуемых за один раз при сохранении
+CHUNK_SIZE = 1 << 16
+
+_HEADER = np.dtype([
+    ('magic', 'S8'),
+    ('version', '<u4'),
+    ('alignment', '<u4'),
+    ('object_count', '<i8'),
+    ('light_count', '<i8'),
+    ('geometry_count', '<i8'),
+    ('objects_offset', '<i8'),
+    ('lights_offset', '<i8'),
+    ('geometries_offset', '<i8'),
+    ('file_size', '<i8'),
+    ('has_camera', 'u1'),
+    ('camera_position', '<f8', (3,)),
+    ('camera_target', '<f8', (3,)),
+    ('camera_up', '<f8', (3,)),
+    ('camera_fov', '<f8'),
+    ('camera_aspect', '<f8'),
+    ('camera_near', '<f8'),
+    ('camera_far', '<f8'),
+])
+
+# Трансформация относительно родителя, материал и ссылки на родителя и
+# геометрию (номера в таблицах, -1 — нет)
+_OBJECT = np.dtype([
+    ('parent', '<i8'),
+    ('geometry', '<i8'),
+    ('position', '<f8', (3,)),
+    ('rotation', '<f8', (3,)),
+    ('scale', '<f8', (3,)),
+    ('orientation', '<f8', (4,)),
+    ('oriented', 'u1'),
+    ('double_sided', 'u1'),
+    ('color', 'S32'),
+    ('ambient', '<f8'),
+    ('diffuse', '<f8'),
+    ('specular', '<f8'),
+])
+
+_LIGHT_KINDS = (Light, DirectionalLight)
+_LIGHT = np.dtype([
+    ('kind', 'u1'),
+    ('position', '<f8', (3,)),
+    ('direction', '<f8', (3,)),
+    ('intensity', '<f8'),
+    ('color', 'S32'),
+])
+
+# Смещения массивов сетки в файле (-1 — массива нет)
+_GEOMETRY = np.dtype([
+    ('vertex_count', '<i8'),
+    ('triangle_count', '<i8'),
+    ('index_size', '<i8'),
+    ('face_count', '<i8'),
+    ('face_index_count', '<i8'),
+    ('vertices', '<i8'),
+    ('triangles', '<i8'),
+    ('triangle_faces', '<i8'),
+    ('normals', '<i8'),
+    ('vertex_normals', '<i8'),
+    ('face_sizes', '<i8'),
+    ('face_indices', '<i8'),
+    ('has_bounds', 'u1'),
+    ('bounds_min', '<f8', (3,)),
+    ('bounds_max', '<f8', (3,)),
+    ('bounds_center', '<f8', (3,)),
+    ('bounds_radius', '<f8'),
+])
+
+def save_scene(path: str, scene: Scene, camera: Optional[Camera] = None) -> None:
+    """Сохранение сцены в бинарный снимок
+
+    Записываются трансформации, материалы и иерархия объектов, источники
+    света, камера и геометрия (сетка, общая для нескольких объектов,
+    записывается один раз). Запись потоковая: массивы геометрии пишутся
+    в файл напрямую из сеток, собственная геометрия объектов
+    преобразуется порциями без создания временной сетки, таблица
+    объектов формируется порциями, а таблицы смещений дописываются в
+    заголовок в конце. Файл записывается через временный, чтобы не
+    оставить частичный снимок.
+
+    Args:
+        path: Путь к файлу снимка
+        scene: Сцена
+        camera: Камера или None
+
+    Raises:
+        ValueError: Если объект сцены не Object3D, тип источника света не
+            поддерживается, цвет не помещается в запись или грань объекта
+            некорректна
+        OSError: Если файл не удается записать
+    """
+    objects = _ordered_objects(scene)
+    lights = list(scene.lights)
+    for light in lights:
+        if type(light) not in _LIGHT_KINDS:
+            raise ValueError(f"Unsupported light type: {type(light).__name__}")
+    # Номера геометрии: сетка или объект с собственными вершинами
+    sources = []
+    numbers = {}
+    geometry = np.full(len(objects), -1, dtype=np.int64)
+    for i, obj in enumerate(objects):
+        source = obj.mesh if obj.mesh is not None else obj if len(obj.vertices) else None
+        if source is not None:
+            geometry[i] = numbers.setdefault(id(source), len(sources))
+            if geometry[i] == len(sources):
+                sources.append(source)
+
+    header = np.zeros(1, dtype=_HEADER)
+    header['magic'] = SCENE_MAGIC
+    header['version'] = FORMAT_VERSION
+    header['alignment'] = ALIGNMENT
+    header['object_count'] = len(objects)
+    header['light_count'] = len(lights)
+    header['geometry_count'] = len(sources)
+    if camera is not None:
+        header['has_camera'] = 1
+        for name in ('position', 'target', 'up'):
+            header['camera_' + name] = getattr(camera, name)
+        for name in ('fov', 'aspect', 'near', 'far'):
+            header['camera_' + name] = getattr(camera, name)
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(header)
+            header['objects_offset'] = _align(f)
+            slots = {id(obj): i for i, obj in enumerate(objects)}
+            for start in range(0, len(objects), CHUNK_SIZE):
+                f.write(_object_records(objects[start:start + CHUNK_SIZE], slots,
+                                        geometry[start:start + CHUNK_SIZE]))
+            header['lights_offset'] = _align(f)
+            f.write(_light_records(lights))
+            header['geometries_offset'] = _align(f)
+            table = np.zeros(len(sources), dtype=_GEOMETRY)
+            f.write(table)
+            for i, source in enumerate(sources):
+                if isinstance(source, Mesh):
+                    table[i] = _write_geometry(f, source)
+                else:
+                    table[i] = _write_object_geometry(f, source)
+            header['file_size'] = f.tell()
+            f.seek(int(header['geometries_offset'][0]))
+            f.write(table)
+            f.seek(0)
+            f.write(header)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def load_scene(path: str) -> Tuple[Scene, Optional[Camera]]:
+    """Загрузка сцены из бинарного снимка
+
+    Файл отображается в память (mmap) целиком, и массивы геометрии
+    становятся представлениями отображения без копирования: при открытии
+    читаются только заголовок и таблицы, а данные сеток подгружаются
+    системой при первом обращении к ним. Массивы сеток доступны только
+    для чтения.
+
+    Args:
+        path: Путь к файлу снимка
+
+    Returns:
+        Tuple[Scene, Optional[Camera]]: Сцена и камера (None, если камера
+            не сохранялась)
+
+    Raises:
+        ValueError: Если файл не является снимком сцены, его версия не
+            поддерживается или файл поврежден
+        OSError: Если файл не удается прочитать
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < _HEADER.itemsize:
+            raise ValueError("Not a scene snapshot")
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    header = np.frombuffer(buffer, dtype=_HEADER, count=1)[0]
+    if header['magic'] != SCENE_MAGIC:
+        raise ValueError("Not a scene snapshot")
+    if not 1 <= header['version'] <= FORMAT_VERSION:
+        raise ValueError(f"Unsupported scene snapshot version: {int(header['version'])}")
+    if header['file_size'] != len(buffer):
+        raise ValueError("Truncated scene snapshot")
+
+    table = _view(buffer, header['geometries_offset'], _GEOMETRY, (int(header['geometry_count']),))
+    meshes = [_read_geometry(buffer, record) for record in table]
+    records = _view(buffer, header['objects_offset'], _OBJECT, (int(header['object_count']),))
+    scene = Scene()
+    objects = _build_objects(records, meshes)
+    for obj in objects:
+        if obj.parent is None:
+            scene.add_object(obj)
+    for light in _build_lights(_view(buffer, header['lights_offset'], _LIGHT, (int(header['light_count']),))):
+        scene.add_light(light)
+
+    camera = None
+    if header['has_camera']:
+        camera = Camera(position=tuple(header['camera_position'].tolist()),
+                        target=tuple(header['camera_target'].tolist()),
+                        up=tuple(header['camera_up'].tolist()),
+                        fov=float(header['camera_fov']), aspect=float(header['camera_aspect']),
+                        near=float(header['camera_near']), far=float(header['camera_far']))
+    logger.info(f"Loaded scene {path}: {len(objects)} objects, {len(meshes)} meshes")
+    return scene, camera
+
+def _ordered_objects(scene: Scene) -> List[Object3D]:
+    """Объекты сцены в прямом порядке обхода иерархии (родитель раньше детей)"""
+    objects = []
+    for obj in scene.objects:
+        if not isinstance(obj, Object3D):
+            raise ValueError(f"Cannot save scene object of type {type(obj).__name__}")
+        if obj.parent is None:
+            objects.extend(obj.traverse())
+    return objects
+
+def _encode_color(color: str) -> bytes:
+    encoded = color.encode('ascii')
+    if len(encoded) > 32:
+        raise ValueError(f"Color value is too long: {color!r}")
+    return encoded
+
+def _object_records(objects: List[Object3D], slots: dict, geometry: np.ndarray) -> np.ndarray:
+    """Порция записей таблицы объектов"""
+    records = np.zeros(len(objects), dtype=_OBJECT)
+    records['geometry'] = geometry
+    records['parent'] = [-1 if obj.parent is None else slots[id(obj.parent)] for obj in objects]
+    records['position'] = [tuple(obj.position) for obj in objects]
+    records['rotation'] = [tuple(obj.rotation) for obj in objects]
+    records['scale'] = [tuple(obj.scale) for obj in objects]
+    for i, obj in enumerate(objects):
+        if obj.orientation is not None:
+            records['orientation'][i] = tuple(obj.orientation)
+            records['oriented'][i] = 1
+    records['double_sided'] = [obj.double_sided for obj in objects]
+    records['color'] = [_encode_color(obj.color) for obj in objects]
+    for name in ('ambient', 'diffuse', 'specular'):
+        records[name] = [getattr(obj, name) for obj in objects]
+    return records
+
+def _light_records(lights: List[Light]) -> np.ndarray:
+    records = np.zeros(len(lights), dtype=_LIGHT)
+    for i, light in enumerate(lights):
+        records['kind'][i] = _LIGHT_KINDS.index(type(light))
+        records['position'][i] = tuple(light.position)
+        if isinstance(light, DirectionalLight):
+            records['direction'][i] = tuple(light.direction)
+        records['intensity'][i] = light.intensity
+        records['color'][i] = _encode_color(light.color)
+    return records
+
+def _align(f) -> int:
+    """Дополнение файла нулями до границы ALIGNMENT; возвращает новое смещение"""
+    padding = -f.tell() % ALIGNMENT
+    if padding:
+        f.write(b'\0' * padding)
+    return f.tell()
+
+def _write_array(f, array, dtype) -> int:
+    """Запись массива в выровненный раздел
+    
+    Непрерывный массив нужного типа пишется без копирования, остальные
+    преобразуются порциями по CHUNK_SIZE строк.
+    """
+    offset = _align(f)
+    array = np.asarray(array)
+    if array.dtype == np.dtype(dtype) and array.flags.c_contiguous:
+        f.write(array)
+    else:
+        for start in range(0, len(array), CHUNK_SIZE):
+            f.write(np.ascontiguousarray(array[start:start + CHUNK_SIZE], dtype=dtype))
+    return offset
+
+def _index_type(vertex_count: int, triangle_count: int) -> np.dtype:
+    return np.dtype('<i4') if vertex_count < 2 ** 31 and triangle_count < 2 ** 31 else np.dtype('<i8')
+
+def _bounds_fields(bounds: Optional[Bounds]) -> tuple:
+    """Поля ограничивающего объема в записи таблицы геометрии"""
+    if bounds is None:
+        zero = (0.0, 0.0, 0.0)
+        return False, zero, zero, zero, 0.0
+    return True, bounds.minimum, bounds.maximum, bounds.center, bounds.radius
+
+def _write_geometry(f, mesh: Mesh) -> tuple:
+    """Запись массивов сетки; возвращает запись таблицы геометрии"""
+    triangles = mesh.triangles
+    index_type = _index_type(len(mesh.vertices), len(triangles))
+    vertices = _write_array(f, mesh.vertices.data, '<f8')
+    triangle_offset = _write_array(f, triangles, index_type)
+    triangle_faces = _write_array(f, mesh.triangle_faces, index_type)
+    normals = _write_array(f, mesh.normals, '<f8')
+    vertex_normals = -1 if mesh.vertex_normals is None else _write_array(f, mesh.vertex_normals, '<f8')
+    face_count = face_index_count = 0
+    face_sizes = face_indices = -1
+    if isinstance(mesh.faces, _PolygonFaces):
+        # Грани загруженной сетки переписываются без декодирования
+        face_count, face_index_count = len(mesh.faces.sizes), len(mesh.faces.indices)
+        face_sizes = _write_array(f, mesh.faces.sizes, '<i8')
+        face_indices = _write_array(f, mesh.faces.indices, '<i8')
+    elif not isinstance(mesh.faces, np.ndarray):
+        # Многоугольные грани: размеры граней и их индексы подряд
+        sizes = np.fromiter((len(face) for face in mesh.faces), dtype=np.int64, count=len(mesh.faces))
+        face_count, face_index_count = len(sizes), int(sizes.sum())
+        face_sizes = _write_array(f, sizes, '<i8')
+        face_indices = _align(f)
+        faces = iter(mesh.faces)
+        for start in range(0, face_count, CHUNK_SIZE):
+            chunk = islice(faces, CHUNK_SIZE)
+            count = int(sizes[start:start + CHUNK_SIZE].sum())
+            f.write(np.fromiter(chain.from_iterable(chunk), dtype='<i8', count=count))
+    return (len(mesh.vertices), len(triangles), index_type.itemsize, face_count, face_index_count,
+            vertices, triangle_offset, triangle_faces, normals, vertex_normals, face_sizes,
+            face_indices) + _bounds_fields(mesh.bounds)
+
+def _write_object_geometry(f, obj: Object3D) -> tuple:
+    """Потоковая запись собственной геометрии объекта; возвращает запись таблицы геометрии
+
+    Вершины записываются порциями с расчетом ограничивающего объема.
+    Разделы треугольников, нормалей и граней размещаются заранее по
+    размерам граней, поэтому каждая порция граней разбивается веером и
+    записывается во все разделы за один проход, без временной сетки с
+    копией геометрии.
+
+    Raises:
+        ValueError: Если грань содержит меньше трех вершин или ссылается
+            на несуществующую вершину
+    """
+    vertices, faces = obj.vertices, obj.faces
+    if isinstance(vertices, Vector3Array):
+        vertices = vertices.data
+    # Нормалям нужен произвольный доступ к вершинам: массив (N, 3) float64
+    # используется напрямую, а вершины-векторы собираются в один массив
+    if isinstance(vertices, np.ndarray):
+        points = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+    else:
+        points = np.empty((len(vertices), 3))
+    if isinstance(faces, np.ndarray) and faces.ndim == 2:
+        sizes = np.full(len(faces), faces.shape[1], dtype=np.int64)
+    else:
+        sizes = np.fromiter((len(face) for face in faces), dtype=np.int64, count=len(faces))
+    if len(sizes) and sizes.min() < 3:
+        raise ValueError("Face must have at least 3 vertices")
+    n, face_count, face_index_count = len(points), len(sizes), int(sizes.sum())
+    t = face_index_count - 2 * face_count
+    index_type = _index_type(n, t)
+
+    vertex_offset = _align(f)
+    low, high = np.full(3, np.inf), np.full(3, -np.inf)
+    for start in range(0, n, CHUNK_SIZE):
+        chunk = points[start:start + CHUNK_SIZE]
+        if not isinstance(vertices, np.ndarray):
+            part = vertices[start:start + CHUNK_SIZE]
+            chunk[:] = np.fromiter(chain.from_iterable(part), dtype='<f8', count=3 * len(part)).reshape(-1, 3)
+        f.write(np.ascontiguousarray(chunk, dtype='<f8'))
+        low, high = np.minimum(low, chunk.min(axis=0)), np.maximum(high, chunk.max(axis=0))
+    center = (low + high) * 0.5
+    radius = max(float(((points[start:start + CHUNK_SIZE] - center) ** 2).sum(axis=1).max())
+                 for start in range(0, n, CHUNK_SIZE))
+    bounds = Bounds(tuple(low.tolist()), tuple(high.tolist()), tuple(center.tolist()), float(np.sqrt(radius)))
+
+    # Треугольники, их грани, нормали, размеры граней и индексы граней
+    offsets = []
+    end = f.tell()
+    for size in (t * 3 * index_type.itemsize, t * index_type.itemsize, t * 3 * 8,
+                 face_count * 8, face_index_count * 8):
+        end += -end % ALIGNMENT
+        offsets.append(end)
+        end += size
+    cursors = list(offsets)
+    for start in range(0, face_count, CHUNK_SIZE):
+        chunk = faces[start:start + CHUNK_SIZE]
+        triangles, triangle_faces = triangulate_faces(chunk)
+        if not 0 <= triangles.min() <= triangles.max() < n:
+            raise ValueError("Face refers to a vertex outside the mesh")
+        chunk_sizes = sizes[start:start + CHUNK_SIZE]
+        arrays = (triangles.astype(index_type), (triangle_faces + start).astype(index_type),
+                  face_normals(points, triangles).astype('<f8'), chunk_sizes.astype('<i8'),
+                  np.fromiter(chain.from_iterable(chunk), dtype='<i8', count=int(chunk_sizes.sum())))
+        for i, array in enumerate(arrays):
+            f.seek(cursors[i])
+            f.write(array)
+            cursors[i] += array.nbytes
+    f.seek(end)
+    f.truncate()
+    return (n, t, index_type.itemsize, face_count, face_index_count, vertex_offset) + tuple(offsets[:3]) \
+        + (-1,) + tuple(offsets[3:]) + _bounds_fields(bounds)
+
+class _PolygonFaces(Sequence):
+    """Многоугольные грани поверх массивов отображенного файла
+
+    Хранит размеры граней и их индексы подряд в виде представлений
+    отображения; кортежи граней строятся только при первом обращении к
+    ним. Рендеринг и выбор лучом используют треугольники сетки, поэтому
+    у большинства загруженных сеток грани так и не декодируются.
+    """
+
+    __slots__ = ('sizes', 'indices', '_faces')
+
+    def __init__(self, sizes: np.ndarray, indices: np.ndarray):
+        self.sizes = sizes
+        self.indices = indices
+        self._faces = None
+
+    @property
+    def decoded(self) -> bool:
+        """Построены ли кортежи граней"""
+        return self._faces is not None
+
+    def _decode(self) -> tuple:
+        if self._faces is None:
+            indices = self.indices.tolist()
+            ends = np.cumsum(self.sizes).tolist()
+            self._faces = tuple(tuple(indices[end - size:end]) for size, end in zip(self.sizes.tolist(), ends))
+        return self._faces
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def __getitem__(self, index):
+        return self._decode()[index]
+
+    def __iter__(self):
+        return iter(self._decode())
+
+    def __repr__(self):
+        return f"_PolygonFaces(faces={len(self)})"
+
+def _view(buffer: mmap.mmap, offset, dtype, shape) -> np.ndarray:
+    """Массив поверх раздела отображенного файла (без копирования)
+
+    Raises:
+        ValueError: Если раздел выходит за пределы файла
+    """
+    dtype = np.dtype(dtype)
+    offset = int(offset)
+    count = int(np.prod(shape))
+    if offset < 0 or offset + count * dtype.itemsize > len(buffer):
+        raise ValueError("Truncated scene snapshot")
+    if not count:
+        return np.empty(shape, dtype=dtype)
+    return np.frombuffer(buffer, dtype=dtype, count=count, offset=offset).reshape(shape)
+
+def _read_geometry(buffer: mmap.mmap, record) -> Mesh:
+    """Сетка поверх массивов отображенного файла"""
+    n, t = int(record['vertex_count']), int(record['triangle_count'])
+    index_type = np.dtype('<i4' if record['index_size'] == 4 else '<i8')
+    vertex_normals = None
+    if record['vertex_normals'] >= 0:
+        vertex_normals = _view(buffer, record['vertex_normals'], '<f8', (n, 3))
+    bounds = None
+    if record['has_bounds']:
+        bounds = Bounds(tuple(record['bounds_min'].tolist()), tuple(record['bounds_max'].tolist()),
+                        tuple(record['bounds_center'].tolist()), float(record['bounds_radius']))
+    # Массивы записаны из корректной сетки, поэтому индексы не проверяются повторно
+    mesh = Mesh.from_arrays(_view(buffer, record['vertices'], '<f8', (n, 3)),
+                            _view(buffer, record['triangles'], index_type, (t, 3)),
+                            _view(buffer, record['normals'], '<f8', (t, 3)), bounds, validate=False,
+                            vertex_normals=vertex_normals,
+                            triangle_faces=_view(buffer, record['triangle_faces'], index_type, (t,)))
+    if record['face_sizes'] >= 0:
+        mesh.faces = _PolygonFaces(_view(buffer, record['face_sizes'], '<i8', (int(record['face_count']),)),
+                                   _view(buffer, record['face_indices'], '<i8',
+                                         (int(record['face_index_count']),)))
+    return mesh
+
+def _build_objects(records: np.ndarray, meshes: List[Mesh]) -> List[Object3D]:
+    """Объекты по записям таблицы с восстановленной иерархией"""
+    objects = []
+    columns = {name: records[name].tolist() for name in records.dtype.names}
+    for i in range(len(records)):
+        geometry, parent = columns['geometry'][i], columns['parent'][i]
+        if geometry >= len(meshes) or parent >= i:
+            raise ValueError("Invalid reference in scene snapshot")
+        obj = Object3D(color=columns['color'][i].decode('ascii'),
+                       mesh=meshes[geometry] if geometry >= 0 else None)
+        obj.position = Vector3(*columns['position'][i])
+        obj.rotation = Vector3(*columns['rotation'][i])
+        obj.scale = Vector3(*columns['scale'][i])
+        if columns['oriented'][i]:
+            obj.orientation = Quaternion(*columns['orientation'][i])
+        obj.double_sided = bool(columns['double_sided'][i])
+        obj.ambient = columns['ambient'][i]
+        obj.diffuse = columns['diffuse'][i]
+        obj.specular = columns['specular'][i]
+        if parent >= 0:
+            objects[parent].add_child(obj)
+        objects.append(obj)
+    return objects
+
+def _build_lights(records: np.ndarray) -> List[Light]:
+    lights = []
+    for record in records:
+        if record['kind'] >= len(_LIGHT_KINDS):
+            raise ValueError(f"Unknown light kind: {int(record['kind'])}")
+        intensity = float(record['intensity'])
+        if _LIGHT_KINDS[record['kind']] is DirectionalLight:
+            light = DirectionalLight(Vector3(*record['direction'].tolist()), intensity)
+        else:
+            light = Light(intensity=intensity)
+        light.position = Vector3(*record['position'].tolist())
+        light.color = record['color'].decode('ascii')
+        lights.append(light)
+    return lights
@@ -0,0 +1,209 @@
+from typing import Dict, List, Tuple
+import numpy as np
+from light import DirectionalLight
+
+class LightArrays:
+    """Источники света, упакованные в массивы для пакетного расчета
+
+    Направленные источники хранятся как направления на источник света,
+    точечные — как позиции. Ключ (key) описывает состояние набора
+    источников и используется для проверки актуальности кэша.
+    """
+
+    def __init__(self, lights: List):
+        directions, direction_intensity = [], []
+        positions, position_intensity = [], []
+        key = []
+        for light in lights or []:
+            intensity = float(getattr(light, 'intensity', 1.0))
+            if isinstance(light, DirectionalLight):
+                # Направление распространения света -> направление на источник
+                d = light.direction
+                direction = (-d[0], -d[1], -d[2])
+                directions.append(direction)
+                direction_intensity.append(intensity)
+                key.append(('directional', direction, intensity))
+            elif hasattr(light, 'position'):
+                p = light.position
+                position = (p[0], p[1], p[2])
+                positions.append(position)
+                position_intensity.append(intensity)
+                key.append(('point', position, intensity))
+
+        self.directions = _normalized(np.array(directions, dtype=np.float64).reshape(-1, 3))
+        self.direction_intensity = np.array(direction_intensity, dtype=np.float64)
+        self.positions = np.array(positions, dtype=np.float64).reshape(-1, 3)
+        self.position_intensity = np.array(position_intensity, dtype=np.float64)
+        self.key = tuple(key)
+
+    def __len__(self):
+        return len(self.directions) + len(self.positions)
+
+def _normalized(vectors: np.ndarray) -> np.ndarray:
+    """Нормализация массива векторов по последней оси (нулевые остаются нулевыми)"""
+    length = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.divide(vectors, length, out=np.zeros_like(vectors), where=length > 0)
+
+def face_normals(vertices: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+    """Нормали треугольников
+
+    Грани объектов задаются обходом по часовой стрелке при взгляде снаружи,
+    поэтому внешняя нормаль равна (v2 - v0) x (v1 - v0).
+
+    Args:
+        vertices: Вершины (N, 3)
+        triangles: Индексы вершин треугольников (T, 3)
+
+    Returns:
+        np.ndarray: Единичные нормали (T, 3)
+    """
+    v0 = vertices[triangles[:, 0]]
+    v1 = vertices[triangles[:, 1]]
+    v2 = vertices[triangles[:, 2]]
+    return _normalized(np.cross(v2 - v0, v1 - v0))
+
+def _light_terms(normals: np.ndarray, positions: np.ndarray,
+                 lights: LightArrays) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Направления на источники (K, L, 3), скалярные произведения N·L (K, L) и интенсивности (L,)"""
+    count = len(normals)
+    to_light = [np.broadcast_to(lights.directions, (count,) + lights.directions.shape)]
+    intensity = [lights.direction_intensity]
+    if len(lights.positions):
+        to_light.append(_normalized(lights.positions[None, :, :] - positions[:, None, :]))
+        intensity.append(lights.position_intensity)
+    to_light = np.concatenate(to_light, axis=1)
+    n_dot_l = np.einsum('kj,klj->kl', normals, to_light)
+    return to_light, n_dot_l, np.concatenate(intensity)
+
+def shade_diffuse(normals: np.ndarray, positions: np.ndarray, lights: LightArrays,
+                  ambient: float = 1.0, diffuse: float = 1.0, ambient_intensity: float = 0.2,
+                  scale: float = 1.0) -> np.ndarray:
+    """Фоновая и диффузная составляющие освещенности (не зависят от наблюдателя)
+
+    Результат не ограничивается сверху: итоговая освещенность равна
+    np.clip(shade_diffuse(...) + shade_specular(...), 0, 1).
+
+    Returns:
+        np.ndarray: Освещенность точек (K,)
+    """
+    total = np.full(len(normals), ambient * ambient_intensity)
+    if not len(lights) or not len(normals):
+        return total
+    _, n_dot_l, intensity = _light_terms(normals, positions, lights)
+    total += scale * ((diffuse * np.maximum(n_dot_l, 0.0)) @ intensity)
+    return total
+
+def shade_specular(normals: np.ndarray, positions: np.ndarray, view_dirs: np.ndarray,
+                   lights: LightArrays, specular: float = 1.0, specular_power: float = 32.0,
+                   specular_intensity: float = 0.5, scale: float = 1.0) -> np.ndarray:
+    """Зеркальная составляющая освещенности (зависит от направления на наблюдателя)
+
+    Returns:
+        np.ndarray: Неотрицательный вклад бликов (K,)
+    """
+    if not len(lights) or not len(normals):
+        return np.zeros(len(normals))
+    to_light, n_dot_l, intensity = _light_terms(normals, positions, lights)
+    reflection = 2.0 * n_dot_l[:, :, None] * normals[:, None, :] - to_light
+    r_dot_v = np.maximum(np.einsum('klj,kj->kl', reflection, view_dirs), 0.0)
+    highlight = np.where(n_dot_l > 0.0, r_dot_v ** specular_power, 0.0)
+    return scale * ((specular * specular_intensity * highlight) @ intensity)
+
+def shade(normals: np.ndarray, positions: np.ndarray, view_dirs: np.ndarray,
+          lights: LightArrays, ambient: float = 1.0, diffuse: float = 1.0,
+          specular: float = 1.0, ambient_intensity: float = 0.2,
+          specular_power: float = 32.0, specular_intensity: float = 0.5,
+          scale: float = 1.0) -> np.ndarray:
+    """Расчет освещенности по модели Фонга для массива точек
+
+    Фоновая, диффузная и зеркальная составляющие вычисляются сразу для
+    всех точек и всех источников света.
+
+    Args:
+        normals: Единичные нормали (K, 3)
+        positions: Позиции точек в мировых координатах (K, 3)
+        view_dirs: Единичные направления на наблюдателя (K, 3)
+        lights: Упакованные источники света
+        ambient, diffuse, specular: Коэффициенты материала
+        ambient_intensity: Интенсивность фонового освещения
+        specular_power: Степень зеркального отражения
+        specular_intensity: Интенсивность зеркального отражения
+        scale: Множитель вклада источников света
+
+    Returns:
+        np.ndarray: Освещенность точек в диапазоне [0, 1]
+    """
+    count = len(normals)
+    total = np.full(count, ambient * ambient_intensity)
+    if not len(lights) or not count:
+        return np.clip(total, 0.0, 1.0)
+
+    to_light, n_dot_l, intensity = _light_terms(normals, positions, lights)
+    lit = np.maximum(n_dot_l, 0.0)
+    reflection = 2.0 * n_dot_l[:, :, None] * normals[:, None, :] - to_light
+    r_dot_v = np.maximum(np.einsum('klj,kj->kl', reflection, view_dirs), 0.0)
+    highlight = np.where(n_dot_l > 0.0, r_dot_v ** specular_power, 0.0)
+
+    contribution = diffuse * lit + specular * specular_intensity * highlight
+    total += scale * (contribution @ intensity)
+    return np.clip(total, 0.0, 1.0)
+
+class FaceShadingCache:
+    """Кэш плоской освещенности граней объектов
+
+    Для каждого объекта хранит нормали, центры граней и рассчитанную
+    освещенность. Пересчитываются только грани, у которых изменились
+    нормаль или положение; при изменении ключа (источников света,
+    материала, а для бликов — положения камеры) пересчитываются все
+    грани объекта.
+    """
+
+    def __init__(self):
+        self._entries: Dict[int, Tuple] = {}
+        self._seen = set()
+        self.hits = 0
+        self.misses = 0
+
+    def begin_frame(self) -> None:
+        """Начало кадра: сбор объектов, использованных в кадре"""
+        self._seen = set()
+
+    def end_frame(self) -> None:
+        """Удаление записей объектов, не отрисованных в кадре"""
+        for key in list(self._entries):
+            if key not in self._seen:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get(self, owner: int, key: Tuple, normals: np.ndarray, centers: np.ndarray,
+            compute) -> np.ndarray:
+        """Получение освещенности граней с пересчетом только изменившихся
+
+        Args:
+            owner: Идентификатор объекта
+            key: Состояние освещения (источники, материал, камера для бликов)
+            normals: Нормали граней (F, 3)
+            centers: Центры граней (F, 3)
+            compute: Функция compute(mask) -> освещенность граней из mask
+
+        Returns:
+            np.ndarray: Освещенность граней (F,)
+        """
+        self._seen.add(owner)
+        entry = self._entries.get(owner)
+        if entry is None or entry[0] != key or entry[1].shape != normals.shape:
+            values = compute(slice(None))
+            self.misses += len(values)
+        else:
+            _, old_normals, old_centers, values = entry
+            changed = (old_normals != normals).any(axis=1) | (old_centers != centers).any(axis=1)
+            count = int(changed.sum())
+            if count:
+                values = values.copy()
+                values[changed] = compute(changed)
+            self.misses += count
+            self.hits += len(values) - count
+        self._entries[owner] = (key, normals, centers, values)
+        return values
@@ -6,15 +6,30 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import test modules
-from test_vector import TestVector3, TestMatrix4
+from test_vector import TestVector3, TestVector3Array, TestQuaternion, TestMatrix4
 from test_scene import TestScene
 from test_renderer import TestRenderer
+from test_framebuffer import TestFrameBuffer
+from test_rasterizer import TestRasterizer
+from test_shading import TestShading
+from test_parallel_raster import TestParallelRaster
+from test_quality import TestQualityGovernor
+from test_mesh import TestMesh
+from test_mesh_io import TestMeshIO
+from test_scene_io import TestSceneIO
+from test_primitives import TestPrimitives
+from test_lod import TestLOD
+from test_normals import TestNormals
+from test_bvh import TestBVH
+from test_picking import TestPicking
 from test_object import TestObject3D as TestObject
 from test_camera import TestCamera
 from test_input_handler import TestInputHandler
 from test_engine import TestEngine
 from integration_tests import TestIntegration
-from stress_tests import TestPerformance
+from stress_tests import TestPerformance, TestRasterPerformance, TestHeadlessRenderPerformance, \
+    TestParallelRasterPerformance, TestVectorPerformance, TestMeshLoadPerformance, TestNormalsPerformance, \
+    TestPickingPerformance, TestHierarchyPerformance, TestSceneSnapshotPerformance
 
 from logger_config import setup_logger
 from test_results import TestResults
@@ -31,15 +46,39 @@ def run_all_tests():
     # Add all test classes
     test_classes = [
         TestVector3,
+        TestVector3Array,
+        TestQuaternion,
         TestMatrix4,
         TestScene,
         TestRenderer,
+        TestFrameBuffer,
+        TestRasterizer,
+        TestShading,
+        TestParallelRaster,
+        TestQualityGovernor,
+        TestMesh,
+        TestMeshIO,
+        TestSceneIO,
+        TestPrimitives,
+        TestLOD,
+        TestNormals,
+        TestBVH,
+        TestPicking,
         TestObject,
         TestCamera,
         TestInputHandler,
         TestEngine,
         TestIntegration,
-        TestPerformance
+        TestPerformance,
+        TestRasterPerformance,
+        TestHeadlessRenderPerformance,
+        TestParallelRasterPerformance,
+        TestVectorPerformance,
+        TestMeshLoadPerformance,
+        TestNormalsPerformance,
+        TestPickingPerformance,
+        TestHierarchyPerformance,
+        TestSceneSnapshotPerformance
     ]
     
     for test_class in test_classes:
@@ -5,12 +5,31 @@ import os
 # Add parent directory to path to import modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import math
 import time
+import shutil
+import logging
+import tempfile
+import timeit
+import tracemalloc
+import numpy as np
 from engine import Engine
 from scene import Scene
 from camera import Camera
 from renderer import Renderer
 from input_handler import InputHandler
+from framebuffer import FrameBuffer
+from rasterizer import rasterize_triangles
+from render_backend import MemoryBackend
+from parallel_raster import ParallelRasterizer
+from vector import Vector3
+from mesh_io import load_mesh
+from normals import SurfaceNormals
+from object import Object3D, Cube
+from primitives import Grid, grid_mesh
+from scene_io import load_scene, save_scene
+
+logger = logging.getLogger(__name__)
 
 class TestPerformance(unittest.TestCase):
     def setUp(self):
@@ -61,4 +80,240 @@ class TestPerformance(unittest.TestCase):
         self.assertGreaterEqual(loaded['fps'], self.engine.target_fps * 0.8)
         
         # Verify frame time consistency
-        self.assertLess(loaded['max_frame_time'], 1.0 / (self.engine.target_fps * 0.5))
\ No newline at end of file
+        self.assertLess(loaded['max_frame_time'], 1.0 / (self.engine.target_fps * 0.5))
+
+class BenchmarkTestCase(unittest.TestCase):
+    """Общая основа тестов производительности: журнал, замер времени и временные каталоги"""
+
+    def setUp(self):
+        self.logger = logger
+        self.rng = np.random.default_rng(0)
+
+    def measure(self, function, *args):
+        """Однократный вызов function(*args); возвращает (результат, время в секундах)"""
+        start = time.perf_counter()
+        result = function(*args)
+        return result, time.perf_counter() - start
+
+    def make_directory(self) -> str:
+        """Временный каталог, удаляемый после теста"""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        return directory
+
+class DictVector3:
+    """Вектор без __slots__ (прежняя реализация) для сравнения"""
+    def __init__(self, x=0, y=0, z=0):
+        self.x = float(x)
+        self.y = float(y)
+        self.z = float(z)
+
+    def __add__(self, other):
+        return DictVector3(self.x + other.x, self.y + other.y, self.z + other.z)
+
+class TestRasterPerformance(BenchmarkTestCase):
+    def test_rasterization_throughput(self):
+        """Test rasterization of thousands of faces within the frame budget"""
+        width, height = 200, 60
+        count = 5000
+        centers = self.rng.uniform([0, 0], [width, height], (count, 2))
+        screen_x = centers[:, 0, None] + self.rng.uniform(-3, 3, (count, 3))
+        screen_y = centers[:, 1, None] + self.rng.uniform(-2, 2, (count, 3))
+        depth = self.rng.uniform(-1, 1, (count, 3))
+        framebuffer = FrameBuffer(width, height)
+
+        def draw():
+            framebuffer.clear()
+            fragments = rasterize_triangles(screen_x, screen_y, depth, width, height)
+            framebuffer.plot(fragments.x, fragments.y, fragments.depth, ord('#'))
+            return fragments
+
+        frame_times = []
+        for _ in range(10):
+            fragments, elapsed = self.measure(draw)
+            frame_times.append(elapsed)
+
+        self.assertGreater(len(fragments), 0)
+        self.assertLess(min(frame_times), 1.0 / 30.0)
+
+class TestHeadlessRenderPerformance(BenchmarkTestCase):
+    def test_transform_raster_throughput(self):
+        """Test full render pipeline throughput without terminal I/O"""
+        renderer = Renderer(backend=MemoryBackend(200, 60))
+        renderer.initialize()
+        scene = Scene()
+        for i in range(25):
+            cube = Cube(0.5)
+            cube.translate((i % 5) - 2, (i // 5) - 2, 0)
+            scene.add_object(cube)
+        camera = Camera(position=(0, 0, -15), target=(0, 0, 0))
+
+        frame_times = [self.measure(renderer.render, scene, camera)[1] for _ in range(10)]
+
+        self.assertEqual(renderer.backend.frames, 10)
+        self.assertLess(sum(frame_times) / len(frame_times), 1.0 / 30.0)
+
+class TestParallelRasterPerformance(BenchmarkTestCase):
+    def test_parallel_crossover(self):
+        """Test measurement of the triangle count where parallel rasterization wins"""
+        rasterizer = ParallelRasterizer(workers=max(2, os.cpu_count() or 1))
+        self.addCleanup(rasterizer.close)
+        threshold = rasterizer.calibrate(200, 60, counts=(1024, 4096, 16384), repeats=2)
+        self.logger.info(f"Parallel raster crossover: {threshold} triangles ({os.cpu_count()} cores)")
+        self.assertTrue(threshold in (1024, 4096, 16384) or math.isinf(threshold))
+
+class TestVectorPerformance(BenchmarkTestCase):
+    def bytes_per_vector(self, cls, count=10000):
+        tracemalloc.start()
+        vectors = [cls(1.0, 2.0, 3.0) for _ in range(count)]
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return current / len(vectors)
+
+    def ops_per_second(self, stmt, setup):
+        number = 100000
+        return number / min(timeit.repeat(stmt, setup=setup, number=number, repeat=3,
+                                          globals={'Vector3': Vector3, 'DictVector3': DictVector3}))
+
+    def test_vector_memory_and_throughput(self):
+        """Test memory per Vector3 and in-place vs allocating operation throughput"""
+        results = {
+            'dict_bytes': self.bytes_per_vector(DictVector3),
+            'slots_bytes': self.bytes_per_vector(Vector3),
+            'dict_add': self.ops_per_second("a + b", "a = DictVector3(1, 2, 3); b = DictVector3(4, 5, 6)"),
+            'add': self.ops_per_second("a + b", "a = Vector3(1, 2, 3); b = Vector3(4, 5, 6)"),
+            'iadd': self.ops_per_second("a += b", "a = Vector3(1, 2, 3); b = Vector3(4, 5, 6)"),
+            'normalize': self.ops_per_second("a.normalize()", "a = Vector3(1, 2, 3)"),
+            'normalize_ip': self.ops_per_second("a.normalize_ip()", "a = Vector3(1, 2, 3)"),
+        }
+        self.logger.info("Vector3 benchmark: " + ", ".join(f"{k}={v:.1f}" for k, v in results.items()))
+
+        self.assertLess(results['slots_bytes'], results['dict_bytes'])
+        self.assertGreater(results['add'], results['dict_add'])
+        self.assertGreater(results['iadd'], results['add'])
+        self.assertGreater(results['normalize_ip'], results['normalize'])
+
+class TestMeshLoadPerformance(BenchmarkTestCase):
+    def test_cold_and_warm_load(self):
+        """Test cold OBJ parsing against warm loading from the memory-mapped cache"""
+        # Сетка n x n вершин с четырехугольными гранями (~320 тыс. треугольников)
+        n = 400
+        xs, ys = np.meshgrid(np.arange(n), np.arange(n))
+        vertices = np.stack([xs.ravel(), ys.ravel(), np.sin(xs.ravel() * 0.1)], axis=1)
+        first = (ys[:-1, :-1] * n + xs[:-1, :-1]).ravel() + 1
+        quads = np.stack([first, first + 1, first + n + 1, first + n], axis=1)
+
+        path = os.path.join(self.make_directory(), 'grid.obj')
+        with open(path, 'w') as f:
+            np.savetxt(f, vertices, fmt='v %.6f %.6f %.6f')
+            np.savetxt(f, quads, fmt='f %d %d %d %d')
+        cold, cold_time = self.measure(load_mesh, path)
+        warm, warm_time = self.measure(load_mesh, path)
+
+        self.logger.info(f"Mesh load: {len(cold.triangles)} triangles, cold {cold_time * 1000:.1f}ms, "
+                         f"warm {warm_time * 1000:.1f}ms")
+        self.assertEqual(len(warm.triangles), 2 * (n - 1) ** 2)
+        self.assertLess(warm_time * 10, cold_time)
+
+class TestNormalsPerformance(BenchmarkTestCase):
+    def test_single_vertex_edit(self):
+        """Test that editing one vertex of a 1M-face mesh is much cheaper than a full recompute"""
+        obj = Object3D(mesh=grid_mesh(10.0, 10.0, 708, 708))
+        # Первое изменение отвязывает объект от общей сетки
+        obj.update_vertices([1000], [[0.0, 1.0, 0.0]])
+        _, full_time = self.measure(obj.get_vertex_normals)
+        _, edit_time = self.measure(obj.update_vertices, [1000], [[0.0, 0.5, 0.0]])
+
+        self.logger.info(f"Normals: {len(obj.faces)} faces, full {full_time * 1000:.1f}ms, "
+                         f"single-vertex edit {edit_time * 1000:.2f}ms")
+        self.assertGreaterEqual(len(obj.faces), 1000000)
+        expected = SurfaceNormals(obj.vertices, obj.faces)
+        self.assertTrue(np.allclose(obj.get_vertex_normals(), expected.vertex_normals))
+        self.assertTrue(np.allclose(obj.get_face_normals(), expected.face_normals))
+        self.assertLess(edit_time * 20, full_time)
+
+class TestPickingPerformance(BenchmarkTestCase):
+    def test_pick_million_triangles(self):
+        """Test that picking in a 1M-triangle scene takes well under a frame"""
+        scene = Scene()
+        grid = Grid(10.0, 10.0, 708, 708)
+        grid.position = Vector3(0.0, -1.0, 0.0)
+        scene.add_object(grid)
+        camera = Camera(position=(0, 5, -5))
+        _, build_time = self.measure(scene.raycast, *camera.screen_to_ray(40, 12, 80, 24))
+
+        times = []
+        for x in range(20, 61, 4):
+            hit, elapsed = self.measure(scene.raycast, *camera.screen_to_ray(x, 12, 80, 24))
+            times.append(elapsed)
+            self.assertIs(hit.object, grid)
+
+        self.logger.info(f"Picking: {len(grid.mesh.triangles)} triangles, first pick (BVH build) "
+                         f"{build_time * 1000:.1f}ms, pick {max(times) * 1000:.2f}ms")
+        self.assertGreaterEqual(len(grid.mesh.triangles), 1000000)
+        self.assertLess(max(times), 1.0 / 60 / 4)
+
+class TestHierarchyPerformance(BenchmarkTestCase):
+    def build_hierarchy(self, scene):
+        """Цепочка глубиной 1000 с ветвлением по 10 узлов на каждом уровне"""
+        root = Object3D()
+        nodes = [root]
+        for depth in range(1000):
+            parent = nodes[-1] if depth else root
+            for i in range(10):
+                node = Object3D()
+                node.position.x = 0.001
+                parent.add_child(node)
+                nodes.append(node)
+        scene.add_object(root)
+        return nodes
+
+    def reparent(self, scene, node, parent):
+        node.set_parent(parent)
+        scene.update_transforms()
+
+    def test_deep_hierarchy_propagation(self):
+        """Test world matrix propagation and reparenting in a 10k-node hierarchy"""
+        scene = Scene()
+        nodes, build_time = self.measure(self.build_hierarchy, scene)
+        changed, full_time = self.measure(scene.update_transforms)
+        self.assertEqual(len(changed), len(nodes))
+
+        changed, idle_time = self.measure(scene.update_transforms)
+        self.assertEqual(changed, [])
+        nodes[-1].position.y = 1.0
+        changed, leaf_time = self.measure(scene.update_transforms)
+        self.assertEqual(changed, [nodes[-1]])
+
+        reparent_times = [self.measure(self.reparent, scene, nodes[5000 + 10 * k], nodes[0])[1]
+                          for k in range(10)]
+
+        self.logger.info(f"Hierarchy: {len(nodes)} nodes, build {build_time * 1000:.1f}ms, "
+                         f"full update {full_time * 1000:.1f}ms, idle {idle_time * 1000:.3f}ms, "
+                         f"leaf {leaf_time * 1000:.2f}ms, reparent {max(reparent_times) * 1000:.1f}ms")
+        self.assertAlmostEqual(nodes[-1].transform()[1][3], 1.0)
+        self.assertLess(idle_time, 0.001)
+        self.assertLess(leaf_time, full_time)
+        self.assertLess(max(reparent_times), 0.5)
+
+class TestSceneSnapshotPerformance(BenchmarkTestCase):
+    def test_lazy_snapshot_load(self):
+        """Test that opening a large scene snapshot does not read its geometry"""
+        scene = Scene()
+        grid = Grid(10.0, 10.0, 1000, 1000)
+        for i in range(4):
+            instance = Grid(10.0, 10.0, 1000, 1000)
+            instance.position.x = 12.0 * i
+            scene.add_object(instance)
+        path = os.path.join(self.make_directory(), 'large.scene')
+        _, save_time = self.measure(save_scene, path, scene, Camera())
+        (loaded, camera), load_time = self.measure(load_scene, path)
+        mesh = loaded.objects[0].mesh
+        checksum, touch_time = self.measure(lambda: float(mesh.vertices.data.sum()))
+
+        self.logger.info(f"Scene snapshot: {os.path.getsize(path) / 2 ** 20:.0f}MB, save {save_time * 1000:.1f}ms, "
+                         f"load {load_time * 1000:.2f}ms, first geometry pass {touch_time * 1000:.1f}ms")
+        self.assertEqual(len(mesh.triangles), len(grid.mesh.triangles))
+        self.assertAlmostEqual(checksum, float(grid.mesh.vertices.data.sum()))
+        self.assertLess(load_time, 0.05)
+        self.assertLess(load_time, save_time / 10)
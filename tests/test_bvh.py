@@ -0,0 +1,153 @@
+import unittest
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bvh import BVH, transform_boxes
+from object import Object3D, Cube
+from scene import Scene
+from camera import Camera
+from renderer import Renderer
+from render_backend import MemoryBackend
+from vector import Vector3
+from logger_config import setup_logger
+from test_results import TestResults
+
+logger = setup_logger('bvh_tests')
+test_results = TestResults()
+
+class TestBVH(unittest.TestCase):
+    def setUp(self):
+        self.logger = logger
+        rng = np.random.default_rng(7)
+        centers = rng.uniform(-50, 50, (500, 3))
+        half = rng.uniform(0.1, 2.0, (500, 3))
+        self.lower, self.upper = centers - half, centers + half
+        self.bvh = BVH(self.lower, self.upper)
+
+    def tearDown(self):
+        test_name = self._testMethodName
+        if hasattr(self, '_outcome'):
+            result = self._outcome.result
+            if len(result.failures) > 0 or len(result.errors) > 0:
+                status = "FAILED"
+                self.logger.error(f"Test {test_name} failed")
+            else:
+                status = "PASSED"
+                self.logger.info(f"Test {test_name} passed")
+            test_results.add_result(test_name, status)
+
+    def brute_aabb(self, minimum, maximum):
+        return np.flatnonzero(((self.lower <= maximum) & (self.upper >= minimum)).all(axis=1))
+
+    def test_structure(self):
+        """Test that every node encloses its children and every item is in one leaf"""
+        bvh = self.bvh
+        inner = np.flatnonzero(bvh.left >= 0)
+        for child in (bvh.left[inner], bvh.right[inner]):
+            self.assertTrue((bvh.node_lower[child] >= bvh.node_lower[inner]).all())
+            self.assertTrue((bvh.node_upper[child] <= bvh.node_upper[inner]).all())
+        self.assertEqual(sorted(bvh.order.tolist()), list(range(500)))
+        self.assertTrue((bvh.count <= bvh.leaf_size).all())
+        leaf = bvh.leaf_of
+        self.assertTrue((bvh.node_lower[leaf] <= self.lower).all())
+        empty = BVH(np.empty((0, 3)), np.empty((0, 3)))
+        self.assertEqual(len(empty.query_aabb((0, 0, 0), (1, 1, 1))), 0)
+
+    def test_queries_match_brute_force(self):
+        """Test AABB, sphere, frustum and ray queries against exhaustive checks"""
+        minimum, maximum = np.array([-10.0, -10.0, -10.0]), np.array([15.0, 5.0, 10.0])
+        self.assertEqual(self.bvh.query_aabb(minimum, maximum).tolist(),
+                         self.brute_aabb(minimum, maximum).tolist())
+        center = np.array([5.0, 0.0, -3.0])
+        closest = np.clip(center, self.lower, self.upper)
+        expected = np.flatnonzero(((closest - center) ** 2).sum(axis=1) <= 400.0)
+        self.assertEqual(self.bvh.query_sphere(center, 20.0).tolist(), expected.tolist())
+
+        planes = np.asarray(Camera(position=(0, 0, -60), far=80.0).get_frustum_planes())
+        centers, half = (self.lower + self.upper) / 2, (self.upper - self.lower) / 2
+        distance = centers @ planes[:, :3].T + planes[:, 3]
+        expected = np.flatnonzero(~(distance < -(half @ np.abs(planes[:, :3]).T)).any(axis=1))
+        self.assertEqual(self.bvh.query_frustum(planes).tolist(), expected.tolist())
+
+        items, distances = self.bvh.query_ray((-60.0, 0.5, 0.0), (1.0, 0.0, 0.0))
+        self.assertTrue((np.diff(distances) >= 0).all())
+        expected = np.flatnonzero((self.lower[:, 1:] <= (0.5, 0.0)).all(axis=1)
+                                  & (self.upper[:, 1:] >= (0.5, 0.0)).all(axis=1))
+        self.assertEqual(sorted(items.tolist()), expected.tolist())
+        self.assertTrue(np.allclose(distances, self.lower[items, 0] + 60.0))
+        near, _ = self.bvh.query_ray((-60.0, 0.5, 0.0), (1.0, 0.0, 0.0), max_distance=50.0)
+        self.assertEqual(near.tolist(), items[distances <= 50.0].tolist())
+
+    def test_refit_and_rebuild(self):
+        """Test incremental refit and the rebuild criterion"""
+        moved = np.arange(0, 500, 25)
+        self.lower[moved] += 100.0
+        self.upper[moved] += 100.0
+        self.bvh.refit(moved, self.lower[moved], self.upper[moved])
+        minimum, maximum = np.array([40.0, 40.0, 40.0]), np.array([160.0, 160.0, 160.0])
+        self.assertEqual(self.bvh.query_aabb(minimum, maximum).tolist(),
+                         self.brute_aabb(minimum, maximum).tolist())
+        self.assertTrue(self.bvh.needs_rebuild())
+        self.bvh.rebuild()
+        self.assertFalse(self.bvh.needs_rebuild())
+        self.assertEqual(self.bvh.query_aabb(minimum, maximum).tolist(),
+                         self.brute_aabb(minimum, maximum).tolist())
+
+    def test_transform_boxes(self):
+        """Test world AABB of a rotated and translated box"""
+        cube = Cube(2.0)
+        cube.position = Vector3(5.0, 0.0, 0.0)
+        cube.rotation = Vector3(0.0, 0.0, np.pi / 4)
+        lower, upper = transform_boxes([(-1, -1, -1)], [(1, 1, 1)], cube.transform().data[None])
+        self.assertTrue(np.allclose(lower, (5.0 - np.sqrt(2), -np.sqrt(2), -1.0)))
+        self.assertTrue(np.allclose(upper, (5.0 + np.sqrt(2), np.sqrt(2), 1.0)))
+
+    def test_scene_queries(self):
+        """Test Scene spatial queries, refit on movement and rebuild on membership changes"""
+        scene = Scene()
+        cubes = [Cube(1.0) for _ in range(20)]
+        for i, cube in enumerate(cubes):
+            cube.position = Vector3(i * 3.0, 0.0, 0.0)
+            scene.add_object(cube)
+        empty = Object3D()
+        scene.add_object(empty)
+        self.assertEqual(scene.query_sphere((9.0, 0.0, 0.0), 1.0), [cubes[3]])
+        self.assertEqual(scene.index_rebuilds, 1)
+        hits = scene.query_ray((-5.0, 0.0, 0.0), (1.0, 0.0, 0.0))
+        self.assertEqual([obj for _, obj in hits], cubes)
+        self.assertAlmostEqual(hits[0][0], 4.5)
+
+        # Перемещение объекта уточняет индекс без перестроения
+        cubes[3].position = Vector3(9.0, 1.0, 0.0)
+        self.assertEqual(scene.query_sphere((9.0, 0.0, 0.0), 0.25), [])
+        self.assertEqual(scene.query_aabb((8, 1.2, -1), (10, 2, 1)), [cubes[3]])
+        self.assertEqual(scene.index_rebuilds, 1)
+        # Перемещение далеко от остальных объектов ухудшает дерево и перестраивает его
+        cubes[3].position = Vector3(0.0, 500.0, 0.0)
+        self.assertEqual(scene.query_aabb((-1, 499, -1), (1, 501, 1)), [cubes[3]])
+        self.assertEqual(scene.index_rebuilds, 2)
+
+        scene.remove_object(cubes[0])
+        self.assertEqual(scene.query_aabb((-1, -1, -1), (1, 1, 1)), [])
+        self.assertEqual(scene.index_rebuilds, 3)
+        planes = Camera(position=(0, 0, -10)).get_frustum_planes()
+        self.assertIn(empty, scene.query_frustum(planes))
+        self.assertNotIn(cubes[3], scene.query_frustum(planes))
+
+    def test_renderer_uses_scene_index(self):
+        """Test that the renderer culls through the scene hierarchy"""
+        scene = Scene()
+        for i in range(10):
+            cube = Cube(1.0)
+            cube.position = Vector3(i * 20.0 - 100.0, 0.0, 0.0)
+            scene.add_object(cube)
+        renderer = Renderer(backend=MemoryBackend(80, 24))
+        renderer.initialize()
+        renderer.render(scene, Camera(position=(0, 0, -10)))
+        self.assertEqual(renderer.culled_objects, 9)
+        self.assertEqual(scene.index_rebuilds, 1)
+        self.assertTrue((renderer.framebuffer.chars != ord(' ')).any())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -75,6 +75,42 @@ class TestCamera(unittest.TestCase):
         self.assertAlmostEqual(matrix[2][1], 0.0)
         self.assertAlmostEqual(matrix[2][2], 1.0)
 
+    def test_view_projection_matrices(self):
+        """Test that camera matrices map the target to the screen center"""
+        from vector import Matrix4, Vector3
+        view = self.camera.get_view_matrix()
+        projection = self.camera.get_projection_matrix()
+        self.assertIsInstance(view, Matrix4)
+        self.assertIsInstance(projection, Matrix4)
+        # The camera looks at the target from distance 10
+        eye_space = view.transform_point(Vector3(0, 0, 0))
+        self.assertAlmostEqual(eye_space.z, -10.0)
+        ndc = (projection * view).transform_point(Vector3(0, 0, 0))
+        self.assertAlmostEqual(ndc.x, 0.0)
+        self.assertAlmostEqual(ndc.y, 0.0)
+        self.assertTrue(-1.0 < ndc.z < 1.0)
+        # The eye position is the inverse view transform of the origin
+        eye = view.affine_inverse().transform_point(Vector3())
+        self.assertAlmostEqual(eye.z, -10.0)
+
+    def test_frustum_planes(self):
+        """Test frustum planes extracted from the view-projection matrix"""
+        planes = self.camera.get_frustum_planes()
+        self.assertEqual(len(planes), 6)
+        for plane in planes:
+            self.assertAlmostEqual(math.sqrt(sum(x * x for x in plane[:3])), 1.0)
+        
+        def inside(point):
+            return all(a * point[0] + b * point[1] + c * point[2] + d >= 0 for a, b, c, d in planes)
+        
+        self.assertTrue(inside((0, 0, 0)))
+        self.assertFalse(inside((0, 0, -20)))   # behind the camera
+        self.assertFalse(inside((100, 0, 0)))   # outside the field of view
+        self.assertFalse(inside((0, 0, 100)))   # beyond the far plane
+        # Near plane lies at distance near from the camera along the view axis
+        near = planes[4]
+        self.assertAlmostEqual(near[2] * (-10 + self.camera.near) + near[3], 0.0)
+
 if __name__ == '__main__':
     try:
         unittest.main(exit=False)
@@ -72,6 +72,57 @@ class TestEngine(unittest.TestCase):
             self.mock_camera
         )
 
+    def test_render_skips_unchanged_frames(self):
+        """Test that rendering is skipped while nothing observable changes"""
+        from renderer import Renderer
+        from render_backend import MemoryBackend
+        from scene import Scene
+        from camera import Camera
+        from object import Cube
+        from light import DirectionalLight
+        from vector import Vector3
+        
+        scene = Scene()
+        cube = Cube(2.0)
+        scene.add_object(cube)
+        camera = Camera()
+        renderer = Renderer(backend=MemoryBackend(60, 20))
+        renderer.initialize()
+        engine = Engine(scene, camera, renderer, self.mock_input_handler)
+        
+        engine.render()
+        engine.render()
+        self.assertEqual(renderer.backend.frames, 1)
+        self.assertEqual(engine.skipped_frames, 1)
+        
+        # Every observable change triggers a new frame
+        changes = [
+            lambda: cube.rotate(0.1, 0, 0),
+            lambda: setattr(cube.position, 'x', 0.5),
+            lambda: camera.move(0, 0, 1),
+            lambda: scene.add_light(DirectionalLight(Vector3(0, 0, 1))),
+            lambda: scene.add_object(Cube(1.0)),
+            cube.mark_dirty,
+            renderer.clear,
+            lambda: renderer.backend.resize(40, 20),
+        ]
+        for frames, change in enumerate(changes, start=2):
+            change()
+            engine.render()
+            engine.render()
+            self.assertEqual(renderer.backend.frames, frames)
+        self.assertEqual(engine.skipped_frames, 1 + len(changes))
+
+    def test_adjust_quality(self):
+        """Test that slow frames lower renderer quality through the governor"""
+        from quality import QualityGovernor
+        self.assertFalse(self.engine.adjust_quality(1.0))
+        self.engine.governor = QualityGovernor(target_fps=30, window=5, start_level=1)
+        changes = [self.engine.adjust_quality(0.1) for _ in range(5)]
+        self.assertEqual(changes, [False] * 4 + [True])
+        self.assertEqual(self.mock_renderer.shading, self.engine.governor.current.shading)
+        self.assertEqual(self.mock_renderer.lod_bias, self.engine.governor.current.lod_bias)
+
     def test_stop(self):
         """Test engine stop functionality"""
         self.engine.running = True
@@ -0,0 +1,73 @@
+import unittest
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from framebuffer import FrameBuffer
+from logger_config import setup_logger
+from test_results import TestResults
+
+logger = setup_logger('framebuffer_tests')
+test_results = TestResults()
+
+class TestFrameBuffer(unittest.TestCase):
+    def setUp(self):
+        self.logger = logger
+        self.framebuffer = FrameBuffer(20, 10)
+        
+    def tearDown(self):
+        test_name = self._testMethodName
+        if hasattr(self, '_outcome'):
+            result = self._outcome.result
+            if len(result.failures) > 0 or len(result.errors) > 0:
+                status = "FAILED"
+                self.logger.error(f"Test {test_name} failed")
+            else:
+                status = "PASSED"
+                self.logger.info(f"Test {test_name} passed")
+            test_results.add_result(test_name, status)
+
+    def test_initialization(self):
+        """Test buffer sizes and initial contents"""
+        self.assertEqual(self.framebuffer.chars.shape, (10, 20))
+        self.assertEqual(self.framebuffer.depth.shape, (10, 20))
+        self.assertTrue(np.isinf(self.framebuffer.depth).all())
+        with self.assertRaises(ValueError):
+            FrameBuffer(0, 10)
+
+    def test_depth_test(self):
+        """Test that the nearest fragment wins regardless of draw order"""
+        written = self.framebuffer.plot([3, 3, 3], [2, 2, 2], [0.5, -0.2, 0.9], [ord('a'), ord('b'), ord('c')])
+        self.assertEqual(written, 1)
+        self.assertEqual(chr(self.framebuffer.chars[2, 3]), 'b')
+        
+        # Farther fragment in a later call is rejected
+        self.framebuffer.plot([3], [2], [0.0], [ord('d')])
+        self.assertEqual(chr(self.framebuffer.chars[2, 3]), 'b')
+        
+        # Out of bounds fragments are ignored
+        self.assertEqual(self.framebuffer.plot([-1, 20], [0, 10], [0.0, 0.0], [ord('x'), ord('x')]), 0)
+
+    def test_swap_returns_changed_cells(self):
+        """Test that only cells changed since the last frame are returned"""
+        self.framebuffer.plot([1, 2], [1, 1], [0.0, 0.0], [ord('#'), ord('#')])
+        ys, xs, codes = self.framebuffer.swap()
+        self.assertEqual(sorted(zip(ys.tolist(), xs.tolist())), [(1, 1), (1, 2)])
+        
+        # Same frame again: nothing to flush
+        self.framebuffer.clear()
+        self.framebuffer.plot([1, 2], [1, 1], [0.0, 0.0], [ord('#'), ord('#')])
+        self.assertEqual(len(self.framebuffer.swap()[0]), 0)
+        
+        # Moved point: old cell is erased, new cell is drawn
+        self.framebuffer.clear()
+        self.framebuffer.plot([1, 3], [1, 1], [0.0, 0.0], [ord('#'), ord('#')])
+        ys, xs, codes = self.framebuffer.swap()
+        self.assertEqual(dict(zip(xs.tolist(), map(chr, codes.tolist()))), {2: ' ', 3: '#'})
+
+if __name__ == '__main__':
+    try:
+        unittest.main(exit=False)
+    finally:
+        test_results.save_results()
+        logger.info("Test results have been saved")
@@ -0,0 +1,94 @@
+import unittest
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lod import LODChain, cluster_vertices, get_lod_chain, select_level
+from object import Cube
+from primitives import IcoSphere, icosphere_mesh, torus_mesh
+from scene import Scene
+from camera import Camera
+from renderer import Renderer
+from render_backend import MemoryBackend
+from logger_config import setup_logger
+from test_results import TestResults
+
+logger = setup_logger('lod_tests')
+test_results = TestResults()
+
+class TestLOD(unittest.TestCase):
+    def setUp(self):
+        self.logger = logger
+
+    def tearDown(self):
+        test_name = self._testMethodName
+        if hasattr(self, '_outcome'):
+            result = self._outcome.result
+            if len(result.failures) > 0 or len(result.errors) > 0:
+                status = "FAILED"
+                self.logger.error(f"Test {test_name} failed")
+            else:
+                status = "PASSED"
+                self.logger.info(f"Test {test_name} passed")
+            test_results.add_result(test_name, status)
+
+    def test_cluster_vertices(self):
+        """Test that vertex clustering reduces triangles and keeps outward winding"""
+        mesh = icosphere_mesh(1.0, 4)
+        simplified = cluster_vertices(mesh, 0.25)
+        self.assertLess(len(simplified.triangles), len(mesh.triangles) // 4)
+        self.assertLess(len(simplified.vertices), len(mesh.vertices))
+        centers = simplified.vertices.data[simplified.triangles].mean(axis=1)
+        self.assertTrue((np.einsum('ij,ij->i', simplified.normals, centers) > 0).all())
+        self.assertTrue(np.allclose(np.linalg.norm(simplified.vertex_normals, axis=1), 1.0))
+        with self.assertRaises(ValueError):
+            cluster_vertices(mesh, 0.0)
+
+    def test_chain(self):
+        """Test lazy chain construction and caching per mesh"""
+        mesh = torus_mesh(1.0, 0.25, 64, 32)
+        chain = get_lod_chain(mesh)
+        self.assertIs(get_lod_chain(mesh), chain)
+        self.assertEqual(len(chain.levels), 1)
+        counts = [len(chain.level(i).triangles) for i in range(chain.max_levels)]
+        self.assertEqual(counts[0], len(mesh.triangles))
+        self.assertTrue(all(a >= b for a, b in zip(counts, counts[1:])))
+        self.assertLess(counts[-1], counts[0])
+        self.assertIs(chain.level(99), chain.level(chain.max_levels - 1))
+        # Объекты с общей сеткой разделяют цепочку
+        first, second = IcoSphere(1.0, 3), IcoSphere(1.0, 3)
+        self.assertIs(first.lod_chain, second.lod_chain)
+        # Куб не упрощается: все уровни совпадают с исходной сеткой
+        cube = Cube(2.0)
+        self.assertIs(cube.lod_chain.level(3), cube.mesh)
+        with self.assertRaises(ValueError):
+            LODChain(mesh, max_levels=0)
+
+    def test_select_level(self):
+        """Test level selection thresholds and bias"""
+        self.assertEqual(select_level(64.0), 0)
+        self.assertEqual(select_level(32.0), 0)
+        self.assertEqual(select_level(31.0), 1)
+        self.assertEqual(select_level(12.0), 2)
+        self.assertEqual(select_level(1.0), 3)
+        self.assertEqual(select_level(0.0), 3)
+        self.assertEqual(select_level(64.0, bias=1), 1)
+        self.assertEqual(select_level(12.0, bias=-1), 1)
+
+    def test_renderer_selects_level(self):
+        """Test that distant objects are drawn with a coarser level"""
+        scene = Scene()
+        scene.add_object(IcoSphere(1.0, 4))
+        renderer = Renderer(backend=MemoryBackend(120, 40))
+        renderer.initialize()
+        renderer.render(scene, Camera(position=(0, 0, -3), aspect=3.0))
+        self.assertEqual(renderer.lod_objects, 0)
+        renderer.render(scene, Camera(position=(0, 0, -30), aspect=3.0))
+        self.assertEqual(renderer.lod_objects, 1)
+        self.assertTrue((renderer.framebuffer.chars != ord(' ')).any())
+        renderer.lod = False
+        renderer.render(scene, Camera(position=(0, 0, -30), aspect=3.0))
+        self.assertEqual(renderer.lod_objects, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from mesh import Mesh, clear_mesh_cache
+from object import Object3D, Cube, Plane, update_world_vertices
+from renderer import Renderer
+from scene import Scene
+from camera import Camera
+from render_backend import MemoryBackend
+from logger_config import setup_logger
+from test_results import TestResults
+
+logger = setup_logger('mesh_tests')
+test_results = TestResults()
+
+class TestMesh(unittest.TestCase):
+    def setUp(self):
+        self.logger = logger
+
+    def tearDown(self):
+        test_name = self._testMethodName
+        if hasattr(self, '_outcome'):
+            result = self._outcome.result
+            if len(result.failures) > 0 or len(result.errors) > 0:
+                status = "FAILED"
+                self.logger.error(f"Test {test_name} failed")
+            else:
+                status = "PASSED"
+                self.logger.info(f"Test {test_name} passed")
+            test_results.add_result(test_name, status)
+
+    def test_precomputed_data(self):
+        """Test triangles, outward normals and bounds computed at creation"""
+        mesh = Cube.build_mesh(2.0)
+        self.assertEqual(len(mesh), 8)
+        self.assertEqual(mesh.triangles.shape, (12, 3))
+        self.assertEqual(mesh.triangle_faces.tolist(), [0, 0, 1, 1, 2, 2, 3, 3, 4, 4, 5, 5])
+        # Front face (z = -1) normal points away from the cube
+        self.assertEqual(mesh.normals[0].tolist(), [0.0, 0.0, -1.0])
+        self.assertEqual(mesh.bounds.maximum, (1.0, 1.0, 1.0))
+        self.assertFalse(mesh.vertices.data.flags.writeable)
+        with self.assertRaises(ValueError):
+            Mesh([(0, 0, 0), (1, 0, 0)], [(0, 1, 2)])
+
+    def test_shared_cache(self):
+        """Test that primitives with equal parameters share one mesh"""
+        a, b, c = Cube(2.0), Cube(2.0), Cube(3.0)
+        self.assertIs(a.mesh, b.mesh)
+        self.assertIs(a.vertices, b.vertices)
+        self.assertIsNot(a.mesh, c.mesh)
+        self.assertIs(Plane(1.0, 2.0).mesh, Plane(1.0, 2.0).mesh)
+        self.assertIs(a.get_bounds(), a.mesh.bounds)
+        clear_mesh_cache()
+        self.assertIsNot(Cube(2.0).mesh, a.mesh)
+        # Replacing geometry detaches the object from the shared mesh
+        a.faces = [(0, 1, 2)]
+        self.assertIsNone(a.mesh)
+        self.assertIsNotNone(b.mesh)
+
+    def test_instanced_transform(self):
+        """Test batched instance transforms match per-object transforms"""
+        cubes = [Cube(2.0) for _ in range(5)]
+        for i, cube in enumerate(cubes):
+            cube.translate(i, -i, 2 * i)
+            cube.rotate(0.1 * i, 0.2 * i, 0.3 * i)
+        update_world_vertices(cubes)
+        for cube in cubes:
+            self.assertEqual(cube.vertices_misses, 1)
+            expected = cube.transform().transform_points(cube.vertices)
+            self.assertTrue(np.allclose(cube.get_world_vertices(), expected))
+            self.assertEqual(cube.vertices_hits, 1)
+        # Unchanged instances are not transformed again
+        update_world_vertices(cubes)
+        self.assertEqual(cubes[0].vertices_misses, 1)
+
+    def test_instanced_rendering_matches_own_geometry(self):
+        """Test that shared-mesh objects render exactly like objects owning their geometry"""
+        def render(make):
+            scene = Scene()
+            for i in range(3):
+                obj = make()
+                obj.translate(3 * i - 3, 0, 0)
+                obj.rotate(0.4, 0.3 * i, 0)
+                scene.add_object(obj)
+            backend = MemoryBackend(60, 20)
+            renderer = Renderer(backend=backend)
+            renderer.initialize()
+            renderer.render(scene, Camera(aspect=3.0))
+            return backend.lines()
+
+        mesh = Cube.build_mesh(2.0)
+        shared = render(lambda: Cube(2.0))
+        owned = render(lambda: Object3D(vertices=mesh.vertices.to_vectors(), faces=list(mesh.faces)))
+        self.assertEqual(shared, owned)
+        self.assertTrue(any(line.strip() for line in shared))
+
+if __name__ == '__main__':
+    try:
+        unittest.main(exit=False)
+    finally:
+        test_results.save_results()
+        logger.info("Test results have been saved")
@@ -0,0 +1,129 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import mesh_io
+from mesh_io import CACHE_SUFFIX, load_mesh, load_object, read_obj, read_ply
+from logger_config import setup_logger
+from test_results import TestResults
+
+logger = setup_logger('mesh_io_tests')
+test_results = TestResults()
+
+SQUARE = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0), (0, 0, 1)]
+
+def write_binary_ply(path, faces, order='<'):
+    """Запись бинарного PLY с вершинами SQUARE и заданными гранями"""
+    fmt = 'binary_little_endian' if order == '<' else 'binary_big_endian'
+    with open(path, 'wb') as f:
+        f.write(f"ply\nformat {fmt} 1.0\nelement vertex {len(SQUARE)}\n"
+                "property float x\nproperty float y\nproperty float z\n"
+                f"element face {len(faces)}\nproperty list uchar int vertex_indices\n"
+                "end_header\n".encode('ascii'))
+        f.write(np.array(SQUARE, dtype=order + 'f4').tobytes())
+        for face in faces:
+            f.write(bytes([len(face)]) + np.array(face, dtype=order + 'i4').tobytes())
+
+class TestMeshIO(unittest.TestCase):
+    def setUp(self):
+        self.logger = logger
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+        test_name = self._testMethodName
+        if hasattr(self, '_outcome'):
+            result = self._outcome.result
+            if len(result.failures) > 0 or len(result.errors) > 0:
+                status = "FAILED"
+                self.logger.error(f"Test {test_name} failed")
+            else:
+                status = "PASSED"
+                self.logger.info(f"Test {test_name} passed")
+            test_results.add_result(test_name, status)
+
+    def path(self, name, content=None):
+        path = os.path.join(self.directory, name)
+        if content is not None:
+            with open(path, 'w') as f:
+                f.write(content)
+        return path
+
+    def test_read_obj(self):
+        """Test OBJ vertices, fan triangulation, v/vt/vn and negative indices"""
+        path = self.path('model.obj', "# comment\nv 0 0 0\nv 1 0 0\nv 1 1 0\nv 0 1 0\nvt 0 0\n"
+                                      "f 1/1/1 2/1/1 3/1/1 4/1/1\nv 0 0 1\nf -1 -5 -4\n")
+        vertices, triangles = read_obj(path)
+        self.assertEqual(vertices.tolist(), [list(map(float, v)) for v in SQUARE])
+        self.assertEqual(triangles.tolist(), [[0, 1, 2], [0, 2, 3], [4, 0, 1]])
+        with self.assertRaises(ValueError):
+            read_obj(self.path('bad.obj', "v 0 0 0\nv 1 0 0\nf 1 2\n"))
+
+    def test_read_ascii_ply(self):
+        """Test ASCII PLY with extra properties before the vertex list"""
+        path = self.path('model.ply', "ply\nformat ascii 1.0\ncomment test\nelement vertex 4\n"
+                                      "property float x\nproperty float y\nproperty float z\n"
+                                      "property uchar red\nelement face 2\nproperty uchar flags\n"
+                                      "property list uchar int vertex_indices\nend_header\n"
+                                      "0 0 0 9\n1 0 0 9\n1 1 0 9\n0 1 0 9\n7 4 0 1 2 3\n7 3 0 2 3\n")
+        vertices, triangles = read_ply(path)
+        self.assertEqual(vertices.shape, (4, 3))
+        self.assertEqual(triangles.tolist(), [[0, 1, 2], [0, 2, 3], [0, 2, 3]])
+        with self.assertRaises(ValueError):
+            read_ply(self.path('bad.ply', "ply\nformat ascii 1.0\nelement vertex 1\n"))
+
+    def test_read_binary_ply(self):
+        """Test binary PLY in both byte orders with mixed face sizes across chunks"""
+        faces = [(0, 1, 2), (0, 2, 3), (0, 1, 2, 3), (1, 2, 4), (1, 2, 4)]
+        expected = [[0, 1, 2], [0, 2, 3], [0, 1, 2], [0, 2, 3], [1, 2, 4], [1, 2, 4]]
+        chunk_size = mesh_io.CHUNK_SIZE
+        try:
+            for chunk in (chunk_size, 2):
+                mesh_io.CHUNK_SIZE = chunk
+                for order in '<>':
+                    path = self.path('model.ply')
+                    write_binary_ply(path, faces, order)
+                    vertices, triangles = read_ply(path)
+                    self.assertEqual(vertices.tolist(), [list(map(float, v)) for v in SQUARE])
+                    self.assertEqual(triangles.tolist(), expected)
+        finally:
+            mesh_io.CHUNK_SIZE = chunk_size
+
+    def test_binary_cache(self):
+        """Test that the binary cache is memory-mapped and refreshed when the source changes"""
+        path = self.path('model.obj', "v 0 0 0\nv 1 0 0\nv 1 1 0\nf 1 2 3\n")
+        cold = load_mesh(path)
+        self.assertTrue(os.path.exists(path + CACHE_SUFFIX))
+        warm = load_mesh(path)
+        self.assertIsInstance(warm.vertices.data.base, np.memmap)
+        self.assertEqual(warm.vertices.data.tolist(), cold.vertices.data.tolist())
+        self.assertEqual(warm.triangles.tolist(), cold.triangles.tolist())
+        self.assertTrue(np.allclose(warm.normals, cold.normals))
+        self.assertEqual(warm.bounds.maximum, cold.bounds.maximum)
+        # A changed source invalidates the cache
+        with open(path, 'a') as f:
+            f.write("v 0 0 5\nf 1 2 4\n")
+        self.assertEqual(len(load_mesh(path).triangles), 2)
+        self.assertEqual(len(load_mesh(path, use_cache=False).vertices), 4)
+        with self.assertRaises(ValueError):
+            load_mesh(self.path('model.stl', ""))
+
+    def test_load_object(self):
+        """Test that loaded models become array-backed objects"""
+        path = self.path('model.ply')
+        write_binary_ply(path, [(0, 1, 2, 3)])
+        obj = load_object(path, use_cache=False)
+        self.assertIsNotNone(obj.mesh)
+        self.assertEqual(len(obj.vertices), 5)
+        self.assertEqual(len(obj.faces), 2)
+        self.assertEqual(obj.get_world_vertices().shape, (5, 3))
+
+if __name__ == '__main__':
+    try:
+        unittest.main(exit=False)
+    finally:
+        test_results.save_results()
+        logger.info("Test results have been saved")
@@ -0,0 +1,91 @@
+import unittest
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from normals import SurfaceNormals, vertex_face_index
+from object import Object3D, Cube
+from primitives import icosphere_mesh
+from vector import Vector3
+from logger_config import setup_logger
+from test_results import TestResults
+
+logger = setup_logger('normals_tests')
+test_results = TestResults()
+
+class TestNormals(unittest.TestCase):
+    def setUp(self):
+        self.logger = logger
+
+    def tearDown(self):
+        test_name = self._testMethodName
+        if hasattr(self, '_outcome'):
+            result = self._outcome.result
+            if len(result.failures) > 0 or len(result.errors) > 0:
+                status = "FAILED"
+                self.logger.error(f"Test {test_name} failed")
+            else:
+                status = "PASSED"
+                self.logger.info(f"Test {test_name} passed")
+            test_results.add_result(test_name, status)
+
+    def test_adjacency_index(self):
+        """Test the vertex-to-face adjacency index"""
+        triangles = np.array([(0, 1, 2), (0, 2, 3), (3, 2, 4)])
+        offsets, faces = vertex_face_index(triangles, 6)
+        self.assertEqual(offsets.tolist(), [0, 2, 3, 6, 8, 9, 9])
+        self.assertEqual(sorted(faces[offsets[2]:offsets[3]].tolist()), [0, 1, 2])
+        self.assertEqual(faces[offsets[4]:offsets[5]].tolist(), [2])
+
+    def test_area_weighted_normals(self):
+        """Test face normals and area-weighted vertex normals"""
+        # Два треугольника с общим ребром: большой в плоскости XY и малый в плоскости XZ
+        vertices = np.array([(0, 0, 0), (0, 4, 0), (4, 0, 0), (0, 0, 1)], dtype=np.float64)
+        normals = SurfaceNormals(vertices, np.array([(0, 1, 2), (0, 2, 3)]))
+        self.assertTrue(np.allclose(normals.face_normals, [(0, 0, 1), (0, 1, 0)]))
+        # Вес грани пропорционален площади: 8 против 2
+        expected = np.array([0.0, 2.0, 8.0]) / np.sqrt(68.0)
+        self.assertTrue(np.allclose(normals.vertex_normals[0], expected))
+        self.assertTrue(np.allclose(normals.vertex_normals[1], (0, 0, 1)))
+
+    def test_incremental_update(self):
+        """Test that a partial update matches a full recompute and touches only neighbours"""
+        mesh = icosphere_mesh(1.0, 3)
+        normals = SurfaceNormals(mesh.vertices, mesh.triangles)
+        indices = np.array([0, 17, 200])
+        positions = mesh.vertices.data[indices] * 1.5 + 0.1
+        faces, touched = normals.update(indices, positions)
+        self.assertLess(len(faces), 20)
+        vertices = mesh.vertices.data.copy()
+        vertices[indices] = positions
+        expected = SurfaceNormals(vertices, mesh.triangles)
+        self.assertTrue(np.allclose(normals.face_normals, expected.face_normals))
+        self.assertTrue(np.allclose(normals.vertex_normals, expected.vertex_normals))
+        self.assertTrue(np.isin(indices, touched).all())
+
+    def test_object_normals(self):
+        """Test normals of Object3D with own and shared geometry"""
+        obj = Object3D([Vector3(0, 0, 0), Vector3(1, 0, 0), Vector3(0, 1, 0), Vector3(1, 1, 0)],
+                       [(0, 1, 3, 2)])
+        self.assertTrue(np.allclose(obj.get_face_normals(), (0, 0, -1)))
+        self.assertTrue(np.allclose(obj.get_vertex_normals(), (0, 0, -1)))
+        version = obj.version
+        obj.update_vertices([3], [(1, 1, 1)])
+        self.assertEqual(obj.version, version + 1)
+        self.assertEqual(obj.vertices[3], Vector3(1, 1, 1))
+        self.assertEqual(obj.get_bounds().maximum, (1.0, 1.0, 1.0))
+        expected = SurfaceNormals([(0, 0, 0), (1, 0, 0), (0, 1, 0), (1, 1, 1)], [(0, 1, 3), (0, 3, 2)])
+        self.assertTrue(np.allclose(obj.get_vertex_normals(), expected.vertex_normals))
+        with self.assertRaises(IndexError):
+            obj.update_vertices([4], [(0, 0, 0)])
+
+        # Изменение вершин объекта с общей сеткой не затрагивает сетку
+        cube, other = Cube(2.0), Cube(2.0)
+        self.assertIs(cube.get_face_normals(), cube.mesh.normals)
+        cube.update_vertices([0], [(-2, -2, -2)])
+        self.assertIsNone(cube.mesh)
+        self.assertEqual(other.mesh.vertices[0], Vector3(-1, -1, -1))
+        self.assertEqual(cube.vertices[0], Vector3(-2, -2, -2))
+
+if __name__ == '__main__':
+    unittest.main()
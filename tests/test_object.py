@@ -3,8 +3,8 @@ import math
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from object import Object3D, Cube, Plane
-from vector import Vector3, Matrix4
+from object import Object3D, Cube, Plane, compose_transforms, update_transforms
+from vector import Vector3, Matrix4, Quaternion
 from logger_config import setup_logger
 from test_results import TestResults
 
@@ -60,6 +60,124 @@ class TestObject3D(unittest.TestCase):
         self.assertEqual(obj.scale.y, 3.0)
         self.assertEqual(obj.scale.z, 4.0)
 
+    def test_object3d_bounds(self):
+        """Test cached local-space bounding sphere and AABB"""
+        obj = Object3D(vertices=[(0, 0, 0), (2, 0, 0), (2, 4, 0), (0, 4, 2)])
+        bounds = obj.get_bounds()
+        self.assertEqual(bounds.minimum, (0.0, 0.0, 0.0))
+        self.assertEqual(bounds.maximum, (2.0, 4.0, 2.0))
+        self.assertEqual(bounds.center, (1.0, 2.0, 1.0))
+        self.assertEqual(bounds.half_extents, (1.0, 2.0, 1.0))
+        self.assertAlmostEqual(bounds.radius, math.sqrt(6.0))
+        # Bounds are cached until the vertices are replaced
+        self.assertIs(obj.get_bounds(), bounds)
+        obj.vertices = [(0, 0, 0), (1, 1, 1)]
+        self.assertEqual(obj.get_bounds().maximum, (1.0, 1.0, 1.0))
+        self.assertIsNone(Object3D().get_bounds())
+
+    def test_object3d_transform_matches_matrix_product(self):
+        """Test that the closed-form transform equals T * Rz * Ry * Rx * S"""
+        obj = Object3D()
+        obj.translate(1.0, -2.0, 3.0)
+        obj.rotate(0.3, -1.1, 2.0)
+        obj.set_scale(2.0, 3.0, 4.0)
+        expected = (Matrix4.translation(1.0, -2.0, 3.0) * Matrix4.rotation_z(2.0)
+                    * Matrix4.rotation_y(-1.1) * Matrix4.rotation_x(0.3) * Matrix4.scale(2.0, 3.0, 4.0))
+        actual = obj.transform()
+        for i in range(4):
+            for j in range(4):
+                self.assertAlmostEqual(actual[i][j], expected[i][j])
+
+    def test_object3d_quaternion_orientation(self):
+        """Test quaternion rotations and batched transforms"""
+        obj = Object3D()
+        obj.rotate_by(Quaternion.from_axis_angle((0, 0, 1), math.pi / 2))
+        self.assertIsNotNone(obj.orientation)
+        point = obj.transform() * Vector3(1, 0, 0)
+        self.assertAlmostEqual(point.x, 0.0)
+        self.assertAlmostEqual(point.y, 1.0)
+        # Euler increments are applied to the stored orientation in local axes
+        key = obj.state_key()
+        obj.rotate(math.pi / 2, 0, 0)
+        self.assertNotEqual(obj.state_key(), key)
+        point = obj.transform() * Vector3(0, 1, 0)
+        self.assertAlmostEqual(point.z, 1.0)
+
+        euler = Object3D()
+        euler.rotate(0.4, 0.5, 0.6)
+        euler.translate(1, 2, 3)
+        matrices = compose_transforms([obj, euler])
+        for index, item in enumerate((obj, euler)):
+            expected = item.transform().data
+            for i in range(4):
+                for j in range(4):
+                    self.assertAlmostEqual(matrices[index][i][j], expected[i][j])
+
+    def test_object3d_transform_cache(self):
+        """Test that world matrix and vertices are cached until the transform changes"""
+        cube = Cube(2.0)
+        matrix = cube.transform()
+        self.assertIs(cube.transform(), matrix)
+        self.assertEqual((cube.transform_hits, cube.transform_misses), (1, 1))
+        world = cube.get_world_vertices()
+        self.assertIs(cube.get_world_vertices(), world)
+        self.assertEqual((cube.vertices_hits, cube.vertices_misses), (1, 1))
+        self.assertFalse(world.flags.writeable)
+        # Direct attribute mutation invalidates the cache
+        cube.position.x = 5.0
+        self.assertIsNot(cube.transform(), matrix)
+        self.assertEqual(cube.get_world_vertices()[0][0], 4.0)
+        self.assertEqual(cube.get_transformed_vertices()[0].x, 4.0)
+        # So do vertex changes
+        cube.vertices = [(1, 1, 1)]
+        self.assertEqual(cube.get_world_vertices().tolist(), [[6.0, 1.0, 1.0]])
+        misses = cube.vertices_misses
+        cube.mark_dirty()
+        cube.get_world_vertices()
+        self.assertEqual(cube.vertices_misses, misses + 1)
+
+    def test_update_transforms(self):
+        """Test batched refresh of cached world matrices"""
+        objects = [Object3D(), Object3D()]
+        objects[1].translate(1, 2, 3)
+        matrices = update_transforms(objects)
+        self.assertEqual(matrices[1][0][3], 1.0)
+        self.assertIs(objects[1].transform(), matrices[1])
+        objects[0].rotate(0.5, 0, 0)
+        update_transforms(objects)
+        self.assertEqual((objects[0].transform_hits, objects[0].transform_misses), (0, 2))
+        self.assertEqual((objects[1].transform_hits, objects[1].transform_misses), (2, 1))
+
+    def test_object3d_hierarchy(self):
+        """Test that child world matrices follow their ancestors"""
+        root, child, leaf = Object3D(), Object3D(), Object3D()
+        root.add_child(child)
+        child.add_child(leaf)
+        self.assertIs(leaf.parent, child)
+        self.assertEqual(list(root.traverse()), [root, child, leaf])
+        root.translate(1, 0, 0)
+        child.rotate(0, math.pi / 2, 0)
+        leaf.translate(0, 0, 2)
+        expected = root.local_transform() * child.local_transform() * leaf.local_transform()
+        for actual, reference in zip(leaf.transform().data, expected.data):
+            for a, b in zip(actual, reference):
+                self.assertAlmostEqual(a, b)
+        self.assertAlmostEqual(leaf.transform()[0][3], 3.0)
+        # Moving an ancestor invalidates cached descendants
+        matrix = leaf.transform()
+        root.position.y = 5.0
+        self.assertIsNot(leaf.transform(), matrix)
+        self.assertAlmostEqual(leaf.transform()[1][3], 5.0)
+        self.assertAlmostEqual(update_transforms([leaf])[0][1][3], 5.0)
+        with self.assertRaises(ValueError):
+            leaf.add_child(root)
+        with self.assertRaises(ValueError):
+            root.remove_child(leaf)
+        child.remove_child(leaf)
+        self.assertIsNone(leaf.parent)
+        self.assertEqual(child.children, [])
+        self.assertAlmostEqual(leaf.transform()[2][3], 2.0)
+
 class TestCube(unittest.TestCase):
     def setUp(self):
         self.logger = logger
@@ -0,0 +1,133 @@
+import unittest
+import sys
+import os
+import subprocess
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from framebuffer import FrameBuffer
+from rasterizer import draw_triangles
+from parallel_raster import ParallelRasterizer, bin_triangles
+from logger_config import setup_logger
+from test_results import TestResults
+
+logger = setup_logger('parallel_raster_tests')
+test_results = TestResults()
+
+def random_triangles(count, width, height, seed=0):
+    """Случайные небольшие треугольники, разбросанные по экрану"""
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform([-5, -5], [width + 5, height + 5], (count, 2))
+    screen_x = centers[:, 0, None] + rng.uniform(-6, 6, (count, 3))
+    screen_y = centers[:, 1, None] + rng.uniform(-4, 4, (count, 3))
+    depth = rng.uniform(-1, 1, (count, 3))
+    codes = rng.integers(0, 128, count).astype(np.uint8)
+    return screen_x, screen_y, depth, codes
+
+class TestParallelRaster(unittest.TestCase):
+    def setUp(self):
+        self.logger = logger
+        self.char_table = np.arange(256, dtype=np.uint8) // 4 + 33
+        self.rasterizer = ParallelRasterizer(workers=2, tile_size=(16, 8), min_triangles=0)
+
+    def tearDown(self):
+        self.rasterizer.close()
+        test_name = self._testMethodName
+        if hasattr(self, '_outcome'):
+            result = self._outcome.result
+            if len(result.failures) > 0 or len(result.errors) > 0:
+                status = "FAILED"
+                self.logger.error(f"Test {test_name} failed")
+            else:
+                status = "PASSED"
+                self.logger.info(f"Test {test_name} passed")
+            test_results.add_result(test_name, status)
+
+    def test_bin_triangles(self):
+        """Test that every covered pixel's triangle is binned into the pixel's tile"""
+        screen_x, screen_y, _, _ = random_triangles(200, 70, 30)
+        bins = bin_triangles(screen_x, screen_y, 70, 30, 16, 8)
+        regions = [region for region, _ in bins]
+        self.assertEqual(len(regions), len(set(regions)))
+        for (x0, y0, x1, y1), index in bins:
+            self.assertTrue(0 <= x0 < x1 <= 70 and 0 <= y0 < y1 <= 30)
+            # Ограничивающий прямоугольник треугольника пересекает тайл
+            self.assertTrue((screen_x[index].min(axis=1) < x1).all())
+            self.assertTrue((screen_x[index].max(axis=1) >= x0).all())
+            self.assertTrue((screen_y[index].min(axis=1) < y1).all())
+            self.assertTrue((screen_y[index].max(axis=1) >= y0).all())
+
+    def test_bin_offscreen(self):
+        """Test that triangles outside the screen are not binned"""
+        screen_x = np.array([[-10.0, -5.0, -8.0], [100.0, 120.0, 110.0]])
+        screen_y = np.array([[1.0, 2.0, 3.0], [1.0, 2.0, 3.0]])
+        self.assertEqual(bin_triangles(screen_x, screen_y, 40, 20, 16, 8), [])
+
+    def test_parallel_matches_serial(self):
+        """Test that tile-parallel rasterization produces the serial frame"""
+        width, height = 70, 30
+        screen_x, screen_y, depth, codes = random_triangles(500, width, height)
+        serial = FrameBuffer(width, height)
+        expected = draw_triangles(serial.chars, serial.depth, screen_x, screen_y, depth,
+                                  codes, self.char_table)
+
+        parallel = FrameBuffer(width, height)
+        written = self.rasterizer.rasterize(parallel, screen_x, screen_y, depth, codes,
+                                            self.char_table)
+        self.assertEqual(self.rasterizer.last_mode, 'parallel')
+        self.assertEqual(written, expected)
+        np.testing.assert_array_equal(parallel.chars, serial.chars)
+        np.testing.assert_array_equal(parallel.depth, serial.depth)
+
+    def test_shared_memory_tracking(self):
+        """Test that a parallel run leaves no resource_tracker errors or leaked segments"""
+        tests_dir = os.path.dirname(os.path.abspath(__file__))
+        result = subprocess.run(
+            [sys.executable, '-m', 'unittest',
+             'test_parallel_raster.TestParallelRaster.test_parallel_matches_serial'],
+            cwd=tests_dir, capture_output=True, text=True, timeout=120)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertNotIn('KeyError', result.stderr)
+        self.assertNotIn('resource_tracker', result.stderr)
+
+    def test_bound_framebuffer_survives_close(self):
+        """Test that a bound framebuffer keeps its content after close"""
+        framebuffer = FrameBuffer(20, 10)
+        framebuffer.chars[3, 4] = ord('#')
+        self.rasterizer.bind(framebuffer)
+        self.assertEqual(framebuffer.chars[3, 4], ord('#'))
+        self.rasterizer.close()
+        framebuffer.chars[5, 5] = ord('@')
+        self.assertEqual(framebuffer.chars[3, 4], ord('#'))
+
+    def test_serial_fallback(self):
+        """Test that small frames are rasterized serially"""
+        self.rasterizer.min_triangles = 1000
+        framebuffer = FrameBuffer(40, 20)
+        screen_x, screen_y, depth, codes = random_triangles(10, 40, 20)
+        self.rasterizer.rasterize(framebuffer, screen_x, screen_y, depth, codes, self.char_table)
+        self.assertEqual(self.rasterizer.last_mode, 'serial')
+
+        single = ParallelRasterizer(workers=1, min_triangles=0)
+        single.rasterize(framebuffer, screen_x, screen_y, depth, codes, self.char_table)
+        self.assertEqual(single.last_mode, 'serial')
+        single.close()
+
+        # Без калибровки кадр растеризуется последовательно, а не измеряется
+        uncalibrated = ParallelRasterizer(workers=2)
+        uncalibrated.rasterize(framebuffer, screen_x, screen_y, depth, codes, self.char_table)
+        self.assertEqual(uncalibrated.last_mode, 'serial')
+        self.assertIsNone(uncalibrated.min_triangles)
+        uncalibrated.close()
+
+    def test_calibrate(self):
+        """Test that calibration yields a threshold and keeps the bound frame"""
+        framebuffer = FrameBuffer(40, 20)
+        self.rasterizer.bind(framebuffer)
+        threshold = self.rasterizer.calibrate(40, 20, counts=(64, 256), repeats=1)
+        self.assertIn(threshold, (64, 256, float('inf')))
+        self.assertEqual(self.rasterizer.min_triangles, threshold)
+        framebuffer.clear()
+        self.assertTrue((framebuffer.chars == FrameBuffer.BLANK).all())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from picking import intersect_triangles, triangle_bvh, raycast_geometry
+from object import Object3D, Cube
+from primitives import IcoSphere
+from scene import Scene
+from camera import Camera
+from vector import Vector3
+from logger_config import setup_logger
+from test_results import TestResults
+
+logger = setup_logger('picking_tests')
+test_results = TestResults()
+
+class TestPicking(unittest.TestCase):
+    def setUp(self):
+        self.logger = logger
+
+    def tearDown(self):
+        test_name = self._testMethodName
+        if hasattr(self, '_outcome'):
+            result = self._outcome.result
+            if len(result.failures) > 0 or len(result.errors) > 0:
+                status = "FAILED"
+                self.logger.error(f"Test {test_name} failed")
+            else:
+                status = "PASSED"
+                self.logger.info(f"Test {test_name} passed")
+            test_results.add_result(test_name, status)
+
+    def test_ray_triangle(self):
+        """Test ray-triangle intersection distances and barycentric coordinates"""
+        vertices = np.array([(0, 0, 0), (0, 2, 0), (2, 0, 0)], dtype=np.float64)
+        triangles = np.array([(0, 1, 2)])
+        hit, t, weights = intersect_triangles(np.array([0.5, 0.5, -3.0]), np.array([0.0, 0.0, 2.0]),
+                                              vertices, triangles)
+        self.assertTrue(hit[0])
+        self.assertAlmostEqual(t[0], 1.5)
+        self.assertTrue(np.allclose(weights[0], (0.5, 0.25, 0.25)))
+        # Мимо треугольника, позади начала луча и параллельно плоскости
+        for origin, direction in (((2.0, 2.0, -1.0), (0.0, 0.0, 1.0)), ((0.5, 0.5, 1.0), (0.0, 0.0, 1.0)),
+                                  ((0.5, 0.5, -1.0), (1.0, 0.0, 0.0))):
+            hit, _, _ = intersect_triangles(np.array(origin), np.array(direction), vertices, triangles)
+            self.assertFalse(hit[0])
+
+    def test_geometry_bvh_matches_brute_force(self):
+        """Test that the triangle BVH finds the same nearest hit as testing every triangle"""
+        mesh = IcoSphere(1.0, 3).mesh
+        vertices, triangles = mesh.vertices.data, mesh.triangles
+        bvh = triangle_bvh(vertices, triangles)
+        rng = np.random.default_rng(3)
+        for _ in range(20):
+            origin = rng.normal(size=3) * 3.0
+            direction = rng.normal(size=3) * 0.1 - origin
+            found = raycast_geometry(origin, direction, vertices, triangles, bvh)
+            hit, t, _ = intersect_triangles(origin, direction, vertices, triangles)
+            self.assertIsNotNone(found)
+            self.assertAlmostEqual(found[1], t[hit].min())
+
+    def test_object_and_scene_raycast(self):
+        """Test nearest hit across transformed objects with shared and own geometry"""
+        scene = Scene()
+        near, far = Cube(2.0), Cube(2.0)
+        far.position = Vector3(0.0, 0.0, 5.0)
+        near.scale = Vector3(1.0, 1.0, 0.5)
+        quad = Object3D([Vector3(-1, -1, 0), Vector3(-1, 1, 0), Vector3(1, 1, 0), Vector3(1, -1, 0)],
+                        [(0, 1, 2, 3)])
+        quad.position = Vector3(5.0, 0.0, 0.0)
+        for obj in (far, near, quad):
+            scene.add_object(obj)
+
+        hit = scene.raycast((0.2, 0.3, -10.0), (0.0, 0.0, 2.0))
+        self.assertIs(hit.object, near)
+        self.assertAlmostEqual(hit.distance, 4.75)
+        self.assertTrue(np.allclose(hit.point, (0.2, 0.3, -0.5)))
+        face = near.faces[hit.face]
+        self.assertTrue(set(hit.vertices.tolist()) <= set(face))
+        corners = near.mesh.vertices.data[hit.vertices] * (1.0, 1.0, 0.5)
+        self.assertTrue(np.allclose(hit.barycentric @ corners, hit.point))
+        self.assertIn(hit.vertex, hit.vertices.tolist())
+        self.assertIsNone(scene.raycast((0.2, 0.3, -10.0), (0.0, 0.0, 1.0), max_distance=5.0))
+
+        hit = scene.raycast((5.5, -0.5, 3.0), (0.0, 0.0, -1.0))
+        self.assertIs(hit.object, quad)
+        self.assertEqual(hit.face, 0)
+        self.assertAlmostEqual(hit.distance, 3.0)
+        # Изменение вершин перестраивает BVH собственной геометрии объекта
+        quad.update_vertices([0, 1, 2, 3], [(-1, -1, 1), (-1, 1, 1), (1, 1, 1), (1, -1, 1)])
+        self.assertAlmostEqual(scene.raycast((5.5, -0.5, 3.0), (0.0, 0.0, -1.0)).distance, 2.0)
+        self.assertIsNone(scene.raycast((20.0, 20.0, 20.0), (1.0, 0.0, 0.0)))
+
+    def test_screen_to_ray(self):
+        """Test that screen rays pass through the projected position of a point"""
+        camera = Camera(position=(1.0, 2.0, -8.0), target=(0.5, 0.0, 0.0), aspect=2.0)
+        width, height = 80, 40
+        point = np.array([0.7, -0.4, 1.5])
+        clip = (camera.get_projection_matrix() * camera.get_view_matrix()).data @ np.append(point, 1.0)
+        x = (clip[0] / clip[3] + 1.0) * width * 0.5 - 0.5
+        y = (1.0 - clip[1] / clip[3]) * height * 0.5 - 0.5
+        origin, direction = camera.screen_to_ray(x, y, width, height)
+        self.assertEqual(tuple(origin), (1.0, 2.0, -8.0))
+        self.assertAlmostEqual(direction.length(), 1.0)
+        offset = point - np.asarray(origin, dtype=np.float64)
+        self.assertTrue(np.allclose(np.cross(offset, np.asarray(direction, dtype=np.float64)), 0.0, atol=1e-9))
+
+        scene = Scene()
+        scene.add_object(Cube(2.0))
+        camera = Camera(position=(0, 0, -10))
+        self.assertIsNotNone(scene.raycast(*camera.screen_to_ray(40, 12, 80, 24)))
+        self.assertIsNone(scene.raycast(*camera.screen_to_ray(0, 0, 80, 24)))
+        with self.assertRaises(ValueError):
+            camera.screen_to_ray(0, 0, 0, 24)
+
+if __name__ == '__main__':
+    unittest.main()
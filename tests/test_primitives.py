@@ -0,0 +1,107 @@
+import unittest
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from primitives import (Sphere, IcoSphere, Cylinder, Cone, Torus, Grid, uv_sphere_mesh, icosphere_mesh,
+                        cylinder_mesh, cone_mesh, torus_mesh, grid_mesh)
+from scene import Scene
+from camera import Camera
+from renderer import Renderer
+from render_backend import MemoryBackend
+from logger_config import setup_logger
+from test_results import TestResults
+
+logger = setup_logger('primitives_tests')
+test_results = TestResults()
+
+class TestPrimitives(unittest.TestCase):
+    def setUp(self):
+        self.logger = logger
+
+    def tearDown(self):
+        test_name = self._testMethodName
+        if hasattr(self, '_outcome'):
+            result = self._outcome.result
+            if len(result.failures) > 0 or len(result.errors) > 0:
+                status = "FAILED"
+                self.logger.error(f"Test {test_name} failed")
+            else:
+                status = "PASSED"
+                self.logger.info(f"Test {test_name} passed")
+            test_results.add_result(test_name, status)
+
+    def assertOutward(self, mesh, axis_points):
+        """Нормали граней направлены от заданных точек оси и согласованы с нормалями вершин"""
+        centers = mesh.vertices.data[mesh.triangles].mean(axis=1)
+        outward = np.einsum('ij,ij->i', mesh.normals, centers - axis_points(centers))
+        self.assertTrue((outward > 0).all())
+        agree = np.einsum('tkj,tj->tk', mesh.vertex_normals[mesh.triangles], mesh.normals)
+        self.assertTrue((agree > 0).all())
+        self.assertTrue(np.allclose(np.linalg.norm(mesh.vertex_normals, axis=1), 1.0))
+
+    def test_spheres(self):
+        """Test UV sphere and icosphere geometry"""
+        origin = np.zeros_like
+        sphere = uv_sphere_mesh(2.0, 8, 4)
+        self.assertEqual(len(sphere.vertices), 2 + 3 * 8)
+        self.assertEqual(len(sphere.triangles), 2 * 8 + 2 * 2 * 8)
+        self.assertTrue(np.allclose(np.linalg.norm(sphere.vertices.data, axis=1), 2.0))
+        self.assertOutward(sphere, origin)
+        ico = icosphere_mesh(1.0, 2)
+        self.assertEqual(len(ico.triangles), 20 * 4 ** 2)
+        self.assertEqual(len(ico.vertices), 162)
+        self.assertOutward(ico, origin)
+
+    def test_cylinder_cone_torus_grid(self):
+        """Test outward winding and per-vertex normals of the remaining primitives"""
+        self.assertOutward(cylinder_mesh(0.5, 2.0, 12), np.zeros_like)
+        self.assertOutward(cylinder_mesh(0.5, 2.0, 12, caps=False), np.zeros_like)
+        self.assertOutward(cone_mesh(0.5, 1.0, 12), lambda c: np.tile((0.0, -0.25, 0.0), (len(c), 1)))
+
+        def tube_center(points):
+            ring = points * (1.0, 0.0, 1.0)
+            return ring / np.linalg.norm(ring, axis=1, keepdims=True)
+        torus = torus_mesh(1.0, 0.25, 12, 8)
+        self.assertEqual(len(torus.triangles), 2 * 12 * 8)
+        self.assertOutward(torus, tube_center)
+
+        grid = grid_mesh(2.0, 4.0, 3, 2)
+        self.assertEqual(len(grid.vertices), 4 * 3)
+        self.assertEqual(len(grid.triangles), 2 * 3 * 2)
+        self.assertTrue(np.allclose(grid.normals, (0.0, 1.0, 0.0)))
+        self.assertEqual(grid.bounds.maximum, (1.0, 0.0, 2.0))
+
+    def test_parameter_cache(self):
+        """Test that equal generator parameters share one mesh"""
+        self.assertIs(Sphere(1.0, 12, 6).mesh, Sphere(1.0, 12, 6).mesh)
+        self.assertIsNot(Sphere(1.0, 12, 6).mesh, Sphere(1.0, 12, 7).mesh)
+        self.assertIs(Torus().mesh, torus_mesh())
+        with self.assertRaises(ValueError):
+            uv_sphere_mesh(1.0, 2, 4)
+        with self.assertRaises(ValueError):
+            cylinder_mesh(-1.0)
+        with self.assertRaises(ValueError):
+            grid_mesh(columns=1.5)
+
+    def test_scene_integration(self):
+        """Test that primitives are added to scenes and rendered like Cube and Plane"""
+        scene = Scene()
+        primitives = [Sphere(), IcoSphere(), Cylinder(), Cone(), Torus(), Grid(2.0, 2.0, 4, 4)]
+        for i, obj in enumerate(primitives):
+            obj.translate(3 * i - 7.5, 0, 0)
+            scene.add_object(obj)
+        self.assertTrue(Grid().double_sided)
+        renderer = Renderer(backend=MemoryBackend(120, 30))
+        renderer.initialize()
+        renderer.render(scene, Camera(position=(0, 0, -10), aspect=4.0))
+        drawn = renderer.framebuffer.chars != ord(' ')
+        self.assertEqual(renderer.culled_objects, 0)
+        self.assertGreater(drawn.sum(), 50)
+
+if __name__ == '__main__':
+    try:
+        unittest.main(exit=False)
+    finally:
+        test_results.save_results()
+        logger.info("Test results have been saved")
@@ -0,0 +1,97 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from quality import QualityGovernor, QualityLevel, DEFAULT_LEVELS
+from renderer import Renderer
+from logger_config import setup_logger
+from test_results import TestResults
+
+logger = setup_logger('quality_tests')
+test_results = TestResults()
+
+class TestQualityGovernor(unittest.TestCase):
+    def setUp(self):
+        self.logger = logger
+        # Бюджет кадра 10 мс
+        self.governor = QualityGovernor(target_fps=100, window=10, start_level=1)
+
+    def tearDown(self):
+        test_name = self._testMethodName
+        if hasattr(self, '_outcome'):
+            result = self._outcome.result
+            if len(result.failures) > 0 or len(result.errors) > 0:
+                status = "FAILED"
+                self.logger.error(f"Test {test_name} failed")
+            else:
+                status = "PASSED"
+                self.logger.info(f"Test {test_name} passed")
+            test_results.add_result(test_name, status)
+
+    def feed(self, frame_time, count):
+        """Передача серии одинаковых кадров, возвращает число изменений уровня"""
+        return sum(self.governor.record_frame(frame_time) for _ in range(count))
+
+    def test_downgrade_when_over_budget(self):
+        """Test that sustained slow frames lower quality one level per window"""
+        self.assertEqual(self.feed(0.02, 9), 0)
+        self.assertEqual(self.feed(0.02, 1), 1)
+        self.assertEqual(self.governor.level, 2)
+        self.assertIn("over budget", self.governor.reason)
+        self.assertEqual(self.governor.changes[-1][1:3], (1, 2))
+        # The next decision needs a full window at the new level
+        self.assertEqual(self.feed(0.02, 9), 0)
+        self.assertEqual(self.feed(0.02, 100), len(DEFAULT_LEVELS) - 3)
+        self.assertEqual(self.governor.current.name, 'minimal')
+
+    def test_upgrade_with_headroom(self):
+        """Test that quality rises only after a long run of fast frames"""
+        self.assertEqual(self.feed(0.001, 19), 0)
+        self.assertEqual(self.feed(0.001, 1), 1)
+        self.assertEqual(self.governor.level, 0)
+        self.assertIn("under", self.governor.reason)
+        self.assertEqual(self.feed(0.001, 100), 0)
+
+    def test_hysteresis_band(self):
+        """Test that frame times between the thresholds change nothing"""
+        self.assertEqual(self.feed(0.008, 200), 0)
+        self.assertEqual(self.feed(0.0105, 200), 0)
+        self.assertEqual(self.governor.reason, "initial")
+
+    def test_failed_upgrade_backs_off(self):
+        """Test that an upgrade reverted at once makes the next one wait longer"""
+        self.feed(0.001, 20)
+        self.assertEqual(self.governor.level, 0)
+        # Higher quality is too slow: back down
+        self.feed(0.02, 10)
+        self.assertEqual(self.governor.level, 1)
+        # The previous 20 frames of headroom are no longer enough
+        self.assertEqual(self.feed(0.001, 20), 0)
+        self.assertEqual(self.feed(0.001, 20), 1)
+        self.assertEqual(self.governor.level, 0)
+
+    def test_apply_to_renderer(self):
+        """Test that quality levels configure the renderer"""
+        renderer = Renderer()
+        level = QualityLevel('test', 0.5, 'fragment', 2, 3)
+        level.apply(renderer)
+        self.assertEqual((renderer.resolution_scale, renderer.shading, renderer.max_lights,
+                          renderer.lod_bias), (0.5, 'fragment', 2, 3))
+        self.governor.apply(renderer)
+        self.assertEqual(renderer.shading, self.governor.current.shading)
+
+    def test_invalid_parameters(self):
+        """Test rejection of inconsistent governor settings"""
+        with self.assertRaises(ValueError):
+            QualityGovernor(target_fps=0)
+        with self.assertRaises(ValueError):
+            QualityGovernor(levels=[])
+        with self.assertRaises(ValueError):
+            QualityGovernor(upgrade_ratio=1.2, downgrade_ratio=1.1)
+
+if __name__ == '__main__':
+    try:
+        unittest.main(exit=False)
+    finally:
+        test_results.save_results()
+        logger.info("Test results have been saved")
@@ -0,0 +1,104 @@
+import unittest
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rasterizer import triangulate_faces, rasterize_triangles, clip_triangles_near
+from logger_config import setup_logger
+from test_results import TestResults
+
+logger = setup_logger('rasterizer_tests')
+test_results = TestResults()
+
+class TestRasterizer(unittest.TestCase):
+    def setUp(self):
+        self.logger = logger
+        
+    def tearDown(self):
+        test_name = self._testMethodName
+        if hasattr(self, '_outcome'):
+            result = self._outcome.result
+            if len(result.failures) > 0 or len(result.errors) > 0:
+                status = "FAILED"
+                self.logger.error(f"Test {test_name} failed")
+            else:
+                status = "PASSED"
+                self.logger.info(f"Test {test_name} passed")
+            test_results.add_result(test_name, status)
+
+    def test_triangulate_quads(self):
+        """Test fan triangulation of uniform quad faces"""
+        triangles, face_index = triangulate_faces([(0, 1, 2, 3), (4, 5, 6, 7)])
+        self.assertEqual(triangles.tolist(), [[0, 1, 2], [0, 2, 3], [4, 5, 6], [4, 6, 7]])
+        self.assertEqual(face_index.tolist(), [0, 0, 1, 1])
+
+    def test_triangulate_mixed(self):
+        """Test triangulation of faces with different vertex counts"""
+        triangles, face_index = triangulate_faces([(0, 1, 2), (3, 4, 5, 6, 7)])
+        self.assertEqual(len(triangles), 4)
+        self.assertEqual(face_index.tolist(), [0, 1, 1, 1])
+        with self.assertRaises(ValueError):
+            triangulate_faces([(0, 1)])
+
+    def test_rasterize_square(self):
+        """Test that two triangles of a square cover exactly its pixels"""
+        sx = np.array([[2, 6, 6], [2, 6, 2]], dtype=float)
+        sy = np.array([[1, 1, 5], [1, 5, 5]], dtype=float)
+        depth = np.zeros((2, 3))
+        fragments = rasterize_triangles(sx, sy, depth, 10, 10)
+        cells = set(zip(fragments.x.tolist(), fragments.y.tolist()))
+        expected = {(x, y) for x in range(2, 6) for y in range(1, 5)}
+        self.assertEqual(cells, expected)
+        np.testing.assert_allclose(fragments.weights.sum(axis=1), 1.0)
+
+    def test_depth_interpolation(self):
+        """Test barycentric interpolation of depth across a triangle"""
+        sx = np.array([[0, 20, 0]], dtype=float)
+        sy = np.array([[0, 0, 20]], dtype=float)
+        depth = np.array([[0.0, 1.0, 0.0]])
+        fragments = rasterize_triangles(sx, sy, depth, 20, 20)
+        expected = (fragments.x + 0.5) / 20.0
+        np.testing.assert_allclose(fragments.depth, expected)
+
+    def test_clipping_to_screen(self):
+        """Test that fragments outside the screen are not generated"""
+        sx = np.array([[-50, 150, -50]], dtype=float)
+        sy = np.array([[-50, -50, 150]], dtype=float)
+        fragments = rasterize_triangles(sx, sy, np.zeros((1, 3)), 8, 4, batch_pixels=5)
+        self.assertEqual(len(fragments), 32)
+        self.assertTrue((fragments.x >= 0).all() and (fragments.x < 8).all())
+        self.assertTrue((fragments.y >= 0).all() and (fragments.y < 4).all())
+
+    def test_near_plane_clipping(self):
+        """Test homogeneous clipping of triangles against the near plane"""
+        def corner(x, y, d):
+            # Clip coordinates with z + w = d and the vertex index as an attribute
+            return [x, y, d - 1.0, 1.0]
+        
+        inside = [corner(0, 0, 1), corner(1, 0, 1), corner(0, 1, 1)]
+        one_out = [corner(0, 0, -1), corner(1, 0, 1), corner(0, 1, 1)]
+        two_out = [corner(0, 0, 1), corner(1, 0, -1), corner(0, 1, -1)]
+        outside = [corner(0, 0, -1), corner(1, 0, -1), corner(0, 1, -1)]
+        corners = np.array([inside, one_out, two_out, outside])
+        
+        clipped, source = clip_triangles_near(corners)
+        self.assertEqual(sorted(source.tolist()), [0, 1, 1, 2])
+        distance = clipped[:, :, 2] + clipped[:, :, 3]
+        self.assertTrue((distance >= -1e-12).all())
+        np.testing.assert_allclose(clipped[source == 0][0], corners[0])
+        
+        # Clipped pieces cover the part of the triangle in front of the plane
+        # and keep the original winding
+        def area(triangle):
+            (ax, ay), (bx, by), (cx, cy) = triangle[:, :2]
+            return 0.5 * ((bx - ax) * (cy - ay) - (cx - ax) * (by - ay))
+        self.assertAlmostEqual(sum(area(t) for t in clipped[source == 1]), 0.5 - 0.125)
+        self.assertAlmostEqual(area(clipped[source == 2][0]), 0.125)
+        self.assertTrue(all(area(t) > 0 for t in clipped))
+
+if __name__ == '__main__':
+    try:
+        unittest.main(exit=False)
+    finally:
+        test_results.save_results()
+        logger.info("Test results have been saved")
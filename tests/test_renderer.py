@@ -2,13 +2,18 @@ import unittest
 import sys
 import os
 import curses
+import numpy as np
 from unittest.mock import MagicMock, patch
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from renderer import Renderer
+from render_backend import MemoryBackend, CursesBackend
 from logger_config import setup_logger
 from test_results import TestResults
 from vector import Vector3
 from light import DirectionalLight
+from camera import Camera
+from scene import Scene
+from object import Object3D, Cube, Plane
 
 logger = setup_logger('renderer_tests')
 test_results = TestResults()
@@ -101,6 +106,295 @@ class TestRenderer(unittest.TestCase):
         self.renderer.render(mock_scene, mock_camera)
         self.mock_screen.refresh.assert_called_once()
 
+    def test_project_vertices(self):
+        """Test batched projection of vertices to screen coordinates"""
+        self.renderer.width = 100
+        self.renderer.height = 50
+        camera = Camera(position=(0, 0, -10), target=(0, 0, 0))
+        matrix = self.renderer._view_projection(camera)
+        
+        vertices = [Vector3(0, 0, 0), Vector3(0, 0, -20), Vector3(1000, 0, 0)]
+        packed = self.renderer._pack_vertices(vertices)
+        self.assertEqual(packed.shape, (3, 3))
+        
+        screen_x, screen_y, depth, visible = self.renderer.project_vertices(packed, matrix)
+        # Origin projects to the screen center
+        self.assertEqual((screen_x[0], screen_y[0]), (50, 25))
+        self.assertTrue(-1.0 <= depth[0] <= 1.0)
+        # Point behind the camera and point far off-screen are rejected
+        self.assertEqual(visible.tolist(), [True, False, False])
+
+    def test_render_objects(self):
+        """Test rendering of scene objects with their model transform"""
+        self.mock_screen.getmaxyx.return_value = (50, 100)
+        self.renderer.backend = CursesBackend(self.mock_screen)
+        self.renderer._initialized = True
+        
+        scene = Scene()
+        # Object without faces is drawn as points
+        cube = Object3D(vertices=Cube(2.0).vertices)
+        scene.add_object(cube)
+        self.renderer.render(scene, Camera())
+        self.assertEqual(self.mock_screen.addch.call_count, 8)
+        self.mock_screen.clear.assert_not_called()
+        
+        # Moving the object must move its projected points
+        def drawn_cells():
+            front = self.renderer.framebuffer.front
+            return sorted(zip(*(front != ord(' ')).nonzero()))
+        
+        first = drawn_cells()
+        cube.translate(0, 3, 0)
+        self.renderer.render(scene, Camera())
+        second = drawn_cells()
+        self.assertEqual(len(second), 8)
+        self.assertTrue(all(b[0] < a[0] for a, b in zip(first, second)))
+        
+        # Unchanged frame produces no terminal output
+        self.mock_screen.addch.reset_mock()
+        self.renderer.render(scene, Camera())
+        self.mock_screen.addch.assert_not_called()
+
+    def test_render_faces(self):
+        """Test filled rasterization of object faces"""
+        self.renderer = Renderer(backend=MemoryBackend(80, 40))
+        self.renderer.initialize()
+        
+        scene = Scene()
+        scene.add_object(Cube(2.0))
+        self.renderer.render(scene, Camera())
+        
+        framebuffer = self.renderer.framebuffer
+        drawn = framebuffer.chars != ord(' ')
+        # A filled cube covers a solid block of cells around the center
+        self.assertGreater(drawn.sum(), 50)
+        self.assertTrue(drawn[20, 38:42].all())
+        self.assertTrue(np.isfinite(framebuffer.depth[drawn]).all())
+        # The front face is nearer than the cube center
+        center_depth = framebuffer.depth[20, 40]
+        self.assertLess(center_depth, self.renderer._project(np.zeros((1, 3)), self.renderer._view_projection(Camera()))[2][0])
+
+    def test_render_lighting(self):
+        """Test flat and per-fragment shading of faces with caching"""
+        self.renderer = Renderer(backend=MemoryBackend(80, 40))
+        self.renderer.initialize()
+        
+        scene = Scene()
+        scene.add_object(Cube(2.0))
+        camera = Camera()
+        # Light shines along +Z, straight onto the face turned to the camera
+        self.renderer.lights = [DirectionalLight(Vector3(0, 0, 1), 1.0)]
+        self.renderer.render(scene, camera)
+        lit = self.renderer.framebuffer.chars[20, 40]
+        ramp = self.renderer.ascii_chars
+        self.assertGreaterEqual(ramp.index(chr(lit)), len(ramp) - 2)
+        self.assertEqual(self.renderer.face_cache.hits, 0)
+        
+        # Static scene reuses cached face intensities
+        self.renderer.render(scene, camera)
+        self.assertEqual(self.renderer.face_cache.hits, self.renderer.face_cache.misses)
+        
+        # Camera moves re-shade only the view-dependent highlights
+        misses = self.renderer.face_cache.misses
+        specular_misses = self.renderer.specular_cache.misses
+        camera.position = [0.5, 0.5, -10]
+        self.renderer.render(scene, camera)
+        self.assertEqual(self.renderer.face_cache.misses, misses)
+        self.assertGreater(self.renderer.specular_cache.misses, specular_misses)
+        camera.position = [0, 0, -10]
+        
+        self.renderer.shading = 'fragment'
+        self.renderer.render(scene, camera)
+        self.assertEqual(self.renderer.framebuffer.chars[20, 40], lit)
+
+    def test_headless_backend(self):
+        """Test rendering into memory without a terminal"""
+        backend = MemoryBackend(60, 20)
+        renderer = Renderer(backend=backend)
+        renderer.initialize()
+        self.assertEqual((renderer.width, renderer.height), (60, 20))
+        
+        scene = Scene()
+        scene.add_object(Cube(2.0))
+        renderer.render(scene, Camera())
+        self.assertEqual(backend.frames, 1)
+        self.assertTrue(np.array_equal(backend.chars, renderer.framebuffer.chars))
+        self.assertTrue(np.array_equal(backend.depth, renderer.framebuffer.depth))
+        lines = backend.lines()
+        self.assertEqual(len(lines), 20)
+        self.assertTrue(any(line.strip() for line in lines))
+        written = backend.cells_written
+        self.assertGreater(written, 0)
+        
+        # Static frame writes nothing, resize redraws everything
+        renderer.render(scene, Camera())
+        self.assertEqual(backend.cells_written, 0)
+        backend.resize(80, 30)
+        renderer.render(scene, Camera())
+        self.assertEqual(renderer.framebuffer.chars.shape, (30, 80))
+        self.assertGreater(backend.cells_written, 0)
+        
+    def test_parallel_render(self):
+        """Test that tile-parallel rendering matches serial rendering"""
+        scene = Scene()
+        for x in (-3.0, 0.0, 3.0):
+            cube = Cube(1.5)
+            cube.position = Vector3(x, 0, 0)
+            cube.rotation = Vector3(0.4, x * 0.2, 0)
+            scene.add_object(cube)
+        lights = [DirectionalLight(Vector3(-1, -1, 1), 1.0)]
+
+        frames = []
+        for parallel in (False, True):
+            renderer = Renderer(backend=MemoryBackend(90, 40), parallel=parallel, workers=2)
+            if parallel:
+                renderer.parallel.min_triangles = 0
+            renderer.initialize(lights=lights)
+            renderer.render(scene, Camera())
+            frames.append(renderer.backend.lines())
+            if parallel:
+                self.assertEqual(renderer.parallel.last_mode, 'parallel')
+            renderer.close()
+        self.assertEqual(frames[0], frames[1])
+
+    def test_parallel_calibration(self):
+        """Test that the parallel threshold is measured in initialize, not in a frame"""
+        renderer = Renderer(backend=MemoryBackend(60, 20), parallel=True, workers=2)
+        calls = []
+        renderer.parallel.calibrate = lambda width, height: calls.append((width, height))
+        renderer.initialize()
+        self.assertEqual(calls, [(60, 20)])
+        renderer.parallel.min_triangles = float('inf')
+        renderer.initialize()
+        renderer.render(Scene(), Camera())
+        self.assertEqual(len(calls), 1)
+        renderer.close()
+
+        preset = Renderer(backend=MemoryBackend(60, 20), parallel=True, workers=2, min_triangles=0)
+        preset.parallel.calibrate = lambda width, height: calls.append((width, height))
+        preset.initialize()
+        self.assertEqual(len(calls), 1)
+        preset.close()
+
+    def test_frustum_culling(self):
+        """Test that objects outside the view frustum are skipped"""
+        renderer = Renderer(backend=MemoryBackend(80, 40))
+        renderer.initialize()
+        scene = Scene()
+        visible = Cube(2.0)
+        behind = Cube(2.0)
+        behind.translate(0, 0, -30)
+        aside = Cube(2.0)
+        aside.translate(200, 0, 0)
+        for obj in (visible, behind, aside):
+            scene.add_object(obj)
+        
+        renderer.render(scene, Camera())
+        self.assertEqual(renderer.culled_objects, 2)
+        frame = renderer.backend.lines()
+        
+        # Culling must not change what is drawn
+        renderer.frustum_culling = False
+        renderer.render(scene, Camera())
+        self.assertEqual(renderer.culled_objects, 0)
+        self.assertEqual(renderer.backend.lines(), frame)
+        
+        # Partially visible object is kept
+        aside.position = Vector3(4.5, 0, 0)
+        renderer.frustum_culling = True
+        renderer.render(scene, Camera())
+        self.assertEqual(renderer.culled_objects, 1)
+        
+    def test_backface_and_near_clipping(self):
+        """Test back-face rejection and clipping of faces crossing the near plane"""
+        renderer = Renderer(backend=MemoryBackend(80, 40))
+        renderer.initialize()
+        scene = Scene()
+        cube = Cube(2.0)
+        cube.rotate(0.5, 0.7, 0)
+        scene.add_object(cube)
+        
+        renderer.render(scene, Camera())
+        culled = renderer.backend.lines()
+        renderer.backface_culling = False
+        renderer.render(scene, Camera())
+        self.assertEqual(renderer.backend.lines(), culled)
+        
+        # Back faces are rejected before rasterization
+        batches = []
+        flush = renderer._flush_batch
+        def record():
+            batches.append(sum(len(codes) for _, _, _, codes in renderer._batch))
+            flush()
+        renderer._flush_batch = record
+        renderer.backface_culling = True
+        renderer.render(scene, Camera())
+        renderer.backface_culling = False
+        renderer.render(scene, Camera())
+        self.assertEqual(batches, [6, 12])
+        
+        # A ground plane passing under the camera is clipped, not dropped
+        renderer.backface_culling = True
+        ground = Plane(200.0, 200.0)
+        ground.translate(0, -2, 0)
+        scene = Scene()
+        scene.add_object(ground)
+        renderer.render(scene, Camera())
+        lines = renderer.backend.lines()
+        self.assertEqual(lines[-1].strip(' '), '.' * 80)
+        self.assertFalse(lines[0].strip())
+        
+    def test_quality_settings(self):
+        """Test reduced internal resolution and light limit"""
+        backend = MemoryBackend(80, 40)
+        renderer = Renderer(backend=backend)
+        renderer.initialize()
+        scene = Scene()
+        cube = Cube(2.0)
+        cube.rotate(0.4, 0.6, 0)
+        scene.add_object(cube)
+        
+        renderer.render(scene, Camera())
+        full = backend.lines()
+        renderer.resolution_scale = 0.5
+        renderer.render(scene, Camera())
+        self.assertEqual(renderer.framebuffer.chars.shape, (20, 40))
+        self.assertEqual((renderer.width, renderer.height), (40, 20))
+        # The low-resolution frame is stretched to the whole screen
+        self.assertEqual(backend.chars.shape, (40, 80))
+        self.assertTrue((backend.chars[::2, ::2] == renderer.framebuffer.chars).all())
+        self.assertTrue((backend.chars[1::2, 1::2] == renderer.framebuffer.chars).all())
+        # Back to full resolution the screen matches a fresh full-size frame
+        renderer.resolution_scale = 1.0
+        renderer.render(scene, Camera())
+        self.assertEqual(backend.lines(), full)
+        
+        bright = DirectionalLight(Vector3(0, 0, 1), 1.0)
+        dim = DirectionalLight(Vector3(1, 0, 0), 0.2)
+        renderer.lights = [dim, bright]
+        renderer.max_lights = 1
+        self.assertEqual(renderer._active_lights(), [bright])
+        renderer.max_lights = None
+        self.assertEqual(renderer._active_lights(), [dim, bright])
+        
+    def test_render_requires_backend(self):
+        """Test that rendering without a backend is rejected"""
+        with self.assertRaises(RuntimeError):
+            self.renderer.render(Scene(), Camera())
+        with self.assertRaises(ValueError):
+            self.renderer.initialize()
+
+    def test_render_requires_initialize(self):
+        """Test that a renderer with a backend still has to be initialized"""
+        renderer = Renderer(backend=MemoryBackend(40, 20))
+        with self.assertRaises(RuntimeError):
+            renderer.render(Scene(), Camera())
+        self.assertIsNone(renderer.framebuffer)
+        self.assertEqual(renderer.backend.frames, 0)
+        renderer.initialize()
+        renderer.render(Scene(), Camera())
+        self.assertEqual(renderer.backend.frames, 1)
+
 if __name__ == '__main__':
     try:
         unittest.main(exit=False)
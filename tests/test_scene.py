@@ -2,7 +2,10 @@ import unittest
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import numpy as np
 from scene import Scene
+from object import Object3D, Cube
+from vector import BoundVector3, Quaternion, Vector3
 from logger_config import setup_logger
 from test_results import TestResults
 
@@ -78,6 +81,137 @@ class TestScene(unittest.TestCase):
         self.assertIn(obj1, objects)
         self.assertIn(obj2, objects)
 
+    def test_handles(self):
+        """Test stable handles, batch add/remove and deterministic order"""
+        objects = [MockObject() for _ in range(6)]
+        handles = self.scene.add_objects(objects)
+        self.assertEqual(handles, list(range(6)))
+        self.assertEqual(self.scene.add_object(objects[0]), 0)
+        self.assertEqual(len(self.scene.objects), 6)
+        self.scene.remove_objects([objects[1], objects[4]])
+        self.assertEqual(self.scene.objects, [objects[i] for i in (0, 2, 3, 5)])
+        self.assertIsNone(self.scene.handle_of(objects[1]))
+        self.assertIs(self.scene.get_object(handles[3]), objects[3])
+        with self.assertRaises(KeyError):
+            self.scene.get_object(handles[1])
+        # Дескрипторы не переиспользуются
+        self.assertEqual(self.scene.add_object(objects[1]), 6)
+        self.assertIs(self.scene.objects[-1], objects[1])
+        self.scene.update(0.1)
+        self.assertTrue(all(obj.updated for obj in self.scene.objects))
+
+    def test_transform_store(self):
+        """Test that object transforms live in scene arrays and update in one batch"""
+        cubes = [Cube(1.0) for _ in range(100)]
+        for i, cube in enumerate(cubes):
+            cube.position = Vector3(i, 0.0, 0.0)
+        handles = self.scene.add_objects(cubes)
+        store = self.scene.transforms
+        self.assertEqual(len(store), 100)
+        self.assertIsInstance(cubes[5].position, BoundVector3)
+        self.assertTrue(np.array_equal(store.positions[:100, 0], np.arange(100)))
+
+        self.assertEqual(len(self.scene.update_transforms()), 100)
+        self.assertEqual(self.scene.update_transforms(), [])
+        cubes[7].position.y = 2.0
+        cubes[9].scale = Vector3(2.0, 2.0, 2.0)
+        cubes[11].orientation = Quaternion.from_axis_angle(Vector3(0, 1, 0), 0.5)
+        self.scene.set_transforms([handles[13]], rotations=[(0.1, 0.2, 0.3)])
+        changed = self.scene.update_transforms()
+        self.assertEqual(changed, [cubes[i] for i in (7, 9, 11, 13)])
+        for cube in cubes:
+            self.assertTrue(np.allclose(cube.transform().data, cube._world_matrix.data))
+        expected = Object3D()
+        expected.position = Vector3(13.0, 0.0, 0.0)
+        expected.rotation = Vector3(0.1, 0.2, 0.3)
+        self.assertTrue(np.allclose(cubes[13].transform().data, expected.transform().data))
+        positions, rotations, scales = self.scene.get_transforms(handles[7:10])
+        self.assertEqual(positions[0].tolist(), [7.0, 2.0, 0.0])
+        self.assertEqual(scales[2].tolist(), [2.0, 2.0, 2.0])
+
+        # Удаление переносит последнюю строку на место удаленной
+        self.scene.remove_object(cubes[3])
+        self.assertEqual(len(store), 99)
+        self.assertEqual(cubes[3].position, Vector3(3.0, 0.0, 0.0))
+        cubes[3].position.x = 50.0
+        self.assertEqual(cubes[99].position, Vector3(99.0, 0.0, 0.0))
+        cubes[99].position.x = -1.0
+        self.assertEqual(store.positions[cubes[99]._transform_slot, 0], -1.0)
+        with self.assertRaises(ValueError):
+            self.scene.set_transforms([self.scene.add_object(MockObject())], positions=[(0, 0, 0)])
+
+        # Рост массивов сохраняет привязку векторов объектов
+        more = [Cube(1.0) for _ in range(200)]
+        self.scene.add_objects(more)
+        cubes[50].position.z = 4.0
+        self.assertEqual(store.positions[cubes[50]._transform_slot].tolist(), [50.0, 0.0, 4.0])
+        self.assertIn(cubes[50], self.scene.update_transforms())
+
+    def test_transform_references_survive_add(self):
+        """Test that transform vectors held before add_object keep driving the object"""
+        cube = Cube(1.0)
+        position, scale = cube.position, cube.scale
+        self.scene.add_object(cube)
+        self.assertIs(cube.position, position)
+        position.x = 7.0
+        scale.set(2.0, 2.0, 2.0)
+        self.assertEqual(cube.position.x, 7.0)
+        self.assertEqual(self.scene.transforms.positions[0].tolist(), [7.0, 0.0, 0.0])
+        self.assertTrue(np.allclose(cube.transform().data[:3, 3], [7.0, 0.0, 0.0]))
+        self.assertTrue(np.allclose(np.diag(cube.transform().data)[:3], [2.0, 2.0, 2.0]))
+        # Присваивание копирует координаты, вектор объекта остается прежним
+        cube.position = Vector3(1.0, 2.0, 3.0)
+        self.assertIs(cube.position, position)
+        self.scene.remove_object(cube)
+        position.y = 5.0
+        self.assertIs(cube.position, position)
+        self.assertEqual(cube.position, Vector3(1.0, 5.0, 3.0))
+
+    def test_hierarchy(self):
+        """Test subtree add/remove and world matrix propagation down dirty subtrees"""
+        building = Object3D()
+        rooms = [Object3D() for _ in range(3)]
+        chairs = [Cube(1.0) for _ in range(3)]
+        for room, chair in zip(rooms, chairs):
+            building.add_child(room)
+            room.add_child(chair)
+            chair.position = Vector3(0.0, 0.0, 1.0)
+        handle = self.scene.add_object(building)
+        self.assertEqual(self.scene.get_object(handle), building)
+        self.assertEqual(len(self.scene.objects), 7)
+        self.assertEqual(len(self.scene.update_transforms()), 7)
+        self.assertEqual(self.scene.update_transforms(), [])
+
+        # Перемещение родителя пересчитывает только его поддерево
+        rooms[1].position.x = 2.0
+        self.assertEqual(self.scene.update_transforms(), [rooms[1], chairs[1]])
+        building.rotation.y = np.pi / 2
+        self.assertEqual(len(self.scene.update_transforms()), 7)
+        self.assertTrue(np.allclose(chairs[1].transform().data[:3, 3], (1.0, 0.0, -2.0)))
+        # Ключ кэша потомка учитывает изменения предков
+        building.position.y = 3.0
+        self.assertAlmostEqual(chairs[0].transform()[1][3], 3.0)
+
+        # Смена родителя внутри сцены
+        chairs[2].set_parent(rooms[1])
+        self.assertTrue(np.allclose(chairs[2].transform().data[:3, 3], (1.0, 3.0, -2.0)))
+        with self.assertRaises(ValueError):
+            building.add_child(Object3D())
+        orphan = Object3D()
+        Object3D().add_child(orphan)
+        with self.assertRaises(ValueError):
+            self.scene.add_object(orphan)
+
+        # Удаление поддерева отсоединяет его от родителя, оставшегося в сцене
+        self.scene.remove_object(rooms[1])
+        self.assertEqual(len(self.scene.objects), 4)
+        self.assertIsNone(rooms[1].parent)
+        self.assertEqual(rooms[1].children, [chairs[1], chairs[2]])
+        self.assertNotIn(rooms[1], building.children)
+        self.assertTrue(np.allclose(chairs[1].transform().data[:3, 3], (2.0, 0.0, 1.0)))
+        rooms[0].position.z = 1.0
+        self.assertEqual(self.scene.update_transforms(), [rooms[0], chairs[0]])
+
 if __name__ == '__main__':
     try:
         unittest.main(exit=False)
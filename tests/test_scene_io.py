@@ -0,0 +1,165 @@
+import unittest
+import sys
+import os
+import mmap
+import shutil
+import tempfile
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scene_io import ALIGNMENT, load_scene, save_scene
+from scene import Scene
+from camera import Camera
+from light import DirectionalLight, Light
+from object import Object3D, Cube, Plane
+from primitives import Sphere
+from vector import Quaternion, Vector3
+from logger_config import setup_logger
+from test_results import TestResults
+
+logger = setup_logger('scene_io_tests')
+test_results = TestResults()
+
+def mapped_base(array):
+    """Объект, владеющий памятью массива (в конце цепочки представлений)"""
+    while isinstance(array, np.ndarray):
+        array = array.base
+    return array.obj if isinstance(array, memoryview) else array
+
+class TestSceneIO(unittest.TestCase):
+    def setUp(self):
+        self.logger = logger
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'demo.scene')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+        test_name = self._testMethodName
+        if hasattr(self, '_outcome'):
+            result = self._outcome.result
+            if len(result.failures) > 0 or len(result.errors) > 0:
+                status = "FAILED"
+                self.logger.error(f"Test {test_name} failed")
+            else:
+                status = "PASSED"
+                self.logger.info(f"Test {test_name} passed")
+            test_results.add_result(test_name, status)
+
+    def build_scene(self):
+        scene = Scene()
+        cube = Cube(2.0)
+        cube.color = "#FF0000"
+        cube.double_sided = True
+        cube.orientation = Quaternion.from_axis_angle(Vector3(0, 1, 0), 0.3)
+        child = Cube(2.0)
+        child.position = Vector3(3.0, 0.0, 0.0)
+        cube.add_child(child)
+        ground = Plane(10.0, 10.0)
+        ground.translate(0, -2, 0)
+        ground.specular = 0.0
+        quad = Object3D([Vector3(0, 0, 0), Vector3(1, 0, 0), Vector3(1, 1, 0), Vector3(0, 1, 0)],
+                        [(0, 1, 2, 3)])
+        scene.add_objects([cube, ground, quad, Sphere(1.0), Object3D()])
+        scene.add_light(DirectionalLight(Vector3(-1, -1, 1), 0.8))
+        scene.add_light(Light(Vector3(1, 2, 3), 0.5, "#00FF00"))
+        return scene
+
+    def test_round_trip(self):
+        """Test that transforms, hierarchy, materials, lights, camera and geometry survive a round trip"""
+        scene = self.build_scene()
+        save_scene(self.path, scene, Camera(position=(1, 2, -5), fov=70.0))
+        loaded, camera = load_scene(self.path)
+
+        self.assertEqual(len(loaded.objects), len(scene.objects))
+        for original, copy in zip(scene.objects, loaded.objects):
+            self.assertTrue(np.allclose(original.transform().data, copy.transform().data))
+            self.assertEqual(copy.color, original.color)
+            self.assertEqual(copy.double_sided, original.double_sided)
+            self.assertEqual((copy.ambient, copy.diffuse, copy.specular),
+                             (original.ambient, original.diffuse, original.specular))
+            self.assertEqual([tuple(face) for face in copy.faces], [tuple(face) for face in original.faces])
+            self.assertEqual(np.asarray(copy.vertices).tolist(), np.asarray(original.vertices).tolist())
+        self.assertIs(loaded.objects[1].parent, loaded.objects[0])
+        self.assertEqual(loaded.objects[0].orientation, scene.objects[0].orientation)
+        # Сетка, общая для двух кубов, записывается один раз
+        self.assertIs(loaded.objects[0].mesh, loaded.objects[1].mesh)
+        sphere = loaded.objects[4].mesh
+        self.assertTrue(np.allclose(sphere.vertex_normals, scene.objects[4].mesh.vertex_normals))
+        self.assertIsNone(loaded.objects[5].mesh)
+        # Собственная геометрия объекта записывается без временной сетки
+        quad = scene.objects[3]
+        self.assertIsNone(quad.mesh)
+        copy = loaded.objects[3].mesh
+        self.assertEqual(copy.triangles.tolist(), [[0, 1, 2], [0, 2, 3]])
+        self.assertEqual(copy.triangle_faces.tolist(), [0, 0])
+        self.assertTrue(np.allclose(copy.normals, quad.get_face_normals()))
+        bounds = quad.get_bounds()
+        self.assertEqual((copy.bounds.minimum, copy.bounds.maximum, copy.bounds.center),
+                         (bounds.minimum, bounds.maximum, bounds.center))
+        self.assertAlmostEqual(copy.bounds.radius, bounds.radius)
+
+        self.assertEqual(camera.position, [1.0, 2.0, -5.0])
+        self.assertEqual(camera.fov, 70.0)
+        self.assertEqual([type(light) for light in loaded.lights], [DirectionalLight, Light])
+        self.assertEqual(loaded.lights[0].direction, scene.lights[0].direction)
+        self.assertEqual(loaded.lights[1].color, "#00FF00")
+        self.assertEqual(loaded.lights[1].intensity, 0.5)
+
+    def test_memory_mapped_geometry(self):
+        """Test that geometry arrays are read-only, aligned views of the mapped file"""
+        save_scene(self.path, self.build_scene())
+        loaded, camera = load_scene(self.path)
+        self.assertIsNone(camera)
+        mesh = loaded.objects[4].mesh
+        for array in (mesh.vertices.data, mesh.triangles, mesh.normals, mesh.triangle_faces):
+            self.assertIsInstance(mapped_base(array), mmap.mmap)
+            self.assertFalse(array.flags.writeable)
+            self.assertEqual(array.__array_interface__['data'][0] % ALIGNMENT, 0)
+        # Многоугольные грани остаются представлениями до первого обращения
+        faces = loaded.objects[0].mesh.faces
+        self.assertEqual(len(faces), 6)
+        self.assertFalse(faces.decoded)
+        for array in (faces.sizes, faces.indices):
+            self.assertIsInstance(mapped_base(array), mmap.mmap)
+        self.assertEqual(tuple(faces[0]), tuple(self.build_scene().objects[0].faces[0]))
+        self.assertTrue(faces.decoded)
+        # Изменение объекта не затрагивает отображенную сетку
+        obj = loaded.objects[4]
+        obj.update_vertices([0], [(9.0, 9.0, 9.0)])
+        self.assertNotEqual(mesh.vertices.data[0].tolist(), [9.0, 9.0, 9.0])
+
+    def test_invalid_files(self):
+        """Test that foreign, truncated and unknown-version snapshots are rejected"""
+        with open(self.path, 'wb') as f:
+            f.write(b'\0' * 256)
+        with self.assertRaises(ValueError):
+            load_scene(self.path)
+        save_scene(self.path, self.build_scene())
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        with open(self.path, 'wb') as f:
+            f.write(data[:-8])
+        with self.assertRaises(ValueError):
+            load_scene(self.path)
+        for version in (0, 99):
+            with open(self.path, 'wb') as f:
+                f.write(data[:8] + version.to_bytes(4, 'little') + data[12:])
+            with self.assertRaises(ValueError):
+                load_scene(self.path)
+
+        broken = Object3D([Vector3(0, 0, 0), Vector3(1, 0, 0), Vector3(1, 1, 0)], [(0, 1, 5)])
+        scene = Scene()
+        scene.add_object(broken)
+        with self.assertRaises(ValueError):
+            save_scene(self.path, scene)
+        scene = Scene()
+        scene.add_object(object())
+        with self.assertRaises(ValueError):
+            save_scene(self.path, scene)
+        self.assertFalse(os.path.exists(self.path + f".{os.getpid()}.tmp"))
+
+if __name__ == '__main__':
+    try:
+        unittest.main(exit=False)
+    finally:
+        test_results.save_results()
+        logger.info("Test results have been saved")
@@ -0,0 +1,128 @@
+import unittest
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from shading import LightArrays, FaceShadingCache, face_normals, shade, shade_diffuse, shade_specular
+from rasterizer import triangulate_faces
+from light import Light, DirectionalLight
+from object import Cube
+from vector import Vector3
+from logger_config import setup_logger
+from test_results import TestResults
+
+logger = setup_logger('shading_tests')
+test_results = TestResults()
+
+class TestShading(unittest.TestCase):
+    def setUp(self):
+        self.logger = logger
+        
+    def tearDown(self):
+        test_name = self._testMethodName
+        if hasattr(self, '_outcome'):
+            result = self._outcome.result
+            if len(result.failures) > 0 or len(result.errors) > 0:
+                status = "FAILED"
+                self.logger.error(f"Test {test_name} failed")
+            else:
+                status = "PASSED"
+                self.logger.info(f"Test {test_name} passed")
+            test_results.add_result(test_name, status)
+
+    def test_light_arrays(self):
+        """Test packing of directional and point lights"""
+        lights = LightArrays([DirectionalLight(Vector3(0, -2, 0), 0.8),
+                              Light(Vector3(1, 2, 3), 0.5),
+                              "not a light"])
+        self.assertEqual(len(lights), 2)
+        np.testing.assert_allclose(lights.directions, [[0, 1, 0]])
+        np.testing.assert_allclose(lights.positions, [[1, 2, 3]])
+        self.assertEqual(lights.key, LightArrays([DirectionalLight(Vector3(0, -2, 0), 0.8),
+                                                  Light(Vector3(1, 2, 3), 0.5)]).key)
+
+    def test_ambient_and_diffuse(self):
+        """Test ambient plus diffuse terms for several points at once"""
+        lights = LightArrays([DirectionalLight(Vector3(0, -1, 0), 0.8)])
+        normals = np.array([[0, 1, 0], [0, -1, 0], [1, 0, 0]], dtype=float)
+        positions = np.zeros((3, 3))
+        view_dirs = np.tile([0.0, 0.0, 1.0], (3, 1))
+        intensity = shade(normals, positions, view_dirs, lights, specular=0.0)
+        # Ambient (0.2) + Diffuse (0.8 * 1.0) = 1.0 for the surface facing the light
+        np.testing.assert_allclose(intensity, [1.0, 0.2, 0.2])
+
+    def test_point_light_and_specular(self):
+        """Test per-point light direction and specular highlight"""
+        lights = LightArrays([Light(Vector3(0, 0, 5), 1.0)])
+        normals = np.array([[0, 0, 1], [0, 0, 1]], dtype=float)
+        positions = np.array([[0, 0, 0], [100, 0, 0]], dtype=float)
+        view_dirs = np.array([[0, 0, 1], [0, 0, 1]], dtype=float)
+        intensity = shade(normals, positions, view_dirs, lights, ambient=0.0, diffuse=0.5,
+                          specular=1.0, specular_intensity=0.5)
+        self.assertAlmostEqual(intensity[0], 1.0)
+        self.assertLess(intensity[1], 0.1)
+
+    def test_split_terms(self):
+        """Test that view-independent and specular terms add up to the full model"""
+        lights = LightArrays([Light(Vector3(0, 0, 5), 0.8), DirectionalLight(Vector3(1, -1, 0), 0.6)])
+        rng = np.random.default_rng(3)
+        normals = rng.normal(size=(50, 3))
+        normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+        positions = rng.normal(size=(50, 3))
+        view_dirs = rng.normal(size=(50, 3))
+        view_dirs /= np.linalg.norm(view_dirs, axis=1, keepdims=True)
+        material = dict(ambient=0.3, diffuse=0.9, specular=0.7, ambient_intensity=0.4,
+                        specular_power=8.0, specular_intensity=0.5)
+        base = shade_diffuse(normals, positions, lights, 0.3, 0.9, 0.4)
+        highlight = shade_specular(normals, positions, view_dirs, lights, 0.7, 8.0, 0.5)
+        self.assertTrue((highlight >= 0).all())
+        np.testing.assert_allclose(np.clip(base + highlight, 0.0, 1.0),
+                                   shade(normals, positions, view_dirs, lights, **material))
+
+    def test_face_normals_point_outward(self):
+        """Test that cube face normals point away from the center"""
+        cube = Cube(2.0)
+        vertices = np.array([(v.x, v.y, v.z) for v in cube.vertices])
+        triangles, _ = triangulate_faces(cube.faces)
+        normals = face_normals(vertices, triangles)
+        centers = vertices[triangles].mean(axis=1)
+        self.assertTrue((np.einsum('ij,ij->i', normals, centers) > 0).all())
+
+    def test_face_cache(self):
+        """Test that only changed faces are re-shaded"""
+        cache = FaceShadingCache()
+        normals = np.array([[0, 1, 0], [1, 0, 0], [0, 0, 1]], dtype=float)
+        centers = np.zeros((3, 3))
+        calls = []
+        current = [normals]
+        
+        def compute(mask):
+            calls.append(np.arange(3)[mask].tolist())
+            return current[0][mask, 0] + 0.5
+            
+        cache.get(1, 'key', normals, centers, compute)
+        cache.get(1, 'key', normals, centers, compute)
+        moved = normals.copy()
+        moved[2] = [1, 0, 0]
+        current[0] = moved
+        values = cache.get(1, 'key', moved, centers, compute)
+        self.assertEqual(calls, [[0, 1, 2], [2]])
+        np.testing.assert_allclose(values, [0.5, 1.5, 1.5])
+        self.assertEqual((cache.hits, cache.misses), (5, 4))
+        
+        # Changed light set invalidates all faces
+        cache.get(1, 'other', moved, centers, compute)
+        self.assertEqual(calls[-1], [0, 1, 2])
+        
+        # Objects not drawn in a frame are dropped
+        cache.begin_frame()
+        cache.end_frame()
+        cache.get(1, 'other', moved, centers, compute)
+        self.assertEqual(len(calls), 4)
+
+if __name__ == '__main__':
+    try:
+        unittest.main(exit=False)
+    finally:
+        test_results.save_results()
+        logger.info("Test results have been saved")
@@ -1,6 +1,7 @@
 import unittest
-from vector import Vector3, Matrix4
+from vector import Vector3, Vector3Array, Matrix4, Quaternion
 import math
+import numpy as np
 
 class TestVector3(unittest.TestCase):
     def test_initialization(self):
@@ -44,6 +45,68 @@ class TestVector3(unittest.TestCase):
         self.assertAlmostEqual(normalized.z, 0.0)
         self.assertAlmostEqual(normalized.length(), 1.0)
 
+    def test_slots(self):
+        v = Vector3(1, 2, 3)
+        self.assertFalse(hasattr(v, '__dict__'))
+        with self.assertRaises(AttributeError):
+            v.w = 1.0
+    
+    def test_in_place_operators(self):
+        v = Vector3(1, 2, 3)
+        original = v
+        v += Vector3(1, 1, 1)
+        v -= Vector3(0, 1, 0)
+        v *= 2
+        v /= 4
+        self.assertIs(v, original)
+        self.assertEqual(v, Vector3(1, 1, 2))
+        with self.assertRaises(ValueError):
+            v /= 0
+    
+    def test_normalize_ip(self):
+        v = Vector3(3, 4, 0)
+        self.assertIs(v.normalize_ip(), v)
+        self.assertAlmostEqual(v.x, 0.6)
+        self.assertAlmostEqual(v.y, 0.8)
+        zero = Vector3()
+        self.assertEqual(zero.normalize_ip(), Vector3())
+    
+    def test_cross_ip(self):
+        v = Vector3(1, 0, 0)
+        self.assertIs(v.cross_ip(Vector3(0, 1, 0)), v)
+        self.assertEqual(v, Vector3(0, 0, 1))
+        self.assertEqual(Vector3(1, 0, 0).cross(Vector3(0, 1, 0)), v)
+    
+    def test_operators(self):
+        a = Vector3(1, 2, 3)
+        b = Vector3(4, 5, 6)
+        self.assertEqual(a @ b, 32.0)
+        self.assertEqual(-a, Vector3(-1, -2, -3))
+        self.assertEqual(2 * a, a * 2)
+        self.assertNotEqual(a, b)
+        self.assertNotEqual(a, (1.0, 2.0, 3.0))
+        self.assertEqual(list(a), [1.0, 2.0, 3.0])
+        self.assertEqual(a.copy(), a)
+        self.assertIsNot(a.copy(), a)
+    
+    def test_unhashable(self):
+        a = Vector3(1, 2, 3)
+        self.assertEqual(a, Vector3(1, 2, 3))
+        # Изменяемый вектор со сравнением по значению не может быть ключом
+        with self.assertRaises(TypeError):
+            hash(a)
+        with self.assertRaises(TypeError):
+            {a}
+        self.assertIn(tuple(a), {tuple(Vector3(1, 2, 3))})
+    
+    def test_from_floats(self):
+        v = Vector3.from_floats(1.5, 2.5, 3.5)
+        self.assertEqual(v, Vector3(1.5, 2.5, 3.5))
+        self.assertIsInstance(v, Vector3)
+        self.assertIs(v.set(1, 2, 3), v)
+        self.assertEqual(v.x, 1.0)
+        self.assertIsInstance(v.x, float)
+
 class TestMatrix4(unittest.TestCase):
     def test_identity(self):
         m = Matrix4()
@@ -58,4 +121,163 @@ class TestMatrix4(unittest.TestCase):
         m = Matrix4.translation(2, 3, 4)
         self.assertEqual(m.data[0][3], 2.0)
         self.assertEqual(m.data[1][3], 3.0)
-        self.assertEqual(m.data[2][3], 4.0)
\ No newline at end of file
+        self.assertEqual(m.data[2][3], 4.0)
+
+    def test_multiplication(self):
+        a = Matrix4.rotation_x(0.3) * Matrix4.scale(2, 3, 4)
+        b = Matrix4.translation(1, 2, 3) * Matrix4.rotation_z(0.7)
+        product = a * b
+        for i in range(4):
+            for j in range(4):
+                expected = sum(a.data[i][k] * b.data[k][j] for k in range(4))
+                self.assertAlmostEqual(product.data[i][j], expected)
+        self.assertIsInstance(product, Matrix4)
+    
+    def test_transform_point_and_direction(self):
+        m = Matrix4.translation(1, 2, 3) * Matrix4.rotation_z(math.pi / 2)
+        point = m * Vector3(1, 0, 0)
+        self.assertIsInstance(point, Vector3)
+        self.assertAlmostEqual(point.x, 1.0)
+        self.assertAlmostEqual(point.y, 3.0)
+        self.assertAlmostEqual(point.z, 3.0)
+        direction = m.transform_direction(Vector3(1, 0, 0))
+        self.assertAlmostEqual(direction.x, 0.0)
+        self.assertAlmostEqual(direction.y, 1.0)
+        self.assertAlmostEqual(direction.z, 0.0)
+    
+    def test_transform_points(self):
+        m = Matrix4.translation(1, 2, 3) * Matrix4.rotation_y(0.4) * Matrix4.scale(2, 2, 2)
+        points = [(1, 0, 0), (0, 1, 0), (0.5, -2, 3)]
+        result = m.transform_points(points)
+        self.assertEqual(result.shape, (3, 3))
+        for row, p in zip(result, points):
+            expected = m.transform_point(p)
+            self.assertAlmostEqual(row[0], expected.x)
+            self.assertAlmostEqual(row[1], expected.y)
+            self.assertAlmostEqual(row[2], expected.z)
+    
+    def test_transpose_and_inverse(self):
+        m = Matrix4.translation(1, -2, 3) * Matrix4.rotation_x(0.5) * Matrix4.scale(2, 1, 0.5)
+        self.assertEqual(m.transpose().data[3][0], m.data[0][3])
+        for inverse in (m.inverse(), m.affine_inverse()):
+            identity = (m * inverse).data
+            for i in range(4):
+                for j in range(4):
+                    self.assertAlmostEqual(identity[i][j], 1.0 if i == j else 0.0)
+        with self.assertRaises(ValueError):
+            Matrix4.scale(0, 1, 1).inverse()
+        with self.assertRaises(ValueError):
+            Matrix4.scale(1, 0, 1).affine_inverse()
+    
+    def test_compose_trs(self):
+        expected = (Matrix4.translation(1, 2, 3) * Matrix4.rotation_z(2.0) * Matrix4.rotation_y(-1.1)
+                    * Matrix4.rotation_x(0.3) * Matrix4.scale(2, 3, 4))
+        for rotation in ((0.3, -1.1, 2.0), Quaternion.from_euler(0.3, -1.1, 2.0)):
+            m = Matrix4.compose_trs((1, 2, 3), rotation, (2, 3, 4))
+            self.assertTrue(np.allclose(m.data, expected.data))
+        batch = Matrix4.compose_trs_batch([(1, 2, 3), (0, 0, 0)], [(0.3, -1.1, 2.0), (0, 0, 0)],
+                                          [(2, 3, 4), (1, 1, 1)])
+        self.assertEqual(batch.shape, (2, 4, 4))
+        self.assertTrue(np.allclose(batch[0], expected.data))
+        self.assertTrue(np.allclose(batch[1], np.identity(4)))
+        quaternions = Matrix4.compose_trs_batch([(1, 2, 3)], [tuple(Quaternion.from_euler(0.3, -1.1, 2.0))],
+                                                [(2, 3, 4)])
+        self.assertTrue(np.allclose(quaternions[0], expected.data))
+        with self.assertRaises(ValueError):
+            Matrix4.compose_trs_batch([(0, 0, 0)], [(0, 0)], [(1, 1, 1)])
+
+    def test_construction(self):
+        m = Matrix4([[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 12], [13, 14, 15, 16]])
+        self.assertEqual(m[1][2], 7.0)
+        self.assertEqual(len(m), 4)
+        self.assertEqual(m.copy().data.tolist(), m.data.tolist())
+        with self.assertRaises(ValueError):
+            Matrix4([[1, 2], [3, 4]])
+
+class TestQuaternion(unittest.TestCase):
+    def assertMatrixAlmostEqual(self, a, b):
+        for i in range(4):
+            for j in range(4):
+                self.assertAlmostEqual(a[i][j], b[i][j])
+
+    def test_rotate_vector(self):
+        q = Quaternion.from_axis_angle(Vector3(0, 0, 1), math.pi / 2)
+        v = q * Vector3(1, 0, 0)
+        self.assertAlmostEqual(v.x, 0.0)
+        self.assertAlmostEqual(v.y, 1.0)
+        self.assertAlmostEqual(v.z, 0.0)
+        back = q.conjugate() * v
+        self.assertAlmostEqual(back.x, 1.0)
+        with self.assertRaises(ValueError):
+            Quaternion.from_axis_angle((0, 0, 0), 1.0)
+
+    def test_euler_and_composition(self):
+        q = Quaternion.from_euler(0.3, -1.1, 2.0)
+        expected = Matrix4.rotation_z(2.0) * Matrix4.rotation_y(-1.1) * Matrix4.rotation_x(0.3)
+        self.assertMatrixAlmostEqual(q.to_matrix(), expected)
+        a = Quaternion.from_axis_angle((1, 0, 0), 0.7)
+        b = Quaternion.from_axis_angle((0, 1, 0), -0.4)
+        self.assertMatrixAlmostEqual((a * b).to_matrix(), a.to_matrix() * b.to_matrix())
+        self.assertAlmostEqual((a * b).length(), 1.0)
+
+    def test_slerp(self):
+        a = Quaternion()
+        b = Quaternion.from_axis_angle((0, 1, 0), math.pi / 2)
+        self.assertEqual(a.slerp(b, 0.0), a)
+        half = a.slerp(b, 0.5)
+        expected = Quaternion.from_axis_angle((0, 1, 0), math.pi / 4)
+        for actual, wanted in zip(half, expected):
+            self.assertAlmostEqual(actual, wanted)
+
+class TestVector3Array(unittest.TestCase):
+    def setUp(self):
+        self.array = Vector3Array([Vector3(1, 2, 3), (4, 5, 6), Vector3(0, 0, 0)])
+
+    def test_construction_and_conversion(self):
+        self.assertEqual(len(self.array), 3)
+        self.assertEqual(self.array.data.shape, (3, 3))
+        self.assertEqual(self.array[1], Vector3(4, 5, 6))
+        self.assertEqual(self.array.to_vectors(), [Vector3(1, 2, 3), Vector3(4, 5, 6), Vector3()])
+        self.assertEqual(list(self.array), self.array.to_vectors())
+        self.assertEqual(len(Vector3Array()), 0)
+        with self.assertRaises(ValueError):
+            Vector3Array(np.zeros((2, 2)))
+
+    def test_views_and_indexing(self):
+        data = np.zeros((4, 3))
+        array = Vector3Array(data, copy=False)
+        self.assertIs(np.asarray(array), data)
+        view = array[1:3]
+        view += Vector3(1, 1, 1)
+        self.assertEqual(data[1].tolist(), [1.0, 1.0, 1.0])
+        # Индексация массивом индексов возвращает копию
+        picked = array[[0, 1]]
+        picked *= 5
+        self.assertEqual(data[1].tolist(), [1.0, 1.0, 1.0])
+        self.assertEqual(picked[1], Vector3(5, 5, 5))
+        array[0] = Vector3(7, 8, 9)
+        self.assertEqual(data[0].tolist(), [7.0, 8.0, 9.0])
+        self.assertEqual(len(array[np.array([True, False, True, False])]), 2)
+
+    def test_arithmetic(self):
+        result = self.array + Vector3(1, 1, 1)
+        self.assertEqual(result[0], Vector3(2, 3, 4))
+        self.assertEqual((self.array - self.array)[1], Vector3())
+        self.assertEqual((2 * self.array)[1], Vector3(8, 10, 12))
+        self.assertEqual((self.array * [1, 2, 3])[1], Vector3(8, 10, 12))
+        self.assertEqual((self.array / 2)[0], Vector3(0.5, 1, 1.5))
+        self.assertEqual((-self.array)[0], Vector3(-1, -2, -3))
+
+    def test_products_and_lengths(self):
+        self.assertEqual(self.array.dot(Vector3(1, 0, 0)).tolist(), [1.0, 4.0, 0.0])
+        self.assertEqual(self.array.dot(self.array).tolist(), [14.0, 77.0, 0.0])
+        self.assertEqual(self.array.cross(Vector3(0, 0, 1))[0], Vector3(2, -1, 0))
+        self.assertAlmostEqual(self.array.length()[0], math.sqrt(14))
+        normalized = self.array.normalize()
+        self.assertAlmostEqual(normalized.length()[1], 1.0)
+        self.assertEqual(normalized[2], Vector3())
+        self.assertEqual(self.array[0], Vector3(1, 2, 3))
+
+    def test_min_max(self):
+        self.assertEqual(self.array.min(), Vector3(0, 0, 0))
+        self.assertEqual(self.array.max(), Vector3(4, 5, 6))
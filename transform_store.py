@@ -0,0 +1,219 @@
+from typing import List, Optional, Tuple
+import numpy as np
+from vector import Matrix4
+
+class TransformStore:
+    """Положения, повороты и масштабы объектов сцены в непрерывных массивах
+
+    Строка slot хранит трансформацию объекта owners[slot]; объект
+    обращается к ней через BoundVector3 (position, rotation, scale), а
+    ориентация-кватернион записывается в orientations. Любая запись
+    отмечает строку в dirty, и update() пересчитывает мировые матрицы
+    всех измененных строк одним векторным вызовом.
+
+    Трансформация строки задается относительно родителя (parents, -1 —
+    корень). Строки упорядочиваются по глубине в иерархии в плоский
+    массив (пересчитывается только при изменении иерархии), и update()
+    проходит уровни сверху вниз: мировая матрица строки пересчитывается,
+    если изменилась ее строка или матрица родителя, то есть только в
+    поддеревьях измененных строк. Кадр без изменений не выполняет
+    матричных операций.
+
+    Строки занимают диапазон [0, count): при удалении последняя строка
+    переносится на место удаленной, поэтому добавление и удаление
+    выполняются за O(1), а пакетные операции работают со срезами.
+
+    Attributes:
+        count: Число занятых строк
+        positions: Положения (capacity, 3)
+        rotations: Углы Эйлера (capacity, 3)
+        scales: Масштабы (capacity, 3)
+        orientations: Кватернионы w, x, y, z (capacity, 4)
+        oriented: Задана ли ориентация-кватернион (capacity,)
+        dirty: Изменилась ли строка после последнего update() (capacity,)
+        versions: Счетчик пересчетов матрицы строки (capacity,)
+        parents: Строка родителя или -1 (capacity,)
+        locals: Матрицы относительно родителя (capacity, 4, 4)
+        worlds: Мировые матрицы (capacity, 4, 4)
+        owners: Объект каждой строки
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.count = 0
+        self.owners = []
+        self._levels = None  # Строки по возрастанию глубины и границы уровней
+        self._allocate(max(1, capacity))
+
+    def _allocate(self, capacity: int) -> None:
+        arrays = {
+            'positions': np.zeros((capacity, 3)),
+            'rotations': np.zeros((capacity, 3)),
+            'scales': np.ones((capacity, 3)),
+            'orientations': np.zeros((capacity, 4)),
+            'oriented': np.zeros(capacity, dtype=bool),
+            'dirty': np.zeros(capacity, dtype=bool),
+            'versions': np.zeros(capacity, dtype=np.int64),
+            'parents': np.full(capacity, -1, dtype=np.intp),
+            'locals': np.zeros((capacity, 4, 4)),
+            'worlds': np.zeros((capacity, 4, 4)),
+        }
+        for name, array in arrays.items():
+            if self.count:
+                array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+        # Векторы объектов указывают на строки старых массивов
+        for slot, obj in enumerate(self.owners):
+            obj._bind_transform(self, slot)
+
+    def __len__(self):
+        return self.count
+
+    def add(self, obj) -> int:
+        """Перенос трансформации объекта в хранилище
+
+        Args:
+            obj: Объект Object3D, еще не привязанный к хранилищу; его
+                родитель, если есть, уже должен быть в хранилище
+
+        Returns:
+            int: Строка объекта
+        """
+        if self.count == len(self.dirty):
+            self._allocate(2 * len(self.dirty))
+        slot = self.count
+        self.count += 1
+        self.owners.append(obj)
+        self.positions[slot] = tuple(obj.position)
+        self.rotations[slot] = tuple(obj.rotation)
+        self.scales[slot] = tuple(obj.scale)
+        self.set_orientation(slot, obj.orientation)
+        parent = obj.parent
+        self.parents[slot] = parent._transform_slot if parent is not None and parent._transform_store is self else -1
+        self._levels = None
+        obj._bind_transform(self, slot)
+        return slot
+
+    def remove(self, slot: int) -> None:
+        """Отвязка объекта строки slot; последняя строка переносится на ее место
+        
+        Дочерние строки удаленной строки становятся корнями.
+        """
+        obj = self.owners[slot]
+        obj._unbind_transform()
+        self._set_child_parents(obj, -1)
+        last = self.count - 1
+        if slot != last:
+            for array in (self.positions, self.rotations, self.scales, self.orientations,
+                          self.oriented, self.dirty, self.versions, self.parents, self.locals,
+                          self.worlds):
+                array[slot] = array[last]
+            moved = self.owners[slot] = self.owners[last]
+            moved._bind_transform(self, slot)
+            self._set_child_parents(moved, slot)
+        self.owners.pop()
+        self.parents[last] = -1
+        self.count = last
+        self._levels = None
+        
+    def _set_child_parents(self, obj, parent: int) -> None:
+        for child in obj.children:
+            if child._transform_store is self:
+                self.parents[child._transform_slot] = parent
+                self.dirty[child._transform_slot] = True
+                
+    def set_parent(self, slot: int, parent: Optional[int]) -> None:
+        """Смена родителя строки (None — корень)"""
+        self.parents[slot] = -1 if parent is None else parent
+        self.dirty[slot] = True
+        self._levels = None
+
+    def set_orientation(self, slot: int, orientation) -> None:
+        """Запись ориентации-кватерниона строки (None — используются углы Эйлера)"""
+        self.oriented[slot] = orientation is not None
+        if orientation is not None:
+            self.orientations[slot] = tuple(orientation)
+        self.dirty[slot] = True
+
+    def _hierarchy(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Глубина строк, строки по возрастанию глубины и границы уровней
+        
+        Глубина считается удвоением указателей на предков, то есть за
+        O(log глубины) векторных шагов.
+        """
+        if self._levels is None:
+            ancestors = self.parents[:self.count].copy()
+            depth = (ancestors >= 0).astype(np.intp)
+            linked = ancestors >= 0
+            while linked.any():
+                rows = np.flatnonzero(linked)
+                up = ancestors[rows]
+                depth[rows] += depth[up]
+                ancestors[rows] = ancestors[up]
+                linked[rows] = ancestors[rows] >= 0
+            order = np.argsort(depth, kind='stable')
+            bounds = np.zeros(depth.max(initial=-1) + 2, dtype=np.intp)
+            np.cumsum(np.bincount(depth), out=bounds[1:])
+            self._levels = (depth, order, bounds)
+        return self._levels
+        
+    def key(self, slot: int):
+        """Ключ кэша мировой матрицы объекта строки (с пересчетом измененных строк)"""
+        # Матрица дочерней строки устаревает и при изменении любого предка
+        if self.dirty[slot] or (self.parents[slot] >= 0 and self.dirty[:self.count].any()):
+            self.update()
+        return (self, self.versions.item(slot))
+
+    def update(self) -> List:
+        """Пересчет мировых матриц измененных строк и их потомков
+        
+        Локальные матрицы измененных строк строятся
+        Matrix4.compose_trs_batch отдельно для строк с углами Эйлера и с
+        кватернионами. Затем уровни иерархии обходятся сверху вниз, и на
+        каждом уровне мировые матрицы устаревших строк получаются одним
+        пакетным умножением на матрицы родителей. Результат записывается
+        в кэш объектов вместе с ключом (хранилище, версия строки), поэтому
+        проверка кэша не читает координаты объекта.
+        
+        Returns:
+            List: Объекты, мировые матрицы которых пересчитаны
+        """
+        count = self.count
+        slots = np.flatnonzero(self.dirty[:count])
+        if not len(slots):
+            return []
+        oriented = self.oriented[slots]
+        for mask, rotations in ((~oriented, self.rotations), (oriented, self.orientations)):
+            rows = slots[mask]
+            if len(rows):
+                self.locals[rows] = Matrix4.compose_trs_batch(self.positions[rows], rotations[rows],
+                                                              self.scales[rows])
+        depth, order, bounds = self._hierarchy()
+        stale = self.dirty[:count].copy()
+        deepest = depth[slots].max()
+        for level in range(depth[slots].min(), len(bounds) - 1):
+            rows = order[bounds[level]:bounds[level + 1]]
+            if level:
+                parents = self.parents[rows]
+                mask = stale[rows] | stale[parents]
+                if not mask.any():
+                    if level >= deepest:
+                        break
+                    continue
+                rows = rows[mask]
+                stale[rows] = True
+                self.worlds[rows] = self.worlds[parents[mask]] @ self.locals[rows]
+            else:
+                rows = rows[stale[rows]]
+                self.worlds[rows] = self.locals[rows]
+        changed = np.flatnonzero(stale)
+        self.dirty[:count] = False
+        self.versions[changed] += 1
+        objects = []
+        for slot, version, matrix in zip(changed.tolist(), self.versions[changed].tolist(),
+                                         self.worlds[changed]):
+            obj = self.owners[slot]
+            obj._world_matrix = Matrix4._wrap(matrix)
+            obj._transform_cache_key = (self, version)
+            obj.transform_misses += 1
+            objects.append(obj)
+        return objects
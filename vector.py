@@ -1,4 +1,5 @@
 import math
+import numpy as np
 
 class Vector3:
     """Класс, представляющий трехмерный вектор с базовыми операциями
@@ -8,26 +9,91 @@ class Vector3:
     - умножение и деление на скаляр
     - нормализация
     - скалярное и векторное произведение
+    
+    Вектор хранит координаты в __slots__, поэтому занимает меньше памяти
+    и быстрее создается. Операторы +=, -=, *=, /= и методы с суффиксом
+    _ip изменяют вектор на месте без создания новых объектов.
     """
     
+    __slots__ = ('x', 'y', 'z')
+    
     def __init__(self, x=0, y=0, z=0):
         self.x = float(x)
         self.y = float(y)
         self.z = float(z)
+        
+    @classmethod
+    def from_floats(cls, x: float, y: float, z: float) -> 'Vector3':
+        """Быстрое создание вектора без приведения координат к float
+        
+        Используется, когда координаты уже являются числами float
+        (например, результатами арифметики над координатами векторов).
+        """
+        v = _new_vector(cls)
+        v.x = x
+        v.y = y
+        v.z = z
+        return v
     
     def __add__(self, other):
-        return Vector3(self.x + other.x, self.y + other.y, self.z + other.z)
+        return _make(self.x + other.x, self.y + other.y, self.z + other.z)
     
     def __sub__(self, other):
-        return Vector3(self.x - other.x, self.y - other.y, self.z - other.z)
+        return _make(self.x - other.x, self.y - other.y, self.z - other.z)
     
     def __mul__(self, scalar):
-        return Vector3(self.x * scalar, self.y * scalar, self.z * scalar)
+        return _make(self.x * scalar, self.y * scalar, self.z * scalar)
+    
+    __rmul__ = __mul__
     
     def __truediv__(self, scalar):
         if scalar == 0:
             raise ValueError("Division by zero")
-        return Vector3(self.x / scalar, self.y / scalar, self.z / scalar)
+        return _make(self.x / scalar, self.y / scalar, self.z / scalar)
+    
+    def __neg__(self):
+        return _make(-self.x, -self.y, -self.z)
+    
+    def __matmul__(self, other):
+        """Скалярное произведение: a @ b"""
+        return self.x * other.x + self.y * other.y + self.z * other.z
+    
+    def __iadd__(self, other):
+        self.x += other.x
+        self.y += other.y
+        self.z += other.z
+        return self
+    
+    def __isub__(self, other):
+        self.x -= other.x
+        self.y -= other.y
+        self.z -= other.z
+        return self
+    
+    def __imul__(self, scalar):
+        self.x *= scalar
+        self.y *= scalar
+        self.z *= scalar
+        return self
+    
+    def __itruediv__(self, scalar):
+        if scalar == 0:
+            raise ValueError("Division by zero")
+        self.x /= scalar
+        self.y /= scalar
+        self.z /= scalar
+        return self
+    
+    def __eq__(self, other):
+        if not isinstance(other, Vector3):
+            return NotImplemented
+        return self.x == other.x and self.y == other.y and self.z == other.z
+    
+    # Вектор изменяемый и сравнивается по значению, поэтому не хешируется
+    __hash__ = None
+    
+    def __repr__(self):
+        return f"Vector3({self.x}, {self.y}, {self.z})"
     
     def length(self):
         return math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
@@ -38,19 +104,64 @@ class Vector3:
             return Vector3()
         return self / length
     
+    def normalize_ip(self):
+        """Нормализация вектора на месте (нулевой вектор не изменяется)
+        
+        Returns:
+            Vector3: Этот же вектор
+        """
+        length = math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+        if length != 0:
+            inv = 1.0 / length
+            self.x *= inv
+            self.y *= inv
+            self.z *= inv
+        return self
+    
     def dot(self, other):
         return self.x * other.x + self.y * other.y + self.z * other.z
     
     def cross(self, other):
-        return Vector3(
+        return _make(
             self.y * other.z - self.z * other.y,
             self.z * other.x - self.x * other.z,
             self.x * other.y - self.y * other.x
         )
     
+    def cross_ip(self, other):
+        """Векторное произведение с записью результата в этот вектор
+        
+        Returns:
+            Vector3: Этот же вектор
+        """
+        x, y, z = self.x, self.y, self.z
+        self.x = y * other.z - z * other.y
+        self.y = z * other.x - x * other.z
+        self.z = x * other.y - y * other.x
+        return self
+    
+    def set(self, x: float, y: float, z: float):
+        """Присвоение координат без создания нового вектора
+        
+        Returns:
+            Vector3: Этот же вектор
+        """
+        self.x = float(x)
+        self.y = float(y)
+        self.z = float(z)
+        return self
+    
+    def copy(self):
+        return _make(self.x, self.y, self.z)
+    
     def __len__(self):
         return 3
         
+    def __iter__(self):
+        yield self.x
+        yield self.y
+        yield self.z
+        
     def __getitem__(self, key):
         if key == 0:
             return self.x
@@ -61,6 +172,403 @@ class Vector3:
         else:
             raise IndexError("Vector3 index out of range")
 
+_new_vector = object.__new__
+
+def _make(x: float, y: float, z: float) -> Vector3:
+    """Создание вектора из готовых float-координат без вызова __init__"""
+    v = _new_vector(Vector3)
+    v.x = x
+    v.y = y
+    v.z = z
+    return v
+
+class BoundVector3(Vector3):
+    """Vector3, координаты которого хранятся в строке общего массива
+
+    Хранилище трансформаций сцены держит положения, повороты и масштабы
+    всех объектов в непрерывных массивах (N, 3); объект обращается к
+    своей строке через такой вектор. Запись координаты отмечает строку
+    в массиве флагов как измененную. Вектор объекта вне сцены хранит
+    координаты в собственной памяти (см. detached), а при добавлении в
+    сцену перепривязывается к строке хранилища, оставаясь тем же
+    объектом. Результаты арифметики — обычные Vector3.
+    """
+
+    __slots__ = ('_row', '_flags', '_index')
+
+    def __init__(self, row: np.ndarray, flags: np.ndarray, index: int):
+        """Создание вектора над строкой массива
+
+        Args:
+            row: Строка массива координат (3,)
+            flags: Массив флагов изменения
+            index: Индекс флага этой строки
+        """
+        self.bind(row, flags, index)
+
+    @classmethod
+    def detached(cls, x: float = 0.0, y: float = 0.0, z: float = 0.0) -> 'BoundVector3':
+        """Вектор с координатами в собственной памяти (не привязан к массиву)"""
+        return cls(np.array((x, y, z), dtype=np.float64), np.zeros(1, dtype=bool), 0)
+
+    def bind(self, row: np.ndarray, flags: np.ndarray, index: int) -> None:
+        """Перепривязка к другой строке (после роста или уплотнения массива)"""
+        self._row = row
+        self._flags = flags
+        self._index = index
+
+    def detach(self) -> None:
+        """Перенос координат в собственную память (строка массива освобождается)"""
+        self.bind(self._row.copy(), np.zeros(1, dtype=bool), 0)
+
+    def _get_x(self):
+        return self._row.item(0)
+
+    def _set_x(self, value):
+        self._row[0] = value
+        self._flags[self._index] = True
+
+    def _get_y(self):
+        return self._row.item(1)
+
+    def _set_y(self, value):
+        self._row[1] = value
+        self._flags[self._index] = True
+
+    def _get_z(self):
+        return self._row.item(2)
+
+    def _set_z(self, value):
+        self._row[2] = value
+        self._flags[self._index] = True
+
+    x = property(_get_x, _set_x)
+    y = property(_get_y, _set_y)
+    z = property(_get_z, _set_z)
+
+    def set(self, x: float, y: float, z: float):
+        self._row[:] = (x, y, z)
+        self._flags[self._index] = True
+        return self
+
+class Vector3Array:
+    """Массив трехмерных векторов в одном массиве NumPy (N, 3)
+
+    Предназначен для пакетных операций над геометрией: сложение,
+    масштабирование, скалярное и векторное произведения, длины,
+    нормализация и поиск минимума и максимума выполняются одним
+    вызовом NumPy для всех векторов сразу.
+
+    Срезы возвращают представления тех же данных без копирования,
+    индексация массивом индексов или маской — копию. Элемент по
+    целому индексу возвращается копией в виде Vector3, а итерация
+    перебирает векторы как Vector3, поэтому массив можно использовать
+    вместо списка векторов.
+    """
+
+    __slots__ = ('data',)
+
+    def __init__(self, vectors=(), copy: bool = True):
+        """Создание массива векторов
+
+        Args:
+            vectors: Массив (N, 3), Vector3Array или последовательность
+                векторов (Vector3 или кортежей из трех чисел)
+            copy: Копировать данные массива (False — использовать
+                переданный массив float64 без копирования)
+
+        Raises:
+            ValueError: Если данные нельзя привести к форме (N, 3)
+        """
+        if isinstance(vectors, Vector3Array):
+            vectors = vectors.data
+        if isinstance(vectors, np.ndarray):
+            data = np.array(vectors, dtype=np.float64, copy=copy) if copy \
+                else np.asarray(vectors, dtype=np.float64)
+        else:
+            vectors = list(vectors)
+            data = np.fromiter((c for v in vectors for c in (v[0], v[1], v[2])),
+                               dtype=np.float64, count=3 * len(vectors)).reshape(-1, 3)
+        if data.ndim != 2 or data.shape[1] != 3:
+            raise ValueError("Vector3Array requires data of shape (N, 3)")
+        self.data = data
+
+    @classmethod
+    def _wrap(cls, data: np.ndarray) -> 'Vector3Array':
+        """Массив поверх готовых данных (N, 3) без проверок и копирования"""
+        array = object.__new__(cls)
+        array.data = data
+        return array
+
+    @classmethod
+    def zeros(cls, count: int) -> 'Vector3Array':
+        return cls._wrap(np.zeros((count, 3)))
+
+    @classmethod
+    def from_vectors(cls, vectors) -> 'Vector3Array':
+        """Создание массива из списка Vector3"""
+        return cls(vectors)
+
+    def to_vectors(self) -> list:
+        """Преобразование в список Vector3"""
+        return [Vector3.from_floats(x, y, z) for x, y, z in self.data.tolist()]
+
+    def copy(self) -> 'Vector3Array':
+        return Vector3Array._wrap(self.data.copy())
+
+    @property
+    def x(self) -> np.ndarray:
+        return self.data[:, 0]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self.data[:, 1]
+
+    @property
+    def z(self) -> np.ndarray:
+        return self.data[:, 2]
+
+    def __len__(self):
+        return len(self.data)
+
+    def __array__(self, dtype=None, copy=None):
+        return self.data if dtype is None else self.data.astype(dtype, copy=False)
+
+    def __iter__(self):
+        for x, y, z in self.data.tolist():
+            yield Vector3.from_floats(x, y, z)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            x, y, z = self.data[index].tolist()
+            return Vector3.from_floats(x, y, z)
+        return Vector3Array._wrap(self.data[index].reshape(-1, 3))
+
+    def __setitem__(self, index, value):
+        self.data[index] = _components(value)
+
+    def __repr__(self):
+        return f"Vector3Array({self.data.tolist()})"
+
+    def __add__(self, other):
+        return Vector3Array._wrap(self.data + _components(other))
+
+    def __sub__(self, other):
+        return Vector3Array._wrap(self.data - _components(other))
+
+    def __mul__(self, scale):
+        """Умножение на скаляр или на массив множителей (N,)"""
+        return Vector3Array._wrap(self.data * _scale(scale))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, scale):
+        return Vector3Array._wrap(self.data / _scale(scale))
+
+    def __neg__(self):
+        return Vector3Array._wrap(-self.data)
+
+    def __iadd__(self, other):
+        self.data += _components(other)
+        return self
+
+    def __isub__(self, other):
+        self.data -= _components(other)
+        return self
+
+    def __imul__(self, scale):
+        self.data *= _scale(scale)
+        return self
+
+    def __itruediv__(self, scale):
+        self.data /= _scale(scale)
+        return self
+
+    def dot(self, other) -> np.ndarray:
+        """Скалярные произведения (N,) с вектором или массивом векторов"""
+        return np.einsum('ij,ij->i', self.data, np.broadcast_to(_components(other), self.data.shape))
+
+    __matmul__ = dot
+
+    def cross(self, other) -> 'Vector3Array':
+        """Векторные произведения с вектором или массивом векторов"""
+        return Vector3Array._wrap(np.cross(self.data, _components(other)))
+
+    def length(self) -> np.ndarray:
+        """Длины векторов (N,)"""
+        return np.sqrt(np.einsum('ij,ij->i', self.data, self.data))
+
+    def normalize(self) -> 'Vector3Array':
+        """Нормализованная копия (нулевые векторы остаются нулевыми)"""
+        return self.copy().normalize_ip()
+
+    def normalize_ip(self) -> 'Vector3Array':
+        """Нормализация на месте (нулевые векторы остаются нулевыми)"""
+        length = self.length()[:, None]
+        np.divide(self.data, length, out=self.data, where=length > 0)
+        return self
+
+    def min(self) -> Vector3:
+        """Покомпонентный минимум"""
+        x, y, z = self.data.min(axis=0).tolist()
+        return Vector3.from_floats(x, y, z)
+
+    def max(self) -> Vector3:
+        """Покомпонентный максимум"""
+        x, y, z = self.data.max(axis=0).tolist()
+        return Vector3.from_floats(x, y, z)
+
+def _components(value):
+    """Координаты вектора или массива векторов для операций NumPy"""
+    if isinstance(value, Vector3Array):
+        return value.data
+    if isinstance(value, Vector3):
+        return (value.x, value.y, value.z)
+    return np.asarray(value, dtype=np.float64)
+
+def _scale(value):
+    """Множитель: скаляр или массив (N,), приводимый к столбцу (N, 1)"""
+    if np.ndim(value) == 1:
+        return np.asarray(value, dtype=np.float64)[:, None]
+    return value
+
+class Quaternion:
+    """Кватернион поворота q = w + xi + yj + zk
+
+    Хранит ориентацию без углов Эйлера: повороты композируются
+    умножением кватернионов без преобразования в матрицы и без
+    блокировки осей (gimbal lock). Произведение a * b означает поворот
+    b, за которым следует поворот a (как у матриц для вектор-столбцов).
+    """
+
+    __slots__ = ('w', 'x', 'y', 'z')
+
+    def __init__(self, w=1.0, x=0.0, y=0.0, z=0.0):
+        self.w = float(w)
+        self.x = float(x)
+        self.y = float(y)
+        self.z = float(z)
+
+    @classmethod
+    def from_axis_angle(cls, axis, angle: float) -> 'Quaternion':
+        """Поворот на угол angle (в радианах) вокруг оси axis
+
+        Raises:
+            ValueError: Если ось имеет нулевую длину
+        """
+        ax, ay, az = axis[0], axis[1], axis[2]
+        length = math.sqrt(ax * ax + ay * ay + az * az)
+        if length == 0:
+            raise ValueError("Rotation axis must be non-zero")
+        s = math.sin(angle * 0.5) / length
+        return cls(math.cos(angle * 0.5), ax * s, ay * s, az * s)
+
+    @classmethod
+    def from_euler(cls, x: float, y: float, z: float) -> 'Quaternion':
+        """Кватернион из углов Эйлера (в радианах)
+
+        Порядок поворотов совпадает с Object3D.transform: сначала вокруг X,
+        затем вокруг Y, затем вокруг Z (R = Rz * Ry * Rx).
+        """
+        cx, sx = math.cos(x * 0.5), math.sin(x * 0.5)
+        cy, sy = math.cos(y * 0.5), math.sin(y * 0.5)
+        cz, sz = math.cos(z * 0.5), math.sin(z * 0.5)
+        return cls(cz * cy * cx + sz * sy * sx,
+                   cz * cy * sx - sz * sy * cx,
+                   cz * sy * cx + sz * cy * sx,
+                   sz * cy * cx - cz * sy * sx)
+
+    def __mul__(self, other):
+        """Композиция поворотов или поворот вектора
+
+        Args:
+            other: Quaternion или Vector3
+
+        Returns:
+            Quaternion для кватерниона, Vector3 (повернутый вектор) для вектора
+        """
+        if isinstance(other, Quaternion):
+            w1, x1, y1, z1 = self.w, self.x, self.y, self.z
+            w2, x2, y2, z2 = other.w, other.x, other.y, other.z
+            return Quaternion(w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2,
+                              w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+                              w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
+                              w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2)
+        if isinstance(other, Vector3):
+            return self.rotate(other)
+        return NotImplemented
+
+    def __eq__(self, other):
+        if not isinstance(other, Quaternion):
+            return NotImplemented
+        return (self.w, self.x, self.y, self.z) == (other.w, other.x, other.y, other.z)
+
+    __hash__ = None
+
+    def __iter__(self):
+        yield self.w
+        yield self.x
+        yield self.y
+        yield self.z
+
+    def __repr__(self):
+        return f"Quaternion({self.w}, {self.x}, {self.y}, {self.z})"
+
+    def length(self) -> float:
+        return math.sqrt(self.w * self.w + self.x * self.x + self.y * self.y + self.z * self.z)
+
+    def normalize(self) -> 'Quaternion':
+        """Нормализованный кватернион (нулевой заменяется единичным)"""
+        length = self.length()
+        if length == 0:
+            return Quaternion()
+        inv = 1.0 / length
+        return Quaternion(self.w * inv, self.x * inv, self.y * inv, self.z * inv)
+
+    def conjugate(self) -> 'Quaternion':
+        """Сопряженный кватернион (обратный поворот для единичного)"""
+        return Quaternion(self.w, -self.x, -self.y, -self.z)
+
+    def rotate(self, v) -> Vector3:
+        """Поворот вектора единичным кватернионом"""
+        # v' = v + 2w(q x v) + 2 q x (q x v)
+        qx, qy, qz, w = self.x, self.y, self.z, self.w
+        tx = 2.0 * (qy * v.z - qz * v.y)
+        ty = 2.0 * (qz * v.x - qx * v.z)
+        tz = 2.0 * (qx * v.y - qy * v.x)
+        return _make(v.x + w * tx + qy * tz - qz * ty,
+                     v.y + w * ty + qz * tx - qx * tz,
+                     v.z + w * tz + qx * ty - qy * tx)
+
+    def to_matrix(self) -> 'Matrix4':
+        """Матрица поворота для вектор-столбцов"""
+        return Matrix4.compose_trs((0.0, 0.0, 0.0), self, (1.0, 1.0, 1.0))
+
+    def slerp(self, other: 'Quaternion', t: float) -> 'Quaternion':
+        """Сферическая линейная интерполяция между поворотами
+
+        Args:
+            other: Конечный поворот
+            t: Параметр интерполяции [0, 1]
+
+        Returns:
+            Quaternion: Единичный кватернион промежуточного поворота
+        """
+        dot = self.w * other.w + self.x * other.x + self.y * other.y + self.z * other.z
+        if dot < 0:
+            # Кратчайший путь: q и -q задают один и тот же поворот
+            other = Quaternion(-other.w, -other.x, -other.y, -other.z)
+            dot = -dot
+        if dot > 0.9995:
+            a, b = 1.0 - t, t
+        else:
+            theta = math.acos(dot)
+            sin_theta = math.sin(theta)
+            a = math.sin((1.0 - t) * theta) / sin_theta
+            b = math.sin(t * theta) / sin_theta
+        return Quaternion(a * self.w + b * other.w, a * self.x + b * other.x,
+                          a * self.y + b * other.y, a * self.z + b * other.z).normalize()
+
 class Matrix4:
     """Класс, представляющий матрицу 4x4 для 3D преобразований
     
@@ -68,17 +576,40 @@ class Matrix4:
     - перемещение (translation)
     - вращение (rotation) вокруг осей X, Y, Z
     - масштабирование (scale)
-    - умножение матриц
+    - построение T * R * S одной матрицей (compose_trs, compose_trs_batch)
+    - умножение матриц и преобразование точек и направлений
+    - транспонирование и обращение
+    
+    Матрица хранится в непрерывном массиве NumPy (4, 4) и действует на
+    вектор-столбцы: перемещение находится в data[i][3]. Доступ вида
+    data[i][j] и m[i][j] сохраняется, а np.asarray(m) возвращает массив
+    без копирования.
     """
     
-    def __init__(self):
-        # Initialize as identity matrix
-        self.data = [
-            [1.0, 0.0, 0.0, 0.0],
-            [0.0, 1.0, 0.0, 0.0],
-            [0.0, 0.0, 1.0, 0.0],
-            [0.0, 0.0, 0.0, 1.0]
-        ]
+    __slots__ = ('data',)
+    
+    def __init__(self, data=None):
+        """Создание матрицы
+        
+        Args:
+            data: Элементы матрицы 4x4 (по умолчанию единичная матрица)
+            
+        Raises:
+            ValueError: Если размер данных не 4x4
+        """
+        if data is None:
+            self.data = np.identity(4)
+        else:
+            self.data = np.array(data, dtype=np.float64)
+            if self.data.shape != (4, 4):
+                raise ValueError("Matrix4 requires 4x4 data")
+                
+    @classmethod
+    def _wrap(cls, array: np.ndarray) -> 'Matrix4':
+        """Матрица поверх готового массива (4, 4) без копирования"""
+        m = object.__new__(cls)
+        m.data = array
+        return m
     
     @staticmethod
     def translation(x, y, z):
@@ -129,11 +660,193 @@ class Matrix4:
         m.data[2][2] = z
         return m
     
+    @staticmethod
+    def compose_trs(position, rotation, scale) -> 'Matrix4':
+        """Матрица перемещения, поворота и масштабирования T * R * S
+
+        Элементы матрицы вычисляются напрямую, без построения и
+        перемножения отдельных матриц.
+
+        Args:
+            position: Перемещение (x, y, z)
+            rotation: Quaternion или углы Эйлера (x, y, z) в радианах,
+                применяемые в порядке X, Y, Z
+            scale: Масштаб по осям (x, y, z)
+
+        Returns:
+            Matrix4: Матрица для вектор-столбцов
+        """
+        sx, sy, sz = scale[0], scale[1], scale[2]
+        if isinstance(rotation, Quaternion):
+            w, x, y, z = rotation.w, rotation.x, rotation.y, rotation.z
+            xx, yy, zz = x * x, y * y, z * z
+            xy, xz, yz = x * y, x * z, y * z
+            wx, wy, wz = w * x, w * y, w * z
+            r00, r01, r02 = 1.0 - 2.0 * (yy + zz), 2.0 * (xy - wz), 2.0 * (xz + wy)
+            r10, r11, r12 = 2.0 * (xy + wz), 1.0 - 2.0 * (xx + zz), 2.0 * (yz - wx)
+            r20, r21, r22 = 2.0 * (xz - wy), 2.0 * (yz + wx), 1.0 - 2.0 * (xx + yy)
+        else:
+            cx, snx = math.cos(rotation[0]), math.sin(rotation[0])
+            cy, sny = math.cos(rotation[1]), math.sin(rotation[1])
+            cz, snz = math.cos(rotation[2]), math.sin(rotation[2])
+            r00, r01, r02 = cy * cz, snx * sny * cz - cx * snz, cx * sny * cz + snx * snz
+            r10, r11, r12 = cy * snz, snx * sny * snz + cx * cz, cx * sny * snz - snx * cz
+            r20, r21, r22 = -sny, snx * cy, cx * cy
+        return Matrix4._wrap(np.array([
+            [r00 * sx, r01 * sy, r02 * sz, float(position[0])],
+            [r10 * sx, r11 * sy, r12 * sz, float(position[1])],
+            [r20 * sx, r21 * sy, r22 * sz, float(position[2])],
+            [0.0, 0.0, 0.0, 1.0],
+        ]))
+
+    @staticmethod
+    def compose_trs_batch(positions, rotations, scales) -> np.ndarray:
+        """Матрицы T * R * S для набора объектов одним векторным расчетом
+
+        Args:
+            positions: Перемещения (N, 3)
+            rotations: Углы Эйлера (N, 3) или кватернионы (N, 4) в порядке w, x, y, z
+            scales: Масштабы (N, 3)
+
+        Returns:
+            np.ndarray: Матрицы (N, 4, 4) для вектор-столбцов
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        rotations = np.asarray(rotations, dtype=np.float64).reshape(len(positions), -1)
+        scales = np.asarray(scales, dtype=np.float64).reshape(-1, 3)
+        result = np.zeros((len(positions), 4, 4))
+        rotation = result[:, :3, :3]
+        if rotations.shape[1] == 4:
+            w, x, y, z = rotations.T
+            rotation[:, 0, 0] = 1.0 - 2.0 * (y * y + z * z)
+            rotation[:, 0, 1] = 2.0 * (x * y - w * z)
+            rotation[:, 0, 2] = 2.0 * (x * z + w * y)
+            rotation[:, 1, 0] = 2.0 * (x * y + w * z)
+            rotation[:, 1, 1] = 1.0 - 2.0 * (x * x + z * z)
+            rotation[:, 1, 2] = 2.0 * (y * z - w * x)
+            rotation[:, 2, 0] = 2.0 * (x * z - w * y)
+            rotation[:, 2, 1] = 2.0 * (y * z + w * x)
+            rotation[:, 2, 2] = 1.0 - 2.0 * (x * x + y * y)
+        elif rotations.shape[1] == 3:
+            cx, cy, cz = np.cos(rotations).T
+            snx, sny, snz = np.sin(rotations).T
+            rotation[:, 0, 0] = cy * cz
+            rotation[:, 0, 1] = snx * sny * cz - cx * snz
+            rotation[:, 0, 2] = cx * sny * cz + snx * snz
+            rotation[:, 1, 0] = cy * snz
+            rotation[:, 1, 1] = snx * sny * snz + cx * cz
+            rotation[:, 1, 2] = cx * sny * snz - snx * cz
+            rotation[:, 2, 0] = -sny
+            rotation[:, 2, 1] = snx * cy
+            rotation[:, 2, 2] = cx * cy
+        else:
+            raise ValueError("Rotations must be Euler angles (N, 3) or quaternions (N, 4)")
+        # Масштаб применяется к столбцам поворота
+        rotation *= scales[:, None, :]
+        result[:, :3, 3] = positions
+        result[:, 3, 3] = 1.0
+        return result
+
     def __mul__(self, other):
-        result = Matrix4()
-        for i in range(4):
-            for j in range(4):
-                result.data[i][j] = sum(
-                    self.data[i][k] * other.data[k][j] for k in range(4)
-                )
-        return result
\ No newline at end of file
+        """Произведение матриц или преобразование точки
+        
+        Args:
+            other: Matrix4 или Vector3
+            
+        Returns:
+            Matrix4 для матрицы, Vector3 (преобразованная точка) для вектора
+        """
+        if isinstance(other, Matrix4):
+            return Matrix4._wrap(self.data @ other.data)
+        if isinstance(other, Vector3):
+            return self.transform_point(other)
+        return NotImplemented
+    
+    __matmul__ = __mul__
+    
+    def __getitem__(self, row):
+        return self.data[row]
+    
+    def __len__(self):
+        return 4
+    
+    def __array__(self, dtype=None, copy=None):
+        return self.data if dtype is None else self.data.astype(dtype, copy=False)
+    
+    def __repr__(self):
+        return f"Matrix4({self.data.tolist()})"
+    
+    def copy(self) -> 'Matrix4':
+        return Matrix4._wrap(self.data.copy())
+    
+    def transpose(self) -> 'Matrix4':
+        """Транспонированная матрица"""
+        return Matrix4._wrap(self.data.T.copy())
+    
+    def inverse(self) -> 'Matrix4':
+        """Обратная матрица общего вида
+        
+        Raises:
+            ValueError: Если матрица вырождена
+        """
+        try:
+            return Matrix4._wrap(np.linalg.inv(self.data))
+        except np.linalg.LinAlgError:
+            raise ValueError("Matrix is singular")
+    
+    def affine_inverse(self) -> 'Matrix4':
+        """Обратная матрица для аффинного преобразования
+        
+        Обращается только линейная часть 3x3, перемещение пересчитывается:
+        inverse = [R^-1, -R^-1 * t]. Последняя строка матрицы должна быть
+        (0, 0, 0, 1).
+        
+        Raises:
+            ValueError: Если линейная часть вырождена
+        """
+        try:
+            linear = np.linalg.inv(self.data[:3, :3])
+        except np.linalg.LinAlgError:
+            raise ValueError("Matrix is singular")
+        result = np.identity(4)
+        result[:3, :3] = linear
+        result[:3, 3] = -linear @ self.data[:3, 3]
+        return Matrix4._wrap(result)
+    
+    def transform_point(self, point) -> Vector3:
+        """Преобразование точки (с перемещением и перспективным делением)"""
+        m = self.data
+        x, y, z = point[0], point[1], point[2]
+        tx = m[0, 0] * x + m[0, 1] * y + m[0, 2] * z + m[0, 3]
+        ty = m[1, 0] * x + m[1, 1] * y + m[1, 2] * z + m[1, 3]
+        tz = m[2, 0] * x + m[2, 1] * y + m[2, 2] * z + m[2, 3]
+        w = m[3, 0] * x + m[3, 1] * y + m[3, 2] * z + m[3, 3]
+        if w != 1.0 and w != 0.0:
+            tx, ty, tz = tx / w, ty / w, tz / w
+        return Vector3.from_floats(float(tx), float(ty), float(tz))
+    
+    def transform_direction(self, direction) -> Vector3:
+        """Преобразование направления (без перемещения)"""
+        m = self.data
+        x, y, z = direction[0], direction[1], direction[2]
+        return Vector3.from_floats(float(m[0, 0] * x + m[0, 1] * y + m[0, 2] * z),
+                                   float(m[1, 0] * x + m[1, 1] * y + m[1, 2] * z),
+                                   float(m[2, 0] * x + m[2, 1] * y + m[2, 2] * z))
+    
+    def transform_points(self, points) -> np.ndarray:
+        """Преобразование массива точек одним умножением
+        
+        Args:
+            points: Точки (N, 3)
+            
+        Returns:
+            np.ndarray: Преобразованные точки (N, 3)
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        m = self.data
+        result = points @ m[:3, :3].T + m[:3, 3]
+        if m[3, 0] or m[3, 1] or m[3, 2] or m[3, 3] != 1.0:
+            # Проективное преобразование: деление на w
+            w = points @ m[3, :3] + m[3, 3]
+            result /= np.where(w == 0.0, 1.0, w)[:, None]
+        return result